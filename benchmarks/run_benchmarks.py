@@ -0,0 +1,217 @@
+"""
+Chronos - Scheduling Core Benchmarks
+Description: Times the scheduling core at restaurant, hospital and factory scale
+             and stores the results as JSON so releases can be compared.
+
+Usage:
+    python benchmarks/run_benchmarks.py                       # all scales
+    python benchmarks/run_benchmarks.py --scales restaurant   # one scale
+    python benchmarks/run_benchmarks.py --compare benchmarks/results/old.json
+"""
+
+import argparse
+import json
+import os
+import platform
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+# Allow running from the repository root or from this directory
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules import Shift, Schedule, storage
+from modules.generator import WorkloadGenerator
+from modules.payroll import PayrollEngine
+
+RESULTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'results')
+
+# Synthetic workload sizes (the scale name is also the generator's role mix)
+SCALES = {
+    'restaurant': {'employees': 50, 'shifts_per_day': 40},
+    'hospital': {'employees': 500, 'shifts_per_day': 400},
+    'factory': {'employees': 5000, 'shifts_per_day': 1500},   # 10,500 shifts per week
+}
+
+# Targets from requirements.md section 4.1 (seconds)
+TARGETS = {
+    'assign_all': 30.0,   # Schedule generation within 30 seconds for 50 employees
+    'load_data': 5.0,     # Application should load within 5 seconds
+}
+
+
+def generate_workload(industry, num_employees, shifts_per_day, seed=42):
+    """
+    Generate employees and one week of unassigned shifts
+
+    Returns:
+        tuple: (employees, schedule, plan) where plan is a list of (shift, employee)
+               pairs to assign
+    """
+    generator = WorkloadGenerator(seed)
+    employees = generator.generate_employees(num_employees, role_mix=industry)
+    schedule = next(generator.iter_schedules(employees, 1, start_date="2025-01-06",
+                                             shifts_per_day=shifts_per_day, fill_rate=0.0))
+    plan = generator.plan_assignments(schedule, employees)
+    return employees, schedule, plan
+
+
+def generate_conflict_free_schedule(num_shifts):
+    """
+    Generate a week of back-to-back 5-minute shifts that never overlap
+
+    has_conflicts() stops at the first conflict it finds, so this is its worst case.
+    """
+    monday = date(2025, 1, 6)
+    schedule = Schedule(monday, monday + timedelta(days=6))
+    for i in range(num_shifts):
+        day_offset, slot = divmod(i, 287)
+        start_minutes = slot * 5
+        end_minutes = start_minutes + 5
+        schedule.add_shift(Shift(monday + timedelta(days=day_offset % 7),
+                                 (start_minutes // 60) * 100 + start_minutes % 60,
+                                 (end_minutes // 60) * 100 + end_minutes % 60,
+                                 ['server']))
+    return schedule
+
+
+def time_call(func, repeat=1):
+    """
+    Time a function
+
+    Returns:
+        dict: Mean and minimum time in milliseconds over repeat runs
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        times.append((time.perf_counter() - start) * 1000)
+    return {'mean_ms': sum(times) / len(times), 'min_ms': min(times), 'runs': repeat}
+
+
+def run_scale(name, num_employees, shifts_per_day):
+    """Run every benchmark for one scale"""
+    print(f"\n{name.upper()}: {num_employees} employees, {shifts_per_day * 7} shifts")
+    employees, schedule, plan = generate_workload(name, num_employees, shifts_per_day)
+    timings = {}
+
+    # Shift.assign_employee (all planned assignments = generating the week)
+    def assign_all():
+        for shift, employee in plan:
+            try:
+                shift.assign_employee(employee)
+            except ValueError:
+                pass
+    timings['assign_all'] = time_call(assign_all)
+    assigned = sum(len(shift.assigned_employees) for shift in schedule.get_all_shifts())
+    timings['assign_all']['calls'] = len(plan)
+    timings['assign_all']['per_call_us'] = timings['assign_all']['mean_ms'] * 1000 / max(len(plan), 1)
+
+    repeat = 5 if num_employees <= 50 else 3 if num_employees <= 500 else 1
+    timings['has_conflicts'] = time_call(schedule.has_conflicts, repeat)
+    # Worst case is quadratic, so it is capped at 2,000 shifts
+    conflict_free = generate_conflict_free_schedule(min(len(schedule.get_all_shifts()), 2000))
+    timings['has_conflicts_worst'] = time_call(conflict_free.has_conflicts)
+    timings['has_conflicts_worst']['shifts'] = len(conflict_free.get_all_shifts())
+    timings['labor_rule_check'] = time_call(schedule.get_labor_rule_violations, repeat)
+    timings['calculate_payroll'] = time_call(lambda: schedule.calculate_payroll(employees), repeat)
+    timings['payroll_engine'] = time_call(lambda: PayrollEngine().calculate(schedule, employees), repeat)
+
+    data = {}
+    def to_dict():
+        data['schedule'] = schedule.to_dict()
+    timings['to_dict'] = time_call(to_dict, repeat)
+    timings['from_dict'] = time_call(lambda: Schedule.from_dict(data['schedule']), repeat)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_file = os.path.join(temp_dir, 'scheduling_data.json')
+        timings['save_data'] = time_call(
+            lambda: storage.save_data(employees, [schedule], data_file=data_file, backup_file=None), repeat)
+        timings['load_data'] = time_call(lambda: storage.load_data(data_file), repeat)
+
+    for bench_name, result in timings.items():
+        line = f"  {bench_name:<20} {result['mean_ms']:>10.2f} ms"
+        if bench_name in TARGETS:
+            target_ms = TARGETS[bench_name] * 1000
+            line += "  ✅ within target" if result['mean_ms'] <= target_ms else "  ❌ OVER TARGET"
+        print(line)
+
+    return {
+        'employees': num_employees,
+        'shifts': len(schedule.get_all_shifts()),
+        'assignments': assigned,
+        'timings': timings
+    }
+
+
+def compare_results(old_results, new_results, threshold=0.2, noise_floor_ms=1.0):
+    """
+    Print the change in best time for every benchmark present in both runs
+
+    Args:
+        old_results (dict): Results loaded from a previous run
+        new_results (dict): Results of this run
+        threshold (float): Slowdown fraction reported as a regression (default 20%)
+        noise_floor_ms (float): Benchmarks faster than this are never flagged (timer noise)
+
+    Returns:
+        list: (scale, benchmark, change) tuples for the regressions found
+    """
+    regressions = []
+    print("\nCOMPARISON WITH PREVIOUS RUN")
+    for scale, new_scale in new_results['scales'].items():
+        old_scale = old_results.get('scales', {}).get(scale)
+        if not old_scale:
+            continue
+        for bench_name, new_timing in new_scale['timings'].items():
+            old_timing = old_scale['timings'].get(bench_name)
+            if not old_timing or old_timing['min_ms'] == 0:
+                continue
+            change = (new_timing['min_ms'] - old_timing['min_ms']) / old_timing['min_ms']
+            is_regression = change > threshold and new_timing['min_ms'] >= noise_floor_ms
+            flag = "  ❌ REGRESSION" if is_regression else ""
+            print(f"  {scale:<11} {bench_name:<20} {change:+7.1%}{flag}")
+            if is_regression:
+                regressions.append((scale, bench_name, change))
+    return regressions
+
+
+def main():
+    """Benchmark entry point"""
+    parser = argparse.ArgumentParser(description="Benchmark the Chronos scheduling core")
+    parser.add_argument('--scales', nargs='+', choices=list(SCALES), default=list(SCALES))
+    parser.add_argument('--output', help="Results file (default benchmarks/results/<timestamp>.json)")
+    parser.add_argument('--compare', help="Previous results file to compare against")
+    parser.add_argument('--threshold', type=float, default=0.2,
+                        help="Slowdown fraction reported as a regression (default 0.2)")
+    args = parser.parse_args()
+
+    results = {
+        'timestamp': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'scales': {}
+    }
+    for name in args.scales:
+        results['scales'][name] = run_scale(name, SCALES[name]['employees'], SCALES[name]['shifts_per_day'])
+
+    output = args.output
+    if not output:
+        if not os.path.exists(RESULTS_DIR):
+            os.makedirs(RESULTS_DIR)
+        output = os.path.join(RESULTS_DIR, datetime.now().strftime("%Y%m%d_%H%M%S") + '.json')
+    with open(output, 'w') as file:
+        json.dump(results, file, indent=2)
+    print(f"\nResults saved to {output}")
+
+    if args.compare:
+        with open(args.compare, 'r') as file:
+            regressions = compare_results(json.load(file), results, args.threshold)
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
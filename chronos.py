@@ -4,8 +4,9 @@ Author: Ptolemy Linden
 Description: Professional scheduling software with Tkinter GUI
 """
 
+import argparse
 import tkinter as tk # basic Tkinter widgets (Label, Button, etc.)
-from tkinter import ttk, messagebox, simpledialog # themed widgets (sexy, sleek, modern widgets)
+from tkinter import ttk, messagebox, simpledialog, filedialog # themed widgets (sexy, sleek, modern widgets)
 import calendar
 from datetime import datetime, date, timedelta
 from functools import partial
@@ -15,12 +16,43 @@ import os
 from modules.employee import Employee
 from modules.shift import Shift
 from modules.schedule import Schedule
+from modules import events, storage
+from modules.events import event_bus
+from modules.eligibility import EligibilityIndex
+from modules.ledger import get_week_start
+from modules.payroll import PayrollEngine
+from modules.analytics import LaborCostCube
+from modules.daily import DailySummaryIndex
+from modules.rules import RuleEngine
+from modules.optimizer import ScheduleOptimizer
+from modules.swaps import SwapMarketplace
+from modules.templates import ShiftTemplate, save_templates, load_templates
+from modules.importer import import_employees
+from modules import export
+from modules.locations import LocationStore, ConflictIndex, location_slug
+from modules.feeds import FeedIndex, FEEDS_DIR
+from modules.notifications import NotificationOutbox, get_transport
+from modules.publishing import Publisher, save_snapshot, load_snapshots, delete_snapshots, PUBLISHED_DIR
+from modules import profiling
+from modules.profiling import profiler, timed, SessionProfiler
+
+
+def get_period_label(schedule):
+    """"Week" for a one-week schedule, "Period" for anything else (e.g., a 4-week rotation)"""
+    return "Week" if schedule is None or schedule.get_length_days() == 7 else "Period"
+
+
+def get_schedule_dates(schedule):
+    """Dates a schedule covers (e.g., "Week of 2025-12-01" or "2025-12-01 to 2025-12-28")"""
+    if schedule.get_length_days() == 7:
+        return f"Week of {schedule.start_date}"
+    return f"{schedule.start_date} to {schedule.end_date}"
 
 
 class SchedulingApp:
-    def __init__(self, root):
+    def __init__(self, root, session_profiler=None, location=None):
         self.root = root # Main window passed from main()
-        self.root.title("Luigi Mangione's Italian Restaurant - Chronos")
+        self.root.title("Luigi Mangione's Italian Restaurant - Chronos" + (f" - {location}" if location else ""))
         self.root.geometry("1200x800")
         self.root.minsize(1000, 600)
         
@@ -35,15 +67,76 @@ class SchedulingApp:
         self.schedules = []
         self.current_schedule = None
         
+        # Monday of the week shown in the weekly view (schedules can span several weeks)
+        self.view_week_start = None
+        self.view_schedule = None
+        
+        # Running as one site: only this location's shard is loaded and saved
+        self.location = location
+        self.location_store = LocationStore() if location else None
+        # Assignments at the other sites (for employees who work at several)
+        self.conflict_index = ConflictIndex()
+        
+        # Precomputed employee eligibility for shift assignment
+        self.eligibility = EligibilityIndex()
+        
+        # Shifts posted for swapping (matched through the eligibility index)
+        self.swaps = SwapMarketplace([], self.eligibility)
+        
+        # Weekly shift patterns for creating schedules in bulk
+        self.templates = []
+        
+        # Employees whose role or availability changed (re-checked when copying schedules forward)
+        self.changed_employee_ids = set()
+        
+        # Payroll with weekly overtime (1.5x past 40 hours)
+        self.payroll_engine = PayrollEngine()
+        # The current schedule's payroll per employee, so one assignment only re-prices one employee
+        self.payroll_schedule = None
+        self.payroll_breakdowns = {}  # employee_id -> EmployeePayroll
+        self.payroll_total = 0.0
+        self.payroll_overtime = 0.0
+        
+        # Labor cost rollups for analytics, kept up to date as schedules change
+        self.labor_cube = LaborCostCube()
+        
+        # Per-day shift, staffing and cost totals for the calendar view
+        self.daily_index = DailySummaryIndex()
+        
+        # Employees' personal .ics feeds (only changed employees are rewritten on publish)
+        self.feeds_dir = os.path.join(FEEDS_DIR, location_slug(location)) if location else FEEDS_DIR
+        self.feeds = FeedIndex(self.feeds_dir)
+        
+        # Assignment changes are batched per employee, released when the data is saved
+        # and sent by a background thread
+        # (SMTP when CHRONOS_SMTP_HOST is set, otherwise data/outbox/notifications.jsonl)
+        self.outbox = NotificationOutbox(get_transport())
+        
+        # Published versions of schedules (immutable snapshots, one file per version)
+        self.published_dir = os.path.join(PUBLISHED_DIR, location_slug(location)) if location else PUBLISHED_DIR
+        self.publisher = Publisher(load_snapshots(self.published_dir))
+        
+        # cProfile session recording (started by --profile or the Diagnostics panel)
+        self.session_profiler = session_profiler or SessionProfiler(os.path.dirname(storage.DATA_FILE))
+        
         # Create GUI first (before loading data)
         self.setup_gui()
         
+        # Listen for model changes (views update only the affected rows)
+        self.subscribe_to_events()
+        
         # Load data if exists (now GUI is ready)
         # self.load_data()
         
-        # Load sample data if no data exists
-        if not self.employees:
+        # A site starts from its own shard; otherwise load sample data if no data exists
+        if self.location:
+            self.load_data()
+        elif not self.employees:
             self.load_sample_data_advanced()
+        
+        # Nobody needs to hear about the assignments that were just loaded
+        self.outbox.clear()
+        self.outbox.start()
 
     def setup_styles(self):
         """Configure ttk styles for a professional look"""
@@ -134,6 +227,34 @@ class SchedulingApp:
                   command=self.create_new_schedule, style='Action.TButton').pack(side='left', padx=5)
         ttk.Button(actions_grid, text="⏰ Add Shift", 
                   command=self.show_add_shift_dialog, style='Action.TButton').pack(side='left', padx=5)
+        
+        # Diagnostics frame (timings of slow actions, recorded only while enabled)
+        diagnostics_frame = ttk.LabelFrame(dashboard_frame, text="Diagnostics", padding=10)
+        diagnostics_frame.pack(fill='x', padx=10, pady=5)
+        
+        diagnostics_buttons = ttk.Frame(diagnostics_frame)
+        diagnostics_buttons.pack(fill='x')
+        
+        self.profiling_var = tk.BooleanVar(value=profiler.enabled)
+        ttk.Checkbutton(diagnostics_buttons, text="Record timings", variable=self.profiling_var,
+                       command=self.toggle_timings).pack(side='left', padx=5)
+        ttk.Button(diagnostics_buttons, text="🔄 Refresh", command=self.refresh_diagnostics).pack(side='left', padx=5)
+        ttk.Button(diagnostics_buttons, text="🧹 Reset", command=self.reset_diagnostics).pack(side='left', padx=5)
+        ttk.Button(diagnostics_buttons, text="💾 Dump to File", command=self.dump_diagnostics).pack(side='left', padx=5)
+        
+        self.session_profile_var = tk.BooleanVar(value=self.session_profiler.running)
+        ttk.Checkbutton(diagnostics_buttons, text="Record cProfile session", variable=self.session_profile_var,
+                       command=self.toggle_session_profile).pack(side='left', padx=20)
+        
+        columns = ('Action', 'Calls', 'Mean (ms)', 'Max (ms)', 'Total (ms)', 'Histogram')
+        self.diagnostics_tree = ttk.Treeview(diagnostics_frame, columns=columns, show='headings', height=6)
+        for col in columns:
+            self.diagnostics_tree.heading(col, text=col)
+        self.diagnostics_tree.column('Action', width=220)
+        for col in ('Calls', 'Mean (ms)', 'Max (ms)', 'Total (ms)'):
+            self.diagnostics_tree.column(col, width=80, anchor='e')
+        self.diagnostics_tree.column('Histogram', width=420)
+        self.diagnostics_tree.pack(fill='x', pady=(5, 0))
 
     def create_employees_tab(self):
         """Create employee management tab"""
@@ -177,6 +298,8 @@ class SchedulingApp:
                   command=self.delete_selected_employee).pack(side='left', padx=5)
         ttk.Button(emp_actions_frame, text="👁️ View Details", 
                   command=self.view_employee_details).pack(side='left', padx=5)
+        ttk.Button(emp_actions_frame, text="📥 Import CSV/Excel", 
+                  command=self.import_employees_from_file).pack(side='left', padx=5)
 
     def create_schedule_tab(self):
         """Create schedule management tab"""
@@ -199,6 +322,28 @@ class SchedulingApp:
                   command=self.create_new_schedule).pack(side='left', padx=10)
         ttk.Button(selection_frame, text="🗑️ Delete Schedule", 
                   command=self.delete_current_schedule).pack(side='left', padx=5)
+        # Says "Copy Period" while a multi-week rotation is selected
+        self.copy_button = ttk.Button(selection_frame, text="📄 Copy Week", 
+                                      command=self.copy_schedule_forward)
+        self.copy_button.pack(side='left', padx=5)
+        ttk.Button(selection_frame, text="📋 From Template", 
+                  command=self.create_schedules_from_template).pack(side='left', padx=5)
+        ttk.Button(selection_frame, text="💾 Save as Template", 
+                  command=self.save_schedule_as_template).pack(side='left', padx=5)
+        ttk.Button(selection_frame, text="📆 Calendar", 
+                  command=self.show_calendar_view).pack(side='left', padx=5)
+        ttk.Button(selection_frame, text="⏱️ Hours Report", 
+                  command=self.show_hours_report).pack(side='left', padx=5)
+        ttk.Button(selection_frame, text="🤖 Auto-Fill", 
+                  command=self.auto_fill_schedule).pack(side='left', padx=5)
+        ttk.Button(selection_frame, text="💲 Min-Cost Fill", 
+                  command=self.min_cost_fill_schedule).pack(side='left', padx=5)
+        ttk.Button(selection_frame, text="⚖️ Fair Fill", 
+                  command=self.fair_fill_schedule).pack(side='left', padx=5)
+        ttk.Button(selection_frame, text="✅ Check Rules", 
+                  command=self.show_rule_violations).pack(side='left', padx=5)
+        ttk.Button(selection_frame, text="📢 Publish", 
+                  command=self.publish_current_schedule).pack(side='left', padx=5)
         
         # Schedule cost frame
         cost_frame = ttk.LabelFrame(schedule_frame, text="Payroll Summary", padding=10)
@@ -209,10 +354,36 @@ class SchedulingApp:
         ttk.Label(cost_frame, textvariable=self.schedule_total_cost,
                   style='Heading.TLabel', foreground='green').pack(side='left', padx=5)
         
+        self.schedule_overtime_cost = tk.StringVar(value="$0.00")
+        ttk.Label(cost_frame, text="Overtime:").pack(side='left', padx=(20, 5))
+        ttk.Label(cost_frame, textvariable=self.schedule_overtime_cost,
+                  style='Heading.TLabel', foreground='orange').pack(side='left', padx=5)
+        
+        ttk.Button(cost_frame, text="📋 Payroll Breakdown", 
+                  command=self.show_payroll_breakdown).pack(side='right', padx=5)
+        export_button = ttk.Menubutton(cost_frame, text="📤 Export")
+        export_menu = tk.Menu(export_button, tearoff=0)
+        export_menu.add_command(label="Shifts (CSV)", command=lambda: self.export_schedules('shifts'))
+        export_menu.add_command(label="Employee Payroll (CSV)", command=lambda: self.export_schedules('payroll'))
+        export_menu.add_command(label="Printable Weeks (HTML/PDF)", command=lambda: self.export_schedules('print'))
+        export_menu.add_separator()
+        export_menu.add_command(label="Publish Employee Calendars (.ics)", command=self.publish_feeds)
+        export_menu.add_command(label="Send Notifications Now", command=self.send_notifications)
+        export_button['menu'] = export_menu
+        export_button.pack(side='right', padx=5)
+        
         # Schedule view frame
         view_frame = ttk.LabelFrame(schedule_frame, text="Weekly Schedule View", padding=10)
         view_frame.pack(fill='both', expand=True, padx=10, pady=5)
         
+        # Week navigation for schedules longer than a week (e.g., 2-week or 4-week rotations)
+        week_nav = ttk.Frame(view_frame)
+        week_nav.pack(fill='x', pady=(0, 5))
+        ttk.Button(week_nav, text="◀ Prev Week", command=lambda: self.change_view_week(-1)).pack(side='left', padx=5)
+        self.view_week_var = tk.StringVar(value="")
+        ttk.Label(week_nav, textvariable=self.view_week_var).pack(side='left', padx=10)
+        ttk.Button(week_nav, text="Next Week ▶", command=lambda: self.change_view_week(1)).pack(side='left', padx=5)
+        
         # Days of week tabs
         self.schedule_notebook = ttk.Notebook(view_frame)
         self.schedule_notebook.pack(fill='both', expand=True)
@@ -286,6 +457,8 @@ class SchedulingApp:
                   command=self.assign_employee_to_shift).pack(side='left', padx=5)
         ttk.Button(shift_actions_frame, text="🗑️ Delete Shift", 
                   command=self.delete_selected_shift).pack(side='left', padx=5)
+        ttk.Button(shift_actions_frame, text="🔄 Swap Shift", 
+                  command=self.swap_selected_shift).pack(side='left', padx=5)
 
     def create_status_bar(self):
         """Create status bar at bottom"""
@@ -303,7 +476,7 @@ class SchedulingApp:
 
     def show_add_employee_dialog(self):
         """Show dialog to add new employee"""
-        dialog = EmployeeDialog(self.root, "Add Employee")
+        dialog = EmployeeDialog(self.root, "Add Employee", location=self.location)
         if dialog.result:
             emp_data = dialog.result
             try:
@@ -314,14 +487,18 @@ class SchedulingApp:
                     role=emp_data['role'],
                     wage=float(emp_data['wage']),
                     max_hours=int(emp_data['max_hours']),
+                    min_hours=int(emp_data['min_hours']),
                     is_minor=emp_data['is_minor']
                 )
                 
                 # Add availability slots
                 for day, start_time, end_time in emp_data.get('availability', []):
                     employee.add_availability(day, start_time, end_time)
+                employee.set_locations(emp_data.get('locations', []))
+                self.reserve_employee_ids([employee])
                 
                 self.employees.append(employee)
+                self.eligibility.add_employee(employee)
                 self.refresh_employee_list()
                 self.update_stats()
                 self.add_activity(f"Added employee: {employee.name}")
@@ -330,6 +507,51 @@ class SchedulingApp:
             except Exception as e:
                 messagebox.showerror("Error", f"Failed to add employee: {str(e)}")
 
+    def reserve_employee_ids(self, employees):
+        """Give new employees IDs no other site has used (at a site; otherwise they keep theirs)"""
+        if self.location:
+            self.location_store.reserve_employee_ids(employees)
+
+    def import_employees_from_file(self):
+        """Add employees and their availability in bulk from a CSV or XLSX file"""
+        path = filedialog.askopenfilename(parent=self.root, title="Import Employees",
+                                          filetypes=[("CSV files", "*.csv"), ("Excel files", "*.xlsx"),
+                                                     ("All files", "*.*")])
+        if not path:
+            return
+        
+        try:
+            result = import_employees(path, self.employees)
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Import Error", f"Failed to import: {str(e)}")
+            return
+        
+        if not result.employees:
+            messagebox.showerror("Import Error", f"No employees imported.\n\n{result.get_error_report()}")
+            return
+        if result.errors and not messagebox.askyesno(
+                "Import Employees", f"{len(result.errors)} of {result.rows} rows have errors and will be skipped:\n\n"
+                                    f"{result.get_error_report()}\n\nImport the other {len(result.employees)}?"):
+            return
+        
+        try:
+            self.reserve_employee_ids(result.employees)
+        except (ValueError, OSError) as e:
+            messagebox.showerror("Import Error", f"Failed to import: {str(e)}")
+            return
+        for employee in result.employees:
+            # At a site, employees without locations are hired for that site
+            if self.location and not employee.locations:
+                employee.locations = [self.location]
+            self.eligibility.add_employee(employee)
+        self.employees.extend(result.employees)
+        
+        self.refresh_employee_list()
+        self.update_stats()
+        self.add_activity(f"Imported {len(result.employees)} employees from {os.path.basename(path)}")
+        self.status_var.set(str(result))
+        self.save_data()
+
     def edit_selected_employee(self):
         """Edit selected employee"""
         selection = self.employee_tree.selection()
@@ -359,12 +581,18 @@ class SchedulingApp:
                 employee.role = emp_data['role']
                 employee.wage = float(emp_data['wage'])
                 employee.max_hours = int(emp_data['max_hours'])
+                employee.min_hours = int(emp_data['min_hours'])
                 employee.is_minor = emp_data['is_minor']
                 
                 # Update availability - clear old and add new
-                employee.available_days_times = []
+                employee.clear_availability()
                 for day, start_time, end_time in emp_data.get('availability', []):
                     employee.add_availability(day, start_time, end_time)
+                employee.set_locations(emp_data.get('locations', []))
+                self.feeds.mark_changed(employee.id)  # The name is shown in the feed
+                
+                # Re-fill any shifts the new role, locations or availability rule out
+                self.repair_schedules(employee)
                 
                 self.refresh_employee_list()
                 self.add_activity(f"Updated employee: {employee.name}")
@@ -388,12 +616,43 @@ class SchedulingApp:
             if messagebox.askyesno("Confirm Delete", 
                                  f"Are you sure you want to delete {employee.name}?"):
                 self.employees.remove(employee)
+                self.eligibility.remove_employee(employee.id)
+                self.repair_schedules(employee, removed=True)
                 self.refresh_employee_list()
                 self.update_stats()
                 self.add_activity(f"Deleted employee: {employee.name}")
                 self.status_var.set(f"Employee {employee.name} deleted")
                 self.save_data()
 
+    def repair_schedules(self, employee, removed=False):
+        """
+        Re-fill the shifts an employee can no longer work in every schedule
+        
+        Args:
+            employee (Employee): Employee whose role or availability changed, or who was removed
+            removed (bool): Whether the employee was deleted
+        """
+        vacated = 0
+        unfilled = []
+        for schedule in self.schedules:
+            result = ScheduleOptimizer(schedule, self.employees, eligibility=self.eligibility).repair(employee, removed)
+            if result.unassigned:
+                vacated += len(result.unassigned)
+                unfilled.extend(result.unfilled)
+                self.add_activity(f"Repaired schedule {schedule.id} for {employee.name}: {result}")
+        if not vacated:
+            return
+        
+        self.refresh_schedule_view()
+        self.refresh_shifts_tab()
+        message = f"{employee.name} was removed from {vacated} shift(s)."
+        if unfilled:
+            message += (f"\n\n{len(unfilled)} shift(s) could not be re-filled without breaking a rule:\n"
+                        + "\n".join(str(shift) for shift in unfilled[:10]))
+        else:
+            message += "\n\nEvery vacated place was re-filled."
+        messagebox.showinfo("Schedule Repair", message)
+
     def view_employee_details(self):
         """Show detailed employee information"""
         selection = self.employee_tree.selection()
@@ -422,11 +681,10 @@ class SchedulingApp:
                     date=shift_data['date'],
                     start_time=shift_data['start_time'],
                     end_time=shift_data['end_time'],
-                    roles_required=[shift_data['role']]
+                    roles_required=[shift_data['role']],
+                    location=self.current_schedule.location or "Main"
                 )
-                self.current_schedule.add_shift(shift)
-                self.refresh_schedule_view()
-                self.update_stats()
+                self.current_schedule.add_shift(shift)  # Views update through SHIFT_ADDED
                 self.add_activity(f"Added shift: {shift.get_day_name()} {shift.format_time(shift.start_time)}")
                 self.status_var.set("Shift added successfully")
                 self.save_data()
@@ -442,13 +700,19 @@ class SchedulingApp:
             print("No date selected, returning")  # Debug
             return
         
+        # Weekly by default; longer periods for 2-week or 4-week rotations
+        days = simpledialog.askinteger("New Schedule", "Schedule length in days (7 = one week, 14 or 28 for rotations):",
+                                       parent=self.root, initialvalue=7, minvalue=1, maxvalue=366)
+        if not days:
+            return
+        
         try:
             start_date = dialog.result
-            end_date = start_date + timedelta(days=6)  # Sunday
+            end_date = start_date + timedelta(days=days - 1)
             
             print(f"Creating schedule from {start_date} to {end_date}")  # Debug
-            schedule = Schedule(start_date, end_date)
-            self.schedules.append(schedule)
+            schedule = Schedule(start_date, end_date, location=self.location)
+            self.add_schedules([schedule])
             self.current_schedule = schedule
             
             self.refresh_schedule_combo()
@@ -461,6 +725,111 @@ class SchedulingApp:
         except ValueError as e:
             messagebox.showerror("Error", f"Invalid date format: {str(e)}")
 
+    def copy_schedule_forward(self):
+        """Copy the current schedule to the next week that doesn't have a schedule yet"""
+        if not self.current_schedule:
+            messagebox.showwarning("No Schedule", "Please select or create a schedule first")
+            return
+        
+        keep = messagebox.askyesno(f"Copy {get_period_label(self.current_schedule)}",
+                                   "Keep the employee assignments?")
+        
+        # Copy by whole periods (e.g., 4 weeks at a time for a 28-day rotation)
+        period = self.current_schedule.get_period_weeks()
+        taken = {schedule.start_date for schedule in self.schedules}
+        weeks = period
+        while self.current_schedule.start_date + timedelta(weeks=weeks) in taken:
+            weeks += period
+        
+        source = self.current_schedule
+        schedule = source.clone(weeks, keep_assignments=keep, employees_list=self.employees,
+                                changed_employee_ids=self.changed_employee_ids)
+        self.add_schedules([schedule])
+        self.current_schedule = schedule
+        
+        self.refresh_schedule_combo()
+        self.refresh_schedule_view()
+        self.refresh_shifts_tab()
+        self.update_stats()
+        
+        message = f"Copied {source.start_date} - {source.end_date} to {schedule.start_date} - {schedule.end_date}"
+        if keep:
+            dropped = (sum(len(s.assigned_employees) for s in source.shifts) -
+                       sum(len(s.assigned_employees) for s in schedule.shifts))
+            if dropped:
+                message += (f" ({dropped} assignments dropped: employee removed, "
+                            f"no longer available or over their hours or rest limits)")
+        self.add_activity(message)
+        self.status_var.set(message)
+        self.save_data()
+
+    def save_schedule_as_template(self):
+        """Save the current schedule's week of shifts as a reusable template"""
+        if not self.current_schedule:
+            messagebox.showwarning("No Schedule", "Please select or create a schedule first")
+            return
+        
+        name = simpledialog.askstring("Save as Template", "Template name:", parent=self.root)
+        if not name or not name.strip():
+            return
+        
+        template = ShiftTemplate.from_schedule(self.current_schedule, name)
+        # A template with the same name is replaced
+        self.templates = [t for t in self.templates if t.name != template.name] + [template]
+        try:
+            save_templates(self.templates, storage.TEMPLATES_FILE)
+        except OSError as e:
+            messagebox.showerror("Save Error", f"Failed to save templates: {str(e)}")
+            return
+        self.add_activity(f"Saved template: {template}")
+        self.status_var.set(f"Template '{template.name}' saved")
+
+    def create_schedules_from_template(self):
+        """Create one or more weekly schedules from a saved template"""
+        if not self.templates:
+            messagebox.showwarning("No Templates", "Save a schedule as a template first")
+            return
+        
+        choices = "\n".join(f"{i}. {template}" for i, template in enumerate(self.templates, start=1))
+        choice = simpledialog.askinteger("From Template", f"Choose a template:\n\n{choices}",
+                                         parent=self.root, minvalue=1, maxvalue=len(self.templates))
+        if not choice:
+            return
+        template = self.templates[choice - 1]
+        
+        dialog = CalendarDialog(self.root)
+        if not dialog.result:
+            return
+        weeks = simpledialog.askinteger("From Template", "Number of weeks to create:",
+                                        parent=self.root, initialvalue=1, minvalue=1, maxvalue=52)
+        if not weeks:
+            return
+        
+        schedules = template.create_schedules(dialog.result, weeks, location=self.location)
+        self.add_schedules(schedules)
+        self.current_schedule = schedules[0]
+        
+        self.refresh_schedule_combo()
+        self.refresh_schedule_view()
+        self.refresh_shifts_tab()
+        self.update_stats()
+        self.add_activity(f"Created {weeks} schedule(s) from template '{template.name}'")
+        self.status_var.set(f"Created {weeks} schedule(s) starting {schedules[0].start_date}")
+        self.save_data()
+
+    def add_schedules(self, schedules):
+        """Add new schedules, checking them against the other sites' assignments"""
+        for schedule in schedules:
+            schedule.conflict_index = self.conflict_index
+            self.daily_index.add_schedule(schedule)
+            self.feeds.add_schedule(schedule)
+        self.schedules.extend(schedules)
+
+    def get_schedule_name(self, schedule):
+        """Label for a schedule in the schedule selector"""
+        location = f" - {schedule.location}" if schedule.location and not self.location else ""
+        return f"{get_schedule_dates(schedule)}{location} (ID: {schedule.id})"
+
     def refresh_employee_list(self):
         """Refresh the employee list display"""
         # Clear existing items
@@ -484,24 +853,23 @@ class SchedulingApp:
 
     def refresh_schedule_combo(self):
         """Refresh schedule selection combobox"""
-        schedule_names = [f"Week of {sched.start_date} (ID: {sched.id})" 
-                         for sched in self.schedules]
+        schedule_names = [self.get_schedule_name(sched) for sched in self.schedules]
         self.schedule_combo['values'] = schedule_names
         
         if self.current_schedule:
-            current_name = f"Week of {self.current_schedule.start_date} (ID: {self.current_schedule.id})"
+            current_name = self.get_schedule_name(self.current_schedule)
             self.schedule_var.set(current_name)
             self.current_schedule_var.set(f"Current: {current_name}")
 
+    @timed("SchedulingApp.refresh_schedule_view")
     def refresh_schedule_view(self):
         """
         Refreshes the weekly schedule view whenever:
         - A schedule is loaded
-        - A shift is added or removed
-        - An employee is assigned to a shift
+        - A schedule is deleted or switched
+        Single shift changes are handled by update_shift_rows() and update_employee_cost() instead
         """
-        if not self.current_schedule:
-            return
+        self.copy_button.config(text=f"📄 Copy {get_period_label(self.current_schedule)}")
         
         # Clear all day trees
         for day in self.day_frames:
@@ -509,53 +877,63 @@ class SchedulingApp:
             for item in day_tree.get_children():
                 day_tree.delete(item)
         
-        # Populate with shifts
-        for shift in self.current_schedule.get_all_shifts():
-            day = shift.get_day_name()
-            day_tree = getattr(self, f'{day.lower()}_tree')
-            
-            # Get assigned employee names
-            assigned_names = []
-            for emp_id in shift.assigned_employees:
-                emp = next((e for e in self.employees if e.id == emp_id), None)
-                if emp:
-                    assigned_names.append(emp.name)
-            
-            assigned_str = ", ".join(assigned_names) if assigned_names else "UNASSIGNED"
-            
-            # Update filled status before checking
-            shift.update_filled_status(self.employees)
-            
-            # Check which roles are missing
-            missing_roles = shift.get_missing_roles(self.employees)
-            if shift.is_filled:
-                status = "✅ Filled"
-            elif missing_roles:
-                status = f"❌ Need: {', '.join(missing_roles)}"
-            else:
-                status = "❌ Need Staff"
-            
-            time_str = f"{shift.format_time(shift.start_time)}-{shift.format_time(shift.end_time)}"
+        if not self.current_schedule:
+            self.view_schedule = None
+            self.view_week_var.set("")
+            self.update_total_cost()
+            return
+        
+        # Show the first week when switching schedules
+        schedule = self.current_schedule
+        if self.view_schedule is not schedule or self.view_week_start not in schedule.get_week_starts():
+            self.view_schedule = schedule
+            self.view_week_start = get_week_start(schedule.start_date)
+        week_end = self.view_week_start + timedelta(days=6)
+        week_number = (self.view_week_start - get_week_start(schedule.start_date)).days // 7 + 1
+        self.view_week_var.set(f"Week {week_number} of {len(schedule.get_week_starts())}: "
+                               f"{max(self.view_week_start, schedule.start_date)} to {min(week_end, schedule.end_date)}")
+        
+        # Populate with the shown week's shifts (read from the date buckets)
+        for shift in schedule.get_shifts_in_range(self.view_week_start, week_end):
+            self.insert_day_row(shift)
+
+        # Calculate and update total payroll
+        self.update_total_cost()
+
+    def change_view_week(self, step):
+        """Move the weekly view forward or back within the current schedule"""
+        if not self.current_schedule:
+            return
+        week_start = self.view_week_start + timedelta(weeks=step)
+        if week_start in self.current_schedule.get_week_starts():
+            self.view_week_start = week_start
+            self.refresh_schedule_view()
 
-            # Calculate shift cost
-            shift_cost = shift.calculate_payroll(self.employees)
-            cost_str = f"${shift_cost:.2f}" # Format as $XX.XX
-            
-            day_tree.insert('', 'end', values=(
-                time_str,
-                shift.roles_required[0] if shift.roles_required else "Any",
-                assigned_str,
-                status,
-                cost_str
-            ))
+    def show_calendar_view(self):
+        """Show the month/multi-week calendar of every schedule's daily totals"""
+        start = self.view_week_start or date.today()
+        ScheduleCalendarDialog(self.root, self.daily_index, start, self.show_day)
+
+    def show_day(self, day):
+        """Show the week containing a date in the weekly view (switching schedules if needed)"""
+        schedules = [self.current_schedule] + self.schedules if self.current_schedule else self.schedules
+        schedule = next((s for s in schedules if s.start_date <= day <= s.end_date), None)
+        if schedule is None:
+            self.status_var.set(f"No schedule covers {day}")
+            return
+        self.current_schedule = schedule
+        self.view_schedule = schedule
+        self.view_week_start = get_week_start(day)
+        self.refresh_schedule_combo()
+        self.refresh_schedule_view()
+        self.schedule_notebook.select(day.weekday())
 
-            # Calculate and update total payroll
-            if self.current_schedule:
-                total_cost = self.current_schedule.calculate_payroll(self.employees)
-                self.schedule_total_cost.set(f"${total_cost:.2f}")
-            else:
-                self.schedule_total_cost.set("$0.00")
+    def is_in_view_week(self, shift):
+        """Whether a shift is in the week shown in the weekly view"""
+        return (self.view_week_start is not None and
+                self.view_week_start <= shift.date <= self.view_week_start + timedelta(days=6))
 
+    @timed("SchedulingApp.refresh_shifts_tab")
     def refresh_shifts_tab(self):
         """Refresh the shifts tab with all shifts from all schedules"""
         # Clear existing items
@@ -566,45 +944,255 @@ class SchedulingApp:
         for schedule in self.schedules:
             # Loop through all shifts in each schedule
             for shift in schedule.get_all_shifts():
-                # Get assigned employee names
-                assigned_names = []
-                for emp_id in shift.assigned_employees:
-                    emp = next((e for e in self.employees if e.id == emp_id), None)
-                    if emp:
-                        assigned_names.append(emp.name)
-                
-                assigned_str = ", ".join(assigned_names) if assigned_names else "UNASSIGNED"
-                
-                # Update filled status before checking
-                shift.update_filled_status(self.employees)
-                
-                # Check which roles are missing
-                missing_roles = shift.get_missing_roles(self.employees)
-                if shift.is_filled:
-                    status = "✅ Filled"
-                elif missing_roles:
-                    status = f"❌ Need: {', '.join(missing_roles)}"
-                else:
-                    status = "❌ Unfilled"
-
-                # Format time
-                time_str = f"{shift.format_time(shift.start_time)}-{shift.format_time(shift.end_time)}"
-
-                # Calculate cost
-                shift_cost = shift.calculate_payroll(self.employees)
-                cost_str = f"${shift_cost:.2f}"
-
-                # Insert into treeview
-                self.shifts_tree.insert('', 'end', values=(
-                    shift.id,
-                    shift.date,
-                    shift.get_day_name(),
-                    time_str,
-                    shift.roles_required[0] if shift.roles_required else "Any",
-                    assigned_str,
-                    status,
-                    cost_str
-                ))
+                self.insert_shift_row(shift)
+
+    def get_shift_display(self, shift, unfilled_label):
+        """
+        Build the display values shared by the day trees and the shifts tab
+
+        Args:
+            shift (Shift): The shift to describe
+            unfilled_label (str): Status text when the shift needs staff but no specific role
+
+        Returns:
+            tuple: (time_str, role_str, assigned_str, status, cost_str)
+        """
+        # Get assigned employee names
+        assigned_names = []
+        for emp_id in shift.assigned_employees:
+            emp = next((e for e in self.employees if e.id == emp_id), None)
+            if emp:
+                assigned_names.append(emp.name)
+        
+        assigned_str = ", ".join(assigned_names) if assigned_names else "UNASSIGNED"
+        
+        # Update filled status before checking
+        shift.update_filled_status(self.employees)
+        
+        # Check which roles are missing
+        missing_roles = shift.get_missing_roles(self.employees)
+        if shift.is_filled:
+            status = "✅ Filled"
+        elif missing_roles:
+            status = f"❌ Need: {', '.join(missing_roles)}"
+        else:
+            status = unfilled_label
+        
+        time_str = f"{shift.format_time(shift.start_time)}-{shift.format_time(shift.end_time)}"
+
+        # Calculate shift cost
+        shift_cost = shift.calculate_payroll(self.employees)
+        cost_str = f"${shift_cost:.2f}" # Format as $XX.XX
+        
+        role_str = shift.roles_required[0] if shift.roles_required else "Any"
+        return (time_str, role_str, assigned_str, status, cost_str)
+
+    def insert_day_row(self, shift):
+        """Insert a shift into its day tree (row ID is the shift ID)"""
+        day_tree = getattr(self, f'{shift.get_day_name().lower()}_tree')
+        day_tree.insert('', 'end', iid=str(shift.id),
+                        values=self.get_shift_display(shift, "❌ Need Staff"))
+
+    def insert_shift_row(self, shift):
+        """Insert a shift into the shifts tab (row ID is the shift ID)"""
+        time_str, role_str, assigned_str, status, cost_str = self.get_shift_display(shift, "❌ Unfilled")
+        self.shifts_tree.insert('', 'end', iid=str(shift.id), values=(
+            shift.id,
+            shift.date,
+            shift.get_day_name(),
+            time_str,
+            role_str,
+            assigned_str,
+            status,
+            cost_str
+        ))
+
+    def update_shift_rows(self, shift):
+        """Update only the rows showing this shift, leaving every other row alone"""
+        iid = str(shift.id)
+        
+        day_tree = getattr(self, f'{shift.get_day_name().lower()}_tree')
+        if day_tree.exists(iid):
+            day_tree.item(iid, values=self.get_shift_display(shift, "❌ Need Staff"))
+        
+        if self.shifts_tree.exists(iid):
+            time_str, role_str, assigned_str, status, cost_str = self.get_shift_display(shift, "❌ Unfilled")
+            self.shifts_tree.item(iid, values=(
+                shift.id, shift.date, shift.get_day_name(), time_str,
+                role_str, assigned_str, status, cost_str
+            ))
+
+    @timed("SchedulingApp.update_total_cost")
+    def update_total_cost(self):
+        """Recalculate the payroll summary (including overtime) for the current schedule"""
+        self.payroll_schedule = self.current_schedule
+        self.payroll_breakdowns = {}
+        self.payroll_total = self.payroll_overtime = 0.0
+        if self.current_schedule:
+            report = self.payroll_engine.calculate(self.current_schedule, self.employees)
+            self.payroll_breakdowns = {breakdown.employee.id: breakdown for breakdown in report.breakdowns}
+            self.payroll_total = report.total_cost
+            self.payroll_overtime = report.total_overtime_cost
+        self.show_total_cost()
+
+    def update_employee_cost(self, schedule, employee_id):
+        """
+        Update the payroll summary after one employee's assignments in a schedule changed
+
+        Only that employee is re-priced (overtime depends on their other
+        shifts that week) and the totals move by the difference.
+        """
+        if schedule is None or schedule is not self.payroll_schedule:
+            return
+        employee = next((emp for emp in self.employees if emp.id == employee_id), None)
+        old = self.payroll_breakdowns.pop(employee_id, None)
+        new = self.payroll_engine.calculate_employee(schedule, employee) if employee else None
+        if new is not None and new.shift_count:
+            self.payroll_breakdowns[employee_id] = new
+        for breakdown, sign in ((old, -1), (new, 1)):
+            if breakdown is not None:
+                self.payroll_total += sign * breakdown.total_pay
+                self.payroll_overtime += sign * breakdown.overtime_pay
+        self.show_total_cost()
+
+    def show_total_cost(self):
+        """Show the current payroll totals"""
+        self.schedule_total_cost.set(f"${self.payroll_total:.2f}")
+        self.schedule_overtime_cost.set(f"${self.payroll_overtime:.2f}")
+
+    def show_payroll_breakdown(self):
+        """Show the per-employee payroll breakdown for the current schedule"""
+        if not self.current_schedule:
+            messagebox.showwarning("No Schedule", "Please select or create a schedule first")
+            return
+        
+        report = self.payroll_engine.calculate(self.current_schedule, self.employees)
+        PayrollBreakdownDialog(self.root, self.current_schedule, report)
+
+    def export_schedules(self, kind):
+        """
+        Export the current schedule (or every schedule) to a file
+
+        Args:
+            kind (str): 'shifts' (CSV), 'payroll' (CSV) or 'print' (HTML, print to PDF from a browser)
+        """
+        if not self.schedules:
+            messagebox.showwarning("No Schedule", "Please create a schedule first")
+            return
+        schedules = sorted(self.schedules, key=lambda s: s.start_date)
+        if self.current_schedule and len(schedules) > 1:
+            only_current = messagebox.askyesnocancel(
+                "Export", f"Export only {self.get_schedule_name(self.current_schedule)}?\n\n"
+                          f"Choose No to export all {len(schedules)} schedules.")
+            if only_current is None:
+                return
+            if only_current:
+                schedules = [self.current_schedule]
+
+        extension = '.html' if kind == 'print' else '.csv'
+        filetypes = [("HTML files", "*.html")] if kind == 'print' else [("CSV files", "*.csv")]
+        path = filedialog.asksaveasfilename(parent=self.root, title="Export", defaultextension=extension,
+                                            initialfile=f"{kind}_{schedules[0].start_date}{extension}",
+                                            filetypes=filetypes + [("All files", "*.*")])
+        if not path:
+            return
+
+        try:
+            if kind == 'shifts':
+                count = export.write_csv(path, export.iter_shift_rows(schedules, self.employees))
+                summary = f"{count} shifts"
+            elif kind == 'payroll':
+                rows = export.iter_employee_rows(schedules, self.employees, self.payroll_engine.rules)
+                count = export.write_csv(path, rows)
+                summary = f"{count} payroll rows"
+            else:
+                export.write_html(path, export.iter_week_html(schedules, self.employees, title="Chronos Schedule"))
+                summary = "printable schedule (open it in a browser to print or save as PDF)"
+        except OSError as e:
+            messagebox.showerror("Export Error", f"Failed to export: {str(e)}")
+            return
+
+        self.add_activity(f"Exported {summary} to {os.path.basename(path)}")
+        self.status_var.set(f"Exported {summary} to {path}")
+
+    def publish_feeds(self):
+        """Write the personal calendar feeds of employees whose shifts changed since the last publish"""
+        try:
+            written, deleted = self.feeds.publish(self.employees)
+        except OSError as e:
+            messagebox.showerror("Publish Error", f"Failed to publish calendars: {str(e)}")
+            return
+        
+        summary = f"Published {written} employee calendars"
+        if deleted:
+            summary += f", removed {deleted}"
+        self.add_activity(summary)
+        self.status_var.set(f"{summary} ({len(self.employees) - written} unchanged) to {self.feeds_dir}")
+
+    def send_notifications(self):
+        """Deliver saved schedule change notifications without waiting for the next batch"""
+        pending = self.outbox.get_pending_count()
+        if not pending:
+            if self.outbox.get_draft_count():
+                self.status_var.set("Save your changes to send their notifications")
+            else:
+                self.status_var.set("No schedule change notifications waiting")
+            return
+        self.outbox.send_soon()
+        self.add_activity(f"Sending schedule change notifications to {pending} employees")
+        self.status_var.set(f"Sending notifications to {pending} employees in the background")
+
+    def subscribe_to_events(self):
+        """Subscribe to model events so views update only what changed"""
+        event_bus.subscribe(events.SHIFT_ADDED, self.on_shift_added)
+        event_bus.subscribe(events.SHIFTS_ADDED, self.on_shifts_added)
+        event_bus.subscribe(events.EMPLOYEE_ASSIGNED, self.on_assignment_changed)
+        event_bus.subscribe(events.EMPLOYEE_UNASSIGNED, self.on_assignment_changed)
+        event_bus.subscribe(events.WAGE_CHANGED, self.on_employee_changed)
+        event_bus.subscribe(events.ROLE_CHANGED, self.on_employee_changed)
+        event_bus.subscribe(events.ROLE_CHANGED, self.track_employee_change)
+        event_bus.subscribe(events.AVAILABILITY_CHANGED, self.track_employee_change)
+
+    def on_shift_added(self, schedule, shift):
+        """Add rows for a new shift"""
+        if schedule not in self.schedules:
+            return
+        if not self.shifts_tree.exists(str(shift.id)):
+            self.insert_shift_row(shift)
+        if schedule is self.current_schedule:
+            if self.is_in_view_week(shift):
+                self.insert_day_row(shift)
+            for emp_id in shift.assigned_employees:
+                self.update_employee_cost(schedule, emp_id)
+        self.update_stats()
+
+    def on_shifts_added(self, schedule, shifts):
+        """Add rows for shifts added in bulk (e.g., from a template)"""
+        if schedule not in self.schedules:
+            return
+        for shift in shifts:
+            if not self.shifts_tree.exists(str(shift.id)):
+                self.insert_shift_row(shift)
+        if schedule is self.current_schedule:
+            self.refresh_schedule_view()
+        self.update_stats()
+
+    def on_assignment_changed(self, shift, employee=None, employee_id=None):
+        """Update the rows of a shift whose assigned employees changed, and that employee's pay"""
+        self.update_shift_rows(shift)
+        self.update_employee_cost(shift.schedule, employee.id if employee is not None else employee_id)
+
+    def on_employee_changed(self, employee, **details):
+        """Update the rows of every shift the changed employee works (cost/status depend on them)"""
+        for schedule in self.schedules:
+            # The employee's timeline holds just their shifts
+            for shift in schedule.get_timeline(employee.id).get_shifts():
+                self.update_shift_rows(shift)
+        self.update_employee_cost(self.payroll_schedule, employee.id)
+
+    def track_employee_change(self, employee, **details):
+        """Remember employees whose existing assignments may no longer be valid"""
+        self.changed_employee_ids.add(employee.id)
 
     def on_schedule_selected(self, event=None):
         """Handle schedule selection change"""
@@ -621,6 +1209,35 @@ class SchedulingApp:
         except (ValueError, IndexError):
             pass
 
+    def rebuild_indexes(self, labor_cube=None):
+        """
+        Rebuild the eligibility index and labor cost rollups after data is replaced in bulk
+
+        Args:
+            labor_cube (LaborCostCube): Rollups already matching the data (None to rebuild them)
+        """
+        self.eligibility.close()
+        self.eligibility = EligibilityIndex(self.employees)
+        # Requests point at the replaced shifts, so start a new marketplace
+        self.swaps = SwapMarketplace(self.employees, self.eligibility)
+        
+        self.labor_cube.close()
+        if labor_cube is None:
+            labor_cube = LaborCostCube.from_schedules(self.schedules, self.employees)
+        self.labor_cube = labor_cube
+        self.labor_cube.track()
+        
+        self.daily_index.close()
+        self.daily_index = DailySummaryIndex(self.schedules, self.employees)
+        
+        self.feeds.close()
+        self.feeds = FeedIndex(self.feeds_dir, self.schedules)
+        
+        self.outbox.set_employees(self.employees)
+        
+        # The data was just loaded, so nobody has changed since
+        self.changed_employee_ids = set()
+
     def update_stats(self):
         """Update dashboard statistics"""
         self.stats_employees.set(str(len(self.employees)))
@@ -629,6 +1246,61 @@ class SchedulingApp:
         total_shifts = sum(len(sched.get_all_shifts()) for sched in self.schedules)
         self.stats_shifts.set(str(total_shifts))
 
+    def toggle_timings(self):
+        """Turn timing instrumentation on or off from the Diagnostics panel"""
+        profiler.enabled = self.profiling_var.get()
+        self.add_activity(f"Timing diagnostics {'enabled' if profiler.enabled else 'disabled'}")
+        self.refresh_diagnostics()
+
+    def refresh_diagnostics(self):
+        """Show the recorded call counts and latency histograms"""
+        for item in self.diagnostics_tree.get_children():
+            self.diagnostics_tree.delete(item)
+        
+        labels = profiling.get_bucket_labels()
+        for stats in profiler.get_stats():
+            # Only the non-empty buckets, e.g. "<1ms: 40  <5ms: 2"
+            histogram = "  ".join(f"{label}: {count}" for label, count in zip(labels, stats.buckets) if count)
+            self.diagnostics_tree.insert('', 'end', values=(
+                stats.name, stats.count, f"{stats.mean_ms:.2f}", f"{stats.max_ms:.2f}",
+                f"{stats.total_ms:.1f}", histogram))
+
+    def reset_diagnostics(self):
+        """Clear the recorded timings"""
+        profiler.reset()
+        self.refresh_diagnostics()
+
+    def dump_diagnostics(self):
+        """Save the recorded timings next to the data file"""
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(os.path.dirname(storage.DATA_FILE), f"timings_{timestamp}.json")
+        try:
+            profiler.dump(path)
+            self.add_activity(f"Timings saved to {path}")
+            messagebox.showinfo("Diagnostics", f"Timings saved to {path}")
+        except Exception as e:
+            messagebox.showerror("Diagnostics", f"Failed to save timings: {str(e)}")
+
+    def toggle_session_profile(self):
+        """Start or stop recording a cProfile session from the Diagnostics panel"""
+        if self.session_profile_var.get():
+            self.session_profiler.start()
+            self.add_activity("cProfile session recording started")
+        else:
+            self.stop_session_profile()
+
+    def stop_session_profile(self):
+        """Stop the cProfile session (if any) and save its stats"""
+        try:
+            path = self.session_profiler.stop()
+        except Exception as e:
+            messagebox.showerror("Diagnostics", f"Failed to save profile: {str(e)}")
+            return
+        self.session_profile_var.set(False)
+        if path:
+            self.add_activity(f"cProfile session saved to {path}")
+            messagebox.showinfo("Diagnostics", f"Profile saved to {path}")
+
     def add_activity(self, activity):
         """Add activity to recent activity list"""
         # Check if GUI is ready
@@ -658,6 +1330,7 @@ class SchedulingApp:
         
         for emp_data in sample_employees:
             employee = Employee(*emp_data)
+            self.reserve_employee_ids([employee])
             # Add availability for all employees
             employee.add_availability("Monday", 900, 2100)
             employee.add_availability("Tuesday", 900, 2100)
@@ -754,6 +1427,7 @@ class SchedulingApp:
         self.refresh_schedule_view()
         self.refresh_shifts_tab()
         self.update_stats()
+        self.rebuild_indexes()
         self.add_activity("Loaded sample data with schedules and shifts")
 
     def load_sample_data_advanced(self):
@@ -772,6 +1446,7 @@ class SchedulingApp:
         
         for emp_data in sample_employees:
             employee = Employee(*emp_data)
+            self.reserve_employee_ids([employee])
             
             # Varied availabilities to showcase the feature
             if employee.role == "manager":
@@ -929,44 +1604,27 @@ class SchedulingApp:
         self.refresh_schedule_view()
         self.refresh_shifts_tab()
         self.update_stats()
+        self.rebuild_indexes()
         self.add_activity("Loaded advanced sample data with varied shift staffing")
 
+    @timed("SchedulingApp.save_data")
     def save_data(self):
         """Save data to JSON file"""
         try:
-            # Create data directory if it doesn't exist
-            if not os.path.exists('data'):
-                os.makedirs('data')
-            
-            data_file = 'data/scheduling_data.json'
-            
-            # Create backup if file exists
-            if os.path.exists(data_file):
-                backup_file = 'data/scheduling_data.backup.json'
-                try:
-                    import shutil
-                    shutil.copy2(data_file, backup_file)
-                except Exception as e:
-                    print(f"Warning: Could not create backup: {e}")
+            if self.location:
+                # This site's staff changes (merged into the shared file) and shard, plus its bookings
+                self.location_store.save_employees(self.employees)
+                self.location_store.save_location(self.location, self.schedules)
+            else:
+                storage.save_data(self.employees, self.schedules)
             
-            # Prepare data for saving
-            data_to_save = {
-                'employees': [emp.to_dict() for emp in self.employees],
-                'schedules': [sched.to_dict() for sched in self.schedules],
-                'metadata': {
-                    'version': '1.0',
-                    'last_saved': datetime.now().isoformat(),
-                    'employee_count': len(self.employees),
-                    'schedule_count': len(self.schedules),
-                    'next_employee_id': Employee._next_id,
-                    'next_shift_id': Shift._next_id,
-                    'next_schedule_id': Schedule._next_id
-                }
-            }
+            # Only schedules changed since the last save are re-aggregated
+            self.labor_cube.refresh(self.employees)
+            labor_cube_file, sources = self.get_labor_cube_files()
+            self.labor_cube.save(labor_cube_file, sources)
             
-            # Save to JSON file
-            with open(data_file, 'w') as file:
-                json.dump(data_to_save, file, indent=2)
+            # The saved assignment changes can now be sent to employees
+            self.outbox.release()
             
             self.add_activity(f"Data saved successfully ({len(self.employees)} employees, {len(self.schedules)} schedules)")
             return True
@@ -976,34 +1634,53 @@ class SchedulingApp:
             self.add_activity(f"Save failed: {str(e)}")
             return False
 
+    def get_labor_cube_files(self):
+        """
+        Where the labor cost rollups are saved, and the data files they are built from
+
+        Returns:
+            tuple: (labor cube file, list of data files)
+        """
+        if self.location:
+            return (self.location_store.get_file(self.location, 'labor_cube'),
+                    [self.location_store.employees_file, self.location_store.get_file(self.location)])
+        return storage.LABOR_CUBE_FILE, [storage.DATA_FILE]
+
+    def load_labor_cube(self):
+        """
+        Load the labor cost rollups saved with the data that was just loaded
+
+        Returns:
+            LaborCostCube: The rollups, or None if they are missing or the data changed since
+        """
+        labor_cube_file, sources = self.get_labor_cube_files()
+        try:
+            labor_cube = LaborCostCube.load(labor_cube_file, sources)
+        except (OSError, ValueError, KeyError, TypeError):
+            return None
+        labor_cube.attach(self.schedules)
+        return labor_cube
+
+    @timed("SchedulingApp.load_data")
     def load_data(self):
         """Load data from JSON file"""
         try:
-            data_file = 'data/scheduling_data.json'
-            
-            # Check if data file exists
-            if not os.path.exists(data_file):
-                self.add_activity("No saved data found - starting fresh")
-                return False
-            
-            # Load JSON data
-            with open(data_file, 'r') as file:
-                loaded_data = json.load(file)
-            
-            # Restore employees
-            self.employees = [Employee.from_dict(emp_data) for emp_data in loaded_data.get('employees', [])]
-            
-            # Restore schedules
-            self.schedules = [Schedule.from_dict(sched_data) for sched_data in loaded_data.get('schedules', [])]
-            
-            # Restore class ID counters to avoid conflicts
-            metadata = loaded_data.get('metadata', {})
-            if 'next_employee_id' in metadata:
-                Employee._next_id = metadata['next_employee_id']
-            if 'next_shift_id' in metadata:
-                Shift._next_id = metadata['next_shift_id']
-            if 'next_schedule_id' in metadata:
-                Schedule._next_id = metadata['next_schedule_id']
+            if self.location:
+                # This site's employees and shard, plus every site's bookings
+                self.employees = self.location_store.load_employees(self.location)
+                self.schedules = self.location_store.load_location(self.location)
+                self.conflict_index = self.location_store.load_conflict_index()
+                for schedule in self.schedules:
+                    schedule.conflict_index = self.conflict_index
+            else:
+                # Check if data file exists
+                if not os.path.exists(storage.DATA_FILE):
+                    self.add_activity("No saved data found - starting fresh")
+                    return False
+                
+                # Restore employees, schedules and ID counters
+                self.employees, self.schedules = storage.load_data()
+            self.templates = load_templates(storage.TEMPLATES_FILE)
             
             # Update UI
             self.refresh_employee_list()
@@ -1014,6 +1691,9 @@ class SchedulingApp:
             if self.schedules:
                 self.current_schedule = self.schedules[0]
                 self.refresh_schedule_view()
+            self.refresh_shifts_tab()
+            # Saved rollups are reused unless the data files changed since they were saved
+            self.rebuild_indexes(self.load_labor_cube())
             
             self.add_activity(f"Data loaded: {len(self.employees)} employees, {len(self.schedules)} schedules")
             return True
@@ -1035,6 +1715,14 @@ class SchedulingApp:
                 if messagebox.askyesno("Save Before Exit", "Do you want to save your data before exiting?"):
                     self.save_data()
             
+            # Unsaved changes are never sent; saved ones still waiting go out now
+            self.outbox.discard()
+            self.outbox.stop(flush=True)
+            
+            # Save the profile of this session if one is being recorded
+            if self.session_profiler.running:
+                self.add_activity(f"cProfile session saved to {self.session_profiler.stop()}")
+            
             # Destroy the window
             self.root.destroy()
             
@@ -1079,35 +1767,201 @@ class SchedulingApp:
             return
         
         # Show assignment dialog
-        dialog = AssignEmployeeDialog(self.root, shift, self.employees)
+        dialog = AssignEmployeeDialog(self.root, shift, self.employees, self.eligibility)
 
-        # If assignment was successful, refresh displays
+        # If assignment was successful (rows already updated through EMPLOYEE_ASSIGNED)
         if dialog.result:
-            self.refresh_schedule_view()
-            self.refresh_shifts_tab()
+            self.update_shift_rows(shift)  # Filled status is updated after the event fires
             self.add_activity(f"Assigned {dialog.result.name} to shift {shift_id}")
             self.status_var.set(f"Employee assigned successfully")
             self.save_data()
 
     
+    def swap_selected_shift(self):
+        """Post the selected shift for swapping and pick a cover or trade partner"""
+        selection = self.shifts_tree.selection()
+        if not selection:
+            messagebox.showwarning("No Selection", "Please select a shift to swap")
+            return
+        item = self.shifts_tree.item(selection[0])
+        shift_id = int(item['values'][0])
+        
+        shift = None
+        for schedule in self.schedules:
+            shift = next((s for s in schedule.get_all_shifts() if s.id == shift_id), None)
+            if shift:
+                break
+        
+        if not shift:
+            messagebox.showerror("Error", "Shift not found")
+            return
+        if not shift.assigned_employees:
+            messagebox.showwarning("No Employees", "Nobody is assigned to this shift yet")
+            return
+        
+        dialog = SwapShiftDialog(self.root, shift, self.swaps)
+        if dialog.result:
+            request = dialog.result
+            for changed in (request.shift, request.partner_shift):
+                if changed is not None:
+                    self.update_shift_rows(changed)
+            self.add_activity(f"Swapped shift {shift_id}: {dialog.summary}")
+            self.status_var.set("Shift swap completed")
+            self.save_data()
+
     def delete_selected_shift(self):
         """Delete selected shift"""
         messagebox.showinfo("Coming Soon", "Shift deletion will be implemented in next version")
 
+    def show_hours_report(self):
+        """Show employees under their minimum hours and how evenly hours are spread in the current schedule"""
+        if not self.current_schedule:
+            messagebox.showwarning("No Schedule", "Please select or create a schedule first")
+            return
+        
+        fairness = self.current_schedule.get_fairness_report(self.employees)
+        report = "Hours fairness by role (Gini, 0 = even):\n" + "\n".join(
+            f"  {role.title()}: {gini:.3f}" for role, gini in fairness.items())
+        
+        under = self.current_schedule.get_employees_under_min_hours(self.employees)
+        if not under:
+            messagebox.showinfo("Hours Report",
+                                "Every employee is scheduled for at least their minimum hours.\n\n" + report)
+            return
+        
+        lines = [f"{employee.name}: {hours:.1f}h scheduled (min {employee.min_hours}h) - week of {week_start}"
+                 for employee, week_start, hours in under]
+        messagebox.showinfo("Hours Report", "Employees under minimum hours:\n\n" + "\n".join(lines) + "\n\n" + report)
+
+    def auto_fill_schedule(self, mode="auto"):
+        """
+        Fill the current schedule's open shifts with employees who satisfy every rule
+        
+        Args:
+            mode (str): "auto" (cheapest feasible, hardest shifts first), "min_cost"
+                        (single-employee shifts at the lowest total labor cost) or
+                        "fair" (hours spread evenly within each role)
+        """
+        if not self.current_schedule:
+            messagebox.showwarning("No Schedule", "Please select or create a schedule first")
+            return
+        
+        optimizer = ScheduleOptimizer(self.current_schedule, self.employees, eligibility=self.eligibility)
+        if mode == "min_cost":
+            result, title = optimizer.solve_min_cost(), "Min-Cost Fill"
+        elif mode == "fair":
+            result, title = optimizer.solve_fair(), "Fair Fill"
+        else:
+            result, title = optimizer.solve(), "Auto-Fill"
+        
+        # Filled status changes after the assignment events, so redraw the views
+        self.refresh_schedule_view()
+        self.refresh_shifts_tab()
+        self.add_activity(f"{title} on schedule {self.current_schedule.id}: {result}")
+        self.status_var.set(str(result))
+        
+        message = f"{len(result.assignments)} assignments made."
+        if result.unfilled:
+            message += f"\n\n{len(result.unfilled)} shifts could not be filled without breaking a rule."
+        message += f"\n\nHours fairness (Gini, 0 = even): {self.current_schedule.get_hours_gini(self.employees):.3f}"
+        messagebox.showinfo(title, message)
+        if result.assignments:
+            self.save_data()
+
+    def min_cost_fill_schedule(self):
+        """Cover the current schedule's single-employee shifts at the lowest labor cost"""
+        self.auto_fill_schedule(mode="min_cost")
+
+    def fair_fill_schedule(self):
+        """Fill the current schedule's open shifts spreading hours evenly within each role"""
+        self.auto_fill_schedule(mode="fair")
+
+    def show_rule_violations(self):
+        """Check the current schedule against the scheduling rules"""
+        if not self.current_schedule:
+            messagebox.showwarning("No Schedule", "Please select or create a schedule first")
+            return
+        
+        engine = RuleEngine(self.current_schedule, self.employees)
+        violations = engine.get_violations()
+        engine.close()
+        
+        if not violations:
+            messagebox.showinfo("Rule Check", "No rule violations in this schedule.")
+            return
+        
+        employees_by_id = {emp.id: emp for emp in self.employees}
+        lines = []
+        for violation in violations[:30]:
+            employee = employees_by_id.get(violation.employee_id)
+            name = employee.name if employee else f"Employee {violation.employee_id}"
+            kind = "❌" if violation.is_hard else "⚠️"
+            lines.append(f"{kind} {name}, {violation.shift.date} shift {violation.shift.id}: {violation.message}")
+        if len(violations) > 30:
+            lines.append(f"... and {len(violations) - 30} more")
+        messagebox.showwarning("Rule Check", f"{len(violations)} rule violations:\n\n" + "\n".join(lines))
+
+    def publish_current_schedule(self):
+        """Publish the current schedule as a new immutable version"""
+        if not self.current_schedule:
+            messagebox.showwarning("No Schedule", "Please select or create a schedule first")
+            return
+        
+        previous = self.publisher.get_latest(self.current_schedule.id)
+        snapshot, created = self.publisher.build(self.current_schedule)
+        if not created:
+            self.publisher.commit(self.current_schedule, snapshot)
+            messagebox.showinfo("Publish", f"Nothing has changed since version {snapshot.version} was published.")
+            self.refresh_schedule_view()
+            return
+        
+        try:
+            save_snapshot(snapshot, self.published_dir)
+        except OSError as e:
+            # Nothing was committed, so the next Publish tries this version again
+            messagebox.showerror("Publish Error", f"Failed to save the published schedule: {str(e)}")
+            return
+        self.publisher.commit(self.current_schedule, snapshot)
+        
+        message = f"Published version {snapshot.version} ({snapshot.shift_count} shifts, {snapshot.hash[:12]})."
+        if previous is not None:
+            changes = previous.diff(snapshot)
+            counts = {kind: sum(1 for change in changes if change.kind == kind)
+                      for kind in ('added', 'changed', 'removed')}
+            message += (f"\n\nSince version {previous.version}: {counts['added']} shifts added, "
+                        f"{counts['changed']} changed, {counts['removed']} removed.")
+        
+        self.refresh_schedule_view()
+        self.add_activity(f"Published {self.get_schedule_name(self.current_schedule)} v{snapshot.version}")
+        self.status_var.set(message.split("\n")[0])
+        self.save_data()  # Shifts are now marked as published
+        messagebox.showinfo("Publish", message)
+
     def delete_current_schedule(self):
         """Delete current schedule"""
         if self.current_schedule:
             if messagebox.askyesno("Confirm Delete", "Are you sure you want to delete the current schedule?"):
                 self.schedules.remove(self.current_schedule)
+                self.labor_cube.remove_schedule(self.current_schedule.id)
+                self.daily_index.remove_schedule(self.current_schedule)
+                self.feeds.remove_schedule(self.current_schedule)
+                self.publisher.remove_schedule(self.current_schedule.id)
+                try:
+                    # A schedule given the same ID later must not inherit these versions
+                    delete_snapshots(self.current_schedule.id, self.published_dir)
+                except OSError as e:
+                    self.add_activity(f"Could not delete published versions: {str(e)}")
                 self.current_schedule = None
                 self.refresh_schedule_combo()
                 self.refresh_schedule_view()
+                self.refresh_shifts_tab()
+                self.update_stats()
                 self.add_activity("Deleted schedule")
                 self.save_data()
 
 
 class EmployeeDialog:
-    def __init__(self, parent, title, employee=None):
+    def __init__(self, parent, title, employee=None, location=None):
         self.result = None
         self.availability_list = []
         
@@ -1165,16 +2019,20 @@ class EmployeeDialog:
         self.max_hours_var = tk.StringVar(value=str(employee.max_hours) if employee else "40")
         ttk.Entry(main_frame, textvariable=self.max_hours_var, width=30).grid(row=5, column=1, pady=5, sticky='ew')
         
+        ttk.Label(main_frame, text="Min Hours:").grid(row=6, column=0, sticky='w', pady=5)
+        self.min_hours_var = tk.StringVar(value=str(employee.min_hours) if employee else "0")
+        ttk.Entry(main_frame, textvariable=self.min_hours_var, width=30).grid(row=6, column=1, pady=5, sticky='ew')
+        
         self.is_minor_var = tk.BooleanVar(value=employee.is_minor if employee else False)
         ttk.Checkbutton(main_frame, text="Is Minor (under 18)", 
-                       variable=self.is_minor_var).grid(row=6, column=1, pady=5, sticky='w')
+                       variable=self.is_minor_var).grid(row=7, column=1, pady=5, sticky='w')
         
         # Availability section
-        ttk.Label(main_frame, text="Availability:", font=('Arial', 10, 'bold')).grid(row=7, column=0, columnspan=2, sticky='w', pady=(10, 5))
+        ttk.Label(main_frame, text="Availability:", font=('Arial', 10, 'bold')).grid(row=8, column=0, columnspan=2, sticky='w', pady=(10, 5))
         
         # Availability inputs
         avail_input_frame = ttk.Frame(main_frame)
-        avail_input_frame.grid(row=8, column=0, columnspan=2, sticky='ew', pady=5)
+        avail_input_frame.grid(row=9, column=0, columnspan=2, sticky='ew', pady=5)
         
         ttk.Label(avail_input_frame, text="Day:").pack(side='left', padx=5)
         self.day_var = tk.StringVar(value="Monday")
@@ -1195,7 +2053,7 @@ class EmployeeDialog:
         
         # Availability listbox
         avail_frame = ttk.Frame(main_frame)
-        avail_frame.grid(row=9, column=0, columnspan=2, sticky='ew', pady=5)
+        avail_frame.grid(row=10, column=0, columnspan=2, sticky='ew', pady=5)
         
         ttk.Label(avail_frame, text="Scheduled Availability:").pack(anchor='w')
         
@@ -1217,9 +2075,14 @@ class EmployeeDialog:
         # Remove availability button
         ttk.Button(avail_frame, text="Remove Selected", command=self.remove_availability).pack(anchor='w', pady=5)
         
+        # Locations (comma separated, blank for any location); new employees default to the site
+        ttk.Label(main_frame, text="Locations:").grid(row=11, column=0, sticky='w', pady=5)
+        self.locations_var = tk.StringVar(value=", ".join(employee.locations) if employee else (location or ""))
+        ttk.Entry(main_frame, textvariable=self.locations_var, width=30).grid(row=11, column=1, pady=5, sticky='ew')
+        
         # Buttons
         button_frame = ttk.Frame(main_frame)
-        button_frame.grid(row=10, column=0, columnspan=2, pady=20)
+        button_frame.grid(row=12, column=0, columnspan=2, pady=20)
         
         ttk.Button(button_frame, text="Save", command=self.save_employee).pack(side='left', padx=5)
         ttk.Button(button_frame, text="Cancel", command=self.dialog.destroy).pack(side='left', padx=5)
@@ -1285,24 +2148,28 @@ class EmployeeDialog:
                 'role': self.role_var.get().strip(),
                 'wage': self.wage_var.get().strip(),
                 'max_hours': self.max_hours_var.get().strip(),
+                'min_hours': self.min_hours_var.get().strip(),
                 'is_minor': self.is_minor_var.get(),
-                'availability': self.availability_list
+                'availability': self.availability_list,
+                'locations': [loc.strip() for loc in self.locations_var.get().split(",") if loc.strip()]
             }
             
             # Basic validation
             if not all([self.result['name'], self.result['phone'], self.result['email'], 
-                       self.result['role'], self.result['wage'], self.result['max_hours']]):
+                       self.result['role'], self.result['wage'], self.result['max_hours'],
+                       self.result['min_hours']]):
                 messagebox.showerror("Error", "All fields are required")
                 return
             
             # Validate numeric fields
             float(self.result['wage'])
             int(self.result['max_hours'])
+            int(self.result['min_hours'])
             
             self.dialog.destroy()
             
         except ValueError:
-            messagebox.showerror("Error", "Please enter valid numbers for wage and max hours")
+            messagebox.showerror("Error", "Please enter valid numbers for wage, max hours and min hours")
 
 
 class ShiftDialog:
@@ -1399,6 +2266,7 @@ class EmployeeDetailsDialog:
         ttk.Label(info_frame, text=f"Role: {employee.role}").pack(anchor='w')
         ttk.Label(info_frame, text=f"Wage: ${employee.wage:.2f}/hour").pack(anchor='w')
         ttk.Label(info_frame, text=f"Max Hours: {employee.max_hours}").pack(anchor='w')
+        ttk.Label(info_frame, text=f"Min Hours: {employee.min_hours}").pack(anchor='w')
         ttk.Label(info_frame, text=f"Status: {'Minor' if employee.is_minor else 'Regular'}").pack(anchor='w')
         
         # Availability
@@ -1416,6 +2284,45 @@ class EmployeeDetailsDialog:
         # Close button
         ttk.Button(main_frame, text="Close", command=self.dialog.destroy).pack(pady=10)
 
+class PayrollBreakdownDialog:
+    def __init__(self, parent, schedule, report):
+        # Create dialog
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title(f"Payroll Breakdown - {get_schedule_dates(schedule)}")
+        self.dialog.geometry("750x400")
+        self.dialog.transient(parent)
+        
+        # Center dialog
+        self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 50, parent.winfo_rooty() + 50))
+        
+        main_frame = ttk.Frame(self.dialog, padding=20)
+        main_frame.pack(fill='both', expand=True)
+        
+        # Per-employee breakdown
+        columns = ('Name', 'Shifts', 'Regular Hrs', 'Overtime Hrs', 'Regular Pay', 'Overtime Pay', 'Total')
+        tree = ttk.Treeview(main_frame, columns=columns, show='headings', height=12)
+        for col in columns:
+            tree.heading(col, text=col)
+            tree.column(col, width=95)
+        tree.pack(fill='both', expand=True)
+        
+        for breakdown in report.breakdowns:
+            tree.insert('', 'end', values=(
+                breakdown.employee.name,
+                breakdown.shift_count,
+                f"{breakdown.regular_hours:.1f}",
+                f"{breakdown.overtime_hours:.1f}",
+                f"${breakdown.regular_pay:.2f}",
+                f"${breakdown.overtime_pay:.2f}",
+                f"${breakdown.total_pay:.2f}"
+            ))
+        
+        ttk.Label(main_frame, text=f"Total: ${report.total_cost:.2f} (Overtime: ${report.total_overtime_cost:.2f})",
+                  style='Heading.TLabel').pack(pady=5)
+        
+        # Close button
+        ttk.Button(main_frame, text="Close", command=self.dialog.destroy).pack(pady=5)
+
 class CalendarDialog:
     def __init__(self, parent):
         self.result = None
@@ -1590,8 +2497,138 @@ class CalendarDialog:
         print(f"Result set to: {self.result}")  # Debug
         self.dialog.destroy()
 
+class ScheduleCalendarDialog:
+    # Weeks shown in each mode (None = the whole month)
+    MODES = {"Month": None, "4 Weeks": 4, "2 Weeks": 2}
+    
+    def __init__(self, parent, daily_index, start, on_day_selected):
+        """
+        Month or multi-week calendar of daily totals
+        
+        Each cell shows the day's shift count, filled percentage and cost,
+        read from the DailySummaryIndex, so redrawing never walks the shifts.
+        
+        Args:
+            parent: Parent window
+            daily_index (DailySummaryIndex): Per-day totals
+            start (date): Date to open the calendar at
+            on_day_selected (callable): Called with the date when a day is clicked
+        """
+        self.daily_index = daily_index
+        self.on_day_selected = on_day_selected
+        self.current_date = start
+        
+        # Create dialog
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Schedule Calendar")
+        self.dialog.geometry("900x620")
+        self.dialog.transient(parent)
+        
+        main_frame = ttk.Frame(self.dialog, padding=10)
+        main_frame.pack(fill='both', expand=True)
+        
+        # Mode and navigation
+        nav_frame = ttk.Frame(main_frame)
+        nav_frame.pack(fill='x', pady=5)
+        
+        self.mode_var = tk.StringVar(value="Month")
+        mode_combo = ttk.Combobox(nav_frame, textvariable=self.mode_var, values=list(self.MODES),
+                                  state='readonly', width=10)
+        mode_combo.pack(side='left', padx=5)
+        mode_combo.bind('<<ComboboxSelected>>', lambda e: self.populate_calendar())
+        
+        ttk.Button(nav_frame, text="<", width=3, command=lambda: self.move(-1)).pack(side='left', padx=5)
+        self.title_var = tk.StringVar()
+        ttk.Label(nav_frame, textvariable=self.title_var, font=('Arial', 12, 'bold'),
+                  width=30, anchor='center').pack(side='left')
+        ttk.Button(nav_frame, text=">", width=3, command=lambda: self.move(1)).pack(side='left', padx=5)
+        
+        self.total_var = tk.StringVar()
+        ttk.Label(nav_frame, textvariable=self.total_var).pack(side='right', padx=5)
+        
+        # Calendar grid
+        cal_frame = ttk.Frame(main_frame)
+        cal_frame.pack(fill='both', expand=True, pady=10)
+        
+        for col, day in enumerate(['Mon', 'Tue', 'Wed', 'Thu', 'Fri', 'Sat', 'Sun']):
+            ttk.Label(cal_frame, text=day, font=('Arial', 9, 'bold'), anchor='center').grid(row=0, column=col, sticky='ew')
+            cal_frame.columnconfigure(col, weight=1)
+        
+        self.day_buttons = []
+        for row in range(6):
+            week_buttons = []
+            for col in range(7):
+                btn = tk.Button(cal_frame, text="", height=5, relief='raised', bg='white', justify='left')
+                btn.grid(row=row+1, column=col, padx=2, pady=2, sticky='nsew')
+                week_buttons.append(btn)
+            self.day_buttons.append(week_buttons)
+            cal_frame.rowconfigure(row+1, weight=1)
+        
+        ttk.Label(main_frame, text="Green = all shifts filled, orange = some open, red = none filled. "
+                                   "Click a day to open its week.").pack(pady=5)
+        
+        self.populate_calendar()
+    
+    def get_days(self):
+        """First and last date shown in the current mode"""
+        weeks = self.MODES[self.mode_var.get()]
+        if weeks is None:
+            first = self.current_date.replace(day=1)
+            last_day = calendar.monthrange(first.year, first.month)[1]
+            return first, first.replace(day=last_day)
+        first = get_week_start(self.current_date)
+        return first, first + timedelta(weeks=weeks, days=-1)
+    
+    def move(self, step):
+        """Go to the previous or next month (or block of weeks)"""
+        weeks = self.MODES[self.mode_var.get()]
+        if weeks is None:
+            month = self.current_date.month - 1 + step
+            self.current_date = date(self.current_date.year + month // 12, month % 12 + 1, 1)
+        else:
+            self.current_date = get_week_start(self.current_date) + timedelta(weeks=weeks * step)
+        self.populate_calendar()
+    
+    def populate_calendar(self):
+        """Fill the grid from the per-day totals of the shown dates"""
+        first, last = self.get_days()
+        days = self.daily_index.get_range(first, last)
+        if self.MODES[self.mode_var.get()] is None:
+            self.title_var.set(first.strftime('%B %Y'))
+        else:
+            self.title_var.set(f"{first.strftime('%b %d')} - {last.strftime('%b %d, %Y')}")
+        total = self.daily_index.get_total(first, last)
+        self.total_var.set(f"{total.shifts} shifts, {total.filled_percent:.0f}% filled, ${total.cost:,.2f}")
+        
+        grid_start = get_week_start(first)
+        for week_idx, week_buttons in enumerate(self.day_buttons):
+            for day_idx, btn in enumerate(week_buttons):
+                day = grid_start + timedelta(weeks=week_idx, days=day_idx)
+                if day < first or day > last:
+                    btn.config(text="", state='disabled', bg='white')
+                    continue
+                
+                summary = days.get(day)
+                if summary is None:
+                    btn.config(text=str(day.day), bg='white')
+                else:
+                    if summary.filled == summary.shifts:
+                        color = 'palegreen'
+                    elif summary.filled:
+                        color = 'orange'
+                    else:
+                        color = 'salmon'
+                    btn.config(text=f"{day.day}\n{summary.shifts} shifts\n{summary.filled_percent:.0f}% filled\n"
+                                    f"${summary.cost:,.0f}", bg=color)
+                btn.config(state='normal', command=partial(self.select_day, day))
+    
+    def select_day(self, day):
+        """Open the day's week in the main window"""
+        self.dialog.destroy()
+        self.on_day_selected(day)
+
 class AssignEmployeeDialog:
-    def __init__(self, parent, shift, employees):
+    def __init__(self, parent, shift, employees, eligibility):
         self.result = None
         self.shift = shift
         self.employees = employees
@@ -1635,33 +2672,33 @@ class AssignEmployeeDialog:
         self.employee_listbox.pack(side='left', fill='both', expand=True)
         scrollbar.pack(side='right', fill='y')
 
-        # Populate employee list with availability info
+        # Populate employee list - eligible candidates come ranked from the index
+        # (most remaining hours first, then cheapest)
         self.eligible_employees = []
-        day_name = shift.get_day_name()
+        candidates = eligibility.get_candidates(shift)
+        for emp in candidates:
+            remaining = eligibility.get_remaining_hours(emp, shift)
+            display = f"{emp.name} ({emp.role}, ${emp.wage:.2f}/hr, {remaining:.1f}h left) ✅"
+            self.employee_listbox.insert(tk.END, display)
+            self.eligible_employees.append((emp, True))
 
+        # Everyone else is listed after the candidates with the reason they can't be assigned
+        candidate_ids = {emp.id for emp in candidates}
+        role_members = eligibility.get_role_members(shift.roles_required)
         for emp in employees:
-            # Check if already assigned
-            if emp.id in shift.assigned_employees:
+            if emp.id in candidate_ids or emp.id in shift.assigned_employees:
                 continue
-            
-            # Check role match
-            role_match = emp.role.lower() in [r.lower() for r in shift.roles_required] or emp.is_manager
-
-            # Check availability
-            is_available = emp.is_available(day_name, shift.start_time, shift.end_time)
-
-            # Build display string
-            status = ""
-            if not role_match:
+            if emp.id not in role_members:
                 status = " [WRONG ROLE]"
-            elif not is_available:
-                status = " [NOT AVAILABLE]"
+            elif eligibility.get_remaining_hours(emp, shift) < shift.get_duration_hours():
+                status = " [OVER MAX HOURS]"
+            elif shift.schedule is not None and shift.schedule.check_labor_rules(emp.id, shift):
+                status = " [SCHEDULE CONFLICT]"
             else:
-                status = " ✅"
-            
+                status = " [NOT AVAILABLE]"
             display = f"{emp.name} ({emp.role}, ${emp.wage:.2f}/hr){status}"
             self.employee_listbox.insert(tk.END, display)
-            self.eligible_employees.append((emp, role_match and is_available))
+            self.eligible_employees.append((emp, False))
 
         # Info label
         info_label = ttk.Label(select_frame,
@@ -1693,7 +2730,7 @@ class AssignEmployeeDialog:
         if not is_eligible:
             messagebox.showerror("Cannot Assign",
                                  f"{employee.name} cannot be assigned to this shift.\n\n"
-                                 f"Reason: Employee is either not available or doesn't have the required role.")
+                                 f"Reason: Employee is not available, doesn't have the required role or is out of weekly hours.")
             return
         
         # Assign the employee
@@ -1712,12 +2749,153 @@ class AssignEmployeeDialog:
             messagebox.showerror("Assignment Failed", str(e))
 
 
+class SwapShiftDialog:
+    def __init__(self, parent, shift, marketplace):
+        """
+        Pick who gives up a shift and who takes it (a cover or a shift-for-shift trade)
+        
+        Args:
+            parent: Parent window
+            shift (Shift): Shift being swapped
+            marketplace (SwapMarketplace): Marketplace holding the swap requests
+        """
+        self.result = None
+        self.summary = ""
+        self.shift = shift
+        self.marketplace = marketplace
+        self.options = []
+        
+        self.dialog = tk.Toplevel(parent)
+        self.dialog.title("Swap Shift")
+        self.dialog.geometry("560x480")
+        self.dialog.transient(parent)
+        self.dialog.grab_set()
+        self.dialog.geometry("+%d+%d" % (parent.winfo_rootx() + 50, parent.winfo_rooty() + 50))
+        
+        main_frame = ttk.Frame(self.dialog, padding=20)
+        main_frame.pack(fill='both', expand=True)
+        
+        info_frame = ttk.LabelFrame(main_frame, text="Shift Information", padding=10)
+        info_frame.pack(fill='x', pady=5)
+        ttk.Label(info_frame, text=f"Date: {shift.date} ({shift.get_day_name()})").pack(anchor='w')
+        ttk.Label(info_frame, text=f"Time: {shift.format_time(shift.start_time)} - {shift.format_time(shift.end_time)}").pack(anchor='w')
+        
+        # Who is giving the shift up
+        poster_frame = ttk.Frame(info_frame)
+        poster_frame.pack(fill='x', pady=5)
+        ttk.Label(poster_frame, text="Giving up:").pack(side='left')
+        self.posters = [marketplace.eligibility.get_employee(emp_id) for emp_id in shift.assigned_employees]
+        self.posters = [emp for emp in self.posters if emp is not None]
+        self.poster_var = tk.StringVar()
+        poster_combo = ttk.Combobox(poster_frame, textvariable=self.poster_var, state='readonly',
+                                    values=[emp.name for emp in self.posters])
+        poster_combo.pack(side='left', padx=5)
+        poster_combo.bind('<<ComboboxSelected>>', lambda event: self.load_options())
+        
+        select_frame = ttk.LabelFrame(main_frame, text="Swap Partners", padding=10)
+        select_frame.pack(fill='both', expand=True, pady=5)
+        list_container = ttk.Frame(select_frame)
+        list_container.pack(fill='both', expand=True)
+        scrollbar = ttk.Scrollbar(list_container, orient='vertical')
+        self.option_listbox = tk.Listbox(list_container, yscrollcommand=scrollbar.set, height=10)
+        scrollbar.config(command=self.option_listbox.yview)
+        self.option_listbox.pack(side='left', fill='both', expand=True)
+        scrollbar.pack(side='right', fill='y')
+        ttk.Label(select_frame, text="Covers take the shift outright | Trades hand a shift back",
+                  font=('Arial', 9, 'italic')).pack(pady=5)
+        
+        button_frame = ttk.Frame(main_frame)
+        button_frame.pack(pady=10)
+        ttk.Button(button_frame, text="Swap Selected", width=15,
+                   command=self.apply_swap).pack(side='left', padx=5)
+        ttk.Button(button_frame, text="Cancel", width=15,
+                   command=self.dialog.destroy).pack(side='left', padx=5)
+        
+        if self.posters:
+            poster_combo.current(0)
+            self.load_options()
+        
+        self.dialog.wait_window()
+    
+    def get_request(self):
+        """Open request for the selected employee, posting one if needed"""
+        poster = self.posters[[emp.name for emp in self.posters].index(self.poster_var.get())]
+        for request in self.marketplace.get_open_requests(poster.id):
+            if request.shift is self.shift:
+                return request
+        return self.marketplace.post(self.shift, poster.id)
+    
+    def load_options(self):
+        """List covers (cheapest first), then trades"""
+        self.option_listbox.delete(0, tk.END)
+        self.options = []
+        request = self.get_request()
+        for employee in self.marketplace.find_covers(request):
+            self.option_listbox.insert(tk.END, f"Cover: {employee.name} (${employee.wage:.2f}/hr)")
+            self.options.append((employee, None))
+        for employee, partner_shift in self.marketplace.find_trades(request):
+            self.option_listbox.insert(tk.END, f"Trade: {employee.name} gives "
+                                       f"{partner_shift.date} ({partner_shift.get_day_name()}) "
+                                       f"{partner_shift.format_time(partner_shift.start_time)} - "
+                                       f"{partner_shift.format_time(partner_shift.end_time)}")
+            self.options.append((employee, partner_shift))
+        if not self.options:
+            self.option_listbox.insert(tk.END, "No eligible swap partners")
+    
+    def apply_swap(self):
+        """Apply the selected cover or trade"""
+        selection = self.option_listbox.curselection()
+        if not selection or selection[0] >= len(self.options):
+            messagebox.showwarning("No Selection", "Please select a swap partner")
+            return
+        
+        partner, partner_shift = self.options[selection[0]]
+        request = self.get_request()
+        try:
+            self.result = self.marketplace.accept(request.id, partner.id, partner_shift)
+        except ValueError as e:
+            messagebox.showerror("Swap Failed", str(e))
+            return
+        
+        poster_name = self.poster_var.get()
+        if partner_shift is None:
+            self.summary = f"{partner.name} covers for {poster_name}"
+        else:
+            self.summary = f"{poster_name} and {partner.name} traded shifts"
+        messagebox.showinfo("Success", self.summary)
+        self.dialog.destroy()
+
 
-def main():
-    """Main application entry point"""
-    root = tk.Tk()
-    app = SchedulingApp(root)
-    root.mainloop()
+def main(argv=None):
+    """
+    Main application entry point
+    
+    Args:
+        argv (list): Command line arguments (default sys.argv)
+                     --profile records a cProfile session of the whole run, saved
+                     next to the data file when the app closes
+                     --location NAME runs the app for one site (see modules/locations.py)
+    """
+    parser = argparse.ArgumentParser(description="Chronos scheduling")
+    parser.add_argument('--profile', action='store_true',
+                        help="Record a cProfile session (saved as data/profile_<timestamp>.prof)")
+    parser.add_argument('--location',
+                        help="Run as one site: load and save only this location's schedules and staff")
+    args = parser.parse_args(argv)
+    
+    session_profiler = SessionProfiler(os.path.dirname(storage.DATA_FILE))
+    if args.profile:
+        session_profiler.start()
+    
+    try:
+        root = tk.Tk()
+        app = SchedulingApp(root, session_profiler, location=args.location)
+        root.mainloop()
+    finally:
+        # Closed without on_closing (e.g., Ctrl+C) - still keep the profile
+        path = session_profiler.stop()
+        if path:
+            print(f"Profile saved to {path}")
 
 
 if __name__ == "__main__":
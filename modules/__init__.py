@@ -2,5 +2,7 @@
 from .employee import Employee
 from .shift import Shift
 from .schedule import Schedule
+from .events import EventBus, event_bus
+from .profiling import profiler, timed
 
-__all__ = ['Employee', 'Shift', 'Schedule']
+__all__ = ['Employee', 'Shift', 'Schedule', 'EventBus', 'event_bus', 'profiler', 'timed']
@@ -0,0 +1,350 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+from . import storage
+from .events import (event_bus, SHIFT_ADDED, SHIFTS_ADDED, EMPLOYEE_ASSIGNED, EMPLOYEE_UNASSIGNED,
+                     WAGE_CHANGED, ROLE_CHANGED)
+
+GRANULARITIES = ('day', 'week', 'month')
+DIMENSIONS = ('total', 'role', 'location', 'employee')
+
+
+def get_period(day, granularity):
+    """
+    Get the period key a date falls in
+
+    Args:
+        day (date): The date
+        granularity (str): 'day', 'week' (keyed by Monday) or 'month'
+
+    Returns:
+        str: Period key that sorts chronologically (e.g., "2025-12-01", "2025-12")
+    """
+    if granularity == 'day':
+        return day.isoformat()
+    if granularity == 'week':
+        return (day - timedelta(days=day.weekday())).isoformat()
+    if granularity == 'month':
+        return day.strftime("%Y-%m")
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+class LaborCostCube:
+    def __init__(self):
+        """
+        Pre-aggregated labor cost and hours rollups over many schedules
+
+        Every assignment adds its cost (wage x shift duration, the same as
+        Schedule.calculate_payroll) and hours into daily, weekly and monthly
+        cells for the total and for each role, location and employee. Queries
+        read those cells directly instead of looping over schedules and shifts.
+
+        Each schedule's contribution is remembered, so when one schedule changes
+        only that schedule is subtracted and re-added. A wage or role change
+        re-aggregates only the schedules the employee works in.
+        """
+        # granularity -> dimension -> period -> value -> [cost, hours]
+        self._cells = {g: {d: {} for d in DIMENSIONS} for g in GRANULARITIES}
+        # schedule_id -> {(granularity, dimension, period, value): [cost, hours]}
+        self._contributions = {}
+        # employee_id -> ids of the schedules the employee has cost in
+        self._schedule_ids_by_employee = {}
+        # schedule_id -> Schedule, for re-aggregating after employee changes
+        self._schedules = {}
+        # Schedules changed since the last refresh()
+        self._dirty = {}
+        self._bus = None
+
+    # BUILDING
+    @classmethod
+    def from_schedules(cls, schedules, employees_list):
+        """Build a cube from Schedule objects"""
+        cube = cls()
+        for schedule in schedules:
+            cube.update_schedule(schedule, employees_list)
+        return cube
+
+    @classmethod
+    def from_file(cls, data_file=storage.DATA_FILE):
+        """
+        Build a cube straight from the persisted data file
+
+        Works on the raw JSON, so no Employee/Shift/Schedule objects are created.
+        """
+        data = storage.read_data(data_file)
+        employees_by_id = {emp['id']: (emp['role'], emp['wage']) for emp in data.get('employees', [])}
+        cube = cls()
+        for sched_data in data.get('schedules', []):
+            records = []
+            for shift_data in sched_data.get('shifts', []):
+                shift_date = datetime.strptime(shift_data['date'], "%Y-%m-%d").date()
+                hours = _duration_hours(shift_data['start_time'], shift_data['end_time'])
+                location = shift_data.get('location', 'Main')
+                for emp_id in shift_data.get('assigned_employees', []):
+                    records.append((shift_date, hours, location, emp_id))
+            cube._set_contribution(sched_data['id'], records, employees_by_id)
+        return cube
+
+    def update_schedule(self, schedule, employees_list):
+        """
+        Replace one schedule's contribution with its current state
+
+        Args:
+            schedule (Schedule): The schedule that changed
+            employees_list (list): List of all Employee objects
+        """
+        employees_by_id = {emp.id: (emp.role, emp.wage) for emp in employees_list}
+        records = []
+        for shift in schedule.get_all_shifts():
+            hours = shift.get_duration_hours()
+            for emp_id in shift.assigned_employees:
+                records.append((shift.date, hours, shift.location, emp_id))
+        self._set_contribution(schedule.id, records, employees_by_id)
+        self._schedules[schedule.id] = schedule
+        self._dirty.pop(schedule.id, None)
+
+    def attach(self, schedules):
+        """
+        Remember the Schedule objects behind loaded rollups
+
+        Rollups read with load() or from_file() only know schedule IDs; once
+        attached, a schedule can be re-aggregated when an employee's wage or
+        role changes.
+
+        Args:
+            schedules (list): Schedule objects
+        """
+        for schedule in schedules:
+            if schedule.id in self._contributions:
+                self._schedules[schedule.id] = schedule
+
+    def remove_schedule(self, schedule_id):
+        """
+        Remove a deleted schedule from every rollup
+
+        Returns:
+            bool: True if the schedule was in the cube, False otherwise
+        """
+        self._dirty.pop(schedule_id, None)
+        self._schedules.pop(schedule_id, None)
+        contribution = self._contributions.pop(schedule_id, None)
+        if contribution is None:
+            return False
+        self._apply(contribution, -1)
+        self._index_employees(schedule_id, contribution, None)
+        return True
+
+    def _set_contribution(self, schedule_id, records, employees_by_id):
+        """Aggregate (date, hours, location, employee_id) records and swap them in for the schedule"""
+        contribution = {}
+        for shift_date, hours, location, emp_id in records:
+            if emp_id not in employees_by_id:
+                continue
+            role, wage = employees_by_id[emp_id]
+            cost = wage * hours
+            for granularity in GRANULARITIES:
+                period = get_period(shift_date, granularity)
+                for dimension, value in (('total', 'total'), ('role', role),
+                                         ('location', location), ('employee', emp_id)):
+                    cell = contribution.setdefault((granularity, dimension, period, value), [0.0, 0.0])
+                    cell[0] += cost
+                    cell[1] += hours
+
+        old = self._contributions.get(schedule_id)
+        if old is not None:
+            self._apply(old, -1)
+        self._contributions[schedule_id] = contribution
+        self._apply(contribution, 1)
+        self._index_employees(schedule_id, old, contribution)
+
+    def _index_employees(self, schedule_id, old, new):
+        """Move a schedule between employees' entries when its contribution is replaced"""
+        for contribution, add in ((old, False), (new, True)):
+            for granularity, dimension, period, emp_id in contribution or ():
+                if granularity != 'day' or dimension != 'employee':
+                    continue
+                schedule_ids = self._schedule_ids_by_employee.setdefault(emp_id, set())
+                if add:
+                    schedule_ids.add(schedule_id)
+                else:
+                    schedule_ids.discard(schedule_id)
+                    if not schedule_ids:
+                        del self._schedule_ids_by_employee[emp_id]
+
+    def _apply(self, contribution, sign):
+        """Add (sign=1) or subtract (sign=-1) a contribution from the rollups"""
+        for (granularity, dimension, period, value), (cost, hours) in contribution.items():
+            values = self._cells[granularity][dimension].setdefault(period, {})
+            cell = values.setdefault(value, [0.0, 0.0])
+            cell[0] += sign * cost
+            cell[1] += sign * hours
+            # Drop empty cells so removed schedules don't leave zero rows behind
+            if abs(cell[0]) < 1e-9 and abs(cell[1]) < 1e-9:
+                del values[value]
+                if not values:
+                    del self._cells[granularity][dimension][period]
+
+    # INCREMENTAL TRACKING
+    def track(self, bus=event_bus):
+        """Start marking schedules dirty when their shifts, assignments or employees' wages and roles change"""
+        self._bus = bus
+        bus.subscribe(SHIFT_ADDED, self._on_shift_changed)
+        bus.subscribe(SHIFTS_ADDED, self._on_shifts_added)
+        bus.subscribe(EMPLOYEE_ASSIGNED, self._on_shift_changed)
+        bus.subscribe(EMPLOYEE_UNASSIGNED, self._on_shift_changed)
+        bus.subscribe(WAGE_CHANGED, self._on_employee_changed)
+        bus.subscribe(ROLE_CHANGED, self._on_employee_changed)
+
+    def close(self):
+        """Stop tracking model events"""
+        if self._bus is not None:
+            self._bus.unsubscribe(SHIFT_ADDED, self._on_shift_changed)
+            self._bus.unsubscribe(SHIFTS_ADDED, self._on_shifts_added)
+            self._bus.unsubscribe(EMPLOYEE_ASSIGNED, self._on_shift_changed)
+            self._bus.unsubscribe(EMPLOYEE_UNASSIGNED, self._on_shift_changed)
+            self._bus.unsubscribe(WAGE_CHANGED, self._on_employee_changed)
+            self._bus.unsubscribe(ROLE_CHANGED, self._on_employee_changed)
+            self._bus = None
+
+    def _on_shift_changed(self, shift, **details):
+        schedule = details.get('schedule') or shift.schedule
+        if schedule is not None:
+            self._dirty[schedule.id] = schedule
+
+    def _on_shifts_added(self, schedule, shifts):
+        self._dirty[schedule.id] = schedule
+
+    def _on_employee_changed(self, employee, **details):
+        # Past cost is re-priced at the new wage, as Schedule.calculate_payroll does
+        for schedule_id in self._schedule_ids_by_employee.get(employee.id, ()):
+            schedule = self._schedules.get(schedule_id)
+            if schedule is not None:
+                self._dirty[schedule_id] = schedule
+
+    def refresh(self, employees_list):
+        """
+        Re-aggregate only the schedules that changed since the last refresh
+
+        Returns:
+            int: Number of schedules updated
+        """
+        dirty = list(self._dirty.values())
+        for schedule in dirty:
+            self.update_schedule(schedule, employees_list)
+        return len(dirty)
+
+    # QUERIES
+    def get_cost_by(self, dimension, granularity='week', start=None, end=None):
+        """
+        Total labor cost per role, location or employee over a date range
+
+        Args:
+            dimension (str): 'total', 'role', 'location' or 'employee'
+            granularity (str): Rollup to read from ('day', 'week' or 'month')
+            start (str): First period to include (e.g., "2025-01" for months), None for all
+            end (str): Last period to include, None for all
+
+        Returns:
+            dict: value -> total cost
+        """
+        totals = {}
+        for period, values in self._cells[granularity][dimension].items():
+            if (start is not None and period < start) or (end is not None and period > end):
+                continue
+            for value, (cost, hours) in values.items():
+                totals[value] = totals.get(value, 0.0) + cost
+        return totals
+
+    def get_series(self, granularity='week', dimension='total', value='total', start=None, end=None):
+        """
+        Labor cost and hours per period for one role, location or employee
+
+        Returns:
+            list: List of (period, cost, hours) tuples in chronological order
+        """
+        series = []
+        for period in sorted(self._cells[granularity][dimension]):
+            if (start is not None and period < start) or (end is not None and period > end):
+                continue
+            cell = self._cells[granularity][dimension][period].get(value)
+            if cell:
+                series.append((period, cell[0], cell[1]))
+        return series
+
+    # PERSISTENCE
+    def to_dict(self):
+        """Convert cube to dictionary for JSON serialization"""
+        return {
+            'contributions': {
+                str(schedule_id): [[g, d, p, v, cost, hours] for (g, d, p, v), (cost, hours) in contribution.items()]
+                for schedule_id, contribution in self._contributions.items()
+            }
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create cube from dictionary (JSON deserialization)"""
+        cube = cls()
+        for schedule_id, cells in data.get('contributions', {}).items():
+            contribution = {}
+            for granularity, dimension, period, value, cost, hours in cells:
+                contribution[(granularity, dimension, period, value)] = [cost, hours]
+            cube._contributions[int(schedule_id)] = contribution
+            cube._apply(contribution, 1)
+            cube._index_employees(int(schedule_id), None, contribution)
+        return cube
+
+    def save(self, path, sources=()):
+        """
+        Save the rollups so they don't need to be rebuilt on the next start
+
+        Args:
+            path (str): File to write
+            sources (list): Data files the rollups match (just saved); their size
+                and modification time are recorded so load() can tell if they
+                changed since
+        """
+        data = self.to_dict()
+        data['sources'] = [_get_stamp(source) for source in sources]
+        temp_file = path + '.tmp'
+        with open(temp_file, 'w') as file:
+            json.dump(data, file)
+        os.replace(temp_file, path)
+
+    @classmethod
+    def load(cls, path, sources=()):
+        """
+        Load rollups saved with save()
+
+        Args:
+            path (str): File written by save()
+            sources (list): Data files the rollups must still match (the ones passed to save()),
+                empty to skip the check
+
+        Raises:
+            ValueError: If a data file changed since the rollups were saved
+        """
+        with open(path, 'r') as file:
+            data = json.load(file)
+        if sources and [_get_stamp(source) for source in sources] != data.get('sources'):
+            raise ValueError(f"Labor cost rollups in {path} are out of date")
+        return cls.from_dict(data)
+
+
+def _get_stamp(path):
+    """A data file's path, size and modification time (None if it doesn't exist)"""
+    try:
+        stat = os.stat(path)
+    except OSError:
+        return None
+    return [path, stat.st_size, stat.st_mtime_ns]
+
+
+def _duration_hours(start_time, end_time):
+    """Shift duration in hours from military times (same rules as Shift.get_duration_hours)"""
+    start_hour = start_time // 100 + (start_time % 100) / 60
+    end_hour = end_time // 100 + (end_time % 100) / 60
+    if end_hour < start_hour:
+        end_hour += 24
+    return end_hour - start_hour
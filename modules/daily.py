@@ -0,0 +1,197 @@
+"""
+Per-day schedule summaries for calendar views
+
+The DailySummaryIndex keeps one small DaySummary per date (shift count,
+filled shifts, staffing, hours and labor cost) and updates it from model
+events, so a month view reads about 42 summaries instead of walking every
+shift on each redraw.
+"""
+
+from datetime import timedelta
+from .events import (event_bus, SHIFT_ADDED, SHIFTS_ADDED, EMPLOYEE_ASSIGNED, EMPLOYEE_UNASSIGNED,
+                     WAGE_CHANGED)
+
+
+class DaySummary:
+    def __init__(self):
+        """Totals for one date (across every tracked schedule)"""
+        self.shifts = 0           # Number of shifts
+        self.filled = 0           # Shifts with at least min_staff assigned
+        self.staff_needed = 0     # Sum of min_staff
+        self.staff_assigned = 0   # Number of assignments
+        self.hours = 0.0          # Assigned hours
+        self.cost = 0.0           # Labor cost (wage x duration, as Schedule.calculate_payroll)
+
+    @property
+    def filled_percent(self):
+        """Percentage of the day's shifts that are filled (0 with no shifts)"""
+        return 100.0 * self.filled / self.shifts if self.shifts else 0.0
+
+    def __str__(self):
+        return f"{self.shifts} shifts, {self.filled_percent:.0f}% filled, ${self.cost:.2f}"
+
+
+class DailySummaryIndex:
+    def __init__(self, schedules=None, employees=None, bus=event_bus):
+        """
+        Date-bucketed summaries of shifts, staffing and cost
+
+        Each event touches only the summary of the shift's date: adding a
+        shift or assigning/unassigning an employee is O(1), and a wage change
+        only adjusts the days that employee works.
+
+        Args:
+            schedules (list): Schedule objects to summarize (more can be added with add_schedule)
+            employees (list): Employee objects (for wages)
+            bus (EventBus): Event bus used to keep the summaries up to date
+        """
+        # date -> DaySummary
+        self._days = {}
+        # IDs of the schedules being summarized
+        self._schedule_ids = set()
+        # employee_id -> wage, and employee_id -> {date: assigned hours} for wage changes
+        self._wages = {emp.id: emp.wage for emp in employees or []}
+        self._hours_by_employee = {}
+
+        for schedule in schedules or []:
+            self.add_schedule(schedule)
+
+        self._bus = bus
+        self._bus.subscribe(SHIFT_ADDED, self._on_shift_added)
+        self._bus.subscribe(SHIFTS_ADDED, self._on_shifts_added)
+        self._bus.subscribe(EMPLOYEE_ASSIGNED, self._on_assigned)
+        self._bus.subscribe(EMPLOYEE_UNASSIGNED, self._on_unassigned)
+        self._bus.subscribe(WAGE_CHANGED, self._on_wage_changed)
+
+    def close(self):
+        """Stop listening for model events"""
+        self._bus.unsubscribe(SHIFT_ADDED, self._on_shift_added)
+        self._bus.unsubscribe(SHIFTS_ADDED, self._on_shifts_added)
+        self._bus.unsubscribe(EMPLOYEE_ASSIGNED, self._on_assigned)
+        self._bus.unsubscribe(EMPLOYEE_UNASSIGNED, self._on_unassigned)
+        self._bus.unsubscribe(WAGE_CHANGED, self._on_wage_changed)
+
+    # SCHEDULES
+    def add_schedule(self, schedule):
+        """Start summarizing a schedule (its existing shifts are counted now)"""
+        if schedule.id in self._schedule_ids:
+            return
+        self._schedule_ids.add(schedule.id)
+        for shift in schedule.get_all_shifts():
+            self._add_shift(shift, 1)
+
+    def remove_schedule(self, schedule):
+        """
+        Stop summarizing a schedule and take its shifts out of the totals
+
+        Returns:
+            bool: True if the schedule was being summarized, False otherwise
+        """
+        if schedule.id not in self._schedule_ids:
+            return False
+        self._schedule_ids.discard(schedule.id)
+        for shift in schedule.get_all_shifts():
+            self._add_shift(shift, -1)
+        return True
+
+    def _is_tracked(self, shift):
+        return shift.schedule is not None and shift.schedule.id in self._schedule_ids
+
+    def _add_shift(self, shift, sign):
+        """Add (sign=1) or subtract (sign=-1) a shift and its assignments"""
+        day = self._days.setdefault(shift.date, DaySummary())
+        day.shifts += sign
+        day.staff_needed += sign * shift.min_staff
+        if len(shift.assigned_employees) >= shift.min_staff:
+            day.filled += sign
+        for emp_id in shift.assigned_employees:
+            self._add_assignment(day, shift, emp_id, sign)
+        if not day.shifts:
+            del self._days[shift.date]
+
+    def _add_assignment(self, day, shift, emp_id, sign):
+        """Add or subtract one employee's hours and cost on a shift"""
+        hours = shift.get_duration_hours()
+        day.staff_assigned += sign
+        day.hours += sign * hours
+        day.cost += sign * hours * self._wages.get(emp_id, 0.0)
+        by_date = self._hours_by_employee.setdefault(emp_id, {})
+        by_date[shift.date] = by_date.get(shift.date, 0.0) + sign * hours
+        if abs(by_date[shift.date]) < 1e-9:
+            del by_date[shift.date]
+
+    # EVENTS
+    def _on_shift_added(self, schedule, shift):
+        if schedule.id in self._schedule_ids:
+            self._add_shift(shift, 1)
+
+    def _on_shifts_added(self, schedule, shifts):
+        if schedule.id in self._schedule_ids:
+            for shift in shifts:
+                self._add_shift(shift, 1)
+
+    def _on_assigned(self, shift, employee):
+        if not self._is_tracked(shift):
+            return
+        self._wages[employee.id] = employee.wage
+        self._on_staff_changed(shift, employee.id, 1)
+
+    def _on_unassigned(self, shift, employee_id):
+        if self._is_tracked(shift):
+            self._on_staff_changed(shift, employee_id, -1)
+
+    def _on_staff_changed(self, shift, emp_id, sign):
+        """Update the shift's day after one assignment was made (sign=1) or removed (sign=-1)"""
+        day = self._days.setdefault(shift.date, DaySummary())
+        self._add_assignment(day, shift, emp_id, sign)
+        # The event comes after the change, so the count before it was one less/more
+        was_filled = len(shift.assigned_employees) - sign >= shift.min_staff
+        is_filled = len(shift.assigned_employees) >= shift.min_staff
+        day.filled += is_filled - was_filled
+
+    def _on_wage_changed(self, employee, old_wage, new_wage):
+        self._wages[employee.id] = new_wage
+        for date, hours in self._hours_by_employee.get(employee.id, {}).items():
+            self._days[date].cost += (new_wage - old_wage) * hours
+
+    # QUERIES
+    def get_day(self, date):
+        """
+        Summary for one date
+
+        Returns:
+            DaySummary: The day's totals (all zero if it has no shifts)
+        """
+        return self._days.get(date) or DaySummary()
+
+    def get_range(self, first_day, last_day):
+        """
+        Summaries for every date in a range (inclusive)
+
+        Returns:
+            dict: date -> DaySummary for the dates that have shifts
+        """
+        days = {}
+        day = first_day
+        while day <= last_day:
+            if day in self._days:
+                days[day] = self._days[day]
+            day += timedelta(days=1)
+        return days
+
+    def get_total(self, first_day, last_day):
+        """
+        Totals over a date range (e.g., the month shown in a calendar)
+
+        Returns:
+            DaySummary: The summed totals
+        """
+        total = DaySummary()
+        for day in self.get_range(first_day, last_day).values():
+            total.shifts += day.shifts
+            total.filled += day.filled
+            total.staff_needed += day.staff_needed
+            total.staff_assigned += day.staff_assigned
+            total.hours += day.hours
+            total.cost += day.cost
+        return total
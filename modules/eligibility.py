@@ -0,0 +1,183 @@
+from bisect import bisect_right
+from .events import event_bus, ROLE_CHANGED, AVAILABILITY_CHANGED
+
+# Role key used for managers, who can work any role
+ANY_ROLE = "*"
+
+
+class EligibilityIndex:
+    def __init__(self, employees=None, bus=event_bus):
+        """
+        Precomputed index of which employees can work which shifts
+
+        Availability windows are bucketed by (weekday, role) and sorted by start
+        time, so finding the candidates for a shift only looks at employees who
+        have the right role and an availability window on that day.
+
+        Args:
+            employees (list): Employee objects to index (default empty)
+            bus (EventBus): Event bus used to keep the index up to date
+        """
+        # (day, role) -> sorted list of (start_time, end_time, employee_id)
+        self._windows = {}
+        # employee_id -> list of (day, role) keys the employee appears under
+        self._keys_by_employee = {}
+        # role -> set of employee IDs with that role (managers under ANY_ROLE)
+        self._role_members = {}
+        self._employees = {}
+
+        for employee in employees or []:
+            self.add_employee(employee)
+
+        # Keep the index up to date as the model changes
+        self._bus = bus
+        self._bus.subscribe(AVAILABILITY_CHANGED, self._on_employee_changed)
+        self._bus.subscribe(ROLE_CHANGED, self._on_employee_changed)
+
+    def close(self):
+        """Stop listening for model events"""
+        self._bus.unsubscribe(AVAILABILITY_CHANGED, self._on_employee_changed)
+        self._bus.unsubscribe(ROLE_CHANGED, self._on_employee_changed)
+
+    # EMPLOYEE INDEXING
+    def add_employee(self, employee):
+        """
+        Add (or re-index) an employee
+
+        Args:
+            employee (Employee): Employee to index
+        """
+        if employee.id in self._employees:
+            self.remove_employee(employee.id)
+
+        self._employees[employee.id] = employee
+        role = ANY_ROLE if employee.is_manager else employee.role.lower()
+        self._role_members.setdefault(role, set()).add(employee.id)
+
+        keys = []
+        for day, start_time, end_time in employee.available_days_times:
+            key = (day.lower(), role)
+            windows = self._windows.setdefault(key, [])
+            # Keep each bucket sorted by start time
+            windows.insert(bisect_right(windows, (start_time, end_time, employee.id)),
+                           (start_time, end_time, employee.id))
+            keys.append(key)
+        self._keys_by_employee[employee.id] = keys
+
+    def remove_employee(self, employee_id):
+        """
+        Remove an employee from the index
+
+        Returns:
+            bool: True if the employee was indexed, False otherwise
+        """
+        employee = self._employees.pop(employee_id, None)
+        if employee is None:
+            return False
+
+        for key in self._keys_by_employee.pop(employee_id, []):
+            windows = self._windows.get(key, [])
+            self._windows[key] = [w for w in windows if w[2] != employee_id]
+        for members in self._role_members.values():
+            members.discard(employee_id)
+        return True
+
+    def _on_employee_changed(self, employee, **details):
+        """Re-index an employee whose role or availability changed"""
+        if employee.id in self._employees:
+            self.add_employee(employee)
+
+    def get_remaining_hours(self, employee, shift):
+        """
+        Hours the employee can still work in the week of the shift
+
+        Args:
+            employee (Employee): The employee
+            shift (Shift): The shift being filled
+
+        Returns:
+            float: max_hours minus the hours already scheduled that week
+                   (read from the shift's schedule ledger)
+        """
+        if shift.schedule is None:
+            return employee.max_hours
+        return employee.max_hours - shift.schedule.get_employee_hours(employee.id, shift.date)
+
+    # QUERIES
+    def get_role_members(self, roles):
+        """
+        Get the IDs of employees who can work any of the given roles
+
+        Args:
+            roles (list): Role names (case-insensitive)
+
+        Returns:
+            set: Employee IDs with a matching role, plus all managers
+        """
+        members = set(self._role_members.get(ANY_ROLE, set()))
+        for role in roles:
+            members |= self._role_members.get(role.lower(), set())
+        return members
+
+    def get_available(self, shift):
+        """
+        Get the IDs of employees with a matching role who are available for the whole shift
+        and work at its location
+
+        Unlike get_candidates, weekly hours and existing assignments are not
+        checked, so the result only changes when roles, locations or availability change.
+
+        Args:
+            shift (Shift): The shift to fill
+
+        Returns:
+            set: Employee IDs
+        """
+        day = shift.get_day_name().lower()
+        roles = [role.lower() for role in shift.roles_required] + [ANY_ROLE]
+
+        candidate_ids = set()
+        for role in dict.fromkeys(roles):
+            windows = self._windows.get((day, role), [])
+            # Only windows starting at or before the shift start can cover it
+            last = bisect_right(windows, (shift.start_time, float('inf'), float('inf')))
+            for start_time, end_time, emp_id in windows[:last]:
+                if end_time >= shift.end_time and self._employees[emp_id].works_at(shift.location):
+                    candidate_ids.add(emp_id)
+        return candidate_ids
+
+    def get_employee(self, employee_id):
+        """Get an indexed Employee by ID (None if not indexed)"""
+        return self._employees.get(employee_id)
+
+    def get_candidates(self, shift):
+        """
+        Get employees who can be assigned to a shift, best candidates first
+
+        Candidates have a matching role (or are managers), are available for the
+        whole shift, have enough weekly hours left, are not already assigned
+        to it and, once the shift is in a schedule, break none of the
+        schedule's labor rules (overlaps, rest periods, consecutive days). They
+        are ranked by most remaining weekly hours, then by lowest wage.
+
+        Args:
+            shift (Shift): The shift to fill
+
+        Returns:
+            list: Eligible Employee objects in ranked order
+        """
+        candidate_ids = self.get_available(shift)
+        candidate_ids.difference_update(shift.assigned_employees)
+        duration = shift.get_duration_hours()
+        schedule = shift.schedule
+        ranked = []
+        for emp_id in candidate_ids:
+            employee = self._employees[emp_id]
+            remaining = self.get_remaining_hours(employee, shift)
+            if remaining < duration:
+                continue
+            if schedule is not None and schedule.check_labor_rules(emp_id, shift) is not None:
+                continue
+            ranked.append((-remaining, employee.wage, emp_id, employee))
+        ranked.sort(key=lambda item: item[:3])
+        return [item[3] for item in ranked]
@@ -1,3 +1,6 @@
+from .events import event_bus, WAGE_CHANGED, ROLE_CHANGED, AVAILABILITY_CHANGED
+
+
 class Employee:
     # Class variable to track the next ID (shared by all instances)
     _next_id = 10000
@@ -32,14 +35,46 @@ class Employee:
         self.min_hours = min_hours
         self.is_minor = is_minor
         
-        # Determine manager/admin status based on role
-        self.is_manager = role.lower() in ["manager", "assistant manager"]
-        self.is_admin = role.lower() in ["admin", "owner", "general manager"]
-        
         # Available times: List of tuples (day, start_time, end_time)
         # Example: [("Monday", 900, 1700), ("Tuesday", 1000, 1800)]
         # Times in military format as integers (900 = 9:00 AM, 1700 = 5:00 PM)
         self.available_days_times = []
+        
+        # Locations the employee works at (empty = any location)
+        self.locations = []
+    
+    @property
+    def role(self):
+        """Job role of the employee"""
+        return self._role
+    
+    @role.setter
+    def role(self, new_role):
+        """Set the role, update manager/admin status and emit ROLE_CHANGED"""
+        old_role = getattr(self, '_role', None)
+        self._role = new_role
+        
+        # Determine manager/admin status based on role
+        self.is_manager = new_role.lower() in ["manager", "assistant manager"]
+        self.is_admin = new_role.lower() in ["admin", "owner", "general manager"]
+        
+        # No event while the employee is still being constructed
+        if old_role is not None and old_role != new_role:
+            event_bus.emit(ROLE_CHANGED, employee=self, old_role=old_role, new_role=new_role)
+    
+    @property
+    def wage(self):
+        """Hourly wage of the employee"""
+        return self._wage
+    
+    @wage.setter
+    def wage(self, new_wage):
+        """Set the hourly wage and emit WAGE_CHANGED"""
+        old_wage = getattr(self, '_wage', None)
+        self._wage = new_wage
+        
+        if old_wage is not None and old_wage != new_wage:
+            event_bus.emit(WAGE_CHANGED, employee=self, old_wage=old_wage, new_wage=new_wage)
     
     def add_availability(self, day, start_time, end_time):
         """
@@ -51,6 +86,38 @@ class Employee:
             end_time (int): End time in military format (e.g., 1700 for 5:00 PM)
         """
         self.available_days_times.append((day, start_time, end_time))
+        event_bus.emit(AVAILABILITY_CHANGED, employee=self)
+    
+    def clear_availability(self):
+        """Remove all available time slots for the employee"""
+        self.available_days_times = []
+        event_bus.emit(AVAILABILITY_CHANGED, employee=self)
+    
+    def set_locations(self, locations):
+        """
+        Set the locations the employee can work at
+        
+        Emits AVAILABILITY_CHANGED, since it changes which shifts the employee can work.
+        
+        Args:
+            locations (list): Location names (empty for any location)
+        """
+        self.locations = [location.strip() for location in locations if location and location.strip()]
+        event_bus.emit(AVAILABILITY_CHANGED, employee=self)
+    
+    def works_at(self, location):
+        """
+        Check if the employee can work at a location
+        
+        Args:
+            location (str): Location name (case-insensitive)
+            
+        Returns:
+            bool: True if the employee has no locations set or the location is one of them
+        """
+        if not self.locations:
+            return True
+        return location.lower() in [loc.lower() for loc in self.locations]
     
     def is_available(self, day, start_time, end_time):
         """
@@ -85,7 +152,8 @@ class Employee:
             'is_minor': self.is_minor,
             'is_manager': self.is_manager,
             'is_admin': self.is_admin,
-            'available_days_times': self.available_days_times
+            'available_days_times': self.available_days_times,
+            'locations': self.locations
         }
     
     @classmethod
@@ -107,6 +175,7 @@ class Employee:
         # Override the auto-generated ID with the saved one
         employee.id = data['id']
         employee.available_days_times = data.get('available_days_times', [])
+        employee.locations = data.get('locations', [])
     
         return employee
     
@@ -0,0 +1,68 @@
+"""
+Event bus shared by the model layer and the GUI
+
+Employee, Shift and Schedule emit small change events here whenever their
+state changes. Views and caches subscribe to the events they care about and
+update only what is affected instead of rebuilding everything.
+"""
+
+# Event types
+SHIFT_ADDED = "shift_added"                    # schedule, shift
+SHIFTS_ADDED = "shifts_added"                  # schedule, shifts (bulk add, one event)
+EMPLOYEE_ASSIGNED = "employee_assigned"        # shift, employee
+EMPLOYEE_UNASSIGNED = "employee_unassigned"    # shift, employee_id
+WAGE_CHANGED = "wage_changed"                  # employee, old_wage, new_wage
+ROLE_CHANGED = "role_changed"                  # employee, old_role, new_role
+AVAILABILITY_CHANGED = "availability_changed"  # employee
+
+
+class EventBus:
+    def __init__(self):
+        """Initialize an empty event bus"""
+        # Dictionary of event type -> list of callbacks
+        self._subscribers = {}
+
+    def subscribe(self, event_type, callback):
+        """
+        Register a callback for an event type
+
+        Args:
+            event_type (str): One of the event type constants (e.g., EMPLOYEE_ASSIGNED)
+            callback (callable): Called with the event's keyword arguments
+        """
+        callbacks = self._subscribers.setdefault(event_type, [])
+        if callback not in callbacks:
+            callbacks.append(callback)
+
+    def unsubscribe(self, event_type, callback):
+        """
+        Remove a previously registered callback
+
+        Returns:
+            bool: True if the callback was removed, False if it was not subscribed
+        """
+        callbacks = self._subscribers.get(event_type, [])
+        if callback in callbacks:
+            callbacks.remove(callback)
+            return True
+        return False
+
+    def emit(self, event_type, **data):
+        """
+        Notify every subscriber of an event
+
+        Args:
+            event_type (str): The event type being emitted
+            **data: Event details passed to each callback as keyword arguments
+        """
+        # Copy the list so callbacks can unsubscribe while being notified
+        for callback in list(self._subscribers.get(event_type, [])):
+            callback(**data)
+
+    def clear(self):
+        """Remove all subscribers (useful between tests)"""
+        self._subscribers = {}
+
+
+# Shared bus used by Employee, Shift and Schedule
+event_bus = EventBus()
@@ -0,0 +1,206 @@
+"""
+Streaming CSV and printable HTML export of schedules and payroll
+
+Every exporter is a generator that walks the schedules one day at a time and
+yields rows (or chunks of HTML) as it goes, and the writers send each one
+straight to the file. Nothing builds the whole document, so exporting a year
+of schedules - even from a generator such as WorkloadGenerator.iter_schedules -
+uses about as much memory as exporting one week.
+
+The HTML layout puts each week on its own printed page; open it in a browser
+and print (or "Save as PDF") to get the PDF.
+"""
+
+import csv
+import os
+from datetime import timedelta
+from html import escape
+
+from .payroll import PayrollEngine
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+SHIFT_COLUMNS = ['schedule_id', 'shift_id', 'date', 'day', 'start_time', 'end_time', 'hours', 'location',
+                 'roles', 'min_staff', 'max_staff', 'assigned', 'employees', 'open', 'cost']
+
+EMPLOYEE_COLUMNS = ['schedule_id', 'period_start', 'period_end', 'employee_id', 'name', 'role', 'wage',
+                    'shifts', 'regular_hours', 'overtime_hours', 'holiday_hours', 'regular_pay',
+                    'overtime_pay', 'total_pay']
+
+PRINT_STYLE = """
+body { font-family: Arial, sans-serif; font-size: 10pt; }
+section.week { page-break-after: always; }
+section.week:last-of-type { page-break-after: auto; }
+table { width: 100%; border-collapse: collapse; table-layout: fixed; }
+th, td { border: 1px solid #999; padding: 4px; vertical-align: top; }
+th { background: #eee; }
+.shift { margin-bottom: 6px; }
+.open { color: #b00; font-weight: bold; }
+@page { size: landscape; margin: 1cm; }
+"""
+
+
+def iter_days(schedule):
+    """
+    Walk a schedule one day at a time
+
+    Yields:
+        tuple: (date, shifts on that date ordered by start time), for every day of the schedule
+    """
+    day = schedule.start_date
+    while day <= schedule.end_date:
+        yield day, sorted(schedule.get_shifts_by_date(day), key=lambda shift: (shift.start_time, shift.id))
+        day += timedelta(days=1)
+
+
+def iter_shift_rows(schedules, employees_list):
+    """
+    One CSV row per shift, in date order within each schedule
+
+    Args:
+        schedules (iterable): Schedule objects (a generator is read one schedule at a time)
+        employees_list (list): List of all Employee objects (for names and wages)
+
+    Yields:
+        list: The SHIFT_COLUMNS header, then one row per shift
+    """
+    employees_by_id = {employee.id: employee for employee in employees_list}
+    yield SHIFT_COLUMNS
+    for schedule in schedules:
+        for day, shifts in iter_days(schedule):
+            for shift in shifts:
+                hours = shift.get_duration_hours()
+                assigned = [employees_by_id[emp_id] for emp_id in shift.assigned_employees
+                            if emp_id in employees_by_id]
+                yield [schedule.id, shift.id, day.isoformat(), DAYS[day.weekday()],
+                       f"{shift.start_time:04d}", f"{shift.end_time:04d}", round(hours, 2), shift.location,
+                       ";".join(shift.roles_required), shift.min_staff, shift.max_staff,
+                       len(shift.assigned_employees), ";".join(emp.name for emp in assigned),
+                       max(0, shift.min_staff - len(shift.assigned_employees)),
+                       f"{sum(emp.wage * hours for emp in assigned):.2f}"]
+
+
+def iter_employee_rows(schedules, employees_list, rules=None):
+    """
+    One CSV row per employee per schedule with their payroll breakdown
+
+    Each schedule is run through the PayrollEngine on its own, so overtime
+    and holiday pay match the Payroll Breakdown dialog.
+
+    Args:
+        schedules (iterable): Schedule objects (a generator is read one schedule at a time)
+        employees_list (list): List of all Employee objects
+        rules (PayrollRules): Pay rules (default PayrollRules())
+
+    Yields:
+        list: The EMPLOYEE_COLUMNS header, then one row per employee who worked in each schedule
+    """
+    engine = PayrollEngine(rules)
+    yield EMPLOYEE_COLUMNS
+    for schedule in schedules:
+        report = engine.calculate(schedule, employees_list)
+        for breakdown in sorted(report.breakdowns, key=lambda b: (b.employee.name.lower(), b.employee.id)):
+            employee = breakdown.employee
+            yield [schedule.id, schedule.start_date.isoformat(), schedule.end_date.isoformat(),
+                   employee.id, employee.name, employee.role, f"{employee.wage:.2f}", breakdown.shift_count,
+                   round(breakdown.regular_hours, 2), round(breakdown.overtime_hours, 2),
+                   round(breakdown.holiday_hours, 2), f"{breakdown.regular_pay:.2f}",
+                   f"{breakdown.overtime_pay:.2f}", f"{breakdown.total_pay:.2f}"]
+
+
+def iter_week_html(schedules, employees_list, title="Schedule"):
+    """
+    Printable HTML with one page per schedule week (Monday to Sunday)
+
+    Args:
+        schedules (iterable): Schedule objects (a generator is read one schedule at a time)
+        employees_list (list): List of all Employee objects (for names and wages)
+        title (str): Document title
+
+    Yields:
+        str: Chunks of the HTML document, about one week at a time
+    """
+    employees_by_id = {employee.id: employee for employee in employees_list}
+    yield (f"<!DOCTYPE html>\n<html>\n<head>\n<meta charset=\"utf-8\">\n<title>{escape(title)}</title>\n"
+           f"<style>{PRINT_STYLE}</style>\n</head>\n<body>\n")
+    for schedule in schedules:
+        location = f" - {escape(schedule.location)}" if schedule.location else ""
+        days = iter_days(schedule)
+        for week_start in schedule.get_week_starts():
+            cells = []
+            hours = cost = 0.0
+            open_slots = 0
+            for offset in range(7):
+                day = week_start + timedelta(days=offset)
+                if not schedule.start_date <= day <= schedule.end_date:
+                    cells.append("<td></td>")
+                    continue
+                _, shifts = next(days)
+                lines = []
+                for shift in shifts:
+                    duration = shift.get_duration_hours()
+                    names = []
+                    for emp_id in shift.assigned_employees:
+                        employee = employees_by_id.get(emp_id)
+                        if employee:
+                            names.append(escape(employee.name))
+                            hours += duration
+                            cost += employee.wage * duration
+                    missing = max(0, shift.min_staff - len(shift.assigned_employees))
+                    open_slots += missing
+                    if missing:
+                        names.append(f"<span class=\"open\">{missing} open</span>")
+                    lines.append(f"<div class=\"shift\"><b>{shift.format_time(shift.start_time)} - "
+                                 f"{shift.format_time(shift.end_time)}</b> "
+                                 f"{escape(', '.join(shift.roles_required))}<br>{', '.join(names)}</div>")
+                cells.append(f"<td>{''.join(lines)}</td>")
+
+            header = "".join(f"<th>{DAYS[offset]}<br>{week_start + timedelta(days=offset)}</th>"
+                             for offset in range(7))
+            yield (f"<section class=\"week\">\n<h2>{escape(title)}: Week of {week_start}{location}</h2>\n"
+                   f"<table>\n<tr>{header}</tr>\n<tr>{''.join(cells)}</tr>\n</table>\n"
+                   f"<p>Assigned hours: {hours:.1f} &middot; Labor cost: ${cost:.2f} &middot; "
+                   f"Open slots: {open_slots}</p>\n</section>\n")
+    yield "</body>\n</html>\n"
+
+
+def _make_parent_dir(path):
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+
+
+def write_csv(path, rows):
+    """
+    Write rows to a CSV file as they are produced
+
+    Args:
+        path (str): File to write
+        rows (iterable): Rows, header first (e.g., from iter_shift_rows)
+
+    Returns:
+        int: Number of rows written after the header
+    """
+    _make_parent_dir(path)
+    count = -1
+    with open(path, 'w', newline='', encoding='utf-8') as file:
+        writer = csv.writer(file)
+        for row in rows:
+            writer.writerow(row)
+            count += 1
+    return max(count, 0)
+
+
+def write_html(path, chunks):
+    """
+    Write HTML chunks (e.g., from iter_week_html) to a file as they are produced
+
+    Returns:
+        int: Number of characters written
+    """
+    _make_parent_dir(path)
+    size = 0
+    with open(path, 'w', encoding='utf-8') as file:
+        for chunk in chunks:
+            size += file.write(chunk)
+    return size
@@ -0,0 +1,98 @@
+import heapq
+from .eligibility import ANY_ROLE
+
+
+def gini_coefficient(values):
+    """
+    Gini coefficient of a list of values (0 = perfectly even, towards 1 = concentrated)
+
+    Args:
+        values (list): Non-negative numbers, e.g. hours per employee
+
+    Returns:
+        float: The coefficient (0.0 for an empty list or all zeros)
+    """
+    values = sorted(values)
+    total = sum(values)
+    if not values or total <= 0:
+        return 0.0
+    n = len(values)
+    weighted = sum(rank * value for rank, value in enumerate(values, start=1))
+    return (2.0 * weighted) / (n * total) - (n + 1.0) / n
+
+
+class HoursQueue:
+    def __init__(self, employees, get_hours, weeks=1):
+        """
+        Employees ordered by hours assigned so far, fewest first, per role
+
+        Each role has a heap of (priority, employee_id). Changing an employee's
+        hours pushes a new entry in O(log n); the old entry is left in place
+        and skipped when it reaches the top (its priority no longer matches).
+
+        Priorities are (reached min_hours, share of max_hours used): employees
+        still short of their minimum come first, then the least utilized. Using
+        the share rather than raw hours keeps part-timers who are already at
+        their max from sitting at the front of the queue.
+
+        Args:
+            employees (list): Employee objects to queue
+            get_hours (callable): employee_id -> hours assigned so far
+            weeks (int): Weeks the hours cover (min_hours is per week)
+        """
+        self._get_hours = get_hours
+        self._weeks = weeks
+        self._employees = {}
+        # role -> heap of ((reached_min, utilization), employee_id)
+        self._heaps = {}
+        # employee_id -> current priority
+        self._priorities = {}
+        for employee in employees:
+            self._employees[employee.id] = employee
+            self.update(employee.id)
+
+    def __len__(self):
+        return len(self._priorities)
+
+    def _get_role(self, employee):
+        """Heap an employee belongs to (managers can work any role)"""
+        return ANY_ROLE if employee.is_manager else employee.role.lower()
+
+    def update(self, employee_id):
+        """Re-queue an employee after their hours changed"""
+        employee = self._employees[employee_id]
+        hours = self._get_hours(employee_id)
+        utilization = hours / (employee.max_hours * self._weeks) if employee.max_hours else 1.0
+        priority = (hours >= employee.min_hours * self._weeks, utilization)
+        self._priorities[employee_id] = priority
+        heapq.heappush(self._heaps.setdefault(self._get_role(employee), []), (priority, employee_id))
+
+    def pop(self, roles):
+        """
+        Remove and return the employee with the lowest priority for any of the roles
+
+        Use push_back() to return employees that weren't used.
+
+        Args:
+            roles (list): Role names (managers are always included)
+
+        Returns:
+            Employee: The employee, or None if the queues are empty
+        """
+        heaps = [self._heaps[role] for role in {role.lower() for role in roles} | {ANY_ROLE}
+                 if role in self._heaps]
+        # Drop stale entries so every heap top is current
+        for heap in heaps:
+            while heap and self._priorities.get(heap[0][1]) != heap[0][0]:
+                heapq.heappop(heap)
+        heaps = [heap for heap in heaps if heap]
+        if not heaps:
+            return None
+        priority, employee_id = heapq.heappop(min(heaps, key=lambda heap: heap[0]))
+        del self._priorities[employee_id]
+        return self._employees[employee_id]
+
+    def push_back(self, employees):
+        """Return popped employees to the queue with their current hours"""
+        for employee in employees:
+            self.update(employee.id)
@@ -0,0 +1,286 @@
+"""
+Personal iCalendar (.ics) schedule feeds for employees
+
+The FeedIndex keeps each employee's assigned shifts (employee -> shifts) up
+to date from model events and remembers whose shifts changed. publish()
+writes one .ics file per employee to a local directory, regenerating only
+the feeds of those employees; everyone else's file is left untouched, so
+publishing a week's changes rewrites a handful of feeds instead of all of them.
+A content hash of every feed is kept in the directory's feeds.json, so after
+a restart only the feeds that differ from the files on disk are rewritten.
+
+Employees can subscribe to their file (e.g., served from a shared folder or
+web server) in any calendar app.
+"""
+
+import hashlib
+import json
+import os
+from datetime import datetime, timedelta, timezone
+
+from .events import event_bus, SHIFT_ADDED, SHIFTS_ADDED, EMPLOYEE_ASSIGNED, EMPLOYEE_UNASSIGNED
+from .timeline import get_shift_interval, MINUTES_PER_DAY
+
+FEEDS_DIR = 'data/feeds'
+MANIFEST_FILE = 'feeds.json'
+PRODUCT_ID = '-//Chronos//Employee Schedule//EN'
+
+
+def get_feed_file(directory, employee_id):
+    """Path of an employee's feed in a directory"""
+    return os.path.join(directory, f"employee_{employee_id}.ics")
+
+
+def get_content_hash(feed):
+    """Hash of a feed's content, leaving out the DTSTAMP lines that change every time it is built"""
+    lines = [line for line in feed.split('\r\n') if not line.startswith('DTSTAMP:')]
+    return hashlib.sha256('\r\n'.join(lines).encode('utf-8')).hexdigest()
+
+
+def escape_text(text):
+    """Escape a TEXT value (RFC 5545 section 3.3.11)"""
+    return (str(text).replace('\\', '\\\\').replace(';', '\\;').replace(',', '\\,')
+            .replace('\r\n', '\\n').replace('\n', '\\n'))
+
+
+def fold_line(line):
+    """Split a content line into 75-octet pieces (RFC 5545 section 3.1)"""
+    encoded = line.encode('utf-8')
+    if len(encoded) <= 75:
+        return line
+    pieces = []
+    limit = 75
+    while encoded:
+        cut = min(limit, len(encoded))
+        # Don't split a multi-byte character
+        while cut < len(encoded) and (encoded[cut] & 0xC0) == 0x80:
+            cut -= 1
+        pieces.append(encoded[:cut].decode('utf-8'))
+        encoded = encoded[cut:]
+        limit = 74  # Continuation lines start with a space
+    return '\r\n '.join(pieces)
+
+
+def _format_minutes(minutes):
+    """Absolute minutes (see timeline.get_shift_interval) -> local date-time value"""
+    day = datetime.fromordinal(minutes // MINUTES_PER_DAY) + timedelta(minutes=minutes % MINUTES_PER_DAY)
+    return day.strftime("%Y%m%dT%H%M%S")
+
+
+def build_feed(employee, shifts, stamp=None):
+    """
+    iCalendar text of an employee's shifts
+
+    Times are written as local (floating) times, the way the schedules show them.
+
+    Args:
+        employee (Employee): The employee
+        shifts (iterable): Their assigned shifts
+        stamp (datetime): Time the feed is generated (default: now, UTC)
+
+    Returns:
+        str: The calendar, with CRLF line endings
+    """
+    stamp = (stamp or datetime.now(timezone.utc)).strftime("%Y%m%dT%H%M%SZ")
+    lines = ['BEGIN:VCALENDAR', 'VERSION:2.0', f'PRODID:{PRODUCT_ID}', 'CALSCALE:GREGORIAN',
+             'METHOD:PUBLISH', f'X-WR-CALNAME:{escape_text(employee.name)} - Shifts']
+    for shift in sorted(shifts, key=lambda s: (s.date, s.start_time, s.id)):
+        start, end = get_shift_interval(shift)
+        roles = ", ".join(role.title() for role in shift.roles_required) or "Shift"
+        lines.extend([
+            'BEGIN:VEVENT',
+            f'UID:shift-{shift.id}-employee-{employee.id}@chronos',
+            f'DTSTAMP:{stamp}',
+            f'DTSTART:{_format_minutes(start)}',
+            f'DTEND:{_format_minutes(end)}',
+            f'SUMMARY:{escape_text(roles)} shift',
+            f'LOCATION:{escape_text(shift.location or "")}',
+            f'DESCRIPTION:{escape_text(f"{shift.format_time(shift.start_time)} - {shift.format_time(shift.end_time)}")}',
+            'END:VEVENT',
+        ])
+    lines.append('END:VCALENDAR')
+    return '\r\n'.join(fold_line(line) for line in lines) + '\r\n'
+
+
+class FeedIndex:
+    def __init__(self, directory=FEEDS_DIR, schedules=None, bus=event_bus):
+        """
+        Per-employee shift index that publishes .ics feeds incrementally
+
+        The first publish() checks every employee's feed against the content
+        hashes saved in the directory and rewrites only those that differ (all
+        of them in a new directory); after that only the feeds of employees
+        whose shifts changed are checked.
+
+        Args:
+            directory (str): Directory the feeds are written to
+            schedules (list): Schedule objects to include (more can be added with add_schedule)
+            bus (EventBus): Event bus used to keep the index up to date
+        """
+        self.directory = directory
+        # employee_id -> {shift_id: shift}
+        self._shifts_by_employee = {}
+        # IDs of the schedules included
+        self._schedule_ids = set()
+        # Employees whose feed is out of date, and employees whose feed was checked by this index
+        self._changed = set()
+        self._published = set()
+        # employee_id -> content hash of the feed on disk (saved in the directory's feeds.json)
+        self._hashes = self._load_manifest()
+
+        for schedule in schedules or []:
+            self.add_schedule(schedule)
+
+        self._bus = bus
+        self._bus.subscribe(SHIFT_ADDED, self._on_shift_added)
+        self._bus.subscribe(SHIFTS_ADDED, self._on_shifts_added)
+        self._bus.subscribe(EMPLOYEE_ASSIGNED, self._on_assigned)
+        self._bus.subscribe(EMPLOYEE_UNASSIGNED, self._on_unassigned)
+
+    def close(self):
+        """Stop listening for model events"""
+        self._bus.unsubscribe(SHIFT_ADDED, self._on_shift_added)
+        self._bus.unsubscribe(SHIFTS_ADDED, self._on_shifts_added)
+        self._bus.unsubscribe(EMPLOYEE_ASSIGNED, self._on_assigned)
+        self._bus.unsubscribe(EMPLOYEE_UNASSIGNED, self._on_unassigned)
+
+    # SCHEDULES
+    def add_schedule(self, schedule):
+        """Include a schedule's shifts in the feeds"""
+        if schedule.id in self._schedule_ids:
+            return
+        self._schedule_ids.add(schedule.id)
+        for shift in schedule.get_all_shifts():
+            self._add_shift(shift)
+
+    def remove_schedule(self, schedule):
+        """
+        Take a schedule's shifts out of the feeds (e.g., when it is deleted)
+
+        Returns:
+            bool: True if the schedule was included, False otherwise
+        """
+        if schedule.id not in self._schedule_ids:
+            return False
+        self._schedule_ids.discard(schedule.id)
+        for shift in schedule.get_all_shifts():
+            for emp_id in shift.assigned_employees:
+                self._remove(emp_id, shift.id)
+        return True
+
+    def _add_shift(self, shift):
+        for emp_id in shift.assigned_employees:
+            self._shifts_by_employee.setdefault(emp_id, {})[shift.id] = shift
+            self._changed.add(emp_id)
+
+    def _remove(self, emp_id, shift_id):
+        shifts = self._shifts_by_employee.get(emp_id, {})
+        if shifts.pop(shift_id, None) is not None:
+            self._changed.add(emp_id)
+            if not shifts:
+                del self._shifts_by_employee[emp_id]
+
+    def mark_changed(self, employee_id):
+        """Regenerate an employee's feed on the next publish (e.g., after their name or a shift's times change)"""
+        self._changed.add(employee_id)
+
+    # EVENTS
+    def _on_shift_added(self, schedule, shift):
+        if schedule.id in self._schedule_ids:
+            self._add_shift(shift)
+
+    def _on_shifts_added(self, schedule, shifts):
+        if schedule.id in self._schedule_ids:
+            for shift in shifts:
+                self._add_shift(shift)
+
+    def _on_assigned(self, shift, employee):
+        if shift.schedule is not None and shift.schedule.id in self._schedule_ids:
+            self._shifts_by_employee.setdefault(employee.id, {})[shift.id] = shift
+            self._changed.add(employee.id)
+
+    def _on_unassigned(self, shift, employee_id):
+        self._remove(employee_id, shift.id)
+
+    # QUERIES
+    def get_shifts(self, employee_id):
+        """
+        An employee's assigned shifts in the included schedules
+
+        Returns:
+            list: Shifts in date order
+        """
+        return sorted(self._shifts_by_employee.get(employee_id, {}).values(),
+                      key=lambda s: (s.date, s.start_time, s.id))
+
+    def get_changed(self):
+        """IDs of the employees whose feeds publish() would rebuild (besides ones not checked yet)"""
+        return set(self._changed)
+
+    # PUBLISHING
+    def publish(self, employees_list, stamp=None):
+        """
+        Write the feeds that are out of date
+
+        Employees who changed or were not checked yet get a new feed unless
+        it has the same content as the file already on disk; employees who
+        are no longer in employees_list have their feed deleted.
+
+        Args:
+            employees_list (list): List of all Employee objects
+            stamp (datetime): Generation time written to the feeds (default: now)
+
+        Returns:
+            tuple: (feeds written, feeds deleted)
+        """
+        if not os.path.exists(self.directory):
+            os.makedirs(self.directory)
+
+        employee_ids = set()
+        written = 0
+        for employee in employees_list:
+            employee_ids.add(employee.id)
+            if employee.id not in self._changed and employee.id in self._published:
+                continue
+            self._published.add(employee.id)
+            feed = build_feed(employee, self.get_shifts(employee.id), stamp)
+            content_hash = get_content_hash(feed)
+            path = get_feed_file(self.directory, employee.id)
+            if self._hashes.get(employee.id) == content_hash and os.path.exists(path):
+                continue  # Same shifts as the feed subscribers already have
+            temp_path = path + '.tmp'
+            with open(temp_path, 'w', encoding='utf-8', newline='') as file:
+                file.write(feed)
+            os.replace(temp_path, path)  # Subscribers never see a half-written feed
+            self._hashes[employee.id] = content_hash
+            written += 1
+
+        deleted = 0
+        for emp_id in (self._changed | self._published | set(self._hashes)) - employee_ids:
+            path = get_feed_file(self.directory, emp_id)
+            if os.path.exists(path):
+                os.remove(path)
+                deleted += 1
+            self._published.discard(emp_id)
+            self._hashes.pop(emp_id, None)
+
+        if written or deleted:
+            self._save_manifest()
+        self._changed = set()
+        return written, deleted
+
+    def _load_manifest(self):
+        """Content hashes of the feeds already in the directory (empty if there are none)"""
+        try:
+            with open(os.path.join(self.directory, MANIFEST_FILE), 'r') as file:
+                return {int(emp_id): content_hash for emp_id, content_hash in json.load(file).items()}
+        except (OSError, ValueError, AttributeError):
+            return {}
+
+    def _save_manifest(self):
+        """Write the content hashes next to the feeds"""
+        path = os.path.join(self.directory, MANIFEST_FILE)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump({str(emp_id): content_hash for emp_id, content_hash in self._hashes.items()}, file)
+        os.replace(temp_path, path)
@@ -0,0 +1,250 @@
+import argparse
+import random
+from datetime import date, datetime, timedelta
+
+from .employee import Employee
+from .shift import Shift
+from .schedule import Schedule
+from . import storage
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Share of employees (and shifts) per role, by industry
+ROLE_MIXES = {
+    'restaurant': {'server': 0.45, 'cook': 0.3, 'host': 0.15, 'manager': 0.1},
+    'hospital': {'nurse': 0.55, 'technician': 0.2, 'doctor': 0.15, 'manager': 0.1},
+    'factory': {'operator': 0.6, 'technician': 0.2, 'forklift driver': 0.12, 'manager': 0.08},
+}
+
+# (mean, standard deviation) of the hourly wage per role
+WAGES = {
+    'server': (15.0, 2.0), 'cook': (19.0, 2.5), 'host': (14.5, 1.5),
+    'nurse': (42.0, 6.0), 'technician': (28.0, 4.0), 'doctor': (95.0, 15.0),
+    'operator': (21.0, 3.0), 'forklift driver': (22.5, 2.5), 'manager': (32.0, 5.0),
+}
+DEFAULT_WAGE = (18.0, 3.0)
+MINIMUM_WAGE = 7.25
+
+# Availability patterns: weight and the (days, start, end) windows they produce
+AVAILABILITY_PATTERNS = {
+    'full_time': (0.45, [(DAYS, 600, 2300)]),
+    'weekdays': (0.2, [(DAYS[:5], 700, 1900)]),
+    'evenings': (0.15, [(DAYS, 1400, 2300)]),
+    'weekends': (0.1, [(DAYS[4:], 800, 2300)]),
+    'mornings': (0.1, [(DAYS, 600, 1500)]),
+}
+# Minors can only work after school on weekdays and during the day on weekends
+MINOR_AVAILABILITY = [(DAYS[:5], 1500, 2100), (DAYS[5:], 900, 2100)]
+
+# Shift start/end times used when generating schedules
+SHIFT_TIMES = [(600, 1400), (900, 1500), (1000, 1800), (1400, 2200), (1700, 2300)]
+
+
+class WorkloadGenerator:
+    def __init__(self, seed=None):
+        """
+        Seeded generator of realistic employees and schedules for load testing
+
+        The same seed always produces the same data, so benchmark runs can be
+        compared with each other.
+
+        Args:
+            seed (int): Random seed (default None for a random run)
+        """
+        self.rng = random.Random(seed)
+
+    def generate_employees(self, count, role_mix='restaurant', minor_rate=0.05, days_off=1):
+        """
+        Generate a population of employees
+
+        Args:
+            count (int): Number of employees
+            role_mix (str or dict): Industry preset from ROLE_MIXES or a dict of role -> share
+            minor_rate (float): Share of employees who are minors (default 0.05)
+            days_off (int): Days each employee drops from their availability pattern (default 1)
+
+        Returns:
+            list: List of Employee objects
+        """
+        roles, weights = self._role_weights(role_mix)
+        patterns = list(AVAILABILITY_PATTERNS.values())
+        pattern_weights = [weight for weight, windows in patterns]
+
+        employees = []
+        for i in range(count):
+            role = self.rng.choices(roles, weights)[0]
+            is_minor = role != 'manager' and self.rng.random() < minor_rate
+            mean, deviation = WAGES.get(role, DEFAULT_WAGE)
+            wage = round(max(MINIMUM_WAGE, self.rng.gauss(mean, deviation)), 2)
+
+            if is_minor:
+                max_hours, min_hours = 20, 0
+                windows = MINOR_AVAILABILITY
+            else:
+                max_hours = self.rng.choice([24, 32, 40, 40, 40, 48])
+                min_hours = self.rng.choice([0, 0, 8, 16])
+                windows = self.rng.choices(patterns, pattern_weights)[0][1]
+
+            employee = Employee(f"Employee {i + 1}", f"555-{i % 10000:04d}",
+                                f"employee{i + 1}@example.com", role, wage,
+                                max_hours=max_hours, min_hours=min_hours, is_minor=is_minor)
+
+            # Everyone takes a random day or two off their pattern
+            all_days = [day for days, start, end in windows for day in days]
+            off = set(self.rng.sample(all_days, min(days_off, len(all_days) - 1)))
+            # Set directly to avoid an AVAILABILITY_CHANGED event per slot
+            employee.available_days_times = [(day, start, end) for days, start, end in windows
+                                             for day in days if day not in off]
+            employees.append(employee)
+        return employees
+
+    def iter_schedules(self, employees, weeks, start_date=None, locations=None,
+                       shifts_per_day=20, fill_rate=0.8, role_mix=None):
+        """
+        Generate weekly schedules one at a time
+
+        Schedules are yielded as they are built so a long run can be streamed
+        straight to disk (see storage.save_data) without holding every week in memory.
+
+        Args:
+            employees (list): Employees to assign (from generate_employees)
+            weeks (int): Number of weekly schedules
+            start_date (date or str): First Monday (default: the Monday of this week)
+            locations (list): Location names (default ["Main"])
+            shifts_per_day (int): Shifts per location per day
+            fill_rate (float): Share of shifts to assign an employee to (0.0 - 1.0)
+            role_mix (str or dict): Mix of roles required by shifts (default: the employees' own mix)
+
+        Yields:
+            Schedule: One schedule per week
+        """
+        if start_date is None:
+            today = date.today()
+            start_date = today - timedelta(days=today.weekday())
+        elif isinstance(start_date, str):
+            start_date = datetime.strptime(start_date, "%Y-%m-%d").date()
+        locations = locations or ["Main"]
+
+        if role_mix is None:
+            role_counts = {}
+            for employee in employees:
+                role_counts[employee.role] = role_counts.get(employee.role, 0) + 1
+            role_mix = role_counts
+        roles, weights = self._role_weights(role_mix)
+
+        for week in range(weeks):
+            monday = start_date + timedelta(weeks=week)
+            schedule = Schedule(monday, monday + timedelta(days=6))
+            shifts = []
+            for day_offset in range(7):
+                shift_date = monday + timedelta(days=day_offset)
+                for location in locations:
+                    for i in range(shifts_per_day):
+                        start_time, end_time = self.rng.choice(SHIFT_TIMES)
+                        role = self.rng.choices(roles, weights)[0]
+                        shifts.append(Shift(shift_date, start_time, end_time, [role], location=location))
+            schedule.add_shifts(shifts)
+
+            for shift, employee in self.plan_assignments(schedule, employees, fill_rate):
+                try:
+                    shift.assign_employee(employee)
+                    shift.update_filled_status([employee])
+                except ValueError:
+                    pass  # Breaks a labor rule (weekly hours, rest or consecutive days)
+            yield schedule
+
+    def generate_schedules(self, employees, weeks, **options):
+        """
+        Generate weekly schedules as a list (see iter_schedules for the options)
+
+        Returns:
+            list: List of Schedule objects
+        """
+        return list(self.iter_schedules(employees, weeks, **options))
+
+    def plan_assignments(self, schedule, employees, fill_rate=1.0):
+        """
+        Pick an employee for a share of the schedule's unassigned shifts
+
+        Employees are taken round-robin per role, working at most one shift per
+        day and staying within max_hours. Nothing is assigned; the returned pairs
+        can be passed to Shift.assign_employee (e.g., to time assignment alone).
+
+        Args:
+            schedule (Schedule): Schedule with shifts to fill
+            employees (list): Employees to choose from
+            fill_rate (float): Share of shifts to plan an assignment for
+
+        Returns:
+            list: List of (shift, employee) pairs
+        """
+        pools = {}
+        for employee in employees:
+            pools.setdefault(employee.role.lower(), []).append(employee)
+        cursor = {role: 0 for role in pools}
+        planned_hours = {}
+        working = set()  # (employee_id, date) pairs already planned
+
+        plan = []
+        for shift in schedule.get_all_shifts():
+            if shift.assigned_employees or self.rng.random() >= fill_rate:
+                continue
+            role = shift.roles_required[0].lower() if shift.roles_required else None
+            pool = pools.get(role, [])
+            day_name = shift.get_day_name()
+            hours = shift.get_duration_hours()
+            for _ in range(len(pool)):
+                employee = pool[cursor[role] % len(pool)]
+                cursor[role] += 1
+                if ((employee.id, shift.date) in working or
+                        planned_hours.get(employee.id, 0.0) + hours > employee.max_hours or
+                        not employee.is_available(day_name, shift.start_time, shift.end_time)):
+                    continue
+                working.add((employee.id, shift.date))
+                planned_hours[employee.id] = planned_hours.get(employee.id, 0.0) + hours
+                plan.append((shift, employee))
+                break
+        return plan
+
+    def _role_weights(self, role_mix):
+        """Turn a preset name or role -> share dict into parallel role and weight lists"""
+        if isinstance(role_mix, str):
+            if role_mix not in ROLE_MIXES:
+                raise ValueError(f"Unknown role mix: {role_mix}")
+            role_mix = ROLE_MIXES[role_mix]
+        if not role_mix:
+            raise ValueError("Role mix cannot be empty")
+        roles = sorted(role_mix)
+        return roles, [role_mix[role] for role in roles]
+
+
+def main():
+    """
+    Write a generated dataset in the normal data file format
+
+    Usage:
+        python -m modules.generator --employees 500 --weeks 52 --output data/load_test.json
+    """
+    parser = argparse.ArgumentParser(description="Generate a synthetic Chronos dataset")
+    parser.add_argument('--employees', type=int, default=500)
+    parser.add_argument('--weeks', type=int, default=4)
+    parser.add_argument('--industry', choices=list(ROLE_MIXES), default='restaurant')
+    parser.add_argument('--locations', nargs='+', default=["Main"])
+    parser.add_argument('--shifts-per-day', type=int, default=40)
+    parser.add_argument('--fill-rate', type=float, default=0.8)
+    parser.add_argument('--seed', type=int, default=42)
+    parser.add_argument('--start-date', help="First Monday (YYYY-MM-DD), default this week")
+    parser.add_argument('--output', default=storage.DATA_FILE)
+    args = parser.parse_args()
+
+    generator = WorkloadGenerator(args.seed)
+    employees = generator.generate_employees(args.employees, role_mix=args.industry)
+    schedules = generator.iter_schedules(employees, args.weeks, start_date=args.start_date,
+                                         locations=args.locations, shifts_per_day=args.shifts_per_day,
+                                         fill_rate=args.fill_rate)
+    count = storage.save_data(employees, schedules, data_file=args.output)
+    print(f"Wrote {len(employees)} employees and {count} schedules to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,318 @@
+"""
+Bulk import of employees and their availability from CSV (or XLSX)
+
+Rows are read one at a time, validated and turned straight into Employee
+objects with their availability, so large files never need to fit in
+memory twice. Invalid rows are skipped and reported with their row number
+instead of stopping the import.
+
+Columns (header names are case-insensitive; only name, role and wage are required):
+
+    name, phone, email, role, wage, max_hours, min_hours, is_minor, locations,
+    availability, monday ... sunday
+
+Availability can be given in one column ("Mon 0900-1700; Sat 1000-1400")
+and/or one column per day ("0900-1700" or "0600-1000, 1500-2100"). Locations
+are separated by commas or semicolons.
+
+XLSX files are read with openpyxl when it is installed.
+"""
+
+import csv
+import os
+from functools import lru_cache
+
+from .employee import Employee
+
+try:
+    import openpyxl
+except ImportError:  # Optional: only needed for .xlsx files
+    openpyxl = None
+
+DAYS = ['Monday', 'Tuesday', 'Wednesday', 'Thursday', 'Friday', 'Saturday', 'Sunday']
+
+# Accepted spellings of each day -> the name Employee.add_availability uses
+DAY_NAMES = {}
+for _day in DAYS:
+    DAY_NAMES[_day.lower()] = _day
+    DAY_NAMES[_day[:3].lower()] = _day
+
+# Other header names accepted for a column
+COLUMN_ALIASES = {
+    'phone_number': 'phone',
+    'hourly_wage': 'wage',
+    'minor': 'is_minor',
+    'location': 'locations',
+}
+
+REQUIRED_COLUMNS = ('name', 'role', 'wage')
+TRUE_VALUES = {'1', 'true', 'yes', 'y', 'x'}
+FALSE_VALUES = {'', '0', 'false', 'no', 'n'}
+
+
+class ImportResult:
+    def __init__(self):
+        """Employees built from valid rows and the errors found in the others"""
+        self.employees = []
+        # List of (row_number, message), row numbers as shown in a spreadsheet (header = row 1)
+        self.errors = []
+        self.rows = 0
+
+    @property
+    def is_clean(self):
+        """Whether every row was imported"""
+        return not self.errors
+
+    def get_error_report(self, limit=20):
+        """
+        Readable list of row errors
+
+        Args:
+            limit (int): Maximum number of errors to list
+
+        Returns:
+            str: One line per error (plus a count of any not listed)
+        """
+        lines = [f"Row {row}: {message}" for row, message in self.errors[:limit]]
+        if len(self.errors) > limit:
+            lines.append(f"... and {len(self.errors) - limit} more")
+        return "\n".join(lines)
+
+    def __str__(self):
+        return f"{len(self.employees)} of {self.rows} rows imported, {len(self.errors)} errors"
+
+
+def iter_rows(path):
+    """
+    Read a CSV or XLSX file one row at a time
+
+    Args:
+        path (str): File to read (.csv, or .xlsx if openpyxl is installed)
+
+    Yields:
+        tuple: (row_number, dict of column -> text) with normalized column names
+
+    Raises:
+        ValueError: If the file type isn't supported or required columns are missing
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == '.xlsx':
+        yield from _iter_xlsx_rows(path)
+    elif extension in ('.csv', '.txt'):
+        with open(path, 'r', newline='', encoding='utf-8-sig') as file:
+            reader = csv.reader(file)
+            header = _read_header(next(reader, []))
+            for row_number, values in enumerate(reader, start=2):
+                if any(values):
+                    yield row_number, dict(zip(header, values))
+    else:
+        raise ValueError(f"Unsupported file type: {extension or path} (use .csv or .xlsx)")
+
+
+def _iter_xlsx_rows(path):
+    """iter_rows for .xlsx files (read-only mode streams the sheet)"""
+    if openpyxl is None:
+        raise ValueError("Reading .xlsx files needs the openpyxl package (or save the sheet as CSV)")
+    workbook = openpyxl.load_workbook(path, read_only=True, data_only=True)
+    try:
+        rows = workbook.active.iter_rows(values_only=True)
+        header = _read_header(['' if value is None else str(value) for value in next(rows, ())])
+        for row_number, values in enumerate(rows, start=2):
+            values = ['' if value is None else str(value) for value in values]
+            if any(values):
+                yield row_number, dict(zip(header, values))
+    finally:
+        workbook.close()
+
+
+def _read_header(header):
+    """Normalize column names and check the required ones are there"""
+    columns = []
+    for name in header:
+        name = name.strip().lower().replace(' ', '_')
+        columns.append(COLUMN_ALIASES.get(name, name))
+    missing = [name for name in REQUIRED_COLUMNS if name not in columns]
+    if missing:
+        raise ValueError(f"Missing required column(s): {', '.join(missing)}")
+    return columns
+
+
+def parse_time(text):
+    """
+    Parse a military time ("0900", "900", "17:30")
+
+    Returns:
+        int: Time in military format (e.g., 1730)
+
+    Raises:
+        ValueError: If the text isn't a valid time
+    """
+    digits = text.strip().replace(':', '')
+    if not digits.isdigit() or len(digits) > 4:
+        raise ValueError(f"Invalid time: {text.strip()!r}")
+    value = int(digits)
+    if value // 100 > 24 or value % 100 > 59 or value > 2400:
+        raise ValueError(f"Invalid time: {text.strip()!r}")
+    return value
+
+
+# Rosters reuse a handful of windows, so each distinct text is only parsed once
+@lru_cache(maxsize=4096)
+def parse_window(text):
+    """
+    Parse a time window ("0900-1700")
+
+    Returns:
+        tuple: (start_time, end_time)
+
+    Raises:
+        ValueError: If the window is invalid or doesn't end after it starts
+    """
+    start, sep, end = text.partition('-')
+    if not sep:
+        raise ValueError(f"Invalid time window: {text.strip()!r} (expected e.g. 0900-1700)")
+    start_time, end_time = parse_time(start), parse_time(end)
+    if end_time <= start_time:
+        raise ValueError(f"Availability must end after it starts: {text.strip()!r}")
+    return start_time, end_time
+
+
+def parse_availability(row):
+    """
+    Collect the availability slots of a row
+
+    Returns:
+        list: (day, start_time, end_time) tuples, as Employee.available_days_times
+
+    Raises:
+        ValueError: If a day or time window is invalid
+    """
+    slots = []
+    for entry in row.get('availability', '').replace(',', ';').split(';'):
+        entry = entry.strip()
+        if not entry:
+            continue
+        day, _, window = entry.partition(' ')
+        if day.lower() not in DAY_NAMES:
+            raise ValueError(f"Invalid day: {day!r}")
+        slots.append((DAY_NAMES[day.lower()], *parse_window(window)))
+    for day in DAYS:
+        for window in row.get(day.lower(), '').split(','):
+            if window.strip():
+                slots.append((day, *parse_window(window)))
+    return slots
+
+
+def _to_int(text):
+    """int() that also accepts whole numbers written as decimals (e.g., "40.0" from a spreadsheet)"""
+    value = float(text)
+    if not value.is_integer():
+        raise ValueError(text)
+    return int(value)
+
+
+def _parse_number(row, column, convert, default):
+    text = row.get(column, '').strip()
+    if not text:
+        return default
+    try:
+        value = convert(text.lstrip('$'))
+    except ValueError:
+        raise ValueError(f"Invalid {column.replace('_', ' ')}: {text!r}")
+    if value < 0:
+        raise ValueError(f"{column.replace('_', ' ').capitalize()} cannot be negative")
+    return value
+
+
+def build_employee(row):
+    """
+    Validate one row and build its Employee
+
+    Availability is set in one go (like Employee.from_dict) rather than
+    through add_availability, so no event is emitted per slot.
+
+    Args:
+        row (dict): Column -> text
+
+    Returns:
+        Employee: The new employee
+
+    Raises:
+        ValueError: With every problem found in the row
+    """
+    problems = []
+    name = row.get('name', '').strip()
+    role = row.get('role', '').strip()
+    if not name:
+        problems.append("Name is required")
+    if not role:
+        problems.append("Role is required")
+
+    values = {}
+    for column, convert, default in (('wage', float, None), ('max_hours', _to_int, 40), ('min_hours', _to_int, 0)):
+        try:
+            values[column] = _parse_number(row, column, convert, default)
+        except ValueError as e:
+            problems.append(str(e))
+    if values.get('wage') is None and 'wage' in values:
+        problems.append("Wage is required")
+    if values.get('max_hours') is not None and values.get('min_hours') is not None \
+            and values['min_hours'] > values['max_hours']:
+        problems.append("Min hours cannot be more than max hours")
+
+    minor = row.get('is_minor', '').strip().lower()
+    if minor not in TRUE_VALUES and minor not in FALSE_VALUES:
+        problems.append(f"Invalid is_minor: {minor!r} (use yes/no)")
+
+    try:
+        availability = parse_availability(row)
+    except ValueError as e:
+        problems.append(str(e))
+
+    if problems:
+        raise ValueError("; ".join(problems))
+
+    employee = Employee(name, row.get('phone', '').strip(), row.get('email', '').strip(), role, values['wage'],
+                        max_hours=values['max_hours'], min_hours=values['min_hours'],
+                        is_minor=minor in TRUE_VALUES)
+    employee.available_days_times = availability
+    employee.locations = [loc.strip() for loc in row.get('locations', '').replace(';', ',').split(',')
+                          if loc.strip()]
+    return employee
+
+
+def import_employees(path, existing=None):
+    """
+    Import employees from a CSV or XLSX file in one pass
+
+    Rows with errors (including an email already used by an existing
+    employee or an earlier row) are skipped and listed in the result; the
+    others are imported.
+
+    Args:
+        path (str): File to read
+        existing (list): Employees already in the system (to catch duplicate emails)
+
+    Returns:
+        ImportResult: Employees built and errors found
+
+    Raises:
+        ValueError: If the file type isn't supported or required columns are missing
+    """
+    result = ImportResult()
+    emails = {emp.email.lower() for emp in existing or [] if emp.email}
+    for row_number, row in iter_rows(path):
+        result.rows += 1
+        email = row.get('email', '').strip()
+        if email and email.lower() in emails:
+            result.errors.append((row_number, f"Duplicate email: {email}"))
+            continue
+        try:
+            employee = build_employee(row)
+        except ValueError as e:
+            result.errors.append((row_number, str(e)))
+            continue
+        if email:
+            emails.add(email.lower())
+        result.employees.append(employee)
+    return result
@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+
+def get_week_start(day):
+    """Get the Monday of the week containing day"""
+    return day - timedelta(days=day.weekday())
+
+
+class HoursLedger:
+    def __init__(self):
+        """
+        Running total of hours scheduled per employee per week
+
+        The ledger is updated whenever an employee is assigned to or removed from
+        a shift, so looking up an employee's hours never has to scan the shifts.
+        """
+        # (employee_id, week_start) -> hours scheduled that week
+        self._hours = {}
+        # employee_id -> hours scheduled across all weeks
+        self._totals = {}
+
+    def add_hours(self, employee_id, day, hours):
+        """
+        Record hours worked by an employee
+
+        Args:
+            employee_id (int): The employee's ID
+            day (date): Date the hours are worked on
+            hours (float): Hours to add (negative to remove)
+        """
+        key = (employee_id, get_week_start(day))
+        total = self._hours.get(key, 0.0) + hours
+        # Drop entries that return to zero so the ledger doesn't grow forever
+        if abs(total) < 1e-9:
+            self._hours.pop(key, None)
+        else:
+            self._hours[key] = total
+
+        total = self._totals.get(employee_id, 0.0) + hours
+        if abs(total) < 1e-9:
+            self._totals.pop(employee_id, None)
+        else:
+            self._totals[employee_id] = total
+
+    def record_shift(self, shift, employee_id):
+        """Record the hours of a shift the employee was assigned to"""
+        self.add_hours(employee_id, shift.date, shift.get_duration_hours())
+
+    def unrecord_shift(self, shift, employee_id):
+        """Remove the hours of a shift the employee was removed from"""
+        self.add_hours(employee_id, shift.date, -shift.get_duration_hours())
+
+    def get_hours(self, employee_id, day):
+        """
+        Get the hours scheduled for an employee in the week containing day
+
+        Returns:
+            float: Hours scheduled that week (0.0 if none)
+        """
+        return self._hours.get((employee_id, get_week_start(day)), 0.0)
+
+    def get_total_hours(self, employee_id):
+        """
+        Get the hours scheduled for an employee across every week
+
+        Returns:
+            float: Total hours scheduled (0.0 if none)
+        """
+        return self._totals.get(employee_id, 0.0)
+
+    def would_exceed_max(self, employee, shift):
+        """
+        Check whether assigning the employee to the shift would go over max_hours
+
+        Args:
+            employee (Employee): Employee being assigned
+            shift (Shift): Shift they are being assigned to
+
+        Returns:
+            bool: True if the week's hours would exceed employee.max_hours
+        """
+        return self.get_hours(employee.id, shift.date) + shift.get_duration_hours() > employee.max_hours
+
+    def get_employees_under_min_hours(self, employees_list, week_start):
+        """
+        List employees scheduled for fewer than their min_hours in a week
+
+        Args:
+            employees_list (list): List of all Employee objects
+            week_start (date): Monday of the week to report on
+
+        Returns:
+            list: List of (employee, hours) tuples, lowest hours first
+        """
+        week_start = get_week_start(week_start)
+        under = []
+        for employee in employees_list:
+            hours = self._hours.get((employee.id, week_start), 0.0)
+            if hours < employee.min_hours:
+                under.append((employee, hours))
+        under.sort(key=lambda item: item[1])
+        return under
+
+    def clear(self):
+        """Remove all recorded hours"""
+        self._hours = {}
+        self._totals = {}
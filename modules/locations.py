@@ -0,0 +1,437 @@
+"""
+Multi-location scheduling
+
+Each location (site) keeps its schedules in its own shard file, so a site
+only loads and saves its own shifts. Employees are shared across sites in
+one employees file, and each site loads the employees who work there
+(employees with no locations set work anywhere).
+
+Employees who work at several sites are checked against a ConflictIndex
+built from small per-location bookings files (just the start and end of
+each assignment), so a site sees that someone is working elsewhere without
+loading the other sites' schedules.
+"""
+
+import json
+import os
+import re
+from bisect import bisect_left
+
+from .employee import Employee
+from .shift import Shift
+from .schedule import Schedule
+from .timeline import get_shift_interval, MINUTES_PER_DAY
+from . import storage
+
+LOCATIONS_DIR = 'data/locations'
+
+
+def location_slug(location):
+    """
+    File-safe name for a location (e.g., "Downtown #2" -> "downtown_2")
+
+    Raises:
+        ValueError: If the name has no letters or digits
+    """
+    slug = re.sub(r'[^a-z0-9]+', '_', location.strip().lower()).strip('_')
+    if not slug:
+        raise ValueError(f"Invalid location name: {location!r}")
+    return slug
+
+
+def _fingerprint(record):
+    """Comparable form of a saved employee record (as it would be written)"""
+    return json.dumps(record, sort_keys=True)
+
+
+def _write_json(path, data, indent=None):
+    """Write a JSON file through a temporary file, so readers never see it half written"""
+    temp_file = path + '.tmp'
+    try:
+        with open(temp_file, 'w') as file:
+            json.dump(data, file, indent=indent)
+    except Exception:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+    os.replace(temp_file, path)
+
+
+def split_by_location(schedules):
+    """
+    Split schedules into one schedule per location and week
+
+    Used to move data saved before locations existed into shards. The shifts
+    themselves are moved (not copied), so the original schedules should not
+    be used afterwards.
+
+    Args:
+        schedules (list): Schedule objects with shifts at any location
+
+    Returns:
+        dict: Location -> list of Schedule objects, in the original order
+    """
+    shards = {}
+    for schedule in schedules:
+        by_location = {}
+        for shift in schedule.get_all_shifts():
+            by_location.setdefault(shift.location, []).append(shift)
+        for location, shifts in by_location.items():
+            shard = Schedule(schedule.start_date, schedule.end_date, min_rest_hours=schedule.min_rest_hours,
+                             max_consecutive_days=schedule.max_consecutive_days, location=location)
+            shard.add_shifts(shifts)
+            shards.setdefault(location, []).append(shard)
+    return shards
+
+
+def get_bookings(schedules):
+    """
+    Every assignment in the schedules as (employee_id, start, end, shift_id)
+
+    Times are absolute minutes (see get_shift_interval).
+    """
+    bookings = []
+    for schedule in schedules:
+        for shift in schedule.get_all_shifts():
+            if shift.assigned_employees:
+                start, end = get_shift_interval(shift)
+                for emp_id in shift.assigned_employees:
+                    bookings.append((emp_id, start, end, shift.id))
+    return bookings
+
+
+class ConflictIndex:
+    def __init__(self):
+        """
+        Every employee's assignments across all locations, sorted by start time
+
+        Checking a shift only looks at the employee's bookings within a day
+        of it (found with bisect), so the cost doesn't grow with the number
+        of sites or weeks.
+        """
+        # employee_id -> sorted list of (start, end, location, shift_id)
+        self._bookings = {}
+        # location -> set of employee IDs with bookings there
+        self._employees_by_location = {}
+
+    def set_location(self, location, bookings):
+        """
+        Replace a location's bookings
+
+        Args:
+            location (str): The location
+            bookings (iterable): (employee_id, start, end, shift_id) tuples (see get_bookings)
+        """
+        self.remove_location(location)
+        employee_ids = set()
+        for emp_id, start, end, shift_id in bookings:
+            self._bookings.setdefault(emp_id, []).append((start, end, location, shift_id))
+            employee_ids.add(emp_id)
+        for emp_id in employee_ids:
+            self._bookings[emp_id].sort()
+        self._employees_by_location[location] = employee_ids
+
+    def remove_location(self, location):
+        """Drop every booking at a location"""
+        for emp_id in self._employees_by_location.pop(location, set()):
+            remaining = [b for b in self._bookings[emp_id] if b[2] != location]
+            if remaining:
+                self._bookings[emp_id] = remaining
+            else:
+                del self._bookings[emp_id]
+
+    def get_locations(self):
+        """Locations with bookings in the index"""
+        return sorted(self._employees_by_location)
+
+    def find_conflict(self, employee_id, shift, min_gap=0):
+        """
+        Find a booking at another location that overlaps a shift or is too close to it
+
+        Bookings at the shift's own location are skipped (the schedule checks those).
+
+        Args:
+            employee_id (int): The employee
+            shift (Shift): The shift (proposed or already assigned)
+            min_gap (float): Minimum minutes required between shifts
+
+        Returns:
+            tuple: (location, shift_id, gap_minutes) of the closest booking, or None
+                   (a negative gap means the shifts overlap)
+        """
+        entries = self._bookings.get(employee_id)
+        if not entries:
+            return None
+
+        start, end = get_shift_interval(shift)
+        # Shifts last at most a day, so only bookings starting within a day of this one can be too close
+        first = bisect_left(entries, (start - min_gap - MINUTES_PER_DAY,))
+        last = bisect_left(entries, (end + min_gap,))
+        closest = None
+        for other_start, other_end, location, shift_id in entries[first:last]:
+            if location.lower() == shift.location.lower():
+                continue
+            gap = max(start - other_end, other_start - end)
+            if gap < min_gap and (closest is None or gap < closest[2]):
+                closest = (location, shift_id, gap)
+        return closest
+
+    def check(self, employee_id, shift, min_rest_hours=None):
+        """
+        Check a shift against the employee's bookings at other locations
+
+        Args:
+            employee_id (int): The employee
+            shift (Shift): The shift
+            min_rest_hours (float): Minimum hours between shifts (None for overlaps only)
+
+        Returns:
+            str: Why the employee can't work the shift, or None if they can
+        """
+        conflict = self.find_conflict(employee_id, shift, (min_rest_hours or 0) * 60)
+        if conflict is None:
+            return None
+        location, shift_id, gap = conflict
+        if gap < 0:
+            return f"Employee is already working shift {shift_id} at {location} at that time"
+        return (f"Employee needs {min_rest_hours} hours rest between shifts "
+                f"(only {gap / 60:.1f} next to shift {shift_id} at {location})")
+
+
+class LocationStore:
+    def __init__(self, directory=LOCATIONS_DIR):
+        """
+        Per-location persistence
+
+        Files in the directory:
+            employees.json            - every employee, shared by all sites
+            <location>.json           - the location's schedules (storage.save_data layout)
+            <location>.bookings.json  - the location's assignments for the ConflictIndex
+
+        Args:
+            directory (str): Directory holding the files (default data/locations)
+        """
+        self.directory = directory
+        self.employees_file = os.path.join(directory, 'employees.json')
+        # employee_id -> fingerprint of the record as loaded (or last saved) by this store
+        self._loaded = {}
+
+    def get_file(self, location, kind=None):
+        """
+        Path of one of a location's files
+
+        Args:
+            location (str): The location
+            kind (str): File kind (e.g., "bookings", "labor_cube"), None for the schedules shard
+
+        Returns:
+            str: The path
+        """
+        name = location_slug(location) if kind is None else f"{location_slug(location)}.{kind}"
+        return os.path.join(self.directory, f"{name}.json")
+
+    def get_locations(self):
+        """
+        Locations saved in the store
+
+        Returns:
+            list: Location names, sorted
+        """
+        if not os.path.isdir(self.directory):
+            return []
+        locations = []
+        for name in os.listdir(self.directory):
+            if name.endswith('.bookings.json'):
+                with open(os.path.join(self.directory, name), 'r') as file:
+                    locations.append(json.load(file)['location'])
+        return sorted(locations)
+
+    # EMPLOYEES
+    def save_employees(self, employees):
+        """
+        Save employees to the shared employees file
+
+        The file is re-read and merged by ID, so several sites can save at
+        once: only employees this store added, changed or removed since it
+        loaded them are written, and every other record is left as it is in
+        the file (including employees another site added or edited). An
+        employee missing from the list is only deleted if it was loaded here,
+        and deleted IDs are recorded so another site's save can't bring the
+        employee back.
+
+        Args:
+            employees (list): Employee objects (e.g., the ones a site loaded, edited and hired)
+        """
+        data = self._read_employees_file()
+        saved = {record['id']: record for record in data['employees']}
+        deleted = set(data['deleted_employee_ids'])
+        current = {emp.id: emp.to_dict() for emp in employees}
+
+        for emp_id in self._loaded:
+            if emp_id not in current:
+                deleted.add(emp_id)
+                saved.pop(emp_id, None)
+        for emp_id, record in current.items():
+            if emp_id not in deleted and self._loaded.get(emp_id) != _fingerprint(record):
+                saved[emp_id] = record
+
+        records = [saved[emp_id] for emp_id in sorted(saved)]
+        next_id = max([Employee._next_id, data['metadata'].get('next_employee_id', 0)] +
+                      [record['id'] + 1 for record in records])
+        self._write_employees_file(records, deleted, next_id)
+        self._loaded = {emp_id: _fingerprint(record) for emp_id, record in current.items() if emp_id not in deleted}
+
+    def load_employees(self, location=None):
+        """
+        Load employees from the shared employees file
+
+        Args:
+            location (str): Only load employees who work at this location (default all)
+
+        Returns:
+            list: Employee objects (empty if nothing is saved yet)
+        """
+        records = [record for record in self._read_employees_file()['employees']
+                   if location is None or self._works_at(record, location)]
+        employees = [Employee.from_dict(record) for record in records]
+        self._loaded = {emp.id: _fingerprint(emp.to_dict()) for emp in employees}
+        self._restore_counters()
+        return employees
+
+    def reserve_employee_ids(self, employees):
+        """
+        Give newly created employees IDs no other site has used
+
+        IDs are taken from the employees file's counter (which is moved past
+        them) rather than this process's, which may be behind if another site
+        hired someone since this one loaded. Call it before the employees are
+        assigned to anything.
+
+        Args:
+            employees (list): The new Employee objects
+        """
+        data = self._read_employees_file()
+        next_id = max(Employee._next_id, data['metadata'].get('next_employee_id', 0))
+        for employee in employees:
+            employee.id = next_id
+            next_id += 1
+        Employee._next_id = next_id
+        self._write_employees_file(data['employees'], data['deleted_employee_ids'], next_id)
+
+    def _read_employees_file(self):
+        """Contents of the employees file (with empty defaults if it doesn't exist yet)"""
+        data = {}
+        if os.path.exists(self.employees_file):
+            with open(self.employees_file, 'r') as file:
+                data = json.load(file)
+        data.setdefault('employees', [])
+        data.setdefault('deleted_employee_ids', [])
+        data.setdefault('metadata', {})
+        return data
+
+    def _write_employees_file(self, records, deleted_ids, next_employee_id):
+        os.makedirs(self.directory, exist_ok=True)
+        _write_json(self.employees_file, {
+            'employees': records,
+            'deleted_employee_ids': sorted(deleted_ids),
+            'metadata': {'next_employee_id': next_employee_id}
+        }, indent=2)
+
+    @staticmethod
+    def _works_at(data, location):
+        """Employee.works_at for saved employee data"""
+        locations = data.get('locations') or []
+        return not locations or location.lower() in [loc.lower() for loc in locations]
+
+    # SCHEDULES
+    def save_location(self, location, schedules):
+        """
+        Save a location's schedules and its bookings
+
+        Args:
+            location (str): The location
+            schedules (list): The location's Schedule objects
+
+        Returns:
+            int: Number of schedules written
+
+        Raises:
+            ValueError: If any shift is at a different location
+        """
+        schedules = list(schedules)
+        for schedule in schedules:
+            for shift in schedule.get_all_shifts():
+                if shift.location.lower() != location.lower():
+                    raise ValueError(f"Shift {shift.id} is at {shift.location}, not {location}")
+
+        os.makedirs(self.directory, exist_ok=True)
+        shard = self.get_file(location)
+        count = storage.save_data([], schedules, shard, self.get_file(location, 'backup'))
+        _write_json(self.get_file(location, 'bookings'), {
+            'location': location,
+            'bookings': get_bookings(schedules),
+            'next_shift_id': Shift._next_id,
+            'next_schedule_id': Schedule._next_id
+        })
+        return count
+
+    def load_location(self, location):
+        """
+        Load a location's schedules
+
+        ID counters are restored to the highest saved by any location, so new
+        shifts and schedules never reuse another site's IDs.
+
+        Args:
+            location (str): The location
+
+        Returns:
+            list: Schedule objects (empty if the location has nothing saved)
+        """
+        shard = self.get_file(location)
+        schedules = storage.load_data(shard)[1] if os.path.exists(shard) else []
+        for schedule in schedules:
+            if schedule.location is None:
+                schedule.location = location
+        self._restore_counters()
+        return schedules
+
+    def load_conflict_index(self):
+        """
+        Build a ConflictIndex from every location's bookings file
+
+        Returns:
+            ConflictIndex: The index
+        """
+        index = ConflictIndex()
+        for location in self.get_locations():
+            with open(self.get_file(location, 'bookings'), 'r') as file:
+                index.set_location(location, [tuple(b) for b in json.load(file)['bookings']])
+        return index
+
+    def import_data(self, employees, schedules):
+        """
+        Move data saved before locations existed into the store
+
+        Args:
+            employees (list): Every Employee object
+            schedules (list): Schedule objects with shifts at any location
+
+        Returns:
+            list: The locations written
+        """
+        self.save_employees(employees)
+        shards = split_by_location(schedules)
+        for location, location_schedules in shards.items():
+            self.save_location(location, location_schedules)
+        return sorted(shards)
+
+    def _restore_counters(self):
+        """Move the ID counters past every ID saved by any location"""
+        next_employee_id = self._read_employees_file()['metadata'].get('next_employee_id', 0)
+        Employee._next_id = max(Employee._next_id, next_employee_id)
+        for location in self.get_locations():
+            with open(self.get_file(location, 'bookings'), 'r') as file:
+                data = json.load(file)
+            Shift._next_id = max(Shift._next_id, data.get('next_shift_id', 0))
+            Schedule._next_id = max(Schedule._next_id, data.get('next_schedule_id', 0))
@@ -0,0 +1,422 @@
+"""
+Batched employee notifications for schedule changes
+
+The NotificationOutbox records assignment changes from model events
+(EMPLOYEE_ASSIGNED/UNASSIGNED, and shifts added with employees already on
+them) and coalesces them per employee: being added to and then removed from
+the same shift cancels out, and every change for one employee goes out as a
+single message. Changes stay drafts until release() (called when the data
+is saved), so unsaved edits are never sent. Released messages are delivered
+in batches through a transport on a background thread, so the GUI never
+waits on the mail server.
+
+Transports:
+    MemoryTransport  Keeps messages in a list (a mailbox stand-in for tests)
+    FileTransport    Appends messages to a local file (default outside production)
+    SMTPTransport    Sends email (configured with the CHRONOS_SMTP_* environment variables)
+"""
+
+import json
+import os
+import smtplib
+import threading
+from datetime import datetime
+from email.message import EmailMessage
+
+from .events import event_bus, SHIFT_ADDED, SHIFTS_ADDED, EMPLOYEE_ASSIGNED, EMPLOYEE_UNASSIGNED
+
+OUTBOX_FILE = 'data/outbox/notifications.jsonl'
+DEFAULT_INTERVAL = 60  # Seconds between deliveries
+
+ASSIGNED = 'assigned'
+REMOVED = 'removed'
+
+
+def describe_shift(shift):
+    """One-line description of a shift (e.g., "Monday 2025-12-01, 9:00 AM - 5:00 PM, server at Main")"""
+    roles = ", ".join(shift.roles_required) or "shift"
+    location = f" at {shift.location}" if shift.location else ""
+    return (f"{shift.get_day_name()} {shift.date}, {shift.format_time(shift.start_time)} - "
+            f"{shift.format_time(shift.end_time)}, {roles}{location}")
+
+
+class Notification:
+    def __init__(self, employee, changes):
+        """
+        One message to an employee listing their schedule changes
+
+        Args:
+            employee (Employee): Recipient
+            changes (list): (ASSIGNED or REMOVED, shift) pairs, in date order
+        """
+        self.employee = employee
+        self.changes = changes
+
+    @property
+    def subject(self):
+        count = len(self.changes)
+        return f"Your schedule has changed ({count} shift{'s' if count != 1 else ''})"
+
+    @property
+    def body(self):
+        lines = [f"Hi {self.employee.name},", "", "Your schedule has been updated:", ""]
+        for kind, shift in self.changes:
+            lines.append(f"  {'+ Added to' if kind == ASSIGNED else '- Removed from'}: {describe_shift(shift)}")
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self):
+        """Convert notification to dictionary for JSON serialization"""
+        return {
+            'employee_id': self.employee.id,
+            'to': self.employee.email,
+            'subject': self.subject,
+            'body': self.body,
+            'changes': [{'change': kind, 'shift_id': shift.id} for kind, shift in self.changes]
+        }
+
+
+class Transport:
+    """Delivers batches of notifications (subclasses implement send)"""
+
+    def send(self, notifications):
+        """
+        Deliver a batch
+
+        Args:
+            notifications (list): Notification objects
+
+        Raises:
+            Exception: If the batch could not be delivered (it will be retried)
+        """
+        raise NotImplementedError
+
+
+class MemoryTransport(Transport):
+    def __init__(self):
+        """Keeps delivered notifications in memory, one list per batch"""
+        self.batches = []
+
+    @property
+    def sent(self):
+        """Every notification delivered so far"""
+        return [notification for batch in self.batches for notification in batch]
+
+    def send(self, notifications):
+        self.batches.append(list(notifications))
+
+
+class FileTransport(Transport):
+    def __init__(self, path=OUTBOX_FILE):
+        """
+        Appends notifications to a local JSON Lines file (one message per line)
+
+        Args:
+            path (str): File to append to
+        """
+        self.path = path
+
+    def send(self, notifications):
+        directory = os.path.dirname(self.path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        sent_at = datetime.now().isoformat()
+        with open(self.path, 'a', encoding='utf-8') as file:
+            for notification in notifications:
+                file.write(json.dumps(dict(notification.to_dict(), sent_at=sent_at)) + "\n")
+
+
+class SMTPTransport(Transport):
+    def __init__(self, host, sender, port=587, username=None, password=None, use_tls=True, timeout=30):
+        """
+        Sends notifications as email, one SMTP connection per batch
+
+        Employees without an email address are skipped.
+
+        Args:
+            host (str): SMTP server
+            sender (str): From address
+            port (int): SMTP port (default 587)
+            username (str): Login user (None to send without logging in)
+            password (str): Login password
+            use_tls (bool): Upgrade the connection with STARTTLS
+            timeout (float): Connection timeout in seconds
+        """
+        self.host = host
+        self.sender = sender
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+
+    def send(self, notifications):
+        messages = []
+        for notification in notifications:
+            if not notification.employee.email:
+                continue
+            message = EmailMessage()
+            message['From'] = self.sender
+            message['To'] = notification.employee.email
+            message['Subject'] = notification.subject
+            message.set_content(notification.body)
+            messages.append(message)
+        if not messages:
+            return
+
+        with smtplib.SMTP(self.host, self.port, timeout=self.timeout) as server:
+            if self.use_tls:
+                server.starttls()
+            if self.username:
+                server.login(self.username, self.password or '')
+            for message in messages:
+                server.send_message(message)
+
+
+def get_transport(outbox_file=OUTBOX_FILE):
+    """
+    Transport configured by the environment
+
+    SMTP when CHRONOS_SMTP_HOST is set (with CHRONOS_SMTP_FROM, and optionally
+    CHRONOS_SMTP_PORT, CHRONOS_SMTP_USER, CHRONOS_SMTP_PASSWORD and
+    CHRONOS_SMTP_TLS=0); otherwise a FileTransport writing to outbox_file.
+
+    Returns:
+        Transport: The transport to deliver with
+    """
+    host = os.environ.get('CHRONOS_SMTP_HOST')
+    if not host:
+        return FileTransport(outbox_file)
+    return SMTPTransport(host, os.environ.get('CHRONOS_SMTP_FROM', f"chronos@{host}"),
+                         port=int(os.environ.get('CHRONOS_SMTP_PORT', 587)),
+                         username=os.environ.get('CHRONOS_SMTP_USER'),
+                         password=os.environ.get('CHRONOS_SMTP_PASSWORD'),
+                         use_tls=os.environ.get('CHRONOS_SMTP_TLS', '1') != '0')
+
+
+def _merge(queue, emp_id, shift, kind):
+    """Add a change to a queue, cancelling out the opposite change to the same shift"""
+    changes = queue.setdefault(emp_id, {})
+    previous = changes.get(shift.id)
+    if previous is not None and previous[0] != kind:
+        del changes[shift.id]
+        if not changes:
+            del queue[emp_id]
+    else:
+        changes[shift.id] = [kind, shift]
+
+
+class NotificationOutbox:
+    def __init__(self, transport, employees=None, batch_size=100, bus=event_bus):
+        """
+        Per-employee queue of schedule changes, delivered in batches
+
+        Args:
+            transport (Transport): How notifications are delivered
+            employees (list): Employee objects (to find the recipient of an unassignment)
+            batch_size (int): Maximum notifications handed to the transport at once
+            bus (EventBus): Event bus the changes are recorded from
+        """
+        self.transport = transport
+        self.batch_size = batch_size
+        self._employees = {emp.id: emp for emp in employees or []}
+        # employee_id -> {shift_id: [ASSIGNED or REMOVED, shift]}, recorded but not released yet
+        self._drafts = {}
+        # Same layout, released and waiting to be delivered
+        self._pending = {}
+        # Guards the queues and _employees (events arrive on the GUI thread, delivery runs on the worker)
+        self._lock = threading.Lock()
+        # Serializes deliveries (flush from the GUI and the worker)
+        self._send_lock = threading.Lock()
+
+        self.sent_count = 0
+        self.last_error = None
+
+        self._thread = None
+        self._stop = threading.Event()
+        self._wake = threading.Event()
+
+        self._bus = bus
+        self._bus.subscribe(SHIFT_ADDED, self._on_shift_added)
+        self._bus.subscribe(SHIFTS_ADDED, self._on_shifts_added)
+        self._bus.subscribe(EMPLOYEE_ASSIGNED, self._on_assigned)
+        self._bus.subscribe(EMPLOYEE_UNASSIGNED, self._on_unassigned)
+
+    def close(self):
+        """Stop listening for model events (queued notifications are kept)"""
+        self._bus.unsubscribe(SHIFT_ADDED, self._on_shift_added)
+        self._bus.unsubscribe(SHIFTS_ADDED, self._on_shifts_added)
+        self._bus.unsubscribe(EMPLOYEE_ASSIGNED, self._on_assigned)
+        self._bus.unsubscribe(EMPLOYEE_UNASSIGNED, self._on_unassigned)
+
+    def set_employees(self, employees):
+        """Replace the employees recipients are looked up in (e.g., after loading data)"""
+        with self._lock:
+            self._employees = {emp.id: emp for emp in employees}
+
+    # RECORDING
+    def _record(self, emp_id, shift, kind):
+        """Add a change to the drafts"""
+        with self._lock:
+            _merge(self._drafts, emp_id, shift, kind)
+
+    def _on_shift_added(self, schedule, shift):
+        for emp_id in shift.assigned_employees:
+            self._record(emp_id, shift, ASSIGNED)
+
+    def _on_shifts_added(self, schedule, shifts):
+        for shift in shifts:
+            self._on_shift_added(schedule, shift)
+
+    def _on_assigned(self, shift, employee):
+        with self._lock:
+            self._employees.setdefault(employee.id, employee)
+        self._record(employee.id, shift, ASSIGNED)
+
+    def _on_unassigned(self, shift, employee_id):
+        self._record(employee_id, shift, REMOVED)
+
+    def release(self):
+        """
+        Queue the drafts for delivery (e.g., once the changes are saved)
+
+        Returns:
+            int: Number of employees whose changes were released
+        """
+        with self._lock:
+            drafts, self._drafts = self._drafts, {}
+            for emp_id, changes in drafts.items():
+                for kind, shift in changes.values():
+                    _merge(self._pending, emp_id, shift, kind)
+        return len(drafts)
+
+    def discard(self):
+        """
+        Drop the drafts without sending them (e.g., when changes aren't saved)
+
+        Returns:
+            int: Number of employees whose draft was dropped
+        """
+        with self._lock:
+            count = len(self._drafts)
+            self._drafts = {}
+        return count
+
+    def clear(self):
+        """
+        Drop every draft and pending notification without sending it
+
+        Returns:
+            int: Number of employees whose notification was dropped
+        """
+        with self._lock:
+            count = len(set(self._drafts) | set(self._pending))
+            self._drafts = {}
+            self._pending = {}
+        return count
+
+    def get_draft_count(self):
+        """Number of employees with changes not released yet"""
+        with self._lock:
+            return len(self._drafts)
+
+    def get_pending_count(self):
+        """Number of employees with a released notification waiting"""
+        with self._lock:
+            return len(self._pending)
+
+    # DELIVERY
+    def flush(self):
+        """
+        Deliver every released notification now (on the calling thread)
+
+        Batches the transport fails on, whatever it raises, are queued again
+        (merged with any newer changes) and retried on the next flush.
+
+        Returns:
+            int: Number of notifications delivered
+        """
+        with self._send_lock:
+            with self._lock:
+                pending, self._pending = self._pending, {}
+                employees = self._employees
+            notifications = []
+            for emp_id, changes in pending.items():
+                employee = employees.get(emp_id)
+                if employee is None:
+                    continue  # Deleted employee: nobody to tell
+                ordered = sorted(changes.values(), key=lambda c: (c[1].date, c[1].start_time, c[1].id))
+                notifications.append(Notification(employee, [(kind, shift) for kind, shift in ordered]))
+
+            delivered = 0
+            for start in range(0, len(notifications), self.batch_size):
+                batch = notifications[start:start + self.batch_size]
+                try:
+                    self.transport.send(batch)
+                except Exception as e:  # Includes smtplib.SMTPException; nothing swapped out is lost
+                    self.last_error = e
+                    self._requeue(notifications[start:])
+                    break
+                delivered += len(batch)
+            self.sent_count += delivered
+            return delivered
+
+    def _requeue(self, notifications):
+        """Put undelivered notifications back, under any changes recorded since"""
+        with self._lock:
+            for notification in notifications:
+                emp_id = notification.employee.id
+                newer = self._pending.pop(emp_id, {})
+                self._pending[emp_id] = {shift.id: [kind, shift] for kind, shift in notification.changes}
+                for kind, shift in newer.values():
+                    _merge(self._pending, emp_id, shift, kind)
+
+    # BACKGROUND THREAD
+    @property
+    def running(self):
+        """Whether the background delivery thread is running"""
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, interval=DEFAULT_INTERVAL):
+        """
+        Deliver released notifications every interval seconds on a background thread
+
+        Args:
+            interval (float): Seconds between deliveries
+        """
+        if self.running:
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, args=(interval,), name="NotificationOutbox",
+                                        daemon=True)
+        self._thread.start()
+
+    def send_soon(self):
+        """Ask the background thread to deliver now instead of at the next interval"""
+        self._wake.set()
+
+    def stop(self, flush=True, timeout=10):
+        """
+        Stop the background thread
+
+        Args:
+            flush (bool): Deliver whatever released notifications are still waiting before stopping
+            timeout (float): Seconds to wait for the thread
+        """
+        if self._thread is not None:
+            self._stop.set()
+            self._wake.set()
+            self._thread.join(timeout)
+            self._thread = None
+        if flush:
+            self.flush()
+
+    def _run(self, interval):
+        while not self._stop.is_set():
+            self._wake.wait(interval)
+            self._wake.clear()
+            if self._stop.is_set():
+                break
+            try:
+                self.flush()
+            except Exception as e:  # Keep delivering later batches whatever a transport raises
+                self.last_error = e
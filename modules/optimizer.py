@@ -0,0 +1,468 @@
+from .eligibility import EligibilityIndex
+from .fairness import HoursQueue
+from .ledger import get_week_start
+from .rules import RuleEngine
+
+
+def solve_assignment(costs):
+    """
+    Minimum-cost assignment of rows to columns (Hungarian algorithm)
+
+    Shortest augmenting path version with row/column potentials, O(n^2 m)
+    for n rows and m columns. Pure Python, so it is meant for the per-slot
+    matrices the optimizer builds (see ScheduleOptimizer.solve_min_cost).
+
+    Args:
+        costs (list): List of rows, each a list of costs; None marks a forbidden pair
+
+    Returns:
+        list: Column index assigned to each row, None for rows that can't be
+              assigned without using a forbidden pair
+    """
+    n = len(costs)
+    if n == 0:
+        return []
+    m = len(costs[0])
+
+    # Forbidden pairs cost more than leaving a row unassigned, and unassigned
+    # rows take one of n dummy columns, so a complete assignment always exists
+    # (dummies are only needed with forbidden pairs or more rows than columns)
+    finite = [cost for row in costs for cost in row if cost is not None]
+    dummies = n if n > m or len(finite) < n * m else 0
+    unassigned = (max(finite) if finite else 0.0) * (n + 1) + 1.0
+    forbidden = unassigned * 2
+    matrix = [[forbidden if cost is None else cost for cost in row] + [unassigned] * dummies for row in costs]
+    width = m + dummies
+
+    inf = float('inf')
+    u = [0.0] * (n + 1)          # Row potentials
+    v = [0.0] * (width + 1)      # Column potentials
+    owner = [0] * (width + 1)    # Row (1-based) assigned to each column, 0 = free
+    way = [0] * (width + 1)
+    for row in range(1, n + 1):
+        owner[0] = row
+        column = 0
+        min_slack = [inf] * (width + 1)
+        used = [False] * (width + 1)
+        while True:
+            used[column] = True
+            current_row = owner[column]
+            row_costs = matrix[current_row - 1]
+            row_potential = u[current_row]
+            delta, next_column = inf, 0
+            for j in range(1, width + 1):
+                if not used[j]:
+                    slack = row_costs[j - 1] - row_potential - v[j]
+                    if slack < min_slack[j]:
+                        min_slack[j] = slack
+                        way[j] = column
+                    if min_slack[j] < delta:
+                        delta, next_column = min_slack[j], j
+            for j in range(width + 1):
+                if used[j]:
+                    u[owner[j]] += delta
+                    v[j] -= delta
+                else:
+                    min_slack[j] -= delta
+            column = next_column
+            if owner[column] == 0:
+                break
+        # Flip the augmenting path
+        while column:
+            previous = way[column]
+            owner[column] = owner[previous]
+            column = previous
+
+    result = [None] * n
+    for j in range(1, m + 1):
+        if owner[j] and costs[owner[j] - 1][j - 1] is not None:
+            result[owner[j] - 1] = j - 1
+    return result
+
+
+class SolverResult:
+    def __init__(self, assignments, unfilled, unassigned=None):
+        """
+        Outcome of an optimizer run
+
+        Args:
+            assignments (list): (shift, employee) pairs that were assigned
+            unfilled (list): Shifts still below min_staff
+            unassigned (list): (shift, employee) pairs that were removed (repairs only)
+        """
+        self.assignments = assignments
+        self.unfilled = unfilled
+        self.unassigned = unassigned or []
+
+    @property
+    def is_complete(self):
+        """Whether every shift reached its min_staff"""
+        return not self.unfilled
+
+    def __str__(self):
+        text = f"{len(self.assignments)} assignments made, {len(self.unfilled)} shifts still unfilled"
+        if self.unassigned:
+            text = f"{len(self.unassigned)} shifts vacated, " + text
+        return text
+
+
+class ScheduleOptimizer:
+    def __init__(self, schedule, employees, engine=None, eligibility=None):
+        """
+        Fills open shifts with assignments that satisfy a RuleEngine's constraints
+
+        Args:
+            schedule (Schedule): The schedule to fill
+            employees (list): Employee objects to choose from
+            engine (RuleEngine): Rules to satisfy (default: the standard rule set)
+            eligibility (EligibilityIndex): Prebuilt candidate index (default: built here)
+        """
+        self.schedule = schedule
+        self.employees = employees
+        self.engine = engine
+        self.eligibility = eligibility
+
+    def solve(self, fill_to_max=False, max_candidates=25):
+        """
+        Greedily fill open shifts, hardest shifts first
+
+        Shifts with the fewest eligible candidates are filled first so they
+        aren't starved by easier shifts. For each open slot, up to
+        max_candidates eligible employees (by role, availability and weekly
+        hours, from the EligibilityIndex) are checked against the hard rules,
+        and the one with the lowest soft penalty is assigned through
+        RuleEngine.assign (and so Shift.assign_employee).
+
+        Candidates are pooled per day, time, location and roles, so shifts with the same
+        slot share one availability lookup. Hard rules only get stricter as
+        assignments are added, so an employee who breaks one is dropped from
+        the slot's pool for the rest of the run.
+
+        Args:
+            fill_to_max (bool): Fill shifts to max_staff instead of min_staff
+            max_candidates (int): Candidates evaluated per slot (bounds the cost for large staffs)
+
+        Returns:
+            SolverResult: Assignments made and shifts left below min_staff
+        """
+        engine, eligibility = self._start()
+        try:
+            shift_pools = {}
+            open_shifts = [shift for shift in self.schedule.get_all_shifts()
+                           if len(shift.assigned_employees) < self._target(shift, fill_to_max)]
+
+            # slot -> employees available for it, cheapest first
+            pools = {}
+            for shift in open_shifts:
+                slot = (shift.date, shift.start_time, shift.end_time, shift.location,
+                        tuple(sorted(role.lower() for role in shift.roles_required)))
+                if slot not in pools:
+                    employees = [eligibility.get_employee(emp_id) for emp_id in eligibility.get_available(shift)]
+                    pools[slot] = sorted(employees, key=lambda e: (e.wage, e.id))
+                shift_pools[shift.id] = pools[slot]
+
+            # Most constrained first (fewest candidates), then in time order
+            open_shifts.sort(key=lambda s: (len(shift_pools[s.id]), s.date, s.start_time, s.id))
+
+            assignments = []
+            for shift in open_shifts:
+                while len(shift.assigned_employees) < self._target(shift, fill_to_max):
+                    employee = self._pick(engine, shift, shift_pools[shift.id], max_candidates)
+                    if employee is None:
+                        break
+                    engine.assign(employee, shift)
+                    assignments.append((shift, employee))
+                self._update_filled(shift)
+        finally:
+            self._finish(engine, eligibility)
+        return SolverResult(assignments, self._get_unfilled())
+
+    def solve_min_cost(self):
+        """
+        Cover single-employee shifts at the lowest total labor cost
+
+        Open shifts with max_staff 1 are grouped by time slot (date, start,
+        end and location). Within a slot, shifts whose candidates overlap get a cost matrix
+        of wage x shift duration, with pairs that break a hard rule (role,
+        availability, hours, rest...) masked out, solved with the Hungarian
+        algorithm. Shifts with the same roles have identical rows, so a group
+        sharing no candidates with others just takes its cheapest employees.
+        The results are assigned through RuleEngine.assign (and so
+        Shift.assign_employee).
+
+        Each shift only needs its n cheapest feasible employees as columns
+        (n = shifts in the slot): an optimal assignment never has to use a
+        more expensive one, since one of the n cheapest is always free.
+
+        Returns:
+            SolverResult: Assignments made and shifts left below min_staff
+        """
+        engine, eligibility = self._start()
+        try:
+            slots = {}
+            for shift in self.schedule.get_all_shifts():
+                if shift.max_staff == 1 and not shift.assigned_employees:
+                    slots.setdefault((shift.date, shift.start_time, shift.end_time, shift.location), []).append(shift)
+
+            assignments = []
+            for slot in sorted(slots):
+                # Shifts in a slot with the same roles have the same feasible employees
+                groups = {}  # roles -> shifts
+                for shift in slots[slot]:
+                    groups.setdefault(tuple(sorted(role.lower() for role in shift.roles_required)), []).append(shift)
+                cheapest = {}  # roles -> up to len(shifts) feasible employees, cheapest first
+                for roles, shifts in groups.items():
+                    available = [eligibility.get_employee(emp_id) for emp_id in eligibility.get_available(shifts[0])]
+                    cheapest[roles] = []
+                    for employee in sorted(available, key=lambda e: (e.wage, e.id)):
+                        if engine.can_assign(employee, shifts[0]):
+                            cheapest[roles].append(employee)
+                            if len(cheapest[roles]) == len(slots[slot]):
+                                break
+
+                for component in self._split_groups(cheapest):
+                    if len(component) == 1:
+                        # Identical rows: the cheapest employees, in order, are optimal
+                        roles = component[0]
+                        pairs = zip(groups[roles], cheapest[roles])
+                    else:
+                        pairs = self._match_min_cost(
+                            [(shift, cheapest[roles]) for roles in component for shift in groups[roles]])
+                    for shift, employee in pairs:
+                        engine.assign(employee, shift)
+                        assignments.append((shift, employee))
+                        self._update_filled(shift)
+        finally:
+            self._finish(engine, eligibility)
+        return SolverResult(assignments, self._get_unfilled())
+
+    def solve_fair(self, fill_to_max=False):
+        """
+        Fill open shifts spreading hours as evenly as possible within each role
+
+        Shifts are filled in time order. Each one goes to the least utilized
+        employee (employees short of min_hours first) who can legally work it,
+        taken from an HoursQueue, so each assignment re-queues one employee in
+        O(log n). Hard rules, max_hours included, are checked with the RuleEngine.
+
+        Shifts with the same slot (day, time, location and roles) are filled together,
+        and employees popped for the slot stay out of the queue until it is
+        done: hard rules only get stricter as assignments are added, so anyone
+        who couldn't work one of its shifts can't work the rest either.
+
+        Args:
+            fill_to_max (bool): Fill shifts to max_staff instead of min_staff
+
+        Returns:
+            SolverResult: Assignments made and shifts left below min_staff
+        """
+        engine, eligibility = self._start()
+        try:
+            ledger = self.schedule.hours_ledger
+            weeks = (self.schedule.end_date - get_week_start(self.schedule.start_date)).days // 7 + 1
+            queue = HoursQueue(self.employees, ledger.get_total_hours, weeks)
+
+            slots = {}  # (date, start, end, location, roles) -> open shifts
+            for shift in self.schedule.get_all_shifts():
+                if len(shift.assigned_employees) < self._target(shift, fill_to_max):
+                    slot = (shift.date, shift.start_time, shift.end_time, shift.location,
+                            tuple(sorted(role.lower() for role in shift.roles_required)))
+                    slots.setdefault(slot, []).append(shift)
+
+            assignments = []
+            for slot in sorted(slots):
+                shifts = sorted(slots[slot], key=lambda s: s.id)
+                available = eligibility.get_available(shifts[0])
+                # Employees taken off the queue stay off until the slot is done: they
+                # either can't work it or were just assigned to one of its shifts
+                popped = []
+                for shift in shifts:
+                    while len(shift.assigned_employees) < self._target(shift, fill_to_max):
+                        employee = queue.pop(shift.roles_required)
+                        if employee is None:
+                            break
+                        popped.append(employee)
+                        if employee.id in available and engine.can_assign(employee, shift):
+                            engine.assign(employee, shift)
+                            assignments.append((shift, employee))
+                    self._update_filled(shift)
+                # Everyone goes back with their current hours (more for whoever was assigned)
+                queue.push_back(popped)
+        finally:
+            self._finish(engine, eligibility)
+        return SolverResult(assignments, self._get_unfilled())
+
+    def repair(self, employee, removed=False, max_candidates=25):
+        """
+        Re-fill the shifts an employee can no longer work, leaving the rest alone
+
+        Only the employee's own shifts are looked at (from the schedule's
+        per-employee timeline), so the cost depends on their shifts, not the
+        size of the schedule. Shifts they can no longer work (wrong role or
+        not available any more, or every shift if they were removed) are
+        unassigned and each vacated place is offered to the cheapest eligible
+        employee. No other assignment is changed.
+
+        Without a RuleEngine only the checks Shift.assign_employee makes
+        (role, availability, weekly hours, rest and consecutive days) apply,
+        so a repair never has to index the whole schedule.
+
+        Args:
+            employee (Employee): Employee whose role or availability changed, or who was removed
+            removed (bool): Whether the employee is gone (vacate all their shifts)
+            max_candidates (int): Candidates tried per vacated place
+
+        Returns:
+            SolverResult: Replacements made, vacated shifts still below min_staff
+                          and the (shift, employee) pairs that were unassigned
+        """
+        timeline = self.schedule.timelines.get(employee.id)
+        affected = [shift for shift in (timeline.get_shifts() if timeline else [])
+                    if removed or shift.check_employee(employee)]
+        if not affected:
+            return SolverResult([], [])
+
+        eligibility = self.eligibility or EligibilityIndex(self.employees)
+        self._employees_by_id = {emp.id: emp for emp in self.employees}
+        assignments = []
+        unassigned = []
+        try:
+            pools = {}  # (day, start, end, location, roles) -> available employees, cheapest first
+            for shift in affected:
+                shift.remove_employee(employee.id)
+                unassigned.append((shift, employee))
+
+                slot = (shift.get_day_name(), shift.start_time, shift.end_time, shift.location,
+                        tuple(sorted(role.lower() for role in shift.roles_required)))
+                if slot not in pools:
+                    available = [eligibility.get_employee(emp_id) for emp_id in eligibility.get_available(shift)
+                                 if emp_id != employee.id]
+                    pools[slot] = sorted(available, key=lambda e: (e.wage, e.id))
+
+                replacement = self._pick_replacement(shift, pools[slot], max_candidates)
+                if replacement is not None:
+                    assignments.append((shift, replacement))
+                self._update_filled(shift)
+        finally:
+            if self.eligibility is None:
+                eligibility.close()
+
+        unfilled = [shift for shift in affected if len(shift.assigned_employees) < shift.min_staff]
+        return SolverResult(assignments, unfilled, unassigned)
+
+    def _pick_replacement(self, shift, pool, max_candidates):
+        """Assign the best candidate for a vacated place (None if nobody can take it)"""
+        if self.engine is not None:
+            employee = self._pick(self.engine, shift, pool, max_candidates)
+            if employee is not None:
+                self.engine.assign(employee, shift)
+            return employee
+
+        tried = 0
+        for employee in pool:
+            if employee.id in shift.assigned_employees:
+                continue
+            try:
+                shift.assign_employee(employee)
+                return employee
+            except ValueError:
+                tried += 1  # Breaks a labor rule (weekly hours, rest or consecutive days)
+                if tried >= max_candidates:
+                    break
+        return None
+
+    def _split_groups(self, cheapest):
+        """
+        Split role groups into components that share no candidates
+
+        Components can be solved on their own, and most are a single group
+        (employees have one role), which needs no cost matrix at all.
+
+        Args:
+            cheapest (dict): roles -> candidate employees
+
+        Returns:
+            list: Lists of roles keys
+        """
+        components = []  # (roles keys, candidate ids)
+        for roles, employees in cheapest.items():
+            keys, ids = [roles], {employee.id for employee in employees}
+            for component in components[:]:
+                if component[1] & ids:
+                    keys += component[0]
+                    ids |= component[1]
+                    components.remove(component)
+            components.append((keys, ids))
+        return [keys for keys, ids in components]
+
+    def _match_min_cost(self, rows):
+        """
+        Cheapest assignment of shifts to candidates with the Hungarian algorithm
+
+        Args:
+            rows (list): (shift, candidate employees) pairs
+
+        Returns:
+            list: (shift, employee) pairs for the shifts that could be matched
+        """
+        columns = list({employee.id: employee for shift, row in rows for employee in row}.values())
+        if not columns:
+            return []
+        column_index = {employee.id: j for j, employee in enumerate(columns)}
+        costs = []
+        for shift, row in rows:
+            hours = shift.get_duration_hours()
+            costs.append([None] * len(columns))
+            for employee in row:
+                costs[-1][column_index[employee.id]] = employee.wage * hours
+        return [(shift, columns[j]) for (shift, row), j in zip(rows, solve_assignment(costs)) if j is not None]
+
+    def _start(self):
+        """Get the rule engine and eligibility index to use, building any not supplied"""
+        engine = self.engine or RuleEngine(self.schedule, self.employees)
+        eligibility = self.eligibility or EligibilityIndex(self.employees)
+        self._employees_by_id = {employee.id: employee for employee in self.employees}
+        return engine, eligibility
+
+    def _finish(self, engine, eligibility):
+        """Close the engine and index if they were built by _start()"""
+        if self.engine is None:
+            engine.close()
+        if self.eligibility is None:
+            eligibility.close()
+
+    def _update_filled(self, shift):
+        """Update a shift's filled status (only its own employees are needed to check its roles)"""
+        shift.update_filled_status([self._employees_by_id[emp_id] for emp_id in shift.assigned_employees
+                                    if emp_id in self._employees_by_id])
+
+    def _get_unfilled(self):
+        """Shifts still below min_staff"""
+        return [shift for shift in self.schedule.get_all_shifts()
+                if len(shift.assigned_employees) < shift.min_staff]
+
+    def _target(self, shift, fill_to_max):
+        """Number of employees a shift should end up with"""
+        return shift.max_staff if fill_to_max else shift.min_staff
+
+    def _pick(self, engine, shift, pool, max_candidates):
+        """Feasible candidate with the lowest soft penalty (None if there isn't one)"""
+        best, best_penalty = None, None
+        checked = 0
+        infeasible = set()
+        for employee in pool:
+            if employee.id in shift.assigned_employees:
+                continue
+            penalty = engine.get_penalty(employee, shift)
+            if penalty is None:
+                infeasible.add(employee.id)
+                continue
+            if best_penalty is None or penalty < best_penalty:
+                best, best_penalty = employee, penalty
+            checked += 1
+            if checked >= max_candidates:
+                break
+
+        if infeasible:
+            pool[:] = [employee for employee in pool if employee.id not in infeasible]
+        return best
@@ -0,0 +1,215 @@
+from datetime import datetime
+from .ledger import get_week_start
+from .profiling import timed
+
+
+class PayrollRules:
+    def __init__(self, weekly_overtime_hours=40, daily_overtime_hours=None, overtime_multiplier=1.5,
+                 minor_multiplier=1.0, holidays=None, holiday_multiplier=1.5):
+        """
+        Configurable pay rules used by the PayrollEngine
+
+        Args:
+            weekly_overtime_hours (float): Regular hours per week before overtime (None to disable)
+            daily_overtime_hours (float): Hours per day before overtime (None to disable, default)
+            overtime_multiplier (float): Pay multiplier for overtime hours (default 1.5)
+            minor_multiplier (float): Pay multiplier applied to minors' wages (default 1.0)
+            holidays (list): Holiday dates (date objects or YYYY-MM-DD strings)
+            holiday_multiplier (float): Pay multiplier for hours worked on a holiday (default 1.5)
+
+        Multipliers stack: an overtime hour worked on a holiday is paid
+        wage x overtime_multiplier x holiday_multiplier.
+        """
+        self.weekly_overtime_hours = weekly_overtime_hours
+        self.daily_overtime_hours = daily_overtime_hours
+        self.overtime_multiplier = overtime_multiplier
+        self.minor_multiplier = minor_multiplier
+        self.holiday_multiplier = holiday_multiplier
+
+        # Convert string dates to date objects if needed
+        self.holidays = set()
+        for holiday in holidays or []:
+            if isinstance(holiday, str):
+                holiday = datetime.strptime(holiday, "%Y-%m-%d").date()
+            self.holidays.add(holiday)
+
+
+class EmployeePayroll:
+    def __init__(self, employee):
+        """
+        Payroll breakdown for one employee
+
+        Args:
+            employee (Employee): The employee this breakdown belongs to
+        """
+        self.employee = employee
+        self.shift_count = 0
+        self.regular_hours = 0.0
+        self.overtime_hours = 0.0
+        self.holiday_hours = 0.0
+        self.regular_pay = 0.0
+        self.overtime_pay = 0.0
+
+    @property
+    def total_hours(self):
+        """Total hours worked"""
+        return self.regular_hours + self.overtime_hours
+
+    @property
+    def total_pay(self):
+        """Total pay including overtime and holiday premiums"""
+        return self.regular_pay + self.overtime_pay
+
+    def to_dict(self):
+        """Convert breakdown to dictionary for JSON serialization"""
+        return {
+            'employee_id': self.employee.id,
+            'name': self.employee.name,
+            'shift_count': self.shift_count,
+            'regular_hours': self.regular_hours,
+            'overtime_hours': self.overtime_hours,
+            'holiday_hours': self.holiday_hours,
+            'regular_pay': self.regular_pay,
+            'overtime_pay': self.overtime_pay,
+            'total_pay': self.total_pay
+        }
+
+
+class PayrollReport:
+    def __init__(self, breakdowns):
+        """
+        Result of running the PayrollEngine over a schedule
+
+        Args:
+            breakdowns (list): List of EmployeePayroll objects
+        """
+        self.breakdowns = breakdowns
+
+    @property
+    def total_cost(self):
+        """Total payroll cost for the schedule"""
+        return sum(breakdown.total_pay for breakdown in self.breakdowns)
+
+    @property
+    def total_overtime_cost(self):
+        """Total pay for overtime hours"""
+        return sum(breakdown.overtime_pay for breakdown in self.breakdowns)
+
+    def get_breakdown(self, employee_id):
+        """Get the breakdown for one employee (None if they have no hours)"""
+        return next((b for b in self.breakdowns if b.employee.id == employee_id), None)
+
+    def to_dict(self):
+        """Convert report to dictionary for JSON serialization"""
+        return {
+            'total_cost': self.total_cost,
+            'total_overtime_cost': self.total_overtime_cost,
+            'employees': [breakdown.to_dict() for breakdown in self.breakdowns]
+        }
+
+
+class PayrollEngine:
+    def __init__(self, rules=None):
+        """
+        Payroll calculator that aggregates hours per employee across a week
+
+        Unlike Shift.calculate_payroll, which prices each shift on its own, the
+        engine knows how many hours each employee has already worked that day
+        and week, so it can apply overtime rules.
+
+        Args:
+            rules (PayrollRules): Pay rules to apply (default PayrollRules())
+        """
+        self.rules = rules if rules is not None else PayrollRules()
+
+    @timed("PayrollEngine.calculate")
+    def calculate(self, schedule, employees_list):
+        """
+        Calculate payroll for a schedule in a single pass over its assignments
+
+        Args:
+            schedule (Schedule): The schedule to pay out
+            employees_list (list): List of all Employee objects
+
+        Returns:
+            PayrollReport: Per-employee breakdown, highest total pay first
+        """
+        employees_by_id = {employee.id: employee for employee in employees_list}
+
+        # Group worked shifts by employee: employee_id -> list of shifts
+        worked = {}
+        for shift in schedule.get_all_shifts():
+            for emp_id in shift.assigned_employees:
+                if emp_id in employees_by_id:
+                    worked.setdefault(emp_id, []).append(shift)
+
+        breakdowns = []
+        for emp_id, shifts in worked.items():
+            breakdowns.append(self._calculate_employee(employees_by_id[emp_id], shifts))
+
+        breakdowns.sort(key=lambda b: (-b.total_pay, b.employee.id))
+        return PayrollReport(breakdowns)
+
+    def calculate_employee(self, schedule, employee):
+        """
+        Calculate one employee's payroll for a schedule
+
+        Only their own shifts are read (from the schedule's timeline), so a
+        running total can be updated when one of their assignments changes
+        without recalculating the whole schedule.
+
+        Args:
+            schedule (Schedule): The schedule to pay out
+            employee (Employee): The employee
+
+        Returns:
+            EmployeePayroll: Their breakdown (no hours if they have no shifts)
+        """
+        return self._calculate_employee(employee, schedule.get_timeline(employee.id).get_shifts())
+
+    def _calculate_employee(self, employee, shifts):
+        """Walk one employee's shifts in time order, splitting regular and overtime hours"""
+        rules = self.rules
+        breakdown = EmployeePayroll(employee)
+
+        base_rate = employee.wage
+        if employee.is_minor:
+            base_rate *= rules.minor_multiplier
+
+        week_regular = {}  # week_start -> regular hours so far
+        day_hours = {}     # date -> hours so far
+
+        for shift in sorted(shifts, key=lambda s: (s.date, s.start_time)):
+            hours = shift.get_duration_hours()
+            worked_today = day_hours.get(shift.date, 0.0)
+            day_hours[shift.date] = worked_today + hours
+
+            # Daily overtime: hours past the daily limit
+            daily_overtime = 0.0
+            if rules.daily_overtime_hours is not None:
+                daily_overtime = (max(0.0, worked_today + hours - rules.daily_overtime_hours)
+                                  - max(0.0, worked_today - rules.daily_overtime_hours))
+
+            # Weekly overtime: regular hours past the weekly limit
+            regular = hours - daily_overtime
+            week = get_week_start(shift.date)
+            regular_so_far = week_regular.get(week, 0.0)
+            weekly_overtime = 0.0
+            if rules.weekly_overtime_hours is not None:
+                weekly_overtime = max(0.0, min(regular, regular_so_far + regular - rules.weekly_overtime_hours))
+            regular -= weekly_overtime
+            week_regular[week] = regular_so_far + regular
+
+            overtime = daily_overtime + weekly_overtime
+            rate = base_rate
+            if shift.date in rules.holidays:
+                rate *= rules.holiday_multiplier
+                breakdown.holiday_hours += hours
+
+            breakdown.shift_count += 1
+            breakdown.regular_hours += regular
+            breakdown.overtime_hours += overtime
+            breakdown.regular_pay += regular * rate
+            breakdown.overtime_pay += overtime * rate * rules.overtime_multiplier
+
+        return breakdown
@@ -0,0 +1,239 @@
+"""
+Opt-in timing instrumentation for hot paths
+
+Functions decorated with @timed (or blocks wrapped in profiler.measure()) record
+call counts and latency histograms while profiling is enabled. When it is
+disabled a call costs one attribute check, so the decorators can stay on.
+
+Enable with the CHRONOS_PROFILE=1 environment variable or the Dashboard's
+Diagnostics panel.
+
+SessionProfiler records a full cProfile session instead (chronos.py --profile),
+for reproducing a slow workflow from the field.
+"""
+
+import contextlib
+import cProfile
+import functools
+import json
+import os
+import time
+from datetime import datetime
+
+# Upper bounds (ms) of the latency histogram buckets; a final bucket holds anything slower
+BUCKETS_MS = (1, 5, 10, 50, 100, 500, 1000, 5000)
+
+
+def get_bucket_labels():
+    """Labels for the histogram buckets, e.g. '<1ms', ..., '>=5000ms'"""
+    return [f"<{bound}ms" for bound in BUCKETS_MS] + [f">={BUCKETS_MS[-1]}ms"]
+
+
+class TimingStats:
+    def __init__(self, name):
+        """
+        Call count and latency histogram for one instrumented action
+
+        Args:
+            name (str): Name of the action (e.g., "Shift.assign_employee")
+        """
+        self.name = name
+        self.count = 0
+        self.total_ms = 0.0
+        self.min_ms = None
+        self.max_ms = 0.0
+        self.buckets = [0] * (len(BUCKETS_MS) + 1)
+
+    def record(self, elapsed_ms):
+        """Add one call's duration"""
+        self.count += 1
+        self.total_ms += elapsed_ms
+        if self.min_ms is None or elapsed_ms < self.min_ms:
+            self.min_ms = elapsed_ms
+        if elapsed_ms > self.max_ms:
+            self.max_ms = elapsed_ms
+
+        for i, bound in enumerate(BUCKETS_MS):
+            if elapsed_ms < bound:
+                self.buckets[i] += 1
+                break
+        else:
+            self.buckets[-1] += 1
+
+    @property
+    def mean_ms(self):
+        """Average call duration"""
+        return self.total_ms / self.count if self.count else 0.0
+
+    def to_dict(self):
+        """Convert stats to dictionary for JSON serialization"""
+        return {
+            'name': self.name,
+            'count': self.count,
+            'total_ms': self.total_ms,
+            'mean_ms': self.mean_ms,
+            'min_ms': self.min_ms,
+            'max_ms': self.max_ms,
+            'histogram': dict(zip(get_bucket_labels(), self.buckets))
+        }
+
+
+class Profiler:
+    def __init__(self, enabled=False):
+        """
+        Collects TimingStats for instrumented functions
+
+        Args:
+            enabled (bool): Whether to start recording straight away
+        """
+        self.enabled = enabled
+        self.started = datetime.now()
+        self._stats = {}
+
+    def record(self, name, elapsed_ms):
+        """Record one call of an action"""
+        stats = self._stats.get(name)
+        if stats is None:
+            stats = self._stats[name] = TimingStats(name)
+        stats.record(elapsed_ms)
+
+    def timed(self, name=None):
+        """
+        Decorator that records every call of a function while enabled
+
+        Args:
+            name (str): Action name (default the function's qualified name)
+        """
+        def decorator(func):
+            label = name or func.__qualname__
+
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                if not self.enabled:
+                    return func(*args, **kwargs)
+                start = time.perf_counter()
+                try:
+                    return func(*args, **kwargs)
+                finally:
+                    self.record(label, (time.perf_counter() - start) * 1000)
+            return wrapper
+        return decorator
+
+    def measure(self, name):
+        """
+        Context manager that records the time spent in a block while enabled
+
+        Example:
+            with profiler.measure("dialog.assign"):
+                ...
+        """
+        if not self.enabled:
+            return contextlib.nullcontext()
+        return self._measure(name)
+
+    @contextlib.contextmanager
+    def _measure(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(name, (time.perf_counter() - start) * 1000)
+
+    def get_stats(self):
+        """
+        Get the stats for every recorded action
+
+        Returns:
+            list: TimingStats objects, most total time first
+        """
+        return sorted(self._stats.values(), key=lambda stats: (-stats.total_ms, stats.name))
+
+    def get_report(self):
+        """
+        Get a plain-text summary of the recorded timings
+
+        Returns:
+            list: Lines of text, one per action
+        """
+        lines = []
+        for stats in self.get_stats():
+            lines.append(f"{stats.name}: {stats.count} calls, mean {stats.mean_ms:.2f} ms, "
+                         f"max {stats.max_ms:.2f} ms, total {stats.total_ms:.1f} ms")
+        return lines
+
+    def reset(self):
+        """Forget everything recorded so far"""
+        self._stats = {}
+        self.started = datetime.now()
+
+    def to_dict(self):
+        """Convert recorded timings to dictionary for JSON serialization"""
+        return {
+            'started': self.started.isoformat(),
+            'dumped': datetime.now().isoformat(),
+            'buckets_ms': list(BUCKETS_MS),
+            'actions': [stats.to_dict() for stats in self.get_stats()]
+        }
+
+    def dump(self, path):
+        """
+        Write the recorded timings to a JSON file
+
+        Args:
+            path (str): File to write (its directory is created if needed)
+        """
+        directory = os.path.dirname(path)
+        if directory and not os.path.exists(directory):
+            os.makedirs(directory)
+        with open(path, 'w') as file:
+            json.dump(self.to_dict(), file, indent=2)
+
+
+class SessionProfiler:
+    def __init__(self, output_dir='data'):
+        """
+        Records a cProfile session of everything the app does between start() and stop()
+
+        Args:
+            output_dir (str): Directory the stats files are saved in
+        """
+        self.output_dir = output_dir
+        self._profile = None
+
+    @property
+    def running(self):
+        """Whether a session is being recorded"""
+        return self._profile is not None
+
+    def start(self):
+        """Start recording (does nothing if already recording)"""
+        if self._profile is None:
+            self._profile = cProfile.Profile()
+            self._profile.enable()
+
+    def stop(self):
+        """
+        Stop recording and save the stats as profile_<timestamp>.prof
+
+        The file can be read with pstats or snakeviz, e.g.:
+            python -m pstats data/profile_20250101_120000.prof
+
+        Returns:
+            str: Path of the saved stats file, None if nothing was being recorded
+        """
+        if self._profile is None:
+            return None
+        self._profile.disable()
+        profile, self._profile = self._profile, None
+
+        if not os.path.exists(self.output_dir):
+            os.makedirs(self.output_dir)
+        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+        path = os.path.join(self.output_dir, f"profile_{timestamp}.prof")
+        profile.dump_stats(path)
+        return path
+
+
+# Global profiler used by the @timed decorators
+profiler = Profiler(enabled=os.environ.get('CHRONOS_PROFILE') == '1')
+timed = profiler.timed
@@ -0,0 +1,478 @@
+"""
+Publishing schedules as immutable, content-hashed snapshots
+
+Publishing freezes a Schedule into a ScheduleSnapshot: one tuple of compact
+ShiftRecords per day, a SHA-256 hash of each day and a hash of the whole
+schedule built from the day hashes. Snapshots never change, so readers get
+the snapshot's own tuples back (nothing is copied), and two versions are
+diffed by comparing day hashes first - only the days that differ are
+looked at shift by shift.
+
+After publishing, the Publisher records each edit to the schedule (shifts
+added, employees assigned/unassigned) as a Delta against the latest
+snapshot. The next publish rebuilds only the days those deltas touched and
+shares every other day's tuple with the previous version.
+"""
+
+import hashlib
+import json
+import os
+from collections import namedtuple
+from datetime import datetime, timedelta
+from types import MappingProxyType
+
+from .events import event_bus, SHIFT_ADDED, SHIFTS_ADDED, EMPLOYEE_ASSIGNED, EMPLOYEE_UNASSIGNED
+
+PUBLISHED_DIR = 'data/published'
+
+# One published shift (everything an employee or a diff needs, nothing else)
+ShiftRecord = namedtuple('ShiftRecord', ['id', 'start_time', 'end_time', 'roles', 'location', 'min_staff',
+                                         'max_staff', 'assigned'])
+
+# One edit made after publishing: kind is 'shift_added', 'assigned' or 'unassigned'
+Delta = namedtuple('Delta', ['kind', 'shift_id', 'date', 'employee_id'])
+
+# One difference between two versions: kind is 'added', 'removed' or 'changed'
+ShiftChange = namedtuple('ShiftChange', ['kind', 'date', 'shift_id', 'old', 'new'])
+
+
+def record_shift(shift):
+    """Freeze a Shift into a ShiftRecord"""
+    return ShiftRecord(shift.id, shift.start_time, shift.end_time, tuple(shift.roles_required), shift.location,
+                       shift.min_staff, shift.max_staff, tuple(shift.assigned_employees))
+
+
+def record_day(shifts):
+    """Freeze one day's shifts, ordered by start time"""
+    return tuple(sorted((record_shift(shift) for shift in shifts), key=lambda r: (r.start_time, r.id)))
+
+
+def hash_day(day, records):
+    """SHA-256 of one day's records"""
+    text = json.dumps([day.isoformat(), records], separators=(',', ':'))
+    return hashlib.sha256(text.encode('utf-8')).hexdigest()
+
+
+class ScheduleSnapshot:
+    __slots__ = ('schedule_id', 'start_date', 'end_date', 'location', 'version', 'published_at',
+                 'parent_hash', '_days', '_day_hashes', 'hash')
+
+    def __init__(self, schedule_id, start_date, end_date, location, days, version=1, published_at=None,
+                 parent_hash=None, day_hashes=None):
+        """
+        Immutable published version of a schedule
+
+        Args:
+            schedule_id (int): ID of the schedule
+            start_date (date): First day of the schedule
+            end_date (date): Last day of the schedule
+            location (str): The schedule's location (None for all)
+            days (dict): date -> tuple of ShiftRecords (days without shifts left out)
+            version (int): Version number (1 for the first publish)
+            published_at (str): ISO timestamp of the publish
+            parent_hash (str): Hash of the previous version (None for the first)
+            day_hashes (dict): date -> hash for days shared with another snapshot (saves rehashing)
+        """
+        set_attr = object.__setattr__
+        set_attr(self, 'schedule_id', schedule_id)
+        set_attr(self, 'start_date', start_date)
+        set_attr(self, 'end_date', end_date)
+        set_attr(self, 'location', location)
+        set_attr(self, 'version', version)
+        set_attr(self, 'published_at', published_at or datetime.now().isoformat())
+        set_attr(self, 'parent_hash', parent_hash)
+        days = {day: records for day, records in sorted(days.items()) if records}
+        set_attr(self, '_days', MappingProxyType(days))
+        known = day_hashes or {}
+        set_attr(self, '_day_hashes', MappingProxyType(
+            {day: known.get(day) or hash_day(day, records) for day, records in days.items()}))
+
+        # The content hash covers what was published, not when or as which version
+        content = hashlib.sha256()
+        content.update(f"{schedule_id}|{start_date}|{end_date}|{location}".encode('utf-8'))
+        for day, day_hash in self._day_hashes.items():
+            content.update(f"|{day}:{day_hash}".encode('utf-8'))
+        set_attr(self, 'hash', content.hexdigest())
+
+    def __setattr__(self, name, value):
+        raise AttributeError("Published snapshots cannot be changed")
+
+    def __delattr__(self, name):
+        raise AttributeError("Published snapshots cannot be changed")
+
+    # READING
+    @property
+    def days(self):
+        """Read-only date -> tuple of ShiftRecords"""
+        return self._days
+
+    @property
+    def day_hashes(self):
+        """Read-only date -> hash of that day's records"""
+        return self._day_hashes
+
+    @property
+    def shift_count(self):
+        return sum(len(records) for records in self._days.values())
+
+    def get_day(self, day):
+        """
+        Records published for a date
+
+        Returns:
+            tuple: The snapshot's own ShiftRecords for that day (empty if none)
+        """
+        return self._days.get(day, ())
+
+    def iter_shifts(self, first_day=None, last_day=None):
+        """
+        Walk the published shifts of a date range (default: the whole schedule) without copying them
+
+        Yields:
+            tuple: (date, ShiftRecord) in date and start time order
+        """
+        first_day = max(first_day or self.start_date, self.start_date)
+        last_day = min(last_day or self.end_date, self.end_date)
+        if (last_day - first_day).days + 1 > len(self._days):
+            days = (day for day in self._days if first_day <= day <= last_day)
+        else:
+            days = (first_day + timedelta(days=i) for i in range((last_day - first_day).days + 1))
+        for day in days:
+            for record in self._days.get(day, ()):
+                yield day, record
+
+    def get_week(self, week_start):
+        """Published shifts of the week starting on a date, as (date, ShiftRecord) pairs"""
+        return self.iter_shifts(week_start, week_start + timedelta(days=6))
+
+    # DIFFS
+    def diff(self, other):
+        """
+        Changes from this version to another version of the same schedule
+
+        Days with equal hashes are skipped without looking at their shifts.
+
+        Args:
+            other (ScheduleSnapshot): The newer version
+
+        Returns:
+            list: ShiftChange tuples in date order ('changed' has both records, 'added'/'removed' one)
+        """
+        changes = []
+        for day in sorted(set(self._day_hashes) | set(other.day_hashes)):
+            if self._day_hashes.get(day) == other.day_hashes.get(day):
+                continue
+            old = {record.id: record for record in self.get_day(day)}
+            new = {record.id: record for record in other.get_day(day)}
+            for shift_id in sorted(set(old) | set(new)):
+                if shift_id not in new:
+                    changes.append(ShiftChange('removed', day, shift_id, old[shift_id], None))
+                elif shift_id not in old:
+                    changes.append(ShiftChange('added', day, shift_id, None, new[shift_id]))
+                elif old[shift_id] != new[shift_id]:
+                    changes.append(ShiftChange('changed', day, shift_id, old[shift_id], new[shift_id]))
+        # A shift moved to another day shows up as removed on one day and added on the other
+        return changes
+
+    # SERIALIZATION
+    def to_dict(self):
+        """Convert snapshot to dictionary for JSON serialization"""
+        return {
+            'hash': self.hash,
+            'schedule_id': self.schedule_id,
+            'start_date': self.start_date.isoformat(),
+            'end_date': self.end_date.isoformat(),
+            'location': self.location,
+            'version': self.version,
+            'published_at': self.published_at,
+            'parent_hash': self.parent_hash,
+            'days': {day.isoformat(): [list(record) for record in records] for day, records in self._days.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """
+        Create snapshot from dictionary (JSON deserialization)
+
+        Raises:
+            ValueError: If the content doesn't match the stored hash
+        """
+        days = {}
+        for day, records in data['days'].items():
+            days[datetime.strptime(day, "%Y-%m-%d").date()] = tuple(
+                ShiftRecord(shift_id, start, end, tuple(roles), location, min_staff, max_staff, tuple(assigned))
+                for shift_id, start, end, roles, location, min_staff, max_staff, assigned in records)
+        snapshot = cls(data['schedule_id'], datetime.strptime(data['start_date'], "%Y-%m-%d").date(),
+                       datetime.strptime(data['end_date'], "%Y-%m-%d").date(), data.get('location'), days,
+                       data.get('version', 1), data.get('published_at'), data.get('parent_hash'))
+        if data.get('hash') and data['hash'] != snapshot.hash:
+            raise ValueError(f"Published schedule {data['schedule_id']} v{data.get('version')} "
+                             f"doesn't match its hash (file changed or damaged)")
+        return snapshot
+
+    def __repr__(self):
+        return f"ScheduleSnapshot(schedule={self.schedule_id}, v{self.version}, {self.hash[:12]})"
+
+
+class Publisher:
+    def __init__(self, snapshots=None, bus=event_bus):
+        """
+        Publishes schedules and records the edits made since each schedule's last publish
+
+        Args:
+            snapshots (list): Previously published ScheduleSnapshots (e.g., from load_snapshots)
+            bus (EventBus): Event bus the edits are recorded from
+        """
+        # schedule_id -> list of snapshots, oldest first
+        self._versions = {}
+        # schedule_id -> Deltas since the latest snapshot
+        self._deltas = {}
+        # Published schedules whose edits since the snapshot are unknown (e.g., loaded from disk)
+        self._unknown = set()
+
+        for snapshot in sorted(snapshots or [], key=lambda s: (s.schedule_id, s.version)):
+            self._versions.setdefault(snapshot.schedule_id, []).append(snapshot)
+            self._unknown.add(snapshot.schedule_id)
+
+        self._bus = bus
+        self._bus.subscribe(SHIFT_ADDED, self._on_shift_added)
+        self._bus.subscribe(SHIFTS_ADDED, self._on_shifts_added)
+        self._bus.subscribe(EMPLOYEE_ASSIGNED, self._on_assigned)
+        self._bus.subscribe(EMPLOYEE_UNASSIGNED, self._on_unassigned)
+
+    def close(self):
+        """Stop listening for model events"""
+        self._bus.unsubscribe(SHIFT_ADDED, self._on_shift_added)
+        self._bus.unsubscribe(SHIFTS_ADDED, self._on_shifts_added)
+        self._bus.unsubscribe(EMPLOYEE_ASSIGNED, self._on_assigned)
+        self._bus.unsubscribe(EMPLOYEE_UNASSIGNED, self._on_unassigned)
+
+    # PUBLISHING
+    def publish(self, schedule):
+        """
+        Publish the schedule as it is now (build() followed by commit())
+
+        Args:
+            schedule (Schedule): The schedule to publish
+
+        Returns:
+            tuple: (ScheduleSnapshot, bool) - the latest snapshot and whether a new version was made
+                   (False when nothing changed since the last publish)
+        """
+        snapshot, created = self.build(schedule)
+        self.commit(schedule, snapshot)
+        return snapshot, created
+
+    def build(self, schedule):
+        """
+        Freeze the schedule as it is now, without publishing it yet
+
+        Only the days edited since the last publish are rebuilt; the others
+        are shared with the previous version. Nothing changes until the
+        snapshot is passed to commit(), so a snapshot that fails to save can
+        simply be dropped.
+
+        Args:
+            schedule (Schedule): The schedule to publish
+
+        Returns:
+            tuple: (ScheduleSnapshot, bool) - the snapshot to commit and whether it is a new version
+                   (False when nothing changed since the last publish: the latest snapshot is returned)
+        """
+        previous = self.get_latest(schedule.id)
+        if previous is None or schedule.id in self._unknown:
+            dirty = None  # Rebuild every day
+        else:
+            dirty = {delta.date for delta in self._deltas.get(schedule.id, [])}
+
+        days = {}
+        shared_hashes = {}
+        day = schedule.start_date
+        while day <= schedule.end_date:
+            if dirty is not None and day not in dirty:
+                records = previous.get_day(day)
+            else:
+                records = record_day(schedule.get_shifts_by_date(day))
+                if previous is not None and records == previous.get_day(day):
+                    records = previous.get_day(day)  # Same content: keep sharing the old tuple
+            if previous is not None and records is previous.get_day(day) and records:
+                shared_hashes[day] = previous.day_hashes[day]
+            days[day] = records
+            day += timedelta(days=1)
+
+        snapshot = ScheduleSnapshot(schedule.id, schedule.start_date, schedule.end_date, schedule.location, days,
+                                    version=previous.version + 1 if previous else 1,
+                                    parent_hash=previous.hash if previous else None, day_hashes=shared_hashes)
+        if previous is not None and snapshot.hash == previous.hash:
+            return previous, False
+        return snapshot, True
+
+    def commit(self, schedule, snapshot):
+        """
+        Make a snapshot from build() the schedule's latest version
+
+        Every shift in the schedule is marked as published and the edits
+        recorded against the previous version are cleared.
+
+        Args:
+            schedule (Schedule): The schedule the snapshot was built from
+            snapshot (ScheduleSnapshot): The snapshot (e.g., once it has been saved)
+
+        Raises:
+            ValueError: If the snapshot isn't the schedule's next version
+        """
+        previous = self.get_latest(schedule.id)
+        if snapshot is not previous:
+            if snapshot.schedule_id != schedule.id or snapshot.parent_hash != (previous.hash if previous else None):
+                raise ValueError(f"Snapshot v{snapshot.version} is not the next version of schedule {schedule.id}")
+            self._versions.setdefault(schedule.id, []).append(snapshot)
+        for shift in schedule.get_all_shifts():
+            shift.is_published = True
+        self._deltas[schedule.id] = []
+        self._unknown.discard(schedule.id)
+
+    def remove_schedule(self, schedule_id):
+        """Forget a deleted schedule's versions and deltas"""
+        self._versions.pop(schedule_id, None)
+        self._deltas.pop(schedule_id, None)
+        self._unknown.discard(schedule_id)
+
+    # EDITS
+    def _record(self, shift, kind, employee_id=None):
+        schedule = shift.schedule
+        if schedule is None or schedule.id not in self._versions:
+            return
+        self._deltas.setdefault(schedule.id, []).append(Delta(kind, shift.id, shift.date, employee_id))
+        shift.is_published = False
+
+    def _on_shift_added(self, schedule, shift):
+        self._record(shift, 'shift_added')
+
+    def _on_shifts_added(self, schedule, shifts):
+        for shift in shifts:
+            self._record(shift, 'shift_added')
+
+    def _on_assigned(self, shift, employee):
+        self._record(shift, 'assigned', employee.id)
+
+    def _on_unassigned(self, shift, employee_id):
+        self._record(shift, 'unassigned', employee_id)
+
+    def mark_changed(self, shift):
+        """Record an edit made without an event (e.g., a shift's times) so the next publish picks it up"""
+        self._record(shift, 'shift_changed')
+
+    # QUERIES
+    def is_published(self, schedule_id):
+        return schedule_id in self._versions
+
+    def get_versions(self, schedule_id):
+        """
+        Every published version of a schedule
+
+        Returns:
+            list: ScheduleSnapshots, oldest first
+        """
+        return list(self._versions.get(schedule_id, []))
+
+    def get_latest(self, schedule_id):
+        """Latest published version of a schedule (None if never published)"""
+        versions = self._versions.get(schedule_id)
+        return versions[-1] if versions else None
+
+    def get_deltas(self, schedule_id):
+        """
+        Edits recorded since the schedule was last published
+
+        Returns:
+            list: Delta tuples, oldest first
+        """
+        return list(self._deltas.get(schedule_id, []))
+
+    def has_unpublished_changes(self, schedule_id):
+        """Whether the schedule may differ from its latest published version"""
+        return schedule_id in self._unknown or bool(self._deltas.get(schedule_id))
+
+    def diff(self, schedule_id, old_version, new_version):
+        """
+        Changes between two published versions of a schedule
+
+        Returns:
+            list: ShiftChange tuples (see ScheduleSnapshot.diff)
+
+        Raises:
+            ValueError: If either version doesn't exist
+        """
+        versions = {snapshot.version: snapshot for snapshot in self._versions.get(schedule_id, [])}
+        for version in (old_version, new_version):
+            if version not in versions:
+                raise ValueError(f"Schedule {schedule_id} has no published version {version}")
+        return versions[old_version].diff(versions[new_version])
+
+
+def get_snapshot_file(directory, schedule_id, version):
+    """Path of a published version of a schedule in a directory"""
+    return os.path.join(directory, f"schedule_{schedule_id}_v{version}.json")
+
+
+def save_snapshot(snapshot, directory=PUBLISHED_DIR):
+    """
+    Write a snapshot to <directory>/schedule_<id>_v<version>.json (once - snapshots never change)
+
+    Files are named by version rather than by hash, so a version with the
+    same content as an earlier one (e.g., an edit that was reverted) is kept
+    too. The hash is stored in the file and checked when it is loaded.
+
+    Returns:
+        str: Path of the file
+    """
+    if not os.path.exists(directory):
+        os.makedirs(directory)
+    path = get_snapshot_file(directory, snapshot.schedule_id, snapshot.version)
+    if not os.path.exists(path):
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w') as file:
+            json.dump(snapshot.to_dict(), file, separators=(',', ':'))
+        os.replace(temp_path, path)
+    return path
+
+
+def delete_snapshots(schedule_id, directory=PUBLISHED_DIR):
+    """
+    Delete every published version of a schedule (e.g., when the schedule is deleted)
+
+    Otherwise a schedule that later gets the same ID would pick up the old versions.
+
+    Returns:
+        int: Number of files deleted
+    """
+    if not os.path.exists(directory):
+        return 0
+    prefix = f"schedule_{schedule_id}_v"
+    deleted = 0
+    for name in os.listdir(directory):
+        if name.startswith(prefix) and name.endswith('.json'):
+            os.remove(os.path.join(directory, name))
+            deleted += 1
+    return deleted
+
+
+def load_snapshots(directory=PUBLISHED_DIR):
+    """
+    Load every published snapshot in a directory
+
+    Returns:
+        list: ScheduleSnapshots (files that don't match their hash are skipped with a warning)
+    """
+    if not os.path.exists(directory):
+        return []
+    snapshots = []
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith('.json'):
+            continue
+        try:
+            with open(os.path.join(directory, name), 'r') as file:
+                snapshots.append(ScheduleSnapshot.from_dict(json.load(file)))
+        except (ValueError, KeyError) as e:
+            print(f"Warning: Skipping published schedule {name}: {e}")
+    return snapshots
@@ -0,0 +1,473 @@
+from datetime import timedelta
+from .events import event_bus, SHIFT_ADDED, SHIFTS_ADDED, EMPLOYEE_ASSIGNED, EMPLOYEE_UNASSIGNED
+from .ledger import get_week_start
+
+class Violation:
+    def __init__(self, constraint, employee_id, shift, message, penalty=0.0):
+        """
+        A constraint broken (or, for soft constraints, strained) by an assignment
+
+        Args:
+            constraint (Constraint): The constraint that produced it
+            employee_id (int): The employee
+            shift (Shift): The shift
+            message (str): Human-readable reason
+            penalty (float): Cost added to the schedule's score (soft constraints)
+        """
+        self.constraint = constraint
+        self.employee_id = employee_id
+        self.shift = shift
+        self.message = message
+        self.penalty = penalty
+
+    @property
+    def is_hard(self):
+        """Whether the violation makes the assignment infeasible"""
+        return self.constraint.hard
+
+    def __str__(self):
+        kind = "HARD" if self.is_hard else "soft"
+        return f"[{kind}] {self.constraint.name}: employee {self.employee_id}, shift {self.shift.id} - {self.message}"
+
+
+class Constraint:
+    # Identifies the rule in violations and in RuleEngine.remove_constraint()
+    name = "constraint"
+    # Days either side of a shift the rule looks at (used to re-check neighbours incrementally)
+    reach_days = 0
+
+    def __init__(self, hard=True, weight=1.0):
+        """
+        Base class for a pluggable scheduling rule
+
+        Subclasses implement check(), looking only at the employee's shifts near
+        the shift being checked (via RuleEngine.get_timeline), so a rule
+        costs the same no matter how big the schedule is.
+
+        Args:
+            hard (bool): Hard constraints block an assignment, soft ones only add a penalty
+            weight (float): Penalty multiplier for soft constraints
+        """
+        self.hard = hard
+        self.weight = weight
+
+    def get_reach_days(self, engine):
+        """Days either side of a shift the rule looks at in this engine (default reach_days)"""
+        return self.reach_days
+
+    def check(self, engine, employee, shift):
+        """
+        Check an assignment of employee to shift
+
+        The assignment may be proposed or existing; rules must ignore the
+        shift itself when looking at the employee's other shifts.
+
+        Returns:
+            Violation: The violation, or None if the rule is satisfied
+        """
+        raise NotImplementedError
+
+    def violation(self, employee, shift, message, amount=1.0):
+        """Create a Violation of this rule (penalty = weight x amount)"""
+        return Violation(self, employee.id, shift, message, self.weight * amount)
+
+
+class ShiftCapacityRule(Constraint):
+    name = "capacity"
+
+    def check(self, engine, employee, shift):
+        others = [emp_id for emp_id in shift.assigned_employees if emp_id != employee.id]
+        if len(others) >= shift.max_staff:
+            return self.violation(employee, shift, "Shift is already full")
+        return None
+
+
+class RoleRule(Constraint):
+    name = "role"
+
+    def check(self, engine, employee, shift):
+        # Managers can work any role
+        if employee.is_manager or employee.role.lower() in [role.lower() for role in shift.roles_required]:
+            return None
+        return self.violation(employee, shift, "Employee's role does not match shift requirements")
+
+
+class AvailabilityRule(Constraint):
+    name = "availability"
+
+    def check(self, engine, employee, shift):
+        if employee.is_available(shift.get_day_name(), shift.start_time, shift.end_time):
+            return None
+        return self.violation(employee, shift, "Employee is not available for chosen day/time")
+
+
+class LocationRule(Constraint):
+    name = "location"
+
+    def check(self, engine, employee, shift):
+        if employee.works_at(shift.location):
+            return None
+        return self.violation(employee, shift, f"Employee does not work at {shift.location}")
+
+
+class NoOverlapRule(Constraint):
+    name = "overlap"
+    reach_days = 1
+
+    def check(self, engine, employee, shift):
+        too_close = engine.get_timeline(employee.id).find_too_close(shift)
+        if too_close is not None:
+            return self.violation(employee, shift, f"Employee is already working shift {too_close[0].id} at that time")
+        return None
+
+
+class MaxHoursRule(Constraint):
+    name = "max_hours"
+
+    def check(self, engine, employee, shift):
+        hours = engine.get_week_hours(employee.id, shift) + shift.get_duration_hours()
+        if hours > employee.max_hours:
+            return self.violation(employee, shift,
+                                  f"Employee would exceed max hours ({employee.max_hours}) for the week")
+        return None
+
+
+class MinRestRule(Constraint):
+    name = "min_rest"
+
+    def __init__(self, hours=None, hard=True, weight=1.0):
+        """
+        Require a rest period between an employee's shifts
+
+        Args:
+            hours (float): Minimum hours between the end of one shift and the start of the next
+                (None to use the schedule's min_rest_hours, the limit Shift.assign_employee enforces)
+        """
+        super().__init__(hard, weight)
+        self.hours = hours
+
+    def get_hours(self, engine):
+        """The rest period in force (None if there is none)"""
+        return self.hours if self.hours is not None else engine.schedule.min_rest_hours
+
+    def get_reach_days(self, engine):
+        hours = self.get_hours(engine)
+        return int(hours // 24) + 1 if hours else 0
+
+    def check(self, engine, employee, shift):
+        hours = self.get_hours(engine)
+        if not hours:
+            return None
+        too_close = engine.get_timeline(employee.id).find_too_close(shift, hours * 60)
+        # Overlaps are left to NoOverlapRule
+        if too_close is not None and too_close[1] >= 0:
+            other, gap = too_close
+            return self.violation(employee, shift,
+                                  f"Only {gap / 60:.1f}h rest next to shift {other.id} (min {hours}h)")
+        return None
+
+
+class MaxConsecutiveDaysRule(Constraint):
+    name = "max_consecutive_days"
+
+    def __init__(self, days=None, hard=True, weight=1.0):
+        """
+        Limit how many days in a row an employee works
+
+        Args:
+            days (int): Maximum consecutive work days
+                (None to use the schedule's max_consecutive_days, the limit Shift.assign_employee enforces)
+        """
+        super().__init__(hard, weight)
+        self.days = days
+
+    def get_days(self, engine):
+        """The limit in force (None if there is none)"""
+        return self.days if self.days is not None else engine.schedule.max_consecutive_days
+
+    def get_reach_days(self, engine):
+        return self.get_days(engine) or 0
+
+    def check(self, engine, employee, shift):
+        days = self.get_days(engine)
+        if days is not None and engine.get_timeline(employee.id).get_streak(shift.date) > days:
+            return self.violation(employee, shift, f"Employee would work more than {days} days in a row")
+        return None
+
+
+class OvertimeRule(Constraint):
+    name = "overtime"
+
+    def __init__(self, weekly_hours=40, hard=False, weight=1.0):
+        """
+        Discourage (soft) or forbid (hard) weekly overtime
+
+        Args:
+            weekly_hours (float): Hours per week before overtime
+            weight (float): Penalty per overtime hour
+        """
+        super().__init__(hard, weight)
+        self.weekly_hours = weekly_hours
+
+    def check(self, engine, employee, shift):
+        before = engine.get_week_hours(employee.id, shift)
+        after = before + shift.get_duration_hours()
+        overtime = max(0.0, after - max(before, self.weekly_hours))
+        if overtime > 0:
+            return self.violation(employee, shift, f"{overtime:.1f}h of overtime", overtime)
+        return None
+
+
+class LaborCostRule(Constraint):
+    name = "labor_cost"
+
+    def __init__(self, hard=False, weight=0.01):
+        """
+        Prefer cheaper employees (soft): penalty is wage x hours x weight
+
+        Not in the default rule set, since every assignment has a cost.
+        """
+        super().__init__(hard, weight)
+
+    def check(self, engine, employee, shift):
+        return self.violation(employee, shift, "Labor cost", employee.wage * shift.get_duration_hours())
+
+
+def get_default_constraints():
+    """
+    The standard rule set: the checks Shift.assign_employee makes (including
+    overlapping shifts), plus overtime
+
+    The rest period and consecutive days rules follow the schedule's
+    min_rest_hours and max_consecutive_days (off unless configured), so the
+    engine and Shift.assign_employee never disagree about them.
+
+    Returns:
+        list: List of Constraint objects
+    """
+    return [
+        ShiftCapacityRule(), RoleRule(), LocationRule(), AvailabilityRule(), NoOverlapRule(), MaxHoursRule(),
+        MinRestRule(), MaxConsecutiveDaysRule(), OvertimeRule()
+    ]
+
+
+class RuleEngine:
+    def __init__(self, schedule, employees, constraints=None, bus=event_bus):
+        """
+        Evaluates pluggable constraints against a schedule's assignments
+
+        The engine keeps each employee's shifts bucketed by day and listens for
+        assignment changes. When an assignment changes, only that employee's
+        days within reach of the shift are re-checked, so the current
+        violations are always up to date without rescanning the schedule.
+
+        Args:
+            schedule (Schedule): The schedule to evaluate
+            employees (list): Employee objects that may be assigned
+            constraints (list): Constraint objects (default get_default_constraints())
+            bus (EventBus): Event bus used to follow assignment changes
+        """
+        self.schedule = schedule
+        self.constraints = list(constraints) if constraints is not None else get_default_constraints()
+        self._employees = {employee.id: employee for employee in employees}
+        # (employee_id, date) -> list of shifts the employee is assigned to that day
+        self._shifts_by_day = {}
+        # (employee_id, date) -> list of violations for the employee's shifts that day
+        self._violations = {}
+
+        for shift in schedule.get_all_shifts():
+            for emp_id in shift.assigned_employees:
+                self._shifts_by_day.setdefault((emp_id, shift.date), []).append(shift)
+        for emp_id, day in list(self._shifts_by_day):
+            self._recheck_day(emp_id, day)
+
+        self._bus = bus
+        self._bus.subscribe(SHIFT_ADDED, self._on_shift_added)
+        self._bus.subscribe(SHIFTS_ADDED, self._on_shifts_added)
+        self._bus.subscribe(EMPLOYEE_ASSIGNED, self._on_assigned)
+        self._bus.subscribe(EMPLOYEE_UNASSIGNED, self._on_unassigned)
+
+    def close(self):
+        """Stop listening for model events"""
+        self._bus.unsubscribe(SHIFT_ADDED, self._on_shift_added)
+        self._bus.unsubscribe(SHIFTS_ADDED, self._on_shifts_added)
+        self._bus.unsubscribe(EMPLOYEE_ASSIGNED, self._on_assigned)
+        self._bus.unsubscribe(EMPLOYEE_UNASSIGNED, self._on_unassigned)
+
+    # CONFIGURATION
+    def add_employee(self, employee):
+        """Make an employee known to the engine"""
+        self._employees[employee.id] = employee
+
+    def add_constraint(self, constraint):
+        """Add a rule and re-check existing assignments against it"""
+        self.constraints.append(constraint)
+        self.revalidate()
+
+    def remove_constraint(self, name):
+        """
+        Remove every rule with the given name
+
+        Returns:
+            bool: True if a rule was removed, False otherwise
+        """
+        remaining = [c for c in self.constraints if c.name != name]
+        removed = len(remaining) != len(self.constraints)
+        self.constraints = remaining
+        if removed:
+            self.revalidate()
+        return removed
+
+    # STATE USED BY CONSTRAINTS
+    def get_timeline(self, employee_id):
+        """Get the employee's time-sorted shifts in the schedule (see EmployeeTimeline)"""
+        return self.schedule.get_timeline(employee_id)
+
+    def get_week_hours(self, employee_id, shift):
+        """Hours the employee works in the shift's week, not counting the shift itself"""
+        hours = self.schedule.get_employee_hours(employee_id, shift.date)
+        if employee_id in shift.assigned_employees:
+            hours -= shift.get_duration_hours()
+        return hours
+
+    # CHECKING
+    def check(self, employee, shift):
+        """
+        Evaluate every rule for assigning employee to shift
+
+        Returns:
+            list: Violation objects (hard and soft)
+        """
+        violations = []
+        for constraint in self.constraints:
+            violation = constraint.check(self, employee, shift)
+            if violation is not None:
+                violations.append(violation)
+        return violations
+
+    def can_assign(self, employee, shift):
+        """Whether assigning employee to shift breaks no hard rule"""
+        for constraint in self.constraints:
+            if constraint.hard and constraint.check(self, employee, shift) is not None:
+                return False
+        return True
+
+    def get_penalty(self, employee, shift):
+        """
+        Soft-rule penalty of assigning employee to shift
+
+        Hard rules are checked first, stopping at the first one broken.
+
+        Returns:
+            float: Total penalty, or None if a hard rule is broken
+        """
+        if not self.can_assign(employee, shift):
+            return None
+        penalty = 0.0
+        for constraint in self.constraints:
+            if not constraint.hard:
+                violation = constraint.check(self, employee, shift)
+                if violation is not None:
+                    penalty += violation.penalty
+        return penalty
+
+    def assign(self, employee, shift):
+        """
+        Assign an employee to a shift if no hard rule is broken
+
+        Shift.assign_employee still runs its own checks and emits the event
+        the engine uses to update its state.
+
+        Raises:
+            ValueError: With the first hard violation's message
+        """
+        for violation in self.check(employee, shift):
+            if violation.is_hard:
+                raise ValueError(violation.message)
+        return shift.assign_employee(employee)
+
+    # CURRENT VIOLATIONS
+    def get_violations(self, hard_only=False):
+        """
+        Get the violations of the schedule's current assignments
+
+        Returns:
+            list: Violation objects sorted by date and employee
+        """
+        violations = []
+        for (emp_id, day) in sorted(self._violations, key=lambda key: (key[1], key[0])):
+            for violation in self._violations[(emp_id, day)]:
+                if violation.is_hard or not hard_only:
+                    violations.append(violation)
+        return violations
+
+    def get_score(self):
+        """Total soft penalty of the current assignments (lower is better)"""
+        return sum(v.penalty for vs in self._violations.values() for v in vs if not v.is_hard)
+
+    def is_feasible(self):
+        """Whether the current assignments break no hard rule"""
+        return not self.get_violations(hard_only=True)
+
+    def revalidate(self):
+        """Re-check every assignment (after the rules change)"""
+        self._violations = {}
+        for emp_id, day in list(self._shifts_by_day):
+            self._recheck_day(emp_id, day)
+
+    def _recheck_day(self, employee_id, day):
+        """Re-check the employee's shifts on one day"""
+        self._violations.pop((employee_id, day), None)
+        employee = self._employees.get(employee_id)
+        if employee is None:
+            return
+        violations = []
+        for shift in self._shifts_by_day.get((employee_id, day), ()):
+            violations.extend(self.check(employee, shift))
+        if violations:
+            self._violations[(employee_id, day)] = violations
+
+    def _recheck_around(self, employee_id, day):
+        """Re-check the employee's days a changed shift on day can affect"""
+        reach = max([c.get_reach_days(self) for c in self.constraints] + [0])
+        for offset in range(-reach, reach + 1):
+            neighbour = day + timedelta(days=offset)
+            if (employee_id, neighbour) in self._shifts_by_day or (employee_id, neighbour) in self._violations:
+                self._recheck_day(employee_id, neighbour)
+        # Weekly rules (max hours, overtime) depend on the rest of the week too
+        week_start = get_week_start(day)
+        for offset in range(7):
+            neighbour = week_start + timedelta(days=offset)
+            if abs((neighbour - day).days) > reach and (employee_id, neighbour) in self._shifts_by_day:
+                self._recheck_day(employee_id, neighbour)
+
+    # EVENT HANDLERS
+    def _on_shift_added(self, schedule, shift):
+        if schedule is self.schedule:
+            for emp_id in shift.assigned_employees:
+                self._add_assignment(emp_id, shift)
+
+    def _on_shifts_added(self, schedule, shifts):
+        for shift in shifts:
+            self._on_shift_added(schedule, shift)
+
+    def _on_assigned(self, shift, employee):
+        if shift.schedule is self.schedule:
+            self._employees.setdefault(employee.id, employee)
+            self._add_assignment(employee.id, shift)
+
+    def _on_unassigned(self, shift, employee_id):
+        if shift.schedule is not self.schedule:
+            return
+        shifts = self._shifts_by_day.get((employee_id, shift.date), [])
+        if shift in shifts:
+            shifts.remove(shift)
+            if not shifts:
+                del self._shifts_by_day[(employee_id, shift.date)]
+            self._recheck_around(employee_id, shift.date)
+
+    def _add_assignment(self, employee_id, shift):
+        shifts = self._shifts_by_day.setdefault((employee_id, shift.date), [])
+        if shift not in shifts:
+            shifts.append(shift)
+            self._recheck_around(employee_id, shift.date)
@@ -1,4 +1,9 @@
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
+from .events import event_bus, SHIFT_ADDED, SHIFTS_ADDED
+from .ledger import HoursLedger, get_week_start
+from .timeline import EmployeeTimeline, get_shift_interval
+from .fairness import gini_coefficient
+from .profiling import timed
 # from .shift import Shift  # Import removed to avoid circular dependency
 # from .employee import Employee
 
@@ -7,14 +12,26 @@ class Schedule:
     # Class variable to track the next schedule ID
     _next_id = 1000
     
-    def __init__(self, start_date, end_date, shifts=None):
+    # Labor rules checked on every assignment are off unless configured
+    DEFAULT_MIN_REST_HOURS = None
+    DEFAULT_MAX_CONSECUTIVE_DAYS = None
+    
+    def __init__(self, start_date, end_date, shifts=None, min_rest_hours=DEFAULT_MIN_REST_HOURS,
+                 max_consecutive_days=DEFAULT_MAX_CONSECUTIVE_DAYS, location=None):
         """
         Initialize a new Schedule
         
+        Schedules can cover any number of days (e.g., a week, or a 2-week or
+        4-week rotation). Shifts are bucketed by date, so looking up a day or
+        a week costs the same however long the schedule is.
+        
         Args:
-            start_date (date or str): The start date, should be Monday (YYYY-MM-DD format if string)
-            end_date (date or str): The end date, should be Sunday (YYY-MM-DD format if string)
+            start_date (date or str): The start date, usually a Monday (YYYY-MM-DD format if string)
+            end_date (date or str): The last date, inclusive (YYYY-MM-DD format if string)
             shifts (list of Shift objects):
+            min_rest_hours (float): Minimum hours between an employee's shifts (None, the default, for no limit)
+            max_consecutive_days (int): Maximum days in a row an employee can work (None, the default, for no limit)
+            location (str): Location the schedule is for (None for shifts at any location)
         """
 
         # Auto-generate schedule ID
@@ -31,12 +48,35 @@ class Schedule:
             self.end_date = datetime.strptime(end_date, "%Y-%m-%d").date()
         else:
             self.end_date = end_date
+        
+        if self.end_date < self.start_date:
+            raise ValueError("Schedule end date cannot be before its start date")
+
+        # Labor rules
+        self.min_rest_hours = min_rest_hours
+        self.max_consecutive_days = max_consecutive_days
+        
+        self.location = location
+        
+        # Assignments at other locations (a ConflictIndex, set when scheduling one site; not serialized)
+        self.conflict_index = None
+
+        # Hours scheduled per employee per week, kept up to date on every assignment
+        self.hours_ledger = HoursLedger()
+        
+        # employee_id -> EmployeeTimeline of their assigned shifts, sorted by time
+        self.timelines = {}
+        
+        # date -> shifts on that date, in the order they were added
+        self._shifts_by_date = {}
 
         # Handle the shifts list
         if shifts is None:
             self.shifts = []
         else:
             self.shifts = shifts
+            for shift in self.shifts:
+                self._index_shift(shift)
 
     # METHODS
     def add_shift(self, shift):
@@ -56,9 +96,209 @@ class Schedule:
         if shift.date < self.start_date or shift.date > self.end_date:
             raise ValueError(f"Shift date {shift.date} is outside schedule range")
         
+        # Check the shift is at this schedule's location
+        self._check_location(shift)
+        
         self.shifts.append(shift)
+        self._index_shift(shift)
+        event_bus.emit(SHIFT_ADDED, schedule=self, shift=shift)
         return True
     
+    def add_shifts(self, shifts):
+        """
+        Add many shifts at once
+
+        Every shift is validated before any is added, so either all of them
+        are added or none are. They are indexed in one pass and a single
+        SHIFTS_ADDED event is emitted instead of one SHIFT_ADDED per shift.
+
+        Args:
+            shifts (list): Shift objects to add
+
+        Returns:
+            int: Number of shifts added, raise ValueError otherwise
+        """
+        shifts = list(shifts)
+        if not shifts:
+            return 0
+        if any(shift is None for shift in shifts):
+            raise ValueError("Cannot add None shift to schedule")
+
+        # Checking the earliest and latest dates covers every shift
+        first = min(shift.date for shift in shifts)
+        last = max(shift.date for shift in shifts)
+        if first < self.start_date or last > self.end_date:
+            outside = first if first < self.start_date else last
+            raise ValueError(f"Shift date {outside} is outside schedule range")
+        for shift in shifts:
+            self._check_location(shift)
+
+        self.shifts.extend(shifts)
+        for shift in shifts:
+            self._index_shift(shift)
+        event_bus.emit(SHIFTS_ADDED, schedule=self, shifts=shifts)
+        return len(shifts)
+
+    def _check_location(self, shift):
+        """Raise ValueError if the shift is at a different location than the schedule"""
+        if self.location is not None and shift.location.lower() != self.location.lower():
+            raise ValueError(f"Shift location {shift.location} does not match schedule location {self.location}")
+
+    def clone(self, weeks=None, keep_assignments=False, employees_list=None, changed_employee_ids=None):
+        """
+        Copy this schedule forward (e.g., "copy last week" or "copy last rotation")
+
+        Shifts are copied object to object (no to_dict/from_dict round trip)
+        and added with add_shifts. Moving by whole weeks keeps every shift on
+        the same weekday, so only employees in changed_employee_ids are
+        re-checked for role and availability. Every kept assignment is checked
+        in time order against the copy's weekly hours and labor rules (and
+        bookings at other locations), like Shift.assign_employee does.
+        Assignments that fail, and employees missing from employees_list, are
+        dropped (compare assigned_employees with the source to report them).
+
+        Args:
+            weeks (int): Weeks to move the copy by (default get_period_weeks(), i.e. the next period)
+            keep_assignments (bool): Keep the assigned employees (default False)
+            employees_list (list): Current employees (None to keep every assignment)
+            changed_employee_ids (set): IDs of employees whose role or availability changed
+
+        Returns:
+            Schedule: The new schedule
+        """
+        if weeks is None:
+            weeks = self.get_period_weeks()
+        offset = timedelta(weeks=weeks)
+        copy = Schedule(self.start_date + offset, self.end_date + offset, min_rest_hours=self.min_rest_hours,
+                        max_consecutive_days=self.max_consecutive_days, location=self.location)
+        copy.conflict_index = self.conflict_index
+        shifts = [shift.copy(days=7 * weeks, keep_assignments=keep_assignments) for shift in self.shifts]
+
+        if keep_assignments and employees_list is not None:
+            employees_by_id = {emp.id: emp for emp in employees_list}
+            changed = set(changed_employee_ids or ())
+            for shift in sorted(shifts, key=lambda s: (s.date, s.start_time)):
+                kept = []
+                for emp_id in shift.assigned_employees:
+                    employee = employees_by_id.get(emp_id)
+                    if (employee is None or (emp_id in changed and shift.check_employee(employee)) or
+                            copy.hours_ledger.would_exceed_max(employee, shift) or
+                            copy.check_labor_rules(emp_id, shift)):
+                        continue
+                    kept.append(emp_id)
+                    copy.record_assignment(shift, emp_id)
+                if len(kept) != len(shift.assigned_employees):
+                    shift.assigned_employees = kept
+                    shift.update_filled_status([employees_by_id[emp_id] for emp_id in kept])
+            # add_shifts records the kept assignments again
+            for shift in shifts:
+                for emp_id in shift.assigned_employees:
+                    copy.unrecord_assignment(shift, emp_id)
+
+        copy.add_shifts(shifts)
+        return copy
+
+    def _index_shift(self, shift):
+        """Link a shift to this schedule, bucket it by date and record its existing assignments"""
+        shift.schedule = self
+        self._shifts_by_date.setdefault(shift.date, []).append(shift)
+        for employee_id in shift.assigned_employees:
+            self.record_assignment(shift, employee_id)
+    
+    def record_assignment(self, shift, employee_id):
+        """Add an assignment to the hours ledger and the employee's timeline"""
+        self.hours_ledger.record_shift(shift, employee_id)
+        timeline = self.timelines.get(employee_id)
+        if timeline is None:
+            timeline = self.timelines[employee_id] = EmployeeTimeline()
+        timeline.add(shift)
+    
+    def unrecord_assignment(self, shift, employee_id):
+        """Remove an assignment from the hours ledger and the employee's timeline"""
+        self.hours_ledger.unrecord_shift(shift, employee_id)
+        timeline = self.timelines.get(employee_id)
+        if timeline is not None:
+            timeline.remove(shift)
+            if not len(timeline):
+                del self.timelines[employee_id]
+    
+    def get_timeline(self, employee_id):
+        """Get an employee's timeline of assigned shifts (empty if they have none)"""
+        return self.timelines.get(employee_id) or EmployeeTimeline()
+    
+    def check_labor_rules(self, employee_id, shift):
+        """
+        Check the rest period and consecutive days rules for an assignment
+        
+        Uses the employee's timeline, so only the shifts next to this one are
+        looked at (O(log n) plus the length of the current streak). With a
+        conflict_index, the employee's shifts at other locations are checked
+        for overlaps and rest too. The RuleEngine's default MinRestRule and
+        MaxConsecutiveDaysRule read the same settings, so there is one limit.
+        
+        Args:
+            employee_id (int): The employee
+            shift (Shift): The shift (proposed or already assigned)
+        
+        Returns:
+            str: Why the assignment breaks a rule, or None if it doesn't
+        """
+        if self.conflict_index is not None:
+            problem = self.conflict_index.check(employee_id, shift, self.min_rest_hours)
+            if problem:
+                return problem
+        
+        timeline = self.timelines.get(employee_id)
+        if timeline is None:
+            return None
+        
+        min_gap = (self.min_rest_hours or 0) * 60
+        too_close = timeline.find_too_close(shift, min_gap)
+        if too_close is not None:
+            other, gap = too_close
+            if gap < 0:
+                return f"Employee is already working shift {other.id} at that time"
+            return f"Employee needs {self.min_rest_hours} hours rest between shifts (only {gap / 60:.1f} next to shift {other.id})"
+        
+        if self.max_consecutive_days is not None and timeline.get_streak(shift.date) > self.max_consecutive_days:
+            return f"Employee would work more than {self.max_consecutive_days} days in a row"
+        return None
+    
+    def get_labor_rule_violations(self):
+        """
+        Check every assignment against the rest period and consecutive days rules
+        
+        Each timeline is already sorted, so this is one linear pass per employee.
+        
+        Returns:
+            list: List of (employee_id, shift, reason) tuples
+        """
+        violations = []
+        min_gap = (self.min_rest_hours or 0) * 60
+        for employee_id, timeline in self.timelines.items():
+            latest_end, latest_shift = None, None
+            streak, last_day = 0, None
+            for shift in timeline.get_shifts():
+                start, end = get_shift_interval(shift)
+                if latest_end is not None and start - latest_end < min_gap:
+                    gap = start - latest_end
+                    reason = (f"Overlaps shift {latest_shift.id}" if gap < 0 else
+                              f"Only {gap / 60:.1f} hours rest after shift {latest_shift.id}")
+                    violations.append((employee_id, shift, reason))
+                if latest_end is None or end > latest_end:
+                    latest_end, latest_shift = end, shift
+                
+                # Shifts are in time order, so days worked come in order too
+                if last_day is not None and (shift.date - last_day).days == 1:
+                    streak += 1
+                elif shift.date != last_day:
+                    streak = 1
+                if (self.max_consecutive_days is not None and streak > self.max_consecutive_days
+                        and shift.date != last_day):
+                    violations.append((employee_id, shift, f"Day {streak} in a row"))
+                last_day = shift.date
+        return violations
+    
     def get_all_shifts(self):
         """Return all shifts in the schedule"""
         return self.shifts
@@ -79,7 +319,50 @@ class Schedule:
         else:
             search_date = date
         
-        return [shift for shift in self.shifts if shift.date == search_date]
+        return list(self._shifts_by_date.get(search_date, []))
+    
+    def get_shifts_in_range(self, first_day, last_day):
+        """
+        Get all shifts between two dates (inclusive), in date order
+
+        Only the days in the range are looked at, not every shift.
+
+        Args:
+            first_day (date): First date
+            last_day (date): Last date
+
+        Returns:
+            list: List of shifts in the range
+        """
+        day = max(first_day, self.start_date)
+        last_day = min(last_day, self.end_date)
+        shifts = []
+        while day <= last_day:
+            shifts.extend(self._shifts_by_date.get(day, []))
+            day += timedelta(days=1)
+        return shifts
+    
+    def get_length_days(self):
+        """Number of days the schedule covers"""
+        return (self.end_date - self.start_date).days + 1
+    
+    def get_period_weeks(self):
+        """Length of the schedule in whole weeks, rounded up (e.g., 2 for a 14-day rotation)"""
+        return -(-self.get_length_days() // 7)
+    
+    def get_week_starts(self):
+        """
+        Mondays of the calendar weeks the schedule touches
+
+        Returns:
+            list: Dates, in order
+        """
+        week_start = get_week_start(self.start_date)
+        weeks = []
+        while week_start <= self.end_date:
+            weeks.append(week_start)
+            week_start += timedelta(days=7)
+        return weeks
     
     def get_shifts_by_employee(self, employee_id):
         """
@@ -93,6 +376,63 @@ class Schedule:
         """
         return [shift for shift in self.shifts if employee_id in shift.assigned_employees]
     
+    def get_employee_hours(self, employee_id, day):
+        """
+        Get the hours an employee is scheduled for in the week containing day
+
+        Args:
+            employee_id (int): The employee ID
+            day (date): Any date in the week
+
+        Returns:
+            float: Hours scheduled that week
+        """
+        return self.hours_ledger.get_hours(employee_id, day)
+    
+    def get_employees_under_min_hours(self, employees_list):
+        """
+        List employees scheduled for fewer than their min_hours
+
+        Args:
+            employees_list: List of all Employee objects
+
+        Returns:
+            list: List of (employee, week_start, hours) tuples for each week in the schedule
+        """
+        report = []
+        for week_start in self.get_week_starts():
+            for employee, hours in self.hours_ledger.get_employees_under_min_hours(employees_list, week_start):
+                report.append((employee, week_start, hours))
+        return report
+    
+    def get_hours_gini(self, employees_list, role=None):
+        """
+        Gini coefficient of the hours scheduled per employee (0 = perfectly even)
+
+        Args:
+            employees_list (list): Employees to include (those with no shifts count as 0 hours)
+            role (str): Only include employees with this role (default all)
+
+        Returns:
+            float: The coefficient
+        """
+        if role is not None:
+            employees_list = [emp for emp in employees_list if emp.role.lower() == role.lower()]
+        return gini_coefficient([self.hours_ledger.get_total_hours(emp.id) for emp in employees_list])
+
+    def get_fairness_report(self, employees_list):
+        """
+        Hours Gini coefficient for each role in the schedule
+
+        Args:
+            employees_list (list): List of all Employee objects
+
+        Returns:
+            dict: Role -> coefficient, sorted by role
+        """
+        roles = sorted({emp.role.lower() for emp in employees_list})
+        return {role: self.get_hours_gini(employees_list, role) for role in roles}
+
     def has_conflicts(self):
         """
         Check if any shifts in the schedule conflict with each other
@@ -100,12 +440,15 @@ class Schedule:
         Returns:
             bool: True if conflicts exist, False otherwise
         """
-        for i, shift1 in enumerate(self.shifts):
-            for shift2 in self.shifts[i+1:]:
-                if shift1.conflicts_with(shift2):
-                    return True
+        # Only shifts on the same date can conflict, so each day is checked on its own
+        for day_shifts in self._shifts_by_date.values():
+            for i, shift1 in enumerate(day_shifts):
+                for shift2 in day_shifts[i+1:]:
+                    if shift1.conflicts_with(shift2):
+                        return True
         return False
     
+    @timed("Schedule.calculate_payroll")
     def calculate_payroll(self, employees_list):
         """
         Calculate total payroll cost for entire schedule
@@ -131,6 +474,9 @@ class Schedule:
             'id': self.id,
             'start_date': self.start_date.isoformat(),  # Convert date to string
             'end_date': self.end_date.isoformat(),      # Convert date to string
+            'min_rest_hours': self.min_rest_hours,
+            'max_consecutive_days': self.max_consecutive_days,
+            'location': self.location,
             'shifts': [shift.to_dict() for shift in self.shifts]  # Recursively convert shifts
         }
     
@@ -141,7 +487,10 @@ class Schedule:
         schedule = cls(
             start_date=data['start_date'],
             end_date=data['end_date'],
-            shifts=None
+            shifts=None,
+            min_rest_hours=data.get('min_rest_hours', cls.DEFAULT_MIN_REST_HOURS),
+            max_consecutive_days=data.get('max_consecutive_days', cls.DEFAULT_MAX_CONSECUTIVE_DAYS),
+            location=data.get('location')
         )
         
         # Restore the original ID
@@ -152,5 +501,7 @@ class Schedule:
         
         # Recursively recreate shift objects
         schedule.shifts = [Shift.from_dict(shift_data) for shift_data in data.get('shifts', [])]
+        for shift in schedule.shifts:
+            schedule._index_shift(shift)
         
         return schedule
\ No newline at end of file
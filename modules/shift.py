@@ -1,4 +1,6 @@
-from datetime import datetime, date
+from datetime import datetime, date, timedelta
+from .events import event_bus, EMPLOYEE_ASSIGNED, EMPLOYEE_UNASSIGNED
+from .profiling import timed
 
 class Shift:
     # Class variable to track the next shift ID
@@ -47,6 +49,10 @@ class Shift:
         self.is_filled = False
         self.is_published = False
         
+        # Schedule this shift belongs to (set by Schedule.add_shift, not serialized)
+        self.schedule = None
+        
+    @timed("Shift.assign_employee")
     def assign_employee(self, employee):
         """
         Assign an employee to this shift
@@ -61,28 +67,77 @@ class Shift:
         if len(self.assigned_employees) >= self.max_staff:
             raise ValueError("Shift is already full")
             
-        # Check if employee has the required role
-        if employee.role.lower() not in [role.lower() for role in self.roles_required]:
-            # Allow managers to work any role
-            if not employee.is_manager:
-                raise ValueError("Employee's role does not match shift requirements")
-        
-        # Check if employee is available
-        day_name = self.date.strftime("%A")  # Get day name (Monday, Tuesday, etc.)
-        if not employee.is_available(day_name, self.start_time, self.end_time):
-            raise ValueError("Employee is not available for chosen day/time")
+        # Check role, location and availability
+        problem = self.check_employee(employee)
+        if problem:
+            raise ValueError(problem)
             
         # Check if employee is already assigned to this shift
         if employee.id in self.assigned_employees:
             raise ValueError("Employee is already assigned to this shift")
+        
+        # Check weekly hours, rest periods and consecutive days (only known once the shift is in a schedule)
+        if self.schedule is not None:
+            if self.schedule.hours_ledger.would_exceed_max(employee, self):
+                raise ValueError(f"Employee would exceed max hours ({employee.max_hours}) for the week")
+            problem = self.schedule.check_labor_rules(employee.id, self)
+            if problem:
+                raise ValueError(problem)
             
         # Assign the employee
         self.assigned_employees.append(employee.id)
+        if self.schedule is not None:
+            self.schedule.record_assignment(self, employee.id)
+        event_bus.emit(EMPLOYEE_ASSIGNED, shift=self, employee=employee)
         
         # Note: Call update_filled_status() after assignment to update filled status
         
         return True
     
+    def check_employee(self, employee):
+        """
+        Check whether an employee has the role, location and availability for this shift
+        
+        Args:
+            employee (Employee): Employee to check
+            
+        Returns:
+            str: Why the employee can't work the shift, or None if they can
+        """
+        # Check if employee has the required role
+        if employee.role.lower() not in [role.lower() for role in self.roles_required]:
+            # Allow managers to work any role
+            if not employee.is_manager:
+                return "Employee's role does not match shift requirements"
+        
+        # Check if employee works at this location
+        if not employee.works_at(self.location):
+            return f"Employee does not work at {self.location}"
+        
+        # Check if employee is available
+        day_name = self.date.strftime("%A")  # Get day name (Monday, Tuesday, etc.)
+        if not employee.is_available(day_name, self.start_time, self.end_time):
+            return "Employee is not available for chosen day/time"
+        return None
+    
+    def copy(self, days=0, keep_assignments=False):
+        """
+        Create a new shift with the same times, roles and staffing
+        
+        Args:
+            days (int): Days to move the copy by (e.g., 7 for the same shift next week)
+            keep_assignments (bool): Copy the assigned employees (and filled status) too
+            
+        Returns:
+            Shift: The copy, with a new ID and not in any schedule
+        """
+        shift = Shift(self.date + timedelta(days=days), self.start_time, self.end_time,
+                      list(self.roles_required), self.location, self.min_staff, self.max_staff)
+        if keep_assignments:
+            shift.assigned_employees = list(self.assigned_employees)
+            shift.is_filled = self.is_filled
+        return shift
+    
     def get_missing_roles(self, employees_list):
         """
         Check which required roles are missing from assigned employees
@@ -149,6 +204,9 @@ class Shift:
         """
         if employee_id in self.assigned_employees:
             self.assigned_employees.remove(employee_id)
+            if self.schedule is not None:
+                self.schedule.unrecord_assignment(self, employee_id)
+            event_bus.emit(EMPLOYEE_UNASSIGNED, shift=self, employee_id=employee_id)
             # Note: filled status should be updated by calling update_filled_status() with employee list
             return True
         return False
@@ -0,0 +1,142 @@
+"""
+JSON persistence for employees and schedules
+
+Used by the GUI's save_data/load_data and by tools that work on the saved
+data without opening the GUI (analytics, benchmarks, imports).
+"""
+
+import json
+import os
+import shutil
+from datetime import datetime
+
+from .employee import Employee
+from .shift import Shift
+from .schedule import Schedule
+from .profiling import timed
+
+DATA_FILE = 'data/scheduling_data.json'
+BACKUP_FILE = 'data/scheduling_data.backup.json'
+LABOR_CUBE_FILE = 'data/labor_cube.json'
+TEMPLATES_FILE = 'data/shift_templates.json'
+
+
+@timed("storage.save_data")
+def save_data(employees, schedules, data_file=DATA_FILE, backup_file=BACKUP_FILE):
+    """
+    Save employees and schedules to a JSON file, backing up the previous file
+
+    Schedules are written one at a time, so any iterable works - including a
+    generator (e.g., WorkloadGenerator.iter_schedules) producing weeks on the fly.
+    They go to a temporary file that replaces data_file only once complete, so
+    an error part way through leaves the previous data intact.
+
+    Args:
+        employees (list): List of Employee objects
+        schedules (iterable): Schedule objects
+        data_file (str): Path of the data file
+        backup_file (str): Path of the backup copy (None to skip the backup)
+
+    Returns:
+        int: Number of schedules written
+    """
+    # Create data directory if it doesn't exist
+    data_dir = os.path.dirname(data_file)
+    if data_dir and not os.path.exists(data_dir):
+        os.makedirs(data_dir)
+
+    # Create backup if file exists
+    if backup_file and os.path.exists(data_file):
+        try:
+            shutil.copy2(data_file, backup_file)
+        except Exception as e:
+            print(f"Warning: Could not create backup: {e}")
+
+    # Save to JSON file (same layout as json.dump(..., indent=2))
+    temp_file = data_file + '.tmp'
+    try:
+        with open(temp_file, 'w') as file:
+            file.write('{\n  "employees": ')
+            _write_list(file, (emp.to_dict() for emp in employees))
+            file.write(',\n  "schedules": ')
+            schedule_count = _write_list(file, (sched.to_dict() for sched in schedules))
+
+            metadata = {
+                'version': '1.0',
+                'last_saved': datetime.now().isoformat(),
+                'employee_count': len(employees),
+                'schedule_count': schedule_count,
+                'next_employee_id': Employee._next_id,
+                'next_shift_id': Shift._next_id,
+                'next_schedule_id': Schedule._next_id
+            }
+            file.write(',\n  "metadata": ')
+            file.write(_indent(json.dumps(metadata, indent=2)))
+            file.write('\n}')
+    except Exception:
+        if os.path.exists(temp_file):
+            os.remove(temp_file)
+        raise
+    os.replace(temp_file, data_file)
+
+    return schedule_count
+
+
+def _write_list(file, items):
+    """Write a JSON list one item at a time, returning the number of items"""
+    count = 0
+    for item in items:
+        file.write(',\n    ' if count else '[\n    ')
+        file.write(_indent(json.dumps(item, indent=2), levels=2))
+        count += 1
+    file.write('\n  ]' if count else '[]')
+    return count
+
+
+def _indent(text, levels=1):
+    """Indent every line after the first by two spaces per level"""
+    return text.replace('\n', '\n' + '  ' * levels)
+
+
+def read_data(data_file=DATA_FILE):
+    """
+    Read the raw saved data without creating any objects
+
+    Returns:
+        dict: The saved 'employees', 'schedules' and 'metadata'
+
+    Raises:
+        FileNotFoundError: If the data file doesn't exist
+        json.JSONDecodeError: If the data file is corrupted
+    """
+    with open(data_file, 'r') as file:
+        return json.load(file)
+
+
+@timed("storage.load_data")
+def load_data(data_file=DATA_FILE):
+    """
+    Load employees and schedules and restore the ID counters
+
+    Returns:
+        tuple: (employees, schedules)
+
+    Raises:
+        FileNotFoundError: If the data file doesn't exist
+        json.JSONDecodeError: If the data file is corrupted
+    """
+    loaded_data = read_data(data_file)
+
+    employees = [Employee.from_dict(emp_data) for emp_data in loaded_data.get('employees', [])]
+    schedules = [Schedule.from_dict(sched_data) for sched_data in loaded_data.get('schedules', [])]
+
+    # Restore class ID counters to avoid conflicts
+    metadata = loaded_data.get('metadata', {})
+    if 'next_employee_id' in metadata:
+        Employee._next_id = metadata['next_employee_id']
+    if 'next_shift_id' in metadata:
+        Shift._next_id = metadata['next_shift_id']
+    if 'next_schedule_id' in metadata:
+        Schedule._next_id = metadata['next_schedule_id']
+
+    return employees, schedules
@@ -0,0 +1,306 @@
+from datetime import datetime
+from .eligibility import EligibilityIndex
+from .events import event_bus, EMPLOYEE_ASSIGNED
+
+# Swap request statuses
+OPEN = "open"
+COMPLETED = "completed"
+CANCELLED = "cancelled"
+
+
+class SwapRequest:
+
+    # Class variable to track the next request ID
+    _next_id = 1
+
+    def __init__(self, shift, employee_id, note=""):
+        """
+        A shift an employee has put up for someone else to take or trade for
+
+        Args:
+            shift (Shift): The posted shift (must be in a schedule)
+            employee_id (int): ID of the employee giving it up
+            note (str): Optional message for potential partners
+        """
+        self.id = SwapRequest._next_id
+        SwapRequest._next_id += 1
+
+        self.shift = shift
+        self.employee_id = employee_id
+        self.note = note
+        self.status = OPEN
+        self.created_at = datetime.now()
+
+        # Filled in once the swap is made
+        self.partner_id = None
+        self.partner_shift = None
+
+    @property
+    def is_open(self):
+        """Whether the request is still waiting for a partner"""
+        return self.status == OPEN
+
+    def __str__(self):
+        return f"Swap #{self.id}: employee {self.employee_id} posting {self.shift} ({self.status})"
+
+
+class SwapMarketplace:
+    def __init__(self, employees, eligibility=None):
+        """
+        Posted shifts and the employees who could take them
+
+        Partners are matched with indexed lookups only: role and availability
+        from the EligibilityIndex, weekly hours from the schedule's
+        HoursLedger, and overlaps, rest and consecutive days from the
+        employee's timeline. Nothing scans the whole staff or schedule.
+
+        Employees are looked up through the index, so anyone added to or
+        removed from it is picked up straight away.
+
+        Args:
+            employees (list): Employee objects who can take part (used when no index is given)
+            eligibility (EligibilityIndex): Prebuilt candidate index (default: built here)
+        """
+        self._owns_eligibility = eligibility is None
+        self.eligibility = eligibility or EligibilityIndex(employees)
+        # request_id -> SwapRequest
+        self.requests = {}
+
+    def close(self):
+        """Stop listening for model events (if the index was built here)"""
+        if self._owns_eligibility:
+            self.eligibility.close()
+
+    # POSTING
+    def post(self, shift, employee_id, note=""):
+        """
+        Post a shift for swapping
+
+        Args:
+            shift (Shift): Shift the employee wants to give up
+            employee_id (int): ID of the employee posting it
+            note (str): Optional message for potential partners
+
+        Returns:
+            SwapRequest: The new request
+
+        Raises:
+            ValueError: If the employee isn't on the shift, the shift isn't in a
+                        schedule, or it is already posted by the employee
+        """
+        if employee_id not in shift.assigned_employees:
+            raise ValueError("Employee is not assigned to this shift")
+        if shift.schedule is None:
+            raise ValueError("Shift is not part of a schedule")
+        for request in self.get_open_requests(employee_id):
+            if request.shift is shift:
+                raise ValueError("Shift is already posted for swapping")
+
+        request = SwapRequest(shift, employee_id, note)
+        self.requests[request.id] = request
+        return request
+
+    def cancel(self, request_id):
+        """
+        Withdraw an open request
+
+        Returns:
+            bool: True if the request was open and is now cancelled, False otherwise
+        """
+        request = self.requests.get(request_id)
+        if request is None or not request.is_open:
+            return False
+        request.status = CANCELLED
+        return True
+
+    def get_open_requests(self, employee_id=None):
+        """
+        Get open requests, oldest first
+
+        Requests whose poster is no longer on the shift are cancelled on the way.
+
+        Args:
+            employee_id (int): Only requests posted by this employee (default all)
+
+        Returns:
+            list: SwapRequest objects
+        """
+        requests = []
+        for request in self.requests.values():
+            if request.is_open and request.employee_id not in request.shift.assigned_employees:
+                request.status = CANCELLED
+            if request.is_open and (employee_id is None or request.employee_id == employee_id):
+                requests.append(request)
+        return requests
+
+    # MATCHING
+    def can_take(self, employee, shift, giving_up=None):
+        """
+        Check whether an employee could work a shift, optionally after giving up another
+
+        Args:
+            employee (Employee): Employee taking the shift
+            shift (Shift): Shift to take
+            giving_up (Shift): Shift the employee hands over in return (None for a cover)
+
+        Returns:
+            bool: True if every rule Shift.assign_employee checks would pass
+        """
+        if employee.id in shift.assigned_employees:
+            return False
+        if giving_up is None and len(shift.assigned_employees) >= shift.max_staff:
+            return False
+        return shift.check_employee(employee) is None and self._fits(employee, shift, giving_up)
+
+    def find_covers(self, request):
+        """
+        Employees who could simply take the posted shift, cheapest first
+
+        Args:
+            request (SwapRequest): The request
+
+        Returns:
+            list: Employee objects
+        """
+        shift = request.shift
+        covers = []
+        for employee in self._get_partners(request):
+            # The poster leaves, so there is room even on a full shift
+            if self._fits(employee, shift):
+                covers.append(employee)
+        covers.sort(key=lambda e: (e.wage, e.id))
+        return covers
+
+    def find_trades(self, request, limit=50):
+        """
+        Shift-for-shift trades: partners who take the posted shift and hand
+        over one of theirs that the poster can work instead
+
+        Args:
+            request (SwapRequest): The request
+            limit (int): Maximum number of trades to return
+
+        Returns:
+            list: (partner, partner_shift) tuples, soonest partner shift first
+        """
+        shift = request.shift
+        poster = self.eligibility.get_employee(request.employee_id)
+        if poster is None:
+            return []
+
+        trades = []
+        for partner in self._get_partners(request):
+            for partner_shift in shift.schedule.get_timeline(partner.id).get_shifts():
+                if poster.id in partner_shift.assigned_employees or partner_shift.check_employee(poster):
+                    continue
+                if self._fits(poster, partner_shift, giving_up=shift) and \
+                        self._fits(partner, shift, giving_up=partner_shift):
+                    trades.append((partner, partner_shift))
+        trades.sort(key=lambda trade: (trade[1].date, trade[1].start_time, trade[0].id))
+        return trades[:limit]
+
+    def _get_partners(self, request):
+        """Employees with the role and availability for the posted shift (from the index)"""
+        shift = request.shift
+        partners = []
+        for emp_id in self.eligibility.get_available(shift):
+            employee = self.eligibility.get_employee(emp_id)
+            if employee is not None and emp_id != request.employee_id and emp_id not in shift.assigned_employees:
+                partners.append(employee)
+        return partners
+
+    def _fits(self, employee, shift, giving_up=None):
+        """
+        Weekly hours and labor rule check (ledger and timeline lookups)
+
+        The handed-over shift is taken out of the employee's hours and timeline
+        while checking and put straight back.
+        """
+        schedule = shift.schedule
+        released = giving_up is not None and giving_up.schedule is schedule
+        if released:
+            schedule.unrecord_assignment(giving_up, employee.id)
+        try:
+            if schedule.hours_ledger.would_exceed_max(employee, shift):
+                return False
+            return schedule.check_labor_rules(employee.id, shift) is None
+        finally:
+            if released:
+                schedule.record_assignment(giving_up, employee.id)
+
+    # APPLYING
+    def accept(self, request_id, partner_id, partner_shift=None):
+        """
+        Complete a swap: the partner takes the posted shift and, for a trade,
+        the poster takes the partner's shift
+
+        All changes go through Shift.remove_employee/assign_employee, so every
+        rule is checked. If any step fails, the steps already made are undone
+        and the schedule is left exactly as it was (removed employees are put
+        back without re-checking rules, which may have changed since they were
+        assigned).
+
+        Args:
+            request_id (int): The open request
+            partner_id (int): ID of the employee taking the posted shift
+            partner_shift (Shift): Shift the partner gives the poster (None for a cover)
+
+        Returns:
+            SwapRequest: The completed request
+
+        Raises:
+            ValueError: If the request isn't open or the swap breaks a rule
+        """
+        request = self.requests.get(request_id)
+        if request is None or not request.is_open:
+            raise ValueError("Swap request is not open")
+        poster = self.eligibility.get_employee(request.employee_id)
+        partner = self.eligibility.get_employee(partner_id)
+        if poster is None or partner is None:
+            raise ValueError("Employee not found")
+        if partner_shift is not None and partner_id not in partner_shift.assigned_employees:
+            raise ValueError("Partner is not assigned to the shift they are offering")
+
+        shift = request.shift
+        undo = []
+        try:
+            # Free both places first so hours and rest are counted without them
+            self._remove(shift, poster, undo)
+            if partner_shift is not None:
+                self._remove(partner_shift, partner, undo)
+            self._assign(shift, partner, undo)
+            if partner_shift is not None:
+                self._assign(partner_shift, poster, undo)
+        except ValueError:
+            for step in reversed(undo):
+                step()
+            raise
+
+        for changed in (shift, partner_shift):
+            if changed is not None:
+                assigned = [self.eligibility.get_employee(emp_id) for emp_id in changed.assigned_employees]
+                changed.update_filled_status([employee for employee in assigned if employee is not None])
+        request.status = COMPLETED
+        request.partner_id = partner_id
+        request.partner_shift = partner_shift
+        return request
+
+    def _remove(self, shift, employee, undo):
+        """Remove an employee from a shift, recording how to put them back"""
+        if employee.id not in shift.assigned_employees:
+            raise ValueError(f"{employee.name} is no longer assigned to this shift")
+        position = shift.assigned_employees.index(employee.id)
+        shift.remove_employee(employee.id)
+        undo.append(lambda: self._restore(shift, employee, position))
+
+    def _restore(self, shift, employee, position):
+        """Put an employee back where they were on a shift (the reverse of Shift.remove_employee)"""
+        shift.assigned_employees.insert(position, employee.id)
+        if shift.schedule is not None:
+            shift.schedule.record_assignment(shift, employee.id)
+        event_bus.emit(EMPLOYEE_ASSIGNED, shift=shift, employee=employee)
+
+    def _assign(self, shift, employee, undo):
+        """Assign an employee to a shift, recording how to take them off again"""
+        shift.assign_employee(employee)
+        undo.append(lambda: shift.remove_employee(employee.id))
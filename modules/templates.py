@@ -0,0 +1,253 @@
+"""
+Recurring weekly shift patterns
+
+A ShiftTemplate describes a week of shifts by weekday, time, roles and
+staffing. Expanding it for a week creates every shift in one go and adds
+them with Schedule.add_shifts, so a year of schedules is built without
+validating and indexing shift by shift.
+"""
+
+import json
+import os
+from datetime import timedelta
+
+from .shift import Shift
+from .schedule import Schedule
+from .ledger import get_week_start
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+class ShiftPattern:
+    def __init__(self, day, start_time, end_time, roles_required, location="Main", min_staff=1, max_staff=1, count=1):
+        """
+        One recurring shift (or several identical ones) in a weekly template
+
+        Args:
+            day (str): Day of the week (e.g., "Monday")
+            start_time (int): Start time in military format
+            end_time (int): End time in military format
+            roles_required (list): Roles for the shift
+            location (str): Location/department (default "Main")
+            min_staff (int): Minimum number of employees needed (default 1)
+            max_staff (int): Maximum number of employees allowed (default 1)
+            count (int): Number of identical shifts to create (default 1)
+        """
+        day = day.capitalize()
+        if day not in DAYS:
+            raise ValueError(f"Invalid day: {day}")
+        if count < 1:
+            raise ValueError("Pattern count must be at least 1")
+
+        self.day = day
+        self.start_time = start_time
+        self.end_time = end_time
+        self.roles_required = list(roles_required or [])
+        self.location = location
+        self.min_staff = min_staff
+        self.max_staff = max_staff
+        self.count = count
+
+    @property
+    def weekday(self):
+        """Day offset from Monday (0-6)"""
+        return DAYS.index(self.day)
+
+    def get_key(self):
+        """Everything but the count (patterns with the same key can be merged)"""
+        return (self.day, self.start_time, self.end_time, tuple(self.roles_required),
+                self.location, self.min_staff, self.max_staff)
+
+    def to_dict(self):
+        """Convert pattern to dictionary for JSON serialization"""
+        return {
+            'day': self.day,
+            'start_time': self.start_time,
+            'end_time': self.end_time,
+            'roles_required': self.roles_required,
+            'location': self.location,
+            'min_staff': self.min_staff,
+            'max_staff': self.max_staff,
+            'count': self.count
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create pattern from dictionary (JSON deserialization)"""
+        return cls(
+            day=data['day'],
+            start_time=data['start_time'],
+            end_time=data['end_time'],
+            roles_required=data.get('roles_required', []),
+            location=data.get('location', 'Main'),
+            min_staff=data.get('min_staff', 1),
+            max_staff=data.get('max_staff', 1),
+            count=data.get('count', 1)
+        )
+
+
+class ShiftTemplate:
+    def __init__(self, name, patterns=None):
+        """
+        A named weekly pattern of shifts
+
+        Args:
+            name (str): Template name (e.g., "Standard week")
+            patterns (list): ShiftPattern objects (default empty)
+        """
+        if not name or not name.strip():
+            raise ValueError("Template name cannot be empty")
+        self.name = name.strip()
+        self.patterns = list(patterns or [])
+
+    def add_pattern(self, day, start_time, end_time, roles_required, **options):
+        """
+        Add a recurring shift
+
+        Args:
+            day (str): Day of the week
+            start_time (int): Start time in military format
+            end_time (int): End time in military format
+            roles_required (list): Roles for the shift
+            **options: location, min_staff, max_staff and count (see ShiftPattern)
+
+        Returns:
+            ShiftPattern: The new pattern
+        """
+        pattern = ShiftPattern(day, start_time, end_time, roles_required, **options)
+        self.patterns.append(pattern)
+        return pattern
+
+    def get_shift_count(self):
+        """Number of shifts one week of this template creates"""
+        return sum(pattern.count for pattern in self.patterns)
+
+    @classmethod
+    def from_schedule(cls, schedule, name):
+        """
+        Capture the shifts of a schedule's first week as a template
+
+        Identical shifts (same day, time, roles, location and staffing) are
+        merged into one pattern with a count. Assignments are not copied.
+
+        Args:
+            schedule (Schedule): Schedule to copy the week from
+            name (str): Template name
+
+        Returns:
+            ShiftTemplate: The new template
+        """
+        week_start = get_week_start(schedule.start_date)
+        week_end = week_start + timedelta(days=6)
+        patterns = {}
+        for shift in schedule.get_all_shifts():
+            if not week_start <= shift.date <= week_end:
+                continue
+            pattern = ShiftPattern(shift.get_day_name(), shift.start_time, shift.end_time, shift.roles_required,
+                                   shift.location, shift.min_staff, shift.max_staff)
+            key = pattern.get_key()
+            if key in patterns:
+                patterns[key].count += 1
+            else:
+                patterns[key] = pattern
+
+        template = cls(name)
+        template.patterns = sorted(patterns.values(), key=lambda p: (p.weekday, p.start_time, p.end_time))
+        return template
+
+    def expand(self, week_start, location=None):
+        """
+        Create the shifts for one week
+
+        Args:
+            week_start (date): Any date in the week (shifts are placed from its Monday)
+            location (str): Put every shift at this location (default each pattern's own)
+
+        Returns:
+            list: New Shift objects, not yet in a schedule
+        """
+        monday = get_week_start(week_start)
+        days = [monday + timedelta(days=offset) for offset in range(7)]
+        shifts = []
+        for pattern in self.patterns:
+            day = days[pattern.weekday]
+            for _ in range(pattern.count):
+                shifts.append(Shift(day, pattern.start_time, pattern.end_time, list(pattern.roles_required),
+                                    location or pattern.location, pattern.min_staff, pattern.max_staff))
+        return shifts
+
+    def create_schedule(self, week_start, **schedule_options):
+        """
+        Create a Monday-Sunday schedule filled with this template's shifts
+
+        Args:
+            week_start (date): Any date in the week
+            **schedule_options: Passed to Schedule (e.g., min_rest_hours). With a
+                                location, every shift is placed at that location
+
+        Returns:
+            Schedule: The new schedule
+        """
+        monday = get_week_start(week_start)
+        schedule = Schedule(monday, monday + timedelta(days=6), **schedule_options)
+        schedule.add_shifts(self.expand(monday, schedule.location))
+        return schedule
+
+    def create_schedules(self, first_week, weeks, **schedule_options):
+        """
+        Create consecutive weekly schedules from this template
+
+        Args:
+            first_week (date): Any date in the first week
+            weeks (int): Number of weeks
+            **schedule_options: Passed to Schedule
+
+        Returns:
+            list: The new Schedule objects, in date order
+        """
+        monday = get_week_start(first_week)
+        return [self.create_schedule(monday + timedelta(weeks=week), **schedule_options)
+                for week in range(weeks)]
+
+    def to_dict(self):
+        """Convert template to dictionary for JSON serialization"""
+        return {
+            'name': self.name,
+            'patterns': [pattern.to_dict() for pattern in self.patterns]
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Create template from dictionary (JSON deserialization)"""
+        return cls(data['name'], [ShiftPattern.from_dict(p) for p in data.get('patterns', [])])
+
+    def __str__(self):
+        return f"{self.name} ({len(self.patterns)} patterns, {self.get_shift_count()} shifts/week)"
+
+
+def save_templates(templates, path):
+    """
+    Save templates to a JSON file
+
+    Args:
+        templates (list): ShiftTemplate objects
+        path (str): File to write
+    """
+    directory = os.path.dirname(path)
+    if directory and not os.path.exists(directory):
+        os.makedirs(directory)
+    with open(path, 'w') as file:
+        json.dump([template.to_dict() for template in templates], file, indent=2)
+
+
+def load_templates(path):
+    """
+    Load templates saved with save_templates()
+
+    Returns:
+        list: ShiftTemplate objects (empty if the file doesn't exist)
+    """
+    if not os.path.exists(path):
+        return []
+    with open(path, 'r') as file:
+        return [ShiftTemplate.from_dict(data) for data in json.load(file)]
@@ -0,0 +1,142 @@
+from bisect import bisect_left
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def get_shift_interval(shift):
+    """
+    Get a shift's start and end as absolute minutes (since 0001-01-01)
+
+    Shifts ending at or before their start time are treated as ending the next day.
+
+    Args:
+        shift (Shift): The shift
+
+    Returns:
+        tuple: (start, end) in minutes
+    """
+    day_start = shift.date.toordinal() * MINUTES_PER_DAY
+    start = day_start + (shift.start_time // 100) * 60 + shift.start_time % 100
+    end = day_start + (shift.end_time // 100) * 60 + shift.end_time % 100
+    if end <= start:
+        end += MINUTES_PER_DAY
+    return start, end
+
+
+class EmployeeTimeline:
+    def __init__(self):
+        """
+        One employee's assigned shifts, sorted by start time
+
+        Entries are (start, end, shift_id, shift) with times in absolute minutes,
+        kept sorted with bisect, so the shifts just before and after any time
+        are found in O(log n) instead of rescanning the schedule.
+        """
+        self._entries = []
+        # Day ordinal -> number of shifts starting that day
+        self._day_counts = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def add(self, shift):
+        """Add a shift (ignored if already present)"""
+        start, end = get_shift_interval(shift)
+        index = bisect_left(self._entries, (start, end, shift.id))
+        if index < len(self._entries) and self._entries[index][2] == shift.id:
+            return
+        self._entries.insert(index, (start, end, shift.id, shift))
+        day = shift.date.toordinal()
+        self._day_counts[day] = self._day_counts.get(day, 0) + 1
+
+    def remove(self, shift):
+        """
+        Remove a shift
+
+        Returns:
+            bool: True if the shift was in the timeline, False otherwise
+        """
+        start, end = get_shift_interval(shift)
+        index = bisect_left(self._entries, (start, end, shift.id))
+        if index == len(self._entries) or self._entries[index][2] != shift.id:
+            return False
+        del self._entries[index]
+        day = shift.date.toordinal()
+        self._day_counts[day] -= 1
+        if not self._day_counts[day]:
+            del self._day_counts[day]
+        return True
+
+    def get_shifts(self):
+        """Get the shifts in time order"""
+        return [entry[3] for entry in self._entries]
+
+    def works_on(self, day):
+        """Whether the employee has a shift starting on the given date"""
+        return day.toordinal() in self._day_counts
+
+    def find_too_close(self, shift, min_gap_minutes=0):
+        """
+        Find a shift that overlaps this one or leaves less than min_gap_minutes of rest
+
+        Only the entries next to the shift's position are looked at: a shift
+        can't be longer than a day, so anything starting more than a day plus
+        the gap before it, or after its end plus the gap, is too far away.
+
+        Args:
+            shift (Shift): Shift being checked (ignored if already in the timeline)
+            min_gap_minutes (float): Required rest between shifts
+
+        Returns:
+            tuple: (other_shift, gap_minutes) for an offending shift
+                   (negative gap = overlap), or None
+        """
+        start, end = get_shift_interval(shift)
+        index = bisect_left(self._entries, (start, end, shift.id))
+
+        # Later shifts: sorted by start, so stop at the first one far enough away
+        i = index
+        while i < len(self._entries):
+            other_start, other_end, other_id, other = self._entries[i]
+            if other_start >= end + min_gap_minutes:
+                break
+            if other_id != shift.id:
+                return other, other_start - end
+            i += 1
+
+        # Earlier shifts: any starting within a day (plus the gap) could still run too late
+        earliest = start - MINUTES_PER_DAY - min_gap_minutes
+        i = index - 1
+        while i >= 0:
+            other_start, other_end, other_id, other = self._entries[i]
+            if other_start < earliest:
+                break
+            if other_id != shift.id and other_end + min_gap_minutes > start:
+                return other, start - other_end
+            i -= 1
+        return None
+
+    def get_streak(self, day):
+        """
+        Number of consecutive days worked through a date, counting the date itself
+
+        Walks outward from the date one day at a time, so the cost is the
+        length of the streak, not the number of shifts.
+
+        Args:
+            day (date): The date (counted as worked)
+
+        Returns:
+            int: Length of the run of worked days containing the date
+        """
+        ordinal = day.toordinal()
+        streak = 1
+        previous = ordinal - 1
+        while previous in self._day_counts:
+            streak += 1
+            previous -= 1
+        following = ordinal + 1
+        while following in self._day_counts:
+            streak += 1
+            following += 1
+        return streak
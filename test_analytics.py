@@ -0,0 +1,109 @@
+import os
+import tempfile
+import time
+from modules import Employee, Shift, Schedule, storage
+from modules.analytics import LaborCostCube
+
+
+def test_labor_cost_cube():
+    """Test labor cost rollups, incremental updates and building from the saved file"""
+    print("=== Testing Labor Cost Analytics ===\n")
+
+    alice = Employee("Alice", "555-0001", "alice@email.com", "server", 16.00)
+    bob = Employee("Bob", "555-0002", "bob@email.com", "cook", 20.00)
+    for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]:
+        alice.add_availability(day, 900, 2200)
+        bob.add_availability(day, 900, 2200)
+    employees = [alice, bob]
+
+    week1 = Schedule("2025-12-01", "2025-12-07")
+    week2 = Schedule("2025-12-29", "2026-01-04")
+    for schedule, day in [(week1, "2025-12-01"), (week1, "2025-12-02"), (week2, "2025-12-29"), (week2, "2026-01-02")]:
+        server_shift = Shift(day, 1000, 1400, ["server"])  # 4 hours
+        cook_shift = Shift(day, 1000, 1800, ["cook"], location="Patio")  # 8 hours
+        schedule.add_shift(server_shift)
+        schedule.add_shift(cook_shift)
+        server_shift.assign_employee(alice)
+        cook_shift.assign_employee(bob)
+    schedules = [week1, week2]
+
+    cube = LaborCostCube.from_schedules(schedules, employees)
+
+    print("1. Rollups by week, role, location and month:")
+    weekly = cube.get_series('week')
+    print(f"  Weekly: {weekly}")
+    assert weekly == [("2025-12-01", 448.0, 24.0), ("2025-12-29", 448.0, 24.0)]
+    assert cube.get_cost_by('role', 'month') == {'server': 256.0, 'cook': 640.0}
+    assert cube.get_cost_by('location', 'day', start="2026-01-01") == {'Main': 64.0, 'Patio': 160.0}
+    assert cube.get_series('month', 'employee', bob.id) == [("2025-12", 480.0, 24.0), ("2026-01", 160.0, 8.0)]
+    total = sum(cost for cost in cube.get_cost_by('total', 'month').values())
+    assert total == sum(schedule.calculate_payroll(employees) for schedule in schedules)
+
+    print("\n2. Only changed schedules are re-aggregated:")
+    cube.track()
+    try:
+        week1.shifts[0].remove_employee(alice.id)
+        assert cube.refresh(employees) == 1
+        assert cube.get_series('week')[0] == ("2025-12-01", 384.0, 20.0)
+        assert cube.refresh(employees) == 0
+
+        print("\n   Wage and role changes re-aggregate the employee's schedules:")
+        bob.wage = 25.00
+        assert cube.refresh(employees) == 2
+        assert cube.get_series('month', 'employee', bob.id) == [("2025-12", 600.0, 24.0), ("2026-01", 200.0, 8.0)]
+        bob.role = "chef"
+        assert cube.refresh(employees) == 2
+        assert set(cube.get_cost_by('role', 'month')) == {'server', 'chef'}
+        bob.role, bob.wage = "cook", 20.00
+        assert cube.refresh(employees) == 2
+        assert cube.get_cost_by('role', 'month') == {'server': 192.0, 'cook': 640.0}
+    finally:
+        cube.close()
+
+    print("\n3. Removing a schedule removes its rollups:")
+    cube.remove_schedule(week2.id)
+    assert cube.get_series('week') == [("2025-12-01", 384.0, 20.0)]
+    assert "2026-01" not in dict((p, c) for p, c, h in cube.get_series('month'))
+
+    print("\n4. Building from the saved data file and saving the cube:")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_file = os.path.join(temp_dir, 'scheduling_data.json')
+        storage.save_data(employees, schedules, data_file=data_file, backup_file=None)
+        from_file = LaborCostCube.from_file(data_file)
+        assert from_file.get_cost_by('role', 'week') == {'server': 192.0, 'cook': 640.0}
+
+        cube_file = os.path.join(temp_dir, 'labor_cube.json')
+        from_file.save(cube_file, [data_file])
+        loaded = LaborCostCube.load(cube_file, [data_file])
+        assert loaded.get_series('month', 'employee', bob.id) == from_file.get_series('month', 'employee', bob.id)
+
+        print("\n5. Loaded rollups follow employee changes once attached to their schedules:")
+        loaded.attach(schedules)
+        loaded.track()
+        try:
+            bob.wage = 25.00
+            assert loaded.refresh(employees) == 2
+            assert loaded.get_cost_by('role', 'week') == {'server': 192.0, 'cook': 800.0}
+        finally:
+            loaded.close()
+            bob.wage = 20.00
+
+        print("\n6. Rollups saved before the data file changed are rejected:")
+        storage.save_data(employees, [week1], data_file=data_file, backup_file=None)
+        os.utime(data_file, ns=(0, 0))
+        try:
+            LaborCostCube.load(cube_file, [data_file])
+            assert False, "Should have rejected out-of-date rollups"
+        except ValueError as e:
+            print(f"  ✅ Correctly rejected: {e}")
+
+    start = time.perf_counter()
+    for _ in range(1000):
+        cube.get_cost_by('role', 'week')
+    print(f"  1000 queries in {(time.perf_counter() - start) * 1000:.2f} ms")
+
+    print("\n✅ LABOR COST ANALYTICS TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_labor_cost_cube()
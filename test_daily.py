@@ -0,0 +1,106 @@
+import time
+from datetime import date, timedelta
+from modules import Shift, Schedule
+from modules.daily import DailySummaryIndex
+from test_helpers import make_employee
+
+
+def brute_force(schedules, employees, day):
+    """Totals for a date computed by walking every shift"""
+    shifts = [shift for schedule in schedules for shift in schedule.get_all_shifts() if shift.date == day]
+    filled = sum(1 for shift in shifts if len(shift.assigned_employees) >= shift.min_staff)
+    cost = sum(shift.calculate_payroll(employees) for shift in shifts)
+    return len(shifts), filled, round(cost, 6)
+
+
+def test_daily_summaries():
+    """Test per-day totals are kept up to date from model events"""
+    print("=== Testing Daily Summaries ===\n")
+
+    alice = make_employee("Alice", wage=15.00)
+    bob = make_employee("Bob", wage=20.00)
+    employees = [alice, bob]
+    schedule = Schedule("2025-12-01", "2025-12-07")
+    monday = Shift("2025-12-01", 900, 1700, ["server"], max_staff=2)
+    evening = Shift("2025-12-01", 1800, 2200, ["server"], min_staff=2, max_staff=2)
+    schedule.add_shifts([monday, evening])
+    monday.assign_employee(alice)
+
+    index = DailySummaryIndex([schedule], employees)
+    try:
+        def check(day):
+            summary = index.get_day(day)
+            assert (summary.shifts, summary.filled, round(summary.cost, 6)) == brute_force([schedule], employees, day)
+
+        print("1. Existing shifts and assignments are counted:")
+        day = date(2025, 12, 1)
+        summary = index.get_day(day)
+        print(f"  {day}: {summary}")
+        assert summary.shifts == 2 and summary.filled == 1 and summary.filled_percent == 50.0
+        assert summary.staff_needed == 3 and summary.staff_assigned == 1 and summary.hours == 8.0
+        check(day)
+
+        print("\n2. Assignments, new shifts and wage changes update only their day:")
+        evening.assign_employee(alice)
+        check(day)
+        assert index.get_day(day).filled == 1  # Evening needs two
+        evening.assign_employee(bob)
+        check(day)
+        assert index.get_day(day).filled_percent == 100.0
+        bob.wage = 25.00
+        check(day)
+        evening.remove_employee(alice.id)
+        check(day)
+        schedule.add_shift(Shift("2025-12-03", 900, 1700, ["server"]))
+        check(date(2025, 12, 3))
+        assert index.get_day(date(2025, 12, 2)).shifts == 0
+
+        print("\n3. Totals over a range and removing a schedule:")
+        total = index.get_total(date(2025, 12, 1), date(2025, 12, 31))
+        assert total.shifts == 3 and abs(total.cost - schedule.calculate_payroll(employees)) < 1e-9
+        assert sorted(index.get_range(date(2025, 11, 1), date(2025, 12, 31))) == [date(2025, 12, 1), date(2025, 12, 3)]
+        other = Schedule("2025-12-01", "2025-12-07")
+        other.add_shift(Shift("2025-12-01", 900, 1700, ["server"]))
+        assert index.get_day(day).shifts == 2  # Untracked schedules are ignored
+        assert index.remove_schedule(schedule)
+        assert index.get_range(date(2025, 12, 1), date(2025, 12, 31)) == {}
+    finally:
+        index.close()
+
+    print("\n✅ DAILY SUMMARIES TEST PASSED")
+
+
+def test_month_view_scale():
+    """Test reading a month of a 5,000-shift site"""
+    print("=== Testing Month View at Scale ===\n")
+
+    staff = [make_employee(f"Staff{i}", wage=12.00 + i % 10) for i in range(200)]
+    start = date(2026, 3, 2)
+    schedule = Schedule(start, start + timedelta(days=34))
+    shifts = [Shift(start + timedelta(days=i % 35), 600 + (i % 3) * 500, 1100 + (i % 3) * 500, ["server"])
+              for i in range(5000)]
+    schedule.add_shifts(shifts)
+    index = DailySummaryIndex([schedule], staff)
+    try:
+        for i, shift in enumerate(shifts[::2]):
+            shift.assign_employee(staff[i % len(staff)])
+
+        started = time.perf_counter()
+        for _ in range(100):
+            days = index.get_range(date(2026, 3, 1), date(2026, 4, 11))
+            total = index.get_total(date(2026, 3, 1), date(2026, 3, 31))
+        elapsed = time.perf_counter() - started
+        print(f"  100 month redraws in {elapsed * 1000:.1f}ms")
+        assert len(days) == 35
+        assert total.shifts == sum(1 for shift in shifts if shift.date.month == 3)
+        assert total.filled == sum(1 for shift in shifts if shift.date.month == 3 and shift.assigned_employees)
+        assert elapsed < 0.5
+    finally:
+        index.close()
+
+    print("\n✅ MONTH VIEW SCALE TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_daily_summaries()
+    test_month_view_scale()
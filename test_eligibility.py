@@ -0,0 +1,76 @@
+from modules import Employee, Shift, Schedule
+from modules.eligibility import EligibilityIndex
+
+
+def test_eligibility_index():
+    """Test candidate lookup, ranking and incremental updates of the eligibility index"""
+    print("=== Testing Eligibility Index ===\n")
+
+    alice = Employee("Alice", "555-0001", "alice@email.com", "server", 16.00)
+    alice.add_availability("Monday", 900, 1700)
+    bob = Employee("Bob", "555-0002", "bob@email.com", "server", 15.00)
+    bob.add_availability("Monday", 1000, 2200)
+    carol = Employee("Carol", "555-0003", "carol@email.com", "cook", 18.00)
+    carol.add_availability("Monday", 800, 2200)
+    diana = Employee("Diana", "555-0004", "diana@email.com", "manager", 25.00)
+    diana.add_availability("Monday", 800, 2300)
+    employees = [alice, bob, carol, diana]
+
+    index = EligibilityIndex(employees)
+    try:
+        schedule = Schedule("2025-12-01", "2025-12-07")
+        lunch = Shift("2025-12-01", 1100, 1500, ["server"])
+        dinner = Shift("2025-12-01", 1700, 2100, ["server"])
+        schedule.add_shift(lunch)
+        schedule.add_shift(dinner)
+
+        print("1. Candidates for lunch (server, 11 AM - 3 PM):")
+        candidates = index.get_candidates(lunch)
+        print(f"  {[emp.name for emp in candidates]}")
+        # Same remaining hours for everyone, so the cheapest comes first; the cook is excluded
+        assert [emp.name for emp in candidates] == ["Bob", "Alice", "Diana"]
+
+        print("\n2. Candidates for dinner (server, 5 PM - 9 PM):")
+        candidates = index.get_candidates(dinner)
+        print(f"  {[emp.name for emp in candidates]}")
+        assert [emp.name for emp in candidates] == ["Bob", "Diana"]
+
+        print("\n3. Ranking follows remaining weekly hours:")
+        lunch.assign_employee(bob)
+        assert index.get_remaining_hours(bob, lunch) == 36.0
+        candidates = index.get_candidates(dinner)
+        print(f"  {[emp.name for emp in candidates]}")
+        assert [emp.name for emp in candidates] == ["Diana", "Bob"]
+
+        print("\n4. Employees the schedule's labor rules rule out are not candidates:")
+        afternoon = Shift("2025-12-01", 1400, 1800, ["server"])
+        schedule.add_shift(afternoon)
+        assert bob not in index.get_candidates(afternoon)  # Overlaps his lunch shift
+        schedule.min_rest_hours = 3
+        assert [emp.name for emp in index.get_candidates(dinner)] == ["Diana"]  # Only 2h after lunch
+        schedule.min_rest_hours = None
+        lunch.remove_employee(bob.id)
+        assert index.get_remaining_hours(bob, lunch) == 40.0
+
+        print("\n5. Availability and role changes update the index:")
+        alice.add_availability("Monday", 1700, 2200)
+        alice.clear_availability()
+        alice.add_availability("Monday", 1600, 2200)
+        assert alice in index.get_candidates(dinner)
+        assert alice not in index.get_candidates(lunch)
+        carol.role = "server"
+        assert carol in index.get_candidates(lunch)
+        assert index.get_role_members(["cook"]) == {diana.id}
+
+        print("\n6. Removed employees are no longer candidates:")
+        index.remove_employee(bob.id)
+        assert bob not in index.get_candidates(dinner)
+        print("  ✅ Index updated incrementally")
+    finally:
+        index.close()
+
+    print("\n✅ ELIGIBILITY INDEX TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_eligibility_index()
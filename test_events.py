@@ -0,0 +1,70 @@
+from modules import Employee, Shift, Schedule
+from modules import events
+from modules.events import EventBus, event_bus
+
+
+def test_event_bus():
+    """Test that model changes emit fine-grained events"""
+    print("=== Testing Event Bus ===\n")
+
+    received = []
+
+    def record(event_type):
+        return lambda **data: received.append((event_type, data))
+
+    watched = [events.SHIFT_ADDED, events.EMPLOYEE_ASSIGNED, events.EMPLOYEE_UNASSIGNED,
+               events.WAGE_CHANGED, events.ROLE_CHANGED, events.AVAILABILITY_CHANGED]
+    callbacks = {event_type: record(event_type) for event_type in watched}
+    for event_type, callback in callbacks.items():
+        event_bus.subscribe(event_type, callback)
+
+    try:
+        # Creating an employee does not emit wage/role events
+        alice = Employee("Alice", "555-0001", "alice@email.com", "server", 16.00)
+        assert received == []
+
+        print("1. Availability, wage and role changes:")
+        alice.add_availability("Monday", 900, 1700)
+        alice.wage = 17.50
+        alice.wage = 17.50  # Unchanged value - no event
+        alice.role = "manager"
+        print(f"  {[event_type for event_type, _ in received]}")
+        assert [event_type for event_type, _ in received] == [
+            events.AVAILABILITY_CHANGED, events.WAGE_CHANGED, events.ROLE_CHANGED]
+        assert received[1][1]['old_wage'] == 16.00 and received[1][1]['new_wage'] == 17.50
+        assert alice.is_manager  # Role setter keeps manager status in sync
+
+        received.clear()
+        print("\n2. Shift added, employee assigned and unassigned:")
+        schedule = Schedule("2025-12-01", "2025-12-07")
+        shift = Shift("2025-12-01", 1000, 1400, ["server"])
+        schedule.add_shift(shift)
+        shift.assign_employee(alice)
+        shift.remove_employee(alice.id)
+        shift.remove_employee(alice.id)  # Not assigned anymore - no event
+        print(f"  {[event_type for event_type, _ in received]}")
+        assert [event_type for event_type, _ in received] == [
+            events.SHIFT_ADDED, events.EMPLOYEE_ASSIGNED, events.EMPLOYEE_UNASSIGNED]
+        assert received[0][1]['schedule'] is schedule
+        assert received[1][1]['employee'] is alice
+        assert received[2][1]['employee_id'] == alice.id
+    finally:
+        for event_type, callback in callbacks.items():
+            event_bus.unsubscribe(event_type, callback)
+
+    print("\n3. Unsubscribing:")
+    bus = EventBus()
+    calls = []
+    callback = lambda **data: calls.append(data)
+    bus.subscribe("ping", callback)
+    bus.emit("ping", value=1)
+    assert bus.unsubscribe("ping", callback)
+    bus.emit("ping", value=2)
+    assert calls == [{'value': 1}]
+    print("  ✅ Unsubscribed callbacks are no longer notified")
+
+    print("\n✅ EVENT BUS TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_event_bus()
@@ -0,0 +1,105 @@
+import csv
+import os
+import tempfile
+import tracemalloc
+from modules import Shift, Schedule
+from modules import export
+from modules.generator import WorkloadGenerator
+from modules.payroll import PayrollEngine
+from test_helpers import make_employee
+
+
+def read_csv(path):
+    with open(path, newline='', encoding='utf-8') as file:
+        return list(csv.DictReader(file))
+
+
+def test_export_schedules():
+    """Test shift CSV, payroll CSV and printable week exports"""
+    print("=== Testing Schedule Export ===\n")
+
+    alice = make_employee("Alice <A>", wage=15.00, max_hours=168)
+    bob = make_employee("Bob", wage=20.00, max_hours=168)
+    employees = [alice, bob]
+    # Wednesday to the next Tuesday: two calendar weeks
+    schedule = Schedule("2025-12-03", "2025-12-09")
+    late = Shift("2025-12-03", 1300, 2100, ["server"], max_staff=2)
+    early = Shift("2025-12-03", 600, 1200, ["server"], min_staff=2, max_staff=2)
+    monday = Shift("2025-12-08", 900, 1700, ["server", "host"], location="Patio")
+    schedule.add_shifts([late, early, monday])
+    late.assign_employee(alice)
+    late.assign_employee(bob)
+    early.assign_employee(alice)
+    for day in range(4, 10):
+        shift = Shift(f"2025-12-{day:02d}", 600, 1800, ["server"])
+        schedule.add_shift(shift)
+        shift.assign_employee(bob)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        print("1. One row per shift, in date and start time order:")
+        path = os.path.join(temp_dir, "exports", "shifts.csv")
+        assert export.write_csv(path, export.iter_shift_rows([schedule], employees)) == 9
+        rows = read_csv(path)
+        assert [row['shift_id'] for row in rows[:2]] == [str(early.id), str(late.id)]
+        assert rows[0]['open'] == '1' and rows[0]['employees'] == "Alice <A>"
+        assert rows[1]['employees'] == "Alice <A>;Bob" and rows[1]['cost'] == "280.00"
+        monday_row = next(row for row in rows if row['shift_id'] == str(monday.id))
+        assert monday_row['day'] == "Monday" and monday_row['roles'] == "server;host"
+        assert monday_row['location'] == "Patio" and monday_row['assigned'] == '0'
+        total = sum(float(row['cost']) for row in rows)
+        assert abs(total - schedule.calculate_payroll(employees)) < 0.01
+
+        print("\n2. One payroll row per employee, matching the payroll engine:")
+        path = os.path.join(temp_dir, "payroll.csv")
+        assert export.write_csv(path, export.iter_employee_rows([schedule], employees)) == 2
+        rows = {row['name']: row for row in read_csv(path)}
+        report = PayrollEngine().calculate(schedule, employees)
+        bob_pay = report.get_breakdown(bob.id)
+        assert float(rows["Bob"]['overtime_hours']) == bob_pay.overtime_hours > 0
+        assert rows["Bob"]['total_pay'] == f"{bob_pay.total_pay:.2f}"
+        assert rows["Alice <A>"]['shifts'] == '2'
+
+        print("\n3. One printable page per calendar week:")
+        path = os.path.join(temp_dir, "schedule.html")
+        assert export.write_html(path, export.iter_week_html([schedule], employees)) > 0
+        with open(path, encoding='utf-8') as file:
+            html = file.read()
+        assert html.count('<section class="week">') == 2
+        assert "Week of 2025-12-01" in html and "Week of 2025-12-08" in html
+        assert "Alice &lt;A&gt;" in html and "Alice <A>" not in html
+        assert '<span class="open">1 open</span>' in html
+        assert "page-break-after: always" in html
+
+    print("\n✅ SCHEDULE EXPORT TEST PASSED")
+
+
+def test_export_memory():
+    """Test that exporting a year uses no more memory than exporting a month"""
+    print("=== Testing Export Memory ===\n")
+
+    generator = WorkloadGenerator(seed=7)
+    employees = generator.generate_employees(60)
+    year = generator.generate_schedules(employees, 52, start_date="2026-01-05")
+    exporters = (("shifts", export.iter_shift_rows, export.write_csv),
+                 ("payroll", export.iter_employee_rows, export.write_csv),
+                 ("print", export.iter_week_html, export.write_html))
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        for name, make_rows, write in exporters:
+            peaks = []
+            for weeks in (4, 52):
+                tracemalloc.start()
+                try:
+                    write(os.path.join(temp_dir, name), make_rows(iter(year[:weeks]), employees))
+                    peaks.append(tracemalloc.get_traced_memory()[1])
+                finally:
+                    tracemalloc.stop()
+            print(f"  {name}: peak {peaks[0] / 1024:.0f} KB for 4 weeks, {peaks[1] / 1024:.0f} KB for 52 weeks")
+            assert peaks[1] < peaks[0] * 1.5 + 64 * 1024
+
+    print("\n✅ EXPORT MEMORY TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_export_schedules()
+    test_export_memory()
@@ -0,0 +1,97 @@
+from modules import Shift, Schedule
+from modules.fairness import HoursQueue, gini_coefficient
+from modules.optimizer import ScheduleOptimizer
+from modules.rules import RuleEngine
+from test_helpers import make_employee
+
+
+def test_gini_coefficient():
+    """Test the hours fairness metric"""
+    print("=== Testing Gini Coefficient ===\n")
+
+    assert gini_coefficient([]) == 0.0
+    assert gini_coefficient([0, 0, 0]) == 0.0
+    assert gini_coefficient([8, 8, 8, 8]) == 0.0
+    # One person has everything: (n - 1) / n
+    assert abs(gini_coefficient([0, 0, 0, 40]) - 0.75) < 1e-9
+    assert gini_coefficient([10, 20, 30]) < gini_coefficient([0, 10, 50])
+    print("  ✅ Even hours score 0, concentrated hours approach 1")
+
+    print("\n✅ GINI COEFFICIENT TEST PASSED")
+
+
+def test_hours_queue():
+    """Test ordering and O(log n) re-queueing by hours"""
+    print("=== Testing Hours Queue ===\n")
+
+    alice = make_employee("Alice")
+    bob = make_employee("Bob")
+    carol = make_employee("Carol", max_hours=20)
+    dave = make_employee("Dave", role="cook")
+    manager = make_employee("Mia", role="manager")
+    hours = {alice.id: 16.0, bob.id: 8.0, carol.id: 8.0, dave.id: 0.0, manager.id: 30.0}
+    queue = HoursQueue([alice, bob, carol, dave, manager], hours.get)
+
+    print("1. Least utilized first, only matching roles (and managers):")
+    order = []
+    while True:
+        employee = queue.pop(["Server"])
+        if employee is None:
+            break
+        order.append(employee.name)
+    print(f"  {order}")
+    # Bob 8/40, Alice 16/40, Carol 8/20, Mia 30/40
+    assert order == ["Bob", "Alice", "Carol", "Mia"]
+
+    print("\n2. Popped employees go back with their new hours:")
+    queue.push_back([alice, bob, carol, manager])
+    hours[bob.id] = 24.0
+    queue.update(bob.id)
+    assert queue.pop(["server"]) is alice
+    assert queue.pop(["server"]) is carol
+    assert queue.pop(["server"]) is bob  # The stale 8h entry was skipped
+    assert len(queue) == 2  # Dave and Mia
+
+    print("\n3. Employees short of min_hours come first:")
+    eve = make_employee("Eve", min_hours=24)
+    frank = make_employee("Frank")
+    queue = HoursQueue([eve, frank], {eve.id: 20.0, frank.id: 0.0}.get)
+    assert queue.pop(["server"]) is eve
+
+    print("\n✅ HOURS QUEUE TEST PASSED")
+
+
+def test_fair_fill():
+    """Test that fair auto-assignment spreads hours within a role"""
+    print("=== Testing Fair Fill ===\n")
+
+    # Cost-first filling gives the cheapest server everything they can take
+    servers = [make_employee(f"Server{i}", wage=12.00 + i) for i in range(4)]
+    results = {}
+    for mode in ("solve", "solve_fair"):
+        schedule = Schedule("2025-12-01", "2025-12-07")
+        for day in range(1, 8):
+            schedule.add_shift(Shift(f"2025-12-0{day}", 1000, 1400, ["server"]))
+        engine = RuleEngine(schedule, servers)
+        try:
+            result = getattr(ScheduleOptimizer(schedule, servers, engine=engine), mode)()
+            assert result.is_complete
+            assert engine.is_feasible()
+        finally:
+            engine.close()
+        hours = [schedule.hours_ledger.get_total_hours(emp.id) for emp in servers]
+        results[mode] = schedule.get_hours_gini(servers)
+        print(f"  {mode}: hours {hours}, Gini {results[mode]:.3f}")
+
+    assert results["solve_fair"] < results["solve"]
+    # 7 four-hour shifts over 4 servers: nobody gets more than 2
+    assert max(schedule.hours_ledger.get_total_hours(emp.id) for emp in servers) == 8.0
+    assert schedule.get_fairness_report(servers) == {"server": results["solve_fair"]}
+
+    print("\n✅ FAIR FILL TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_gini_coefficient()
+    test_hours_queue()
+    test_fair_fill()
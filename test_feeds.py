@@ -0,0 +1,109 @@
+import os
+import tempfile
+import time
+from datetime import datetime, timezone
+from modules import Shift, Schedule
+from modules.feeds import FeedIndex, build_feed, fold_line, get_feed_file, MANIFEST_FILE
+from test_helpers import make_employee
+
+STAMP = datetime(2025, 11, 28, 12, 0, tzinfo=timezone.utc)
+
+
+def test_build_feed():
+    """Test the iCalendar text of one employee's feed"""
+    print("=== Testing Feed Format ===\n")
+
+    alice = make_employee("Alice, Jr.")
+    late = Shift("2025-12-05", 2200, 600, ["server", "host"], location="Downtown; Patio")
+    early = Shift("2025-12-01", 900, 1730, ["server"])
+
+    feed = build_feed(alice, [late, early], STAMP)
+    print(feed)
+    lines = feed.split("\r\n")
+    assert lines[0] == "BEGIN:VCALENDAR" and lines[-2] == "END:VCALENDAR" and lines[-1] == ""
+    assert "X-WR-CALNAME:Alice\\, Jr. - Shifts" in lines
+    assert lines.count("BEGIN:VEVENT") == 2
+    # Events in date order; overnight shifts end the next day
+    assert lines.index("DTSTART:20251201T090000") < lines.index("DTSTART:20251205T220000")
+    assert "DTEND:20251201T173000" in lines and "DTEND:20251206T060000" in lines
+    assert f"UID:shift-{late.id}-employee-{alice.id}@chronos" in lines
+    assert "SUMMARY:Server\\, Host shift" in lines and "LOCATION:Downtown\\; Patio" in lines
+    assert "DTSTAMP:20251128T120000Z" in lines
+
+    long_line = "DESCRIPTION:" + "é" * 80
+    folded = fold_line(long_line)
+    assert all(len(piece.encode("utf-8")) <= 75 for piece in folded.split("\r\n"))
+    assert folded.replace("\r\n ", "") == long_line
+
+    print("\n✅ FEED FORMAT TEST PASSED")
+
+
+def test_incremental_publish():
+    """Test that publishing rewrites only the feeds of employees whose shifts changed"""
+    print("=== Testing Incremental Publish ===\n")
+
+    staff = [make_employee(f"Staff{i}") for i in range(500)]
+    schedule = Schedule("2025-12-01", "2025-12-07")
+    shifts = [Shift("2025-12-01", 900, 1700, ["server"]) for _ in range(500)]
+    schedule.add_shifts(shifts)
+    for shift, employee in zip(shifts, staff):
+        shift.assign_employee(employee)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        feeds = FeedIndex(temp_dir, [schedule])
+        try:
+            print("1. The first publish writes every feed:")
+            assert feeds.publish(staff, STAMP) == (500, 0)
+            assert len(os.listdir(temp_dir)) == 501 and os.path.exists(os.path.join(temp_dir, MANIFEST_FILE))
+            assert feeds.get_shifts(staff[0].id) == [shifts[0]]
+
+            print("\n2. A week's changes rewrite only the affected feeds:")
+            paths = [get_feed_file(temp_dir, emp.id) for emp in staff]
+            for path in paths:
+                os.utime(path, (0, 0))
+            shifts[0].remove_employee(staff[0].id)
+            tuesday = Shift("2025-12-02", 900, 1700, ["server"])
+            schedule.add_shift(tuesday)
+            tuesday.assign_employee(staff[1])
+            extra = Shift("2025-12-03", 900, 1700, ["server"])
+            extra.assign_employee(staff[2])  # Assigned before being added to the schedule
+            schedule.add_shift(extra)
+            Schedule("2025-12-01", "2025-12-07").add_shift(Shift("2025-12-03", 900, 1700, ["server"]))
+            assert feeds.get_changed() == {staff[0].id, staff[1].id, staff[2].id}
+
+            started = time.perf_counter()
+            assert feeds.publish(staff, STAMP) == (3, 0)
+            elapsed = time.perf_counter() - started
+            print(f"  Published 3 changed feeds in {elapsed * 1000:.1f}ms")
+            touched = [i for i, path in enumerate(paths) if os.path.getmtime(path) != 0]
+            assert touched == [0, 1, 2]
+            with open(paths[1], encoding="utf-8", newline="") as file:
+                assert file.read().count("BEGIN:VEVENT") == 2
+            assert feeds.publish(staff, STAMP) == (0, 0)
+
+            print("\n3. A restarted index rewrites only feeds that differ from the files on disk:")
+            os.remove(paths[3])
+            restarted = FeedIndex(temp_dir, [schedule])
+            try:
+                assert restarted.publish(staff) == (1, 0)  # A new DTSTAMP alone doesn't count
+                touched = [i for i, path in enumerate(paths) if os.path.getmtime(path) != 0]
+                assert touched == [0, 1, 2, 3]
+            finally:
+                restarted.close()
+
+            print("\n4. Deleted schedules and employees drop out of the feeds:")
+            assert feeds.remove_schedule(schedule)
+            assert feeds.get_shifts(staff[1].id) == [] and len(feeds.get_changed()) == 499
+            assert feeds.publish(staff[1:], STAMP) == (499, 1)
+            assert not os.path.exists(paths[0])
+            with open(paths[1], encoding="utf-8", newline="") as file:
+                assert "BEGIN:VEVENT" not in file.read()
+        finally:
+            feeds.close()
+
+    print("\n✅ INCREMENTAL PUBLISH TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_build_feed()
+    test_incremental_publish()
@@ -0,0 +1,81 @@
+import os
+import tempfile
+from modules import storage
+from modules.generator import WorkloadGenerator, ROLE_MIXES
+
+
+def test_workload_generator():
+    """Test seeded employee and schedule generation and streaming them to disk"""
+    print("=== Testing Workload Generator ===\n")
+
+    print("1. The same seed produces the same employees:")
+    first = WorkloadGenerator(seed=7).generate_employees(200, role_mix='hospital')
+    second = WorkloadGenerator(seed=7).generate_employees(200, role_mix='hospital')
+    assert [(e.role, e.wage, e.max_hours, e.available_days_times) for e in first] == \
+        [(e.role, e.wage, e.max_hours, e.available_days_times) for e in second]
+    print(f"  ✅ {len(first)} identical employees")
+
+    print("\n2. Roles follow the industry mix and minors are limited:")
+    employees = WorkloadGenerator(seed=1).generate_employees(1000, role_mix='restaurant', minor_rate=0.1)
+    counts = {}
+    for employee in employees:
+        counts[employee.role] = counts.get(employee.role, 0) + 1
+    print(f"  Roles: {counts}")
+    assert set(counts) == set(ROLE_MIXES['restaurant'])
+    assert counts['server'] > counts['cook'] > counts['host']
+    minors = [e for e in employees if e.is_minor]
+    assert minors and all(e.max_hours == 20 and e.role != 'manager' for e in minors)
+    assert not any(e.is_available("Monday", 900, 1200) for e in minors)  # School hours
+
+    try:
+        WorkloadGenerator().generate_employees(10, role_mix='airline')
+        assert False, "Should have rejected unknown role mix"
+    except ValueError as e:
+        print(f"  ✅ Correctly rejected: {e}")
+
+    print("\n3. Schedules are filled at roughly the fill rate without breaking max hours:")
+    generator = WorkloadGenerator(seed=3)
+    employees = generator.generate_employees(300, role_mix='restaurant')
+    schedules = generator.generate_schedules(employees, 2, start_date="2025-01-06",
+                                             locations=["Downtown", "Airport"], shifts_per_day=20,
+                                             fill_rate=0.5)
+    assert len(schedules) == 2
+    shifts = [shift for schedule in schedules for shift in schedule.get_all_shifts()]
+    assert len(shifts) == 2 * 7 * 2 * 20
+    assert {shift.location for shift in shifts} == {"Downtown", "Airport"}
+    filled = sum(1 for shift in shifts if shift.assigned_employees) / len(shifts)
+    print(f"  Filled: {filled:.0%}")
+    assert 0.4 < filled <= 0.6
+    for schedule in schedules:
+        for employee in employees:
+            assert schedule.get_employee_hours(employee.id, schedule.start_date) <= employee.max_hours
+
+    print("\n4. Schedules can be streamed to the data file:")
+    generator = WorkloadGenerator(seed=4)
+    employees = generator.generate_employees(50)
+    with tempfile.TemporaryDirectory() as temp_dir:
+        data_file = os.path.join(temp_dir, 'scheduling_data.json')
+        count = storage.save_data(employees, generator.iter_schedules(employees, 3, shifts_per_day=10),
+                                  data_file=data_file, backup_file=None)
+        loaded_employees, loaded_schedules = storage.load_data(data_file)
+
+        def failing_schedules():
+            yield from generator.iter_schedules(employees, 1, shifts_per_day=10)
+            raise RuntimeError("generator failed")
+        try:
+            storage.save_data(employees, failing_schedules(), data_file=data_file, backup_file=None)
+            assert False, "Should have raised the generator's error"
+        except RuntimeError as e:
+            print(f"  ✅ Save failed part way: {e}")
+        # The previous save is left whole
+        assert len(storage.load_data(data_file)[1]) == 3 and os.listdir(temp_dir) == ['scheduling_data.json']
+    print(f"  Saved {count} schedules, loaded {len(loaded_schedules)}")
+    assert count == 3 and len(loaded_schedules) == 3
+    assert len(loaded_employees) == 50
+    assert all(len(schedule.get_all_shifts()) == 70 for schedule in loaded_schedules)
+
+    print("\n✅ WORKLOAD GENERATOR TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_workload_generator()
@@ -0,0 +1,28 @@
+from modules import Employee
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def make_employee(name, role="server", wage=15.00, max_hours=40, min_hours=0, days=DAYS, locations=None):
+    """
+    Create an employee for the tests, available all day on the given days
+
+    Args:
+        name (str): Employee name (the email address is made from it)
+        role (str): Job role
+        wage (float): Hourly wage
+        max_hours (int): Maximum hours per week
+        min_hours (int): Minimum hours per week
+        days (list): Days the employee is available (default every day)
+        locations (list): Locations the employee works at (None for any)
+
+    Returns:
+        Employee: The employee
+    """
+    employee = Employee(name, "555-0000", f"{name.lower()}@email.com", role, wage,
+                        max_hours=max_hours, min_hours=min_hours)
+    for day in days:
+        employee.add_availability(day, 0, 2359)
+    if locations:
+        employee.set_locations(locations)
+    return employee
@@ -0,0 +1,104 @@
+import os
+import tempfile
+import time
+from modules import Employee
+from modules import importer
+from modules.importer import import_employees, parse_window
+
+HEADER = "Name,Phone,Email,Role,Wage,Max Hours,Min Hours,Is Minor,Locations,Availability,Monday,Saturday\n"
+
+
+def write_file(directory, name, text):
+    path = os.path.join(directory, name)
+    with open(path, 'w', newline='') as file:
+        file.write(text)
+    return path
+
+
+def test_import_employees():
+    """Test importing employees and availability from CSV"""
+    print("=== Testing Employee Import ===\n")
+
+    existing = Employee("Alice", "555-0001", "alice@email.com", "server", 15.00)
+    rows = (HEADER +
+            'Bob,555-0002,bob@email.com,server,$16.50,30,10,no,"Downtown; Uptown",Tue 0900-1700; wed 900-1300,"0600-1000, 1500-2100",\n'
+            'Carol,555-0003,carol@email.com,cook,18,40.0,,yes,,,,10:00-14:00\n'
+            'Dave,555-0004,,cook,abc,20,30,maybe,,Fun 0900-1700,,\n'
+            'Eve,555-0005,ALICE@email.com,server,15,,,,,,,\n'
+            ',,,,,,,,,,,\n'
+            ',555-0006,frank@email.com,,15,,,,,,1700-0900,\n'
+            'Gina,555-0007,bob@email.com,host,14,,,,,,,\n')
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = write_file(temp_dir, "staff.csv", rows)
+        result = import_employees(path, [existing])
+
+        print("1. Valid rows become employees with their availability:")
+        print(f"  {result}")
+        assert [emp.name for emp in result.employees] == ["Bob", "Carol"]
+        bob, carol = result.employees
+        assert bob.wage == 16.50 and bob.max_hours == 30 and bob.min_hours == 10 and not bob.is_minor
+        assert bob.locations == ["Downtown", "Uptown"]
+        assert bob.available_days_times == [("Tuesday", 900, 1700), ("Wednesday", 900, 1300),
+                                            ("Monday", 600, 1000), ("Monday", 1500, 2100)]
+        assert bob.is_available("Monday", 1600, 2000) and not bob.is_available("Monday", 1100, 1400)
+        assert carol.is_minor and carol.max_hours == 40 and carol.locations == []
+        assert carol.available_days_times == [("Saturday", 1000, 1400)]
+
+        print("\n2. Invalid rows are skipped and reported by row number:")
+        print(result.get_error_report())
+        errors = dict(result.errors)
+        assert sorted(errors) == [4, 5, 7, 8] and result.rows == 6 and not result.is_clean
+        assert "Invalid wage" in errors[4] and "Min hours" in errors[4]
+        assert "is_minor" in errors[4] and "Invalid day" in errors[4]
+        assert errors[5] == "Duplicate email: ALICE@email.com"
+        assert "Name is required" in errors[7] and "Role is required" in errors[7] and "end after" in errors[7]
+        assert errors[8] == "Duplicate email: bob@email.com"
+
+        print("\n3. Unreadable files are rejected:")
+        for name, text in (("missing.csv", "Name,Email,Wage\nBob,bob@email.com,15\n"), ("staff.json", "[]")):
+            try:
+                import_employees(write_file(temp_dir, name, text))
+                assert False, f"Should have rejected {name}"
+            except ValueError as e:
+                print(f"  ✅ Correctly rejected: {e}")
+        if importer.openpyxl is None:
+            try:
+                import_employees(write_file(temp_dir, "staff.xlsx", ""))
+                assert False, "Should have asked for openpyxl"
+            except ValueError as e:
+                print(f"  ✅ Correctly rejected: {e}")
+                assert "openpyxl" in str(e)
+
+    print("\n✅ EMPLOYEE IMPORT TEST PASSED")
+
+
+def test_import_scale():
+    """Test importing a 100,000-row roster"""
+    print("=== Testing Import at Scale ===\n")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "roster.csv")
+        with open(path, 'w', newline='') as file:
+            file.write(HEADER)
+            for i in range(100000):
+                file.write(f"Staff{i},555-{i:05d},staff{i}@email.com,server,{12 + i % 10},40,0,no,Site{i % 5},"
+                           f"Tue 0900-1700; Thu 0900-1700,0600-1400,1000-{1400 + (i % 4) * 100}\n")
+
+        parse_window.cache_clear()
+        started = time.perf_counter()
+        result = import_employees(path)
+        elapsed = time.perf_counter() - started
+        print(f"  {result} in {elapsed:.2f}s")
+        assert result.is_clean and len(result.employees) == 100000
+        assert result.employees[-1].available_days_times[-1] == ("Saturday", 1000, 1700)
+        # Each distinct window text is parsed once
+        assert parse_window.cache_info().misses == 6
+        assert elapsed < 10
+
+    print("\n✅ IMPORT SCALE TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_import_employees()
+    test_import_scale()
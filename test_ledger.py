@@ -0,0 +1,59 @@
+from datetime import date
+from modules import Employee, Shift, Schedule
+
+
+def test_hours_ledger():
+    """Test weekly hours tracking and max/min hours enforcement"""
+    print("=== Testing Hours Ledger ===\n")
+
+    alice = Employee("Alice", "555-0001", "alice@email.com", "server", 16.00, max_hours=20, min_hours=10)
+    bob = Employee("Bob", "555-0002", "bob@email.com", "server", 15.00, max_hours=40, min_hours=8)
+    for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday"]:
+        alice.add_availability(day, 900, 2200)
+        bob.add_availability(day, 900, 2200)
+    employees = [alice, bob]
+
+    schedule = Schedule("2025-12-01", "2025-12-07")
+    shifts = [Shift(f"2025-12-0{day}", 900, 1700, ["server"]) for day in range(1, 6)]  # 8 hours each
+
+    # Assignments made before the shift joins the schedule are recorded when it is added
+    shifts[0].assign_employee(alice)
+    for shift in shifts:
+        schedule.add_shift(shift)
+
+    print("1. Hours are tracked as employees are assigned:")
+    shifts[1].assign_employee(alice)
+    print(f"  Alice: {schedule.get_employee_hours(alice.id, date(2025, 12, 3)):.1f} hours")
+    assert schedule.get_employee_hours(alice.id, date(2025, 12, 3)) == 16.0
+
+    print("\n2. Assignments past max_hours are rejected:")
+    try:
+        shifts[2].assign_employee(alice)  # Would be 24 hours (max 20)
+        assert False, "Should have rejected assignment over max hours"
+    except ValueError as e:
+        print(f"  ✅ Correctly rejected: {e}")
+    assert alice.id not in shifts[2].assigned_employees
+
+    print("\n3. Removing an employee gives the hours back:")
+    shifts[1].remove_employee(alice.id)
+    assert schedule.get_employee_hours(alice.id, date(2025, 12, 1)) == 8.0
+    shifts[2].assign_employee(alice)
+    assert schedule.get_employee_hours(alice.id, date(2025, 12, 1)) == 16.0
+
+    print("\n4. Employees under min_hours are reported:")
+    under = schedule.get_employees_under_min_hours(employees)
+    for employee, week_start, hours in under:
+        print(f"  {employee.name}: {hours:.1f}h (min {employee.min_hours}h), week of {week_start}")
+    assert [(employee.name, week_start, hours) for employee, week_start, hours in under] == [
+        ("Bob", date(2025, 12, 1), 0.0)]
+
+    print("\n5. Hours are rebuilt when a schedule is loaded:")
+    loaded = Schedule.from_dict(schedule.to_dict())
+    assert loaded.get_employee_hours(alice.id, date(2025, 12, 1)) == 16.0
+    assert loaded.shifts[0].schedule is loaded
+
+    print("\n✅ HOURS LEDGER TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_hours_ledger()
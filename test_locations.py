@@ -0,0 +1,191 @@
+import json
+import os
+import tempfile
+from modules import Employee, Shift, Schedule
+from modules.eligibility import EligibilityIndex
+from modules.locations import LocationStore, ConflictIndex, get_bookings, location_slug
+from test_helpers import make_employee
+
+
+def test_location_rules():
+    """Test employee locations, schedule locations and eligibility by location"""
+    print("=== Testing Location Rules ===\n")
+
+    anywhere = make_employee("Alice")
+    downtown = make_employee("Bob", locations=["Downtown"])
+    both = make_employee("Carol", locations=["downtown", "Uptown"])
+
+    print("1. Employees only work at their locations (none set = anywhere):")
+    shift = Shift("2025-12-01", 900, 1700, ["server"], location="Uptown")
+    assert shift.check_employee(anywhere) is None
+    assert shift.check_employee(downtown) == "Employee does not work at Uptown"
+    assert shift.check_employee(both) is None
+    index = EligibilityIndex([anywhere, downtown, both])
+    try:
+        assert index.get_available(shift) == {anywhere.id, both.id}
+    finally:
+        index.close()
+
+    print("\n2. A location's schedule only takes its own shifts:")
+    schedule = Schedule("2025-12-01", "2025-12-07", location="Downtown")
+    schedule.add_shift(Shift("2025-12-01", 900, 1700, ["server"], location="Downtown"))
+    try:
+        schedule.add_shifts([Shift("2025-12-02", 900, 1700, ["server"], location="Downtown"), shift])
+        assert False, "Should have rejected an Uptown shift"
+    except ValueError as e:
+        print(f"  ✅ Correctly rejected: {e}")
+    assert len(schedule.shifts) == 1
+    assert Schedule.from_dict(schedule.to_dict()).location == "Downtown"
+    assert Employee.from_dict(both.to_dict()).locations == ["downtown", "Uptown"]
+
+    print("\n✅ LOCATION RULES TEST PASSED")
+
+
+def test_conflict_index():
+    """Test that assignments at other sites block overlaps and short rests"""
+    print("=== Testing Conflict Index ===\n")
+
+    carol = make_employee("Carol", locations=["Downtown", "Uptown"])
+    uptown = Schedule("2025-12-01", "2025-12-07", location="Uptown")
+    uptown_shift = Shift("2025-12-01", 900, 1700, ["server"], location="Uptown")
+    uptown.add_shift(uptown_shift)
+    uptown_shift.assign_employee(carol)
+
+    index = ConflictIndex()
+    index.set_location("Uptown", get_bookings([uptown]))
+    downtown = Schedule("2025-12-01", "2025-12-07", min_rest_hours=8, location="Downtown")
+    downtown.conflict_index = index
+    overlap = Shift("2025-12-01", 1200, 2000, ["server"], location="Downtown")
+    close = Shift("2025-12-01", 2000, 2300, ["server"], location="Downtown")
+    fine = Shift("2025-12-02", 900, 1700, ["server"], location="Downtown")
+    downtown.add_shifts([overlap, close, fine])
+
+    print("1. Overlaps and short rests at another site are rejected:")
+    for shift in (overlap, close):
+        try:
+            shift.assign_employee(carol)
+            assert False, "Should have rejected the cross-location conflict"
+        except ValueError as e:
+            print(f"  ✅ Correctly rejected: {e}")
+            assert "Uptown" in str(e)
+    fine.assign_employee(carol)
+
+    print("\n2. The site's own bookings are left to its schedule:")
+    index.set_location("Downtown", get_bookings([downtown]))
+    assert index.get_locations() == ["Downtown", "Uptown"]
+    assert index.find_conflict(carol.id, fine) is None
+    index.remove_location("Uptown")
+    assert overlap.check_employee(carol) is None and downtown.check_labor_rules(carol.id, overlap) is None
+
+    print("\n✅ CONFLICT INDEX TEST PASSED")
+
+
+def test_location_store():
+    """Test per-location shards with shared employees"""
+    print("=== Testing Location Store ===\n")
+
+    alice = make_employee("Alice", locations=["Downtown"])
+    bob = make_employee("Bob", locations=["Uptown"])
+    carol = make_employee("Carol")
+    schedule = Schedule("2025-12-01", "2025-12-07")
+    downtown_shift = Shift("2025-12-01", 900, 1700, ["server"], location="Downtown")
+    uptown_shift = Shift("2025-12-01", 1800, 2200, ["server"], location="Uptown")
+    schedule.add_shifts([downtown_shift, uptown_shift])
+    downtown_shift.assign_employee(alice)
+    uptown_shift.assign_employee(carol)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        store = LocationStore(os.path.join(temp_dir, 'locations'))
+        assert store.get_locations() == [] and store.load_employees() == []
+
+        print("1. Existing data is split into one shard per location:")
+        assert store.import_data([alice, bob, carol], [schedule]) == ["Downtown", "Uptown"]
+        assert store.get_locations() == ["Downtown", "Uptown"]
+        assert os.path.exists(store.get_file("Downtown"))
+        assert location_slug("Downtown #2") == "downtown_2"
+
+        print("\n2. A site loads only its shard and its staff:")
+        employees = store.load_employees("Downtown")
+        schedules = store.load_location("Downtown")
+        assert sorted(emp.name for emp in employees) == ["Alice", "Carol"]
+        assert len(schedules) == 1 and schedules[0].location == "Downtown"
+        assert [shift.id for shift in schedules[0].shifts] == [downtown_shift.id]
+        assert store.load_location("Nowhere") == []
+
+        print("\n3. Saving a site keeps the other sites' staff:")
+        dave = make_employee("Dave", locations=["Downtown"])
+        employees = [emp for emp in employees if emp.name != "Alice"] + [dave]
+        store.reserve_employee_ids([dave])
+        store.save_employees(employees)
+        assert sorted(emp.name for emp in store.load_employees()) == ["Bob", "Carol", "Dave"]
+
+        print("\n4. The conflict index sees every site's assignments:")
+        index = store.load_conflict_index()
+        evening = Shift("2025-12-01", 1600, 2000, ["server"], location="Downtown")
+        assert index.check(carol.id, evening) is not None
+        assert index.check(alice.id, evening) is None
+
+        try:
+            store.save_location("Uptown", schedules)
+            assert False, "Should have rejected Downtown shifts in the Uptown shard"
+        except ValueError as e:
+            print(f"  ✅ Correctly rejected: {e}")
+
+    print("\n✅ LOCATION STORE TEST PASSED")
+
+
+def test_concurrent_sites():
+    """Test two sites editing the shared employees file at the same time"""
+    print("=== Testing Concurrent Sites ===\n")
+
+    alice = make_employee("Alice", locations=["Downtown"])
+    bob = make_employee("Bob", locations=["Uptown"])
+    carol = make_employee("Carol")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        directory = os.path.join(temp_dir, 'locations')
+        LocationStore(directory).import_data([alice, bob, carol], [])
+        downtown, uptown = LocationStore(directory), LocationStore(directory)
+        downtown_staff = downtown.load_employees("Downtown")
+        uptown_staff = uptown.load_employees("Uptown")
+
+        print("1. Sites hiring at once get different IDs:")
+        # Each process only knows the counter it loaded
+        counter = Employee._next_id
+        dave = make_employee("Dave", locations=["Downtown"])
+        Employee._next_id = counter
+        erin = make_employee("Erin", locations=["Uptown"])
+        downtown.reserve_employee_ids([dave])
+        uptown.reserve_employee_ids([erin])
+        print(f"  Dave {dave.id}, Erin {erin.id}")
+        assert dave.id != erin.id
+
+        print("\n2. Each save keeps the other site's hires and edits:")
+        shared = next(emp for emp in uptown_staff if emp.name == "Carol")
+        shared.wage = 18.00
+        uptown.save_employees(uptown_staff + [erin])
+        downtown.save_employees(downtown_staff + [dave])  # Stale: loaded before Erin and the raise
+        saved = {emp.name: emp for emp in LocationStore(directory).load_employees()}
+        assert sorted(saved) == ["Alice", "Bob", "Carol", "Dave", "Erin"]
+        assert saved["Carol"].wage == 18.00
+
+        print("\n3. Deletions are recorded and not undone by another site:")
+        uptown_staff = [emp for emp in uptown_staff if emp.name != "Carol"]
+        uptown.save_employees(uptown_staff + [erin])
+        carol_downtown = next(emp for emp in downtown_staff if emp.name == "Carol")
+        carol_downtown.max_hours = 30
+        downtown.save_employees(downtown_staff + [dave])
+        saved = sorted(emp.name for emp in LocationStore(directory).load_employees())
+        assert saved == ["Alice", "Bob", "Dave", "Erin"]
+        with open(downtown.employees_file) as file:
+            assert json.load(file)['deleted_employee_ids'] == [carol.id]
+        assert not [name for name in os.listdir(directory) if name.endswith('.tmp')]
+
+    print("\n✅ CONCURRENT SITES TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_location_rules()
+    test_conflict_index()
+    test_location_store()
+    test_concurrent_sites()
@@ -0,0 +1,177 @@
+import json
+import os
+import tempfile
+import threading
+import time
+from modules import Shift, Schedule
+from modules.notifications import (NotificationOutbox, MemoryTransport, FileTransport, SMTPTransport,
+                                   Transport, get_transport, ASSIGNED, REMOVED)
+from test_helpers import make_employee
+
+
+class FlakyTransport(Transport):
+    """Fails with each of errors in turn, then records batches and the thread that sent them"""
+
+    def __init__(self, errors):
+        self.errors = list(errors)
+        self.batches = []
+        self.threads = []
+
+    def send(self, notifications):
+        if self.errors:
+            raise self.errors.pop(0)
+        self.batches.append(list(notifications))
+        self.threads.append(threading.current_thread().name)
+
+
+def test_coalescing():
+    """Test that changes are coalesced into one notification per employee"""
+    print("=== Testing Notification Coalescing ===\n")
+
+    alice, bob, carol = make_employee("Alice"), make_employee("Bob"), make_employee("Carol")
+    schedule = Schedule("2025-12-01", "2025-12-07")
+    monday = Shift("2025-12-01", 900, 1700, ["server"], max_staff=3)
+    tuesday = Shift("2025-12-02", 900, 1700, ["server"], max_staff=3)
+    schedule.add_shifts([tuesday, monday])
+    monday.assign_employee(carol)  # Before the outbox existed
+
+    transport = MemoryTransport()
+    outbox = NotificationOutbox(transport, [alice, bob, carol], batch_size=2)
+    try:
+        print("1. Opposite changes to the same shift cancel out:")
+        monday.assign_employee(bob)
+        monday.remove_employee(bob.id)
+        assert outbox.get_draft_count() == 0
+
+        print("\n2. Each employee gets one message with every change, in date order:")
+        tuesday.assign_employee(alice)
+        monday.assign_employee(alice)
+        monday.remove_employee(carol.id)
+        copy = Shift("2025-12-03", 900, 1700, ["server"])
+        copy.assign_employee(bob)  # Outside a schedule: recorded when the shift is added
+        schedule.add_shift(copy)
+        Schedule("2025-12-08", "2025-12-14").add_shifts([Shift("2025-12-08", 900, 1700, ["server"])])
+        assert outbox.get_draft_count() == 3
+
+        print("\n3. Nothing is sent until the changes are released (saved):")
+        assert outbox.get_pending_count() == 0 and outbox.flush() == 0
+        assert outbox.release() == 3 and outbox.get_draft_count() == 0
+        assert outbox.flush() == 3 and outbox.sent_count == 3
+        assert [len(batch) for batch in transport.batches] == [2, 1]
+        sent = {notification.employee.name: notification for notification in transport.sent}
+        assert sent["Alice"].changes == [(ASSIGNED, monday), (ASSIGNED, tuesday)]
+        assert sent["Carol"].changes == [(REMOVED, monday)]
+        assert sent["Bob"].changes == [(ASSIGNED, copy)]
+        print(sent["Alice"].body)
+        assert sent["Alice"].subject == "Your schedule has changed (2 shifts)"
+        assert "+ Added to: Monday 2025-12-01, 9:00 AM - 5:00 PM, server at Main" in sent["Alice"].body
+        assert "- Removed from: Monday 2025-12-01" in sent["Carol"].body
+        assert outbox.get_pending_count() == 0 and outbox.flush() == 0
+
+        print("\n4. Discarded changes are never sent:")
+        tuesday.remove_employee(alice.id)
+        assert outbox.discard() == 1
+        assert outbox.release() == 0 and outbox.flush() == 0
+    finally:
+        outbox.close()
+
+    monday.remove_employee(alice.id)
+    assert outbox.get_draft_count() == 0  # Closed outboxes stop recording
+
+    print("\n✅ NOTIFICATION COALESCING TEST PASSED")
+
+
+def test_background_delivery():
+    """Test retrying failed batches and delivering on the background thread"""
+    print("=== Testing Background Delivery ===\n")
+
+    alice, bob = make_employee("Alice"), make_employee("Bob")
+    schedule = Schedule("2025-12-01", "2025-12-07")
+    monday = Shift("2025-12-01", 900, 1700, ["server"], max_staff=2)
+    tuesday = Shift("2025-12-02", 900, 1700, ["server"], max_staff=2)
+    schedule.add_shifts([monday, tuesday])
+
+    transport = FlakyTransport([ConnectionRefusedError("mail server down"), ValueError("bad header")])
+    outbox = NotificationOutbox(transport, [alice, bob])
+    try:
+        print("1. A failed batch is queued again and merged with newer changes:")
+        monday.assign_employee(alice)
+        tuesday.assign_employee(alice)
+        outbox.release()
+        assert outbox.flush() == 0 and isinstance(outbox.last_error, OSError)
+        monday.remove_employee(alice.id)
+        tuesday.assign_employee(bob)
+        outbox.release()
+        assert outbox.get_pending_count() == 2
+        # Not only mail server errors: a message the transport can't build is kept too
+        assert outbox.flush() == 0 and isinstance(outbox.last_error, ValueError)
+        assert outbox.get_pending_count() == 2
+
+        print("\n2. The background thread delivers without blocking the caller:")
+        outbox.start(interval=60)
+        assert outbox.running
+        outbox.send_soon()
+        deadline = time.time() + 5
+        while not transport.batches and time.time() < deadline:
+            time.sleep(0.01)
+        sent = {notification.employee.name: notification.changes for notification in transport.batches[0]}
+        assert sent == {"Alice": [(ASSIGNED, tuesday)], "Bob": [(ASSIGNED, tuesday)]}
+        assert transport.threads == ["NotificationOutbox"]
+
+        print("\n3. Stopping sends whatever released changes are still waiting:")
+        monday.assign_employee(bob)
+        outbox.release()
+        outbox.stop()
+        assert not outbox.running and outbox.get_pending_count() == 0
+        assert transport.batches[-1][0].changes == [(ASSIGNED, monday)]
+    finally:
+        outbox.stop(flush=False)
+        outbox.close()
+
+    print("\n✅ BACKGROUND DELIVERY TEST PASSED")
+
+
+def test_transports():
+    """Test the file transport and the transport chosen by the environment"""
+    print("=== Testing Transports ===\n")
+
+    alice = make_employee("Alice")
+    schedule = Schedule("2025-12-01", "2025-12-07")
+    shift = Shift("2025-12-01", 900, 1700, ["server"])
+    schedule.add_shift(shift)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, "outbox", "notifications.jsonl")
+        outbox = NotificationOutbox(FileTransport(path), [alice])
+        try:
+            shift.assign_employee(alice)
+            outbox.release()
+            assert outbox.flush() == 1
+        finally:
+            outbox.close()
+        with open(path, encoding="utf-8") as file:
+            messages = [json.loads(line) for line in file]
+        assert len(messages) == 1 and messages[0]['to'] == "alice@email.com"
+        assert messages[0]['changes'] == [{'change': ASSIGNED, 'shift_id': shift.id}]
+
+    saved = {key: os.environ.pop(key) for key in list(os.environ) if key.startswith('CHRONOS_SMTP_')}
+    try:
+        assert isinstance(get_transport(), FileTransport)
+        os.environ.update({'CHRONOS_SMTP_HOST': "mail.example.com", 'CHRONOS_SMTP_PORT': "2525",
+                           'CHRONOS_SMTP_FROM': "schedules@example.com", 'CHRONOS_SMTP_TLS': "0"})
+        transport = get_transport()
+        assert isinstance(transport, SMTPTransport)
+        assert (transport.host, transport.port, transport.sender, transport.use_tls) == \
+            ("mail.example.com", 2525, "schedules@example.com", False)
+    finally:
+        for key in [key for key in os.environ if key.startswith('CHRONOS_SMTP_')]:
+            del os.environ[key]
+        os.environ.update(saved)
+
+    print("\n✅ TRANSPORTS TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_coalescing()
+    test_background_delivery()
+    test_transports()
@@ -0,0 +1,65 @@
+from modules import Employee, Shift, Schedule
+from modules.payroll import PayrollEngine, PayrollRules
+
+
+def test_payroll_engine():
+    """Test weekly/daily overtime, minor and holiday multipliers"""
+    print("=== Testing Payroll Engine ===\n")
+
+    alice = Employee("Alice", "555-0001", "alice@email.com", "cook", 20.00, max_hours=60)
+    bob = Employee("Bob", "555-0002", "bob@email.com", "server", 10.00, is_minor=True)
+    for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday"]:
+        alice.add_availability(day, 600, 2200)
+        bob.add_availability(day, 600, 2200)
+    employees = [alice, bob]
+
+    schedule = Schedule("2025-12-01", "2025-12-07")
+    # Alice works five 10-hour days = 50 hours (10 hours of weekly overtime)
+    for day in range(1, 6):
+        shift = Shift(f"2025-12-0{day}", 800, 1800, ["cook"])
+        schedule.add_shift(shift)
+        shift.assign_employee(alice)
+    # Bob works one 4-hour shift
+    bob_shift = Shift("2025-12-01", 1000, 1400, ["server"])
+    schedule.add_shift(bob_shift)
+    bob_shift.assign_employee(bob)
+
+    print("1. Default rules (1.5x past 40 hours/week):")
+    report = PayrollEngine().calculate(schedule, employees)
+    alice_pay = report.get_breakdown(alice.id)
+    print(f"  Alice: {alice_pay.regular_hours:.1f} regular + {alice_pay.overtime_hours:.1f} overtime = ${alice_pay.total_pay:.2f}")
+    assert alice_pay.regular_hours == 40 and alice_pay.overtime_hours == 10
+    assert alice_pay.total_pay == 40 * 20 + 10 * 30
+    assert report.total_cost == 1100 + 40
+    # The flat per-shift calculation has no overtime
+    assert schedule.calculate_payroll(employees) == 50 * 20 + 40
+
+    print("\n2. Daily overtime past 8 hours:")
+    rules = PayrollRules(daily_overtime_hours=8)
+    alice_pay = PayrollEngine(rules).calculate(schedule, employees).get_breakdown(alice.id)
+    print(f"  Alice: {alice_pay.regular_hours:.1f} regular + {alice_pay.overtime_hours:.1f} overtime")
+    # 2 hours/day of daily overtime; the remaining 40 regular hours don't hit the weekly limit
+    assert alice_pay.regular_hours == 40 and alice_pay.overtime_hours == 10
+
+    print("\n3. Minor and holiday multipliers:")
+    rules = PayrollRules(minor_multiplier=1.1, holidays=["2025-12-01"], holiday_multiplier=2.0)
+    report = PayrollEngine(rules).calculate(schedule, employees)
+    bob_pay = report.get_breakdown(bob.id)
+    print(f"  Bob (minor, holiday): ${bob_pay.total_pay:.2f}")
+    assert abs(bob_pay.total_pay - 4 * 10 * 1.1 * 2.0) < 1e-9
+    assert report.get_breakdown(alice.id).holiday_hours == 10
+
+    print("\n4. One employee is re-priced from their own shifts:")
+    engine = PayrollEngine()
+    friday = schedule.get_shifts_by_date(schedule.start_date.replace(day=5))[0]
+    friday.remove_employee(alice.id)
+    alice_pay = engine.calculate_employee(schedule, alice)
+    print(f"  Alice without Friday: ${alice_pay.total_pay:.2f}")
+    assert alice_pay.total_pay == engine.calculate(schedule, employees).get_breakdown(alice.id).total_pay == 800
+    assert engine.calculate_employee(schedule, Employee("Carol", "555-0003", "carol@email.com", "cook", 20.00)).shift_count == 0
+
+    print("\n✅ PAYROLL ENGINE TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_payroll_engine()
@@ -0,0 +1,60 @@
+import time
+from datetime import date, timedelta
+from modules import Employee, Shift, Schedule
+
+
+def test_schedule_periods():
+    """Test schedules longer than a week and date-bucketed lookups"""
+    print("=== Testing Schedule Periods ===\n")
+
+    print("1. A 14-day rotation covers two calendar weeks:")
+    rotation = Schedule("2025-12-01", "2025-12-14")
+    assert rotation.get_length_days() == 14 and rotation.get_period_weeks() == 2
+    assert rotation.get_week_starts() == [date(2025, 12, 1), date(2025, 12, 8)]
+    first = Shift("2025-12-01", 900, 1700, ["nurse"])
+    second = Shift("2025-12-09", 900, 1700, ["nurse"])
+    later = Shift("2025-12-14", 1900, 700, ["nurse"])
+    rotation.add_shifts([first, second, later])
+    assert rotation.get_shifts_by_date("2025-12-09") == [second]
+    assert rotation.get_shifts_in_range(date(2025, 12, 8), date(2025, 12, 14)) == [second, later]
+    # Ranges are clipped to the schedule
+    assert rotation.get_shifts_in_range(date(2025, 11, 1), date(2026, 1, 31)) == [first, second, later]
+    assert Schedule.from_dict(rotation.to_dict()).get_shifts_by_date(date(2025, 12, 14))[0].id == later.id
+
+    print("\n2. Invalid periods are rejected:")
+    try:
+        Schedule("2025-12-14", "2025-12-01")
+        assert False, "Should have rejected an end date before the start"
+    except ValueError as e:
+        print(f"  ✅ Correctly rejected: {e}")
+
+    print("\n3. Copying forward moves by the whole period:")
+    nurse = Employee("Nora", "555-0001", "nora@email.com", "nurse", 30.00)
+    nurse.add_availability("Monday", 0, 2359)
+    first.assign_employee(nurse)
+    copy = rotation.clone(keep_assignments=True)
+    assert (copy.start_date, copy.end_date) == (date(2025, 12, 15), date(2025, 12, 28))
+    assert copy.get_shifts_by_date("2025-12-15")[0].assigned_employees == [nurse.id]
+    assert rotation.get_employees_under_min_hours([nurse]) == []
+
+    print("\n4. Day lookups on a 28-day, 10,000-shift rotation don't scan every shift:")
+    start = date(2026, 1, 5)
+    big = Schedule(start, start + timedelta(days=27))
+    big.add_shifts([Shift(start + timedelta(days=i % 28), 600 + (i % 12) * 100, 700 + (i % 12) * 100, ["nurse"])
+                    for i in range(10000)])
+    started = time.perf_counter()
+    for _ in range(100):
+        day_shifts = big.get_shifts_by_date(start + timedelta(days=13))
+        week_shifts = big.get_shifts_in_range(start + timedelta(days=7), start + timedelta(days=13))
+    elapsed = time.perf_counter() - started
+    print(f"  100 day + week lookups in {elapsed * 1000:.1f}ms")
+    assert len(day_shifts) == 357 and len(week_shifts) == sum(
+        len(big.get_shifts_by_date(start + timedelta(days=d))) for d in range(7, 14))
+    assert big.has_conflicts()
+    assert elapsed < 0.5
+
+    print("\n✅ SCHEDULE PERIODS TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_schedule_periods()
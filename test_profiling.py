@@ -0,0 +1,108 @@
+import json
+import os
+import pstats
+import tempfile
+from modules import Employee, Shift, Schedule
+from modules.profiling import Profiler, SessionProfiler, profiler
+
+
+def test_profiling():
+    """Test opt-in call counts and latency histograms"""
+    print("=== Testing Profiling Hooks ===\n")
+
+    local = Profiler()
+
+    @local.timed("work")
+    def work(value):
+        return value * 2
+
+    print("1. Nothing is recorded while disabled:")
+    assert work(2) == 4
+    assert local.get_stats() == []
+
+    print("\n2. Calls and blocks are recorded while enabled:")
+    local.enabled = True
+    for i in range(5):
+        work(i)
+    with local.measure("block"):
+        sum(range(1000))
+    try:
+        with local.measure("failing block"):
+            raise ValueError("boom")
+    except ValueError:
+        pass  # Time is still recorded when the block raises
+    for line in local.get_report():
+        print(f"  {line}")
+    stats = {s.name: s for s in local.get_stats()}
+    assert stats['work'].count == 5
+    assert sum(stats['work'].buckets) == 5
+    assert stats['block'].count == 1 and stats['failing block'].count == 1
+    assert stats['work'].min_ms <= stats['work'].mean_ms <= stats['work'].max_ms
+
+    print("\n3. Histogram buckets follow the bucket bounds:")
+    local.record("slow", 7.0)
+    local.record("slow", 7000.0)
+    slow = {s.name: s for s in local.get_stats()}['slow']
+    histogram = slow.to_dict()['histogram']
+    print(f"  {histogram}")
+    assert histogram['<10ms'] == 1 and histogram['>=5000ms'] == 1
+
+    print("\n4. Timings can be dumped to a file:")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'diagnostics', 'timings.json')
+        local.dump(path)
+        with open(path, 'r') as file:
+            dumped = json.load(file)
+    assert {action['name'] for action in dumped['actions']} == {'work', 'block', 'failing block', 'slow'}
+    local.reset()
+    assert local.get_stats() == []
+
+    print("\n5. Hot paths are instrumented through the global profiler:")
+    alice = Employee("Alice", "555-0001", "alice@email.com", "server", 16.00)
+    alice.add_availability("Monday", 900, 2200)
+    schedule = Schedule("2025-12-01", "2025-12-07")
+    shift = Shift("2025-12-01", 1000, 1400, ["server"])
+    schedule.add_shift(shift)
+
+    profiler.enabled = True
+    profiler.reset()
+    try:
+        shift.assign_employee(alice)
+        schedule.calculate_payroll([alice])
+    finally:
+        profiler.enabled = False
+    names = {s.name for s in profiler.get_stats()}
+    print(f"  Recorded: {sorted(names)}")
+    assert {'Shift.assign_employee', 'Schedule.calculate_payroll'} <= names
+    profiler.reset()
+
+    print("\n✅ PROFILING TEST PASSED")
+
+
+def test_session_profiler():
+    """Test recording a cProfile session to a timestamped stats file"""
+    print("=== Testing Session Profiler ===\n")
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        session = SessionProfiler(os.path.join(temp_dir, 'data'))
+        assert session.stop() is None  # Nothing recorded yet
+
+        session.start()
+        assert session.running
+        schedule = Schedule("2025-12-01", "2025-12-07")
+        schedule.add_shift(Shift("2025-12-01", 1000, 1400, ["server"]))
+        schedule.has_conflicts()
+        path = session.stop()
+
+        print(f"  Saved to {os.path.basename(path)}")
+        assert not session.running
+        assert os.path.basename(path).startswith("profile_") and path.endswith(".prof")
+        functions = {name for (filename, line, name) in pstats.Stats(path).stats}
+        assert 'has_conflicts' in functions
+
+    print("\n✅ SESSION PROFILER TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_profiling()
+    test_session_profiler()
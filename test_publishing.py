@@ -0,0 +1,211 @@
+import json
+import os
+import tempfile
+import time
+from datetime import date, timedelta
+from modules import Shift, Schedule
+from modules.publishing import Publisher, ScheduleSnapshot, save_snapshot, load_snapshots, delete_snapshots
+from test_helpers import make_employee
+
+
+def test_publish_versions():
+    """Test publishing, deltas after publishing and diffs between versions"""
+    print("=== Testing Publish Versions ===\n")
+
+    alice, bob = make_employee("Alice"), make_employee("Bob")
+    schedule = Schedule("2025-12-01", "2025-12-07")
+    monday = Shift("2025-12-01", 900, 1700, ["server"])
+    tuesday = Shift("2025-12-02", 900, 1700, ["server"], max_staff=2)
+    schedule.add_shifts([monday, tuesday])
+    monday.assign_employee(alice)
+
+    publisher = Publisher()
+    try:
+        print("1. Publishing freezes the schedule:")
+        first, created = publisher.publish(schedule)
+        assert created and first.version == 1 and first.parent_hash is None and first.shift_count == 2
+        assert monday.is_published and tuesday.is_published
+        assert first.get_day(date(2025, 12, 1))[0].assigned == (alice.id,)
+        # Reads hand back the snapshot's own tuples
+        assert first.get_day(date(2025, 12, 1)) is first.get_day(date(2025, 12, 1))
+        assert [record.id for _, record in first.get_week(date(2025, 12, 1))] == [monday.id, tuesday.id]
+        for change in (lambda: setattr(first, 'version', 5),
+                       lambda: first.days.__setitem__(date(2025, 12, 3), ())):
+            try:
+                change()
+                assert False, "Snapshots should be read-only"
+            except (AttributeError, TypeError) as e:
+                print(f"  ✅ Correctly rejected: {e}")
+        assert publisher.publish(schedule) == (first, False)
+
+        print("\n2. Later edits are recorded as deltas against the snapshot:")
+        tuesday.assign_employee(bob)
+        thursday = Shift("2025-12-04", 1200, 2000, ["host"])
+        schedule.add_shift(thursday)
+        assert [delta.kind for delta in publisher.get_deltas(schedule.id)] == ['assigned', 'shift_added']
+        assert not tuesday.is_published and monday.is_published
+        assert first.get_day(date(2025, 12, 2))[0].assigned == ()  # The snapshot is unchanged
+
+        print("\n3. The next version rebuilds only the edited days:")
+        second, created = publisher.publish(schedule)
+        assert created and second.version == 2 and second.parent_hash == first.hash
+        assert second.get_day(date(2025, 12, 1)) is first.get_day(date(2025, 12, 1))
+        assert publisher.get_deltas(schedule.id) == [] and tuesday.is_published
+        changes = publisher.diff(schedule.id, 1, 2)
+        assert [(change.kind, change.shift_id) for change in changes] == [('changed', tuesday.id),
+                                                                        ('added', thursday.id)]
+        assert changes[0].old.assigned == () and changes[0].new.assigned == (bob.id,)
+        assert [change.kind for change in second.diff(first)] == ['changed', 'removed']
+
+        try:
+            publisher.diff(schedule.id, 1, 3)
+            assert False, "Should have rejected a missing version"
+        except ValueError as e:
+            print(f"  ✅ Correctly rejected: {e}")
+    finally:
+        publisher.close()
+
+    print("\n✅ PUBLISH VERSIONS TEST PASSED")
+
+
+def test_snapshot_storage():
+    """Test saving snapshots by version and loading them back"""
+    print("=== Testing Snapshot Storage ===\n")
+
+    alice = make_employee("Alice")
+    schedule = Schedule("2025-12-01", "2025-12-07", location="Downtown")
+    shift = Shift("2025-12-03", 900, 1700, ["server", "host"], location="Downtown")
+    schedule.add_shift(shift)
+    shift.assign_employee(alice)
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        publisher = Publisher()
+        try:
+            snapshot, _ = publisher.publish(schedule)
+        finally:
+            publisher.close()
+        path = save_snapshot(snapshot, temp_dir)
+        assert os.path.basename(path) == f"schedule_{schedule.id}_v1.json"
+        assert save_snapshot(snapshot, temp_dir) == path
+
+        print("1. Loaded snapshots match their hash:")
+        loaded = load_snapshots(temp_dir)
+        assert len(loaded) == 1 and loaded[0].hash == snapshot.hash
+        assert loaded[0].get_day(date(2025, 12, 3)) == snapshot.get_day(date(2025, 12, 3))
+
+        print("\n2. Edited files are rejected:")
+        with open(path) as file:
+            data = json.load(file)
+        data['days']['2025-12-03'][0][1] = 800
+        try:
+            ScheduleSnapshot.from_dict(data)
+            assert False, "Should have rejected a changed snapshot"
+        except ValueError as e:
+            print(f"  ✅ Correctly rejected: {e}")
+
+        print("\n3. A restarted publisher checks every day but reuses unchanged ones:")
+        publisher = Publisher(loaded)
+        try:
+            assert publisher.has_unpublished_changes(schedule.id)
+            latest, created = publisher.publish(schedule)
+            assert not created and latest is loaded[0]
+            assert not publisher.has_unpublished_changes(schedule.id)
+
+            print("\n4. Reverting to published content is saved as a new version:")
+            shift.remove_employee(alice.id)
+            save_snapshot(publisher.publish(schedule)[0], temp_dir)
+            shift.assign_employee(alice)
+            reverted, created = publisher.publish(schedule)
+            assert created and reverted.version == 3 and reverted.hash == snapshot.hash
+            save_snapshot(reverted, temp_dir)
+        finally:
+            publisher.close()
+        reloaded = Publisher(load_snapshots(temp_dir))
+        try:
+            assert [s.version for s in reloaded.get_versions(schedule.id)] == [1, 2, 3]
+            assert reloaded.get_latest(schedule.id).hash == snapshot.hash
+        finally:
+            reloaded.close()
+
+        print("\n5. Deleting a schedule's versions leaves nothing for a reused ID:")
+        other = Schedule("2025-12-08", "2025-12-14")
+        other.add_shift(Shift("2025-12-08", 900, 1700, ["server"]))
+        publisher = Publisher()
+        try:
+            save_snapshot(publisher.publish(other)[0], temp_dir)
+        finally:
+            publisher.close()
+        assert delete_snapshots(schedule.id, temp_dir) == 3
+        assert [s.schedule_id for s in load_snapshots(temp_dir)] == [other.id]
+
+        print("\n6. A version that fails to save isn't committed:")
+        publisher = Publisher()
+        try:
+            publisher.commit(other, publisher.build(other)[0])
+            other.get_all_shifts()[0].assign_employee(alice)
+            blocked = os.path.join(temp_dir, "blocked")
+            open(blocked, "w").close()  # A file where the directory should be
+            snapshot, created = publisher.build(other)
+            try:
+                save_snapshot(snapshot, blocked)
+                assert False, "Should have failed to save"
+            except OSError:
+                pass
+            assert created and publisher.has_unpublished_changes(other.id)
+            assert publisher.get_latest(other.id).version == 1
+            retried, created = publisher.build(other)
+            assert created and retried.version == 2 and retried.hash == snapshot.hash
+            save_snapshot(retried, temp_dir)
+            publisher.commit(other, retried)
+            assert not publisher.has_unpublished_changes(other.id)
+            try:
+                publisher.commit(other, snapshot)
+                assert False, "Should have rejected a stale snapshot"
+            except ValueError as e:
+                print(f"  ✅ Correctly rejected: {e}")
+        finally:
+            publisher.close()
+
+    print("\n✅ SNAPSHOT STORAGE TEST PASSED")
+
+
+def test_publish_scale():
+    """Test republishing a 10,000-shift rotation after a small edit"""
+    print("=== Testing Publish at Scale ===\n")
+
+    nurse = make_employee("Nora")
+    start = date(2026, 1, 5)
+    schedule = Schedule(start, start + timedelta(days=27))
+    shifts = [Shift(start + timedelta(days=i % 28), 600 + (i % 12) * 100, 700 + (i % 12) * 100, ["server"])
+              for i in range(10000)]
+    schedule.add_shifts(shifts)
+
+    publisher = Publisher()
+    try:
+        started = time.perf_counter()
+        first, _ = publisher.publish(schedule)
+        full = time.perf_counter() - started
+        shifts[13].assign_employee(nurse)
+        started = time.perf_counter()
+        second, _ = publisher.publish(schedule)
+        incremental = time.perf_counter() - started
+        print(f"  First publish {full * 1000:.1f}ms, after one edit {incremental * 1000:.1f}ms")
+
+        shared = sum(1 for day in first.days if second.get_day(day) is first.get_day(day))
+        assert shared == 27 and second.shift_count == 10000
+        started = time.perf_counter()
+        changes = first.diff(second)
+        elapsed = time.perf_counter() - started
+        print(f"  Diff in {elapsed * 1000:.2f}ms")
+        assert [change.shift_id for change in changes] == [shifts[13].id]
+        assert incremental < full
+    finally:
+        publisher.close()
+
+    print("\n✅ PUBLISH SCALE TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_publish_versions()
+    test_snapshot_storage()
+    test_publish_scale()
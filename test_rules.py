@@ -0,0 +1,315 @@
+from itertools import permutations
+from modules import Shift, Schedule
+from modules.generator import WorkloadGenerator
+from modules.optimizer import ScheduleOptimizer, solve_assignment
+from modules.rules import RuleEngine, MinRestRule, MaxConsecutiveDaysRule, OvertimeRule, LaborCostRule
+from test_helpers import make_employee, DAYS
+
+
+def test_rule_engine():
+    """Test hard and soft constraints and incremental violation tracking"""
+    print("=== Testing Rule Engine ===\n")
+
+    alice = make_employee("Alice")
+    schedule = Schedule("2025-12-01", "2025-12-14")
+    late = Shift("2025-12-01", 1600, 2300, ["server"])
+    early = Shift("2025-12-02", 600, 1200, ["server"])   # 7h after the late shift
+    schedule.add_shift(late)
+    schedule.add_shift(early)
+    engine = RuleEngine(schedule, [alice])
+
+    try:
+        print("1. Minimum rest between shifts is enforced:")
+        engine.assign(alice, late)
+        assert engine.can_assign(alice, early)  # The schedule sets no rest period
+        engine.remove_constraint("min_rest")
+        engine.add_constraint(MinRestRule(hours=8))
+        assert not engine.can_assign(alice, early)
+        try:
+            engine.assign(alice, early)
+            assert False, "Should have rejected assignment without enough rest"
+        except ValueError as e:
+            print(f"  ✅ Correctly rejected: {e}")
+        assert alice.id not in early.assigned_employees
+
+        print("\n2. Assignments made outside the engine are checked incrementally:")
+        early.assign_employee(alice)
+        violations = engine.get_violations(hard_only=True)
+        for violation in violations:
+            print(f"  {violation}")
+        assert {v.constraint.name for v in violations} == {"min_rest"}
+        assert not engine.is_feasible()
+        early.remove_employee(alice.id)
+        assert engine.is_feasible()
+
+        print("\n3. Maximum consecutive days is enforced:")
+        engine.remove_constraint("min_rest")
+        engine.add_constraint(MinRestRule(hours=4))
+        engine.remove_constraint("max_consecutive_days")
+        engine.add_constraint(MaxConsecutiveDaysRule(days=6))
+        week = [Shift(f"2025-12-0{day}", 1000, 1400, ["server"]) for day in range(2, 8)]
+        for shift in week:
+            schedule.add_shift(shift)
+        for shift in week[:-1]:
+            engine.assign(alice, shift)  # Monday (late) to Saturday = 6 days
+        assert engine.get_penalty(alice, week[-1]) is None
+        print(f"  Sunday rejected: {[v.message for v in engine.check(alice, week[-1]) if v.is_hard]}")
+
+        print("\n4. Soft rules add a penalty instead of blocking:")
+        engine.remove_constraint("max_consecutive_days")
+        engine.add_constraint(MaxConsecutiveDaysRule(days=7))
+        engine.remove_constraint("overtime")
+        engine.add_constraint(OvertimeRule(weekly_hours=30, weight=2.0))
+        penalty = engine.get_penalty(alice, week[-1])
+        print(f"  Sunday penalty: {penalty}")
+        assert penalty == 2.0 * 1  # 27h scheduled + 4h is 1h past 30h
+        engine.assign(alice, week[-1])
+        assert engine.is_feasible()
+        assert engine.get_score() > 0
+
+        print("\n5. Shifts added with assignments are tracked:")
+        bob = make_employee("Bob", max_hours=4)
+        engine.add_employee(bob)
+        extra = Shift("2025-12-08", 900, 1700, ["server"])
+        extra.assign_employee(bob)  # Outside a schedule, so weekly hours aren't checked yet
+        schedule.add_shift(extra)
+        assert [(v.constraint.name, v.shift) for v in engine.get_violations(hard_only=True)] == [("max_hours", extra)]
+    finally:
+        engine.close()
+
+    print("\n✅ RULE ENGINE TEST PASSED")
+
+
+def test_schedule_labor_rules():
+    """Test that the engine and Shift.assign_employee apply the schedule's one set of labor rules"""
+    print("=== Testing Schedule Labor Rules ===\n")
+
+    alice = make_employee("Alice")
+    schedule = Schedule("2025-12-01", "2025-12-07")
+    lunch = Shift("2025-12-01", 1100, 1400, ["server"])
+    dinner = Shift("2025-12-01", 1700, 2200, ["server"])
+    breakfast = Shift("2025-12-02", 600, 1000, ["server"])
+    schedule.add_shifts([lunch, dinner, breakfast])
+    engine = RuleEngine(schedule, [alice])
+
+    try:
+        print("1. With no limits configured, a same-day split shift is fine:")
+        lunch.assign_employee(alice)
+        assert engine.check(alice, dinner) == []
+        dinner.assign_employee(alice)
+
+        print("\n2. A configured rest period is enforced by both:")
+        schedule.min_rest_hours = 10
+        engine.revalidate()
+        assert not engine.can_assign(alice, breakfast)  # 8h after dinner
+        try:
+            breakfast.assign_employee(alice)
+            assert False, "Should have rejected assignment without enough rest"
+        except ValueError as e:
+            print(f"  ✅ Correctly rejected: {e}")
+        # Lunch and dinner, already assigned, are only 3h apart
+        assert [v.shift for v in engine.get_violations()] == [lunch, dinner]
+
+        print("\n3. A soft engine rule applies once the schedule's limit is relaxed:")
+        schedule.min_rest_hours = None
+        engine.remove_constraint("min_rest")
+        engine.add_constraint(MinRestRule(hours=10, hard=False, weight=5.0))
+        assert engine.get_penalty(alice, breakfast) == 5.0
+        breakfast.assign_employee(alice)
+        assert engine.is_feasible() and engine.get_score() == 3 * 5.0
+    finally:
+        engine.close()
+
+    print("\n✅ SCHEDULE LABOR RULES TEST PASSED")
+
+
+def test_schedule_optimizer():
+    """Test filling a generated schedule without breaking hard rules"""
+    print("=== Testing Schedule Optimizer ===\n")
+
+    generator = WorkloadGenerator(seed=11)
+    employees = generator.generate_employees(120, role_mix='restaurant')
+    schedule = next(generator.iter_schedules(employees, 1, start_date="2025-01-06",
+                                             shifts_per_day=25, fill_rate=0.0))
+    engine = RuleEngine(schedule, employees)
+    try:
+        print("1. Open shifts are filled without breaking hard rules:")
+        result = ScheduleOptimizer(schedule, employees, engine=engine).solve()
+        print(f"  {result}")
+        assert result.assignments
+        assert engine.is_feasible()
+        for shift, employee in result.assignments:
+            assert employee.id in shift.assigned_employees
+        for shift in result.unfilled:
+            assert len(shift.assigned_employees) < shift.min_staff
+        filled = [shift for shift in schedule.get_all_shifts() if shift.assigned_employees]
+        assert all(shift.is_filled for shift in filled)
+
+        # A second run has nothing left it can fill
+        again = ScheduleOptimizer(schedule, employees, engine=engine).solve()
+        assert again.assignments == []
+    finally:
+        engine.close()
+
+    print("\n2. Soft rules steer the choice between feasible employees:")
+    cheap = make_employee("Cheap", wage=12.00)
+    pricey = make_employee("Pricey", wage=30.00)
+    schedule = Schedule("2025-12-01", "2025-12-07")
+    shift = Shift("2025-12-01", 900, 1700, ["server"])
+    schedule.add_shift(shift)
+    engine = RuleEngine(schedule, [pricey, cheap], constraints=[LaborCostRule()])
+    try:
+        ScheduleOptimizer(schedule, [pricey, cheap], engine=engine).solve()
+    finally:
+        engine.close()
+    assert shift.assigned_employees == [cheap.id]
+
+    print("\n✅ SCHEDULE OPTIMIZER TEST PASSED")
+
+
+def test_min_cost_assignment():
+    """Test the Hungarian solver and the min-cost fill mode"""
+    print("=== Testing Min-Cost Assignment ===\n")
+
+    print("1. Solver matches a brute-force search:")
+    costs = [[4, 1, 3], [2, 0, 5], [3, 2, 2]]
+    result = solve_assignment(costs)
+    best = min(sum(costs[i][j] for i, j in enumerate(p)) for p in permutations(range(3)))
+    print(f"  {result} (cost {sum(costs[i][j] for i, j in enumerate(result))}, best {best})")
+    assert sum(costs[i][j] for i, j in enumerate(result)) == best
+
+    print("\n2. Forbidden pairs and extra rows are left unassigned:")
+    result = solve_assignment([[None, 5], [None, 1], [None, None]])
+    print(f"  {result}")
+    assert result == [None, 1, None]
+    assert solve_assignment([[7], [3], [9]]) == [None, 0, None]
+    assert solve_assignment([]) == []
+
+    print("\n3. Min-cost fill picks the cheapest legal combination:")
+    cheap = make_employee("Cheap", wage=12.00)
+    pricey = make_employee("Pricey", wage=30.00)
+    host = make_employee("Host", role="host", wage=25.00)
+    employees = [pricey, host, cheap]
+    schedule = Schedule("2025-12-01", "2025-12-07")
+    server_only = Shift("2025-12-01", 900, 1700, ["server"], max_staff=1)
+    server_or_host = Shift("2025-12-01", 900, 1700, ["server", "host"], max_staff=1)
+    schedule.add_shift(server_or_host)
+    schedule.add_shift(server_only)
+    engine = RuleEngine(schedule, employees)
+    try:
+        result = ScheduleOptimizer(schedule, employees, engine=engine).solve_min_cost()
+        print(f"  {result}")
+        assert engine.is_feasible()
+    finally:
+        engine.close()
+    # Giving Cheap the shared shift would leave Pricey for the server-only one
+    assert server_only.assigned_employees == [cheap.id]
+    assert server_or_host.assigned_employees == [host.id]
+    assert result.is_complete
+
+    print("\n✅ MIN-COST ASSIGNMENT TEST PASSED")
+
+
+def test_schedule_repair():
+    """Test re-filling only the shifts an employee can no longer work"""
+    print("=== Testing Schedule Repair ===\n")
+
+    alice = make_employee("Alice", wage=14.00)
+    bob = make_employee("Bob", wage=16.00)
+    carol = make_employee("Carol", wage=15.00)
+    employees = [alice, bob, carol]
+    schedule = Schedule("2025-12-01", "2025-12-07", min_rest_hours=8)
+    monday = Shift("2025-12-01", 900, 1700, ["server"])
+    tuesday = Shift("2025-12-02", 900, 1700, ["server"])
+    tuesday_late = Shift("2025-12-02", 1700, 2300, ["server"])
+    for shift in (monday, tuesday, tuesday_late):
+        schedule.add_shift(shift)
+    monday.assign_employee(alice)
+    tuesday.assign_employee(alice)
+    tuesday_late.assign_employee(carol)
+
+    print("1. Only shifts the new availability rules out are re-filled:")
+    alice.clear_availability()
+    for day in DAYS:
+        if day != "Tuesday":
+            alice.add_availability(day, 0, 2359)
+    result = ScheduleOptimizer(schedule, employees).repair(alice)
+    print(f"  {result}")
+    assert [shift for shift, employee in result.unassigned] == [tuesday]
+    # Carol is cheaper but already works right after, so Bob takes it
+    assert tuesday.assigned_employees == [bob.id]
+    assert monday.assigned_employees == [alice.id]
+    assert tuesday_late.assigned_employees == [carol.id]
+    assert result.is_complete
+    assert schedule.get_labor_rule_violations() == []
+
+    print("\n2. Nothing changes when the employee can still work every shift:")
+    assert ScheduleOptimizer(schedule, employees).repair(alice).unassigned == []
+
+    print("\n3. A removed employee's shifts are all handed over (with a rule engine):")
+    employees.remove(carol)
+    dave = make_employee("Dave", wage=18.00)
+    employees.append(dave)
+    engine = RuleEngine(schedule, employees)
+    try:
+        result = ScheduleOptimizer(schedule, employees, engine=engine).repair(carol, removed=True)
+        print(f"  {result}")
+        assert engine.is_feasible()
+    finally:
+        engine.close()
+    assert [shift for shift, employee in result.unassigned] == [tuesday_late]
+    # Alice isn't available and Bob would get no rest, so Dave takes it
+    assert tuesday_late.assigned_employees == [dave.id]
+    assert len(schedule.get_timeline(carol.id)) == 0
+
+    print("\n✅ SCHEDULE REPAIR TEST PASSED")
+
+
+def test_multi_location_optimizer():
+    """Test filling same-time shifts at different locations in one schedule"""
+    print("=== Testing Multi-Location Optimizer ===\n")
+
+    def build():
+        uptown = [make_employee(f"Up{i}", wage=12.00 + i, locations=["Uptown"]) for i in range(2)]
+        downtown = [make_employee(f"Down{i}", wage=20.00 + i, locations=["Downtown"]) for i in range(2)]
+        schedule = Schedule("2025-12-01", "2025-12-07")
+        shifts = [Shift("2025-12-01", 900, 1700, ["server"], location=location)
+                  for location in ("Uptown", "Downtown", "Uptown", "Downtown")]
+        schedule.add_shifts(shifts)
+        return uptown + downtown, schedule, shifts
+
+    for mode in ("solve", "solve_min_cost", "solve_fair"):
+        print(f"{mode}: every site is filled from its own staff")
+        employees, schedule, shifts = build()
+        result = getattr(ScheduleOptimizer(schedule, employees), mode)()
+        print(f"  {result}")
+        assert result.is_complete
+        for shift in shifts:
+            assert [e.works_at(shift.location) for e in employees if e.id in shift.assigned_employees] == [True]
+
+    print("\nrepair: vacated shifts at two sites go to each site's staff")
+    alice = make_employee("Alice", wage=10.00)
+    up = make_employee("Up", locations=["Uptown"])
+    down = make_employee("Down", locations=["Downtown"])
+    employees = [alice, up, down]
+    schedule = Schedule("2025-12-01", "2025-12-14")
+    first = Shift("2025-12-01", 900, 1700, ["server"], location="Uptown")
+    second = Shift("2025-12-08", 900, 1700, ["server"], location="Downtown")
+    schedule.add_shifts([first, second])
+    first.assign_employee(alice)
+    second.assign_employee(alice)
+    result = ScheduleOptimizer(schedule, employees).repair(alice, removed=True)
+    print(f"  {result}")
+    assert first.assigned_employees == [up.id] and second.assigned_employees == [down.id]
+    assert result.is_complete
+
+    print("\n✅ MULTI-LOCATION OPTIMIZER TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_rule_engine()
+    test_schedule_labor_rules()
+    test_schedule_optimizer()
+    test_min_cost_assignment()
+    test_schedule_repair()
+    test_multi_location_optimizer()
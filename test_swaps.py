@@ -0,0 +1,104 @@
+from modules import Employee, Shift, Schedule
+from modules.swaps import SwapMarketplace, COMPLETED, CANCELLED
+from test_helpers import make_employee
+
+
+def test_shift_swaps():
+    """Test posting shifts, matching partners and applying swaps atomically"""
+    print("=== Testing Shift Swaps ===\n")
+
+    alice = make_employee("Alice", days=["Monday", "Tuesday"])
+    bob = make_employee("Bob", wage=16.00)
+    carol = make_employee("Carol", wage=14.00, max_hours=8)
+    cook = Employee("Dan", "555-0000", "dan@email.com", "cook", 15.00)
+    cook.add_availability("Monday", 0, 2359)
+    employees = [alice, bob, carol, cook]
+
+    schedule = Schedule("2025-12-01", "2025-12-07")
+    monday = Shift("2025-12-01", 900, 1700, ["server"])
+    tuesday = Shift("2025-12-02", 900, 1700, ["server"])
+    wednesday = Shift("2025-12-03", 900, 1700, ["server"])
+    carol_shift = Shift("2025-12-04", 900, 1700, ["server"])
+    for shift in (monday, tuesday, wednesday, carol_shift):
+        schedule.add_shift(shift)
+    monday.assign_employee(alice)
+    tuesday.assign_employee(bob)
+    wednesday.assign_employee(bob)
+    carol_shift.assign_employee(carol)
+
+    marketplace = SwapMarketplace(employees)
+    try:
+        print("1. Posting checks the employee is on the shift:")
+        try:
+            marketplace.post(monday, bob.id)
+            assert False, "Should have rejected a shift Bob isn't on"
+        except ValueError as e:
+            print(f"  ✅ Correctly rejected: {e}")
+        request = marketplace.post(monday, alice.id, note="Doctor's appointment")
+        try:
+            marketplace.post(monday, alice.id)
+            assert False, "Should have rejected posting the same shift twice"
+        except ValueError as e:
+            print(f"  ✅ Correctly rejected: {e}")
+        assert marketplace.get_open_requests() == [request]
+
+        print("\n2. Covers fit role, availability, hours and conflicts:")
+        covers = marketplace.find_covers(request)
+        print(f"  {[employee.name for employee in covers]}")
+        # Carol is at her 8h max and Dan is a cook
+        assert covers == [bob]
+
+        print("\n3. Trades only offer shifts the poster can work in return:")
+        trades = marketplace.find_trades(request)
+        print(f"  {[(partner.name, str(shift.date)) for partner, shift in trades]}")
+        # Alice isn't available Wednesday or Thursday
+        assert trades == [(bob, tuesday)]
+
+        print("\n4. A failing swap leaves the schedule untouched:")
+        hours_before = schedule.get_employee_hours(bob.id, monday.date)
+        try:
+            marketplace.accept(request.id, bob.id, wednesday)
+            assert False, "Should have rejected giving Alice a Wednesday shift"
+        except ValueError as e:
+            print(f"  ✅ Correctly rejected: {e}")
+        assert monday.assigned_employees == [alice.id]
+        assert wednesday.assigned_employees == [bob.id]
+        assert schedule.get_employee_hours(bob.id, monday.date) == hours_before
+        assert request.status == "open"
+
+        print("\n   Assignments that would no longer pass their checks are still put back:")
+        bob.max_hours = 8  # Lowered after Bob was given Tuesday and Wednesday
+        try:
+            marketplace.accept(request.id, bob.id, wednesday)
+            assert False, "Should have rejected Bob going over his max hours"
+        except ValueError as e:
+            print(f"  ✅ Correctly rejected: {e}")
+        assert monday.assigned_employees == [alice.id]
+        assert wednesday.assigned_employees == [bob.id]
+        assert schedule.get_employee_hours(bob.id, monday.date) == hours_before
+        assert len(schedule.get_timeline(bob.id)) == 2
+        bob.max_hours = 40
+
+        print("\n5. A valid trade is applied:")
+        marketplace.accept(request.id, bob.id, tuesday)
+        assert monday.assigned_employees == [bob.id]
+        assert tuesday.assigned_employees == [alice.id]
+        assert request.status == COMPLETED and request.partner_shift is tuesday
+        assert monday.is_filled and tuesday.is_filled
+        assert schedule.get_labor_rule_violations() == []
+        assert marketplace.get_open_requests() == []
+
+        print("\n6. Requests are cancelled when the poster leaves the shift:")
+        stale = marketplace.post(wednesday, bob.id)
+        wednesday.remove_employee(bob.id)
+        assert marketplace.get_open_requests() == []
+        assert stale.status == CANCELLED
+        assert not marketplace.cancel(stale.id)
+    finally:
+        marketplace.close()
+
+    print("\n✅ SHIFT SWAP TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_shift_swaps()
@@ -0,0 +1,176 @@
+import os
+import tempfile
+import time
+from datetime import date
+from modules import Employee, Shift, Schedule
+from modules.events import event_bus, SHIFT_ADDED, SHIFTS_ADDED
+from modules.locations import ConflictIndex
+from modules.templates import ShiftTemplate, save_templates, load_templates
+from modules.timeline import get_shift_interval
+
+
+def test_add_shifts():
+    """Test validating and indexing many shifts in one call"""
+    print("=== Testing Bulk Add Shifts ===\n")
+
+    schedule = Schedule("2025-12-01", "2025-12-07")
+    events = []
+
+    def on_shifts_added(schedule, shifts):
+        events.append(len(shifts))
+
+    def on_shift_added(schedule, shift):
+        events.append(shift)
+
+    event_bus.subscribe(SHIFTS_ADDED, on_shifts_added)
+    event_bus.subscribe(SHIFT_ADDED, on_shift_added)
+    try:
+        print("1. Nothing is added if any shift is out of range:")
+        bad = [Shift("2025-12-01", 900, 1700, ["server"]), Shift("2025-12-09", 900, 1700, ["server"])]
+        try:
+            schedule.add_shifts(bad)
+            assert False, "Should have rejected a shift outside the schedule"
+        except ValueError as e:
+            print(f"  ✅ Correctly rejected: {e}")
+        assert schedule.shifts == [] and events == []
+
+        print("\n2. Valid shifts are indexed with one event:")
+        shifts = [Shift(f"2025-12-0{day}", 900, 1700, ["server"]) for day in range(1, 8)]
+        assert schedule.add_shifts(shifts) == 7
+        assert events == [7]
+        assert all(shift.schedule is schedule for shift in shifts)
+        assert schedule.add_shifts([]) == 0
+    finally:
+        event_bus.unsubscribe(SHIFTS_ADDED, on_shifts_added)
+        event_bus.unsubscribe(SHIFT_ADDED, on_shift_added)
+
+    print("\n✅ BULK ADD SHIFTS TEST PASSED")
+
+
+def test_shift_templates():
+    """Test capturing a week as a template and expanding it into schedules"""
+    print("=== Testing Shift Templates ===\n")
+
+    print("1. A schedule's week is captured with identical shifts merged:")
+    schedule = Schedule("2025-12-01", "2025-12-07")
+    schedule.add_shift(Shift("2025-12-01", 900, 1700, ["server"]))
+    schedule.add_shift(Shift("2025-12-01", 900, 1700, ["server"]))
+    schedule.add_shift(Shift("2025-12-06", 1600, 2300, ["cook"], min_staff=2, max_staff=3))
+    template = ShiftTemplate.from_schedule(schedule, "Standard week")
+    print(f"  {template}")
+    assert len(template.patterns) == 2
+    assert template.patterns[0].count == 2 and template.patterns[0].day == "Monday"
+    assert template.get_shift_count() == 3
+
+    print("\n2. Expanding places shifts on the matching weekdays:")
+    shifts = template.expand(date(2026, 1, 7))  # Any day in the week works
+    assert [str(shift.date) for shift in shifts] == ["2026-01-05", "2026-01-05", "2026-01-10"]
+    assert shifts[2].min_staff == 2 and shifts[2].max_staff == 3
+    assert shifts[0].assigned_employees == []
+
+    print("\n3. Invalid patterns are rejected:")
+    try:
+        template.add_pattern("Funday", 900, 1700, ["server"])
+        assert False, "Should have rejected an invalid day"
+    except ValueError as e:
+        print(f"  ✅ Correctly rejected: {e}")
+
+    print("\n4. A year of a 400-shift week is created in bulk:")
+    big = ShiftTemplate("Busy week")
+    for day in ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]:
+        big.add_pattern(day, 600, 1400, ["nurse"], count=20)
+        big.add_pattern(day, 1400, 2200, ["nurse"], count=20)
+        big.add_pattern(day, 2200, 600, ["nurse"], count=17)
+    assert big.get_shift_count() == 399
+    started = time.perf_counter()
+    schedules = big.create_schedules(date(2026, 1, 5), 52)
+    elapsed = time.perf_counter() - started
+    print(f"  52 weeks, {sum(len(s.shifts) for s in schedules)} shifts in {elapsed:.3f}s")
+    assert len(schedules) == 52
+    assert schedules[-1].start_date == date(2026, 12, 28)
+    assert all(len(s.shifts) == 399 for s in schedules)
+    assert elapsed < 1.0
+
+    print("\n5. Templates are saved and loaded:")
+    with tempfile.TemporaryDirectory() as temp_dir:
+        path = os.path.join(temp_dir, 'data', 'templates.json')
+        assert load_templates(path) == []
+        save_templates([template, big], path)
+        loaded = load_templates(path)
+    assert [t.to_dict() for t in loaded] == [template.to_dict(), big.to_dict()]
+
+    print("\n✅ SHIFT TEMPLATE TEST PASSED")
+
+
+def test_schedule_clone():
+    """Test copying a schedule forward with and without assignments"""
+    print("=== Testing Schedule Clone ===\n")
+
+    alice = Employee("Alice", "555-0001", "alice@email.com", "server", 15.00)
+    bob = Employee("Bob", "555-0002", "bob@email.com", "server", 16.00)
+    carol = Employee("Carol", "555-0003", "carol@email.com", "server", 17.00)
+    for employee in (alice, bob, carol):
+        employee.add_availability("Monday", 800, 2200)
+        employee.add_availability("Tuesday", 800, 2200)
+
+    schedule = Schedule("2025-12-01", "2025-12-07", min_rest_hours=10)
+    monday = Shift("2025-12-01", 900, 1700, ["server"], max_staff=2)
+    tuesday = Shift("2025-12-02", 900, 1700, ["server"])
+    schedule.add_shifts([monday, tuesday])
+    monday.assign_employee(alice)
+    monday.assign_employee(bob)
+    tuesday.assign_employee(carol)
+    for shift in (monday, tuesday):
+        shift.update_filled_status([alice, bob, carol])
+
+    print("1. An empty copy moves every shift by whole weeks:")
+    empty = schedule.clone(weeks=2)
+    assert str(empty.start_date) == "2025-12-15" and str(empty.end_date) == "2025-12-21"
+    assert [str(shift.date) for shift in empty.shifts] == ["2025-12-15", "2025-12-16"]
+    assert all(not shift.assigned_employees for shift in empty.shifts)
+    assert empty.min_rest_hours == 10
+    assert empty.shifts[0].id != monday.id and empty.shifts[0].schedule is empty
+
+    print("\n2. Assignments are kept and indexed:")
+    copy = schedule.clone(keep_assignments=True)
+    assert copy.shifts[0].assigned_employees == [alice.id, bob.id]
+    assert copy.get_employee_hours(alice.id, copy.start_date) == 8.0
+    assert copy.shifts[0].is_filled
+    # The original is untouched
+    assert monday.assigned_employees == [alice.id, bob.id] and monday.schedule is schedule
+
+    print("\n3. Only changed employees are re-checked, removed ones are dropped:")
+    bob.clear_availability()
+    bob.add_availability("Tuesday", 800, 2200)
+    copy = schedule.clone(keep_assignments=True, employees_list=[alice, bob],
+                          changed_employee_ids={bob.id})
+    print(f"  Monday: {copy.shifts[0].assigned_employees}, Tuesday: {copy.shifts[1].assigned_employees}")
+    assert copy.shifts[0].assigned_employees == [alice.id]      # Bob no longer works Mondays
+    assert copy.shifts[1].assigned_employees == []              # Carol was removed
+    assert not copy.shifts[1].is_filled
+    assert copy.get_employee_hours(bob.id, copy.start_date) == 0.0
+
+    print("\n4. Kept assignments must still fit the employee's weekly hours:")
+    alice.max_hours = 4
+    copy = schedule.clone(keep_assignments=True, employees_list=[alice, bob, carol])
+    print(f"  Monday: {copy.shifts[0].assigned_employees}, Tuesday: {copy.shifts[1].assigned_employees}")
+    assert copy.shifts[0].assigned_employees == [bob.id]
+    assert copy.shifts[1].assigned_employees == [carol.id]
+    assert copy.get_employee_hours(alice.id, copy.start_date) == 0.0
+    assert copy.get_employee_hours(bob.id, copy.start_date) == 8.0
+    assert copy.get_labor_rule_violations() == []
+
+    print("\n5. ...and not clash with bookings at other locations:")
+    uptown = Shift("2025-12-09", 1000, 1400, ["server"], location="Uptown")
+    schedule.conflict_index = ConflictIndex()
+    schedule.conflict_index.set_location("Uptown", [(carol.id, *get_shift_interval(uptown), uptown.id)])
+    copy = schedule.clone(keep_assignments=True, employees_list=[alice, bob, carol])
+    assert copy.shifts[1].assigned_employees == [] and not copy.shifts[1].is_filled
+
+    print("\n✅ SCHEDULE CLONE TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_add_shifts()
+    test_shift_templates()
+    test_schedule_clone()
@@ -0,0 +1,82 @@
+from datetime import date
+from modules import Employee, Shift, Schedule
+from modules.timeline import EmployeeTimeline, get_shift_interval
+
+DAYS = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+
+
+def test_employee_timeline():
+    """Test sorted per-employee timelines and the rest/consecutive-day rules"""
+    print("=== Testing Employee Timelines ===\n")
+
+    print("1. Intervals are absolute minutes and overnight shifts end the next day:")
+    overnight = Shift("2025-12-01", 2200, 600, ["nurse"])
+    start, end = get_shift_interval(overnight)
+    assert end - start == 8 * 60
+    assert start == date(2025, 12, 1).toordinal() * 24 * 60 + 22 * 60
+
+    print("\n2. Neighbouring shifts that are too close are found:")
+    timeline = EmployeeTimeline()
+    timeline.add(overnight)
+    timeline.add(Shift("2025-12-05", 900, 1700, ["nurse"]))
+    next_morning = Shift("2025-12-02", 1000, 1400, ["nurse"])   # 4h after the overnight shift
+    other, gap = timeline.find_too_close(next_morning, 8 * 60)
+    print(f"  Shift {other.id} is {gap / 60:.1f}h away")
+    assert other is overnight and gap == 4 * 60
+    assert timeline.find_too_close(next_morning, 4 * 60) is None
+    overlapping = Shift("2025-12-02", 500, 900, ["nurse"])
+    assert timeline.find_too_close(overlapping)[1] < 0
+    assert timeline.find_too_close(overnight, 8 * 60) is None  # A shift never clashes with itself
+
+    print("\n3. Streaks count consecutive days worked:")
+    for day in range(2, 5):
+        timeline.add(Shift(f"2025-12-0{day}", 900, 1000, ["nurse"]))
+    assert timeline.get_streak(date(2025, 12, 3)) == 5   # Dec 1-5
+    assert timeline.get_streak(date(2025, 12, 7)) == 1
+    assert timeline.get_streak(date(2025, 12, 6)) == 6   # Filling the gap joins the runs
+    assert timeline.remove(overnight) and not timeline.remove(overnight)
+    assert timeline.get_streak(date(2025, 12, 3)) == 4
+
+    print("\n4. Shift.assign_employee enforces rest periods and consecutive days:")
+    nurse = Employee("Nora", "555-0001", "nora@email.com", "nurse", 40.00, max_hours=80)
+    for day in DAYS:
+        nurse.add_availability(day, 0, 2359)
+    schedule = Schedule("2025-12-01", "2025-12-14", min_rest_hours=8, max_consecutive_days=6)
+    shifts = [Shift(f"2025-12-{day:02d}", 800, 1200, ["nurse"]) for day in range(1, 9)]
+    late = Shift("2025-12-09", 1800, 2330, ["nurse"])
+    early = Shift("2025-12-10", 500, 1100, ["nurse"])
+    for shift in shifts + [late, early]:
+        schedule.add_shift(shift)
+
+    for shift in shifts[:6]:
+        shift.assign_employee(nurse)
+    try:
+        shifts[6].assign_employee(nurse)  # Day 7 in a row
+        assert False, "Should have rejected a 7th consecutive day"
+    except ValueError as e:
+        print(f"  ✅ Correctly rejected: {e}")
+    shifts[7].assign_employee(nurse)  # After a day off
+    late.assign_employee(nurse)
+    try:
+        early.assign_employee(nurse)  # 5.5h after the late shift
+        assert False, "Should have rejected assignment without enough rest"
+    except ValueError as e:
+        print(f"  ✅ Correctly rejected: {e}")
+
+    print("\n5. Whole-schedule validation and persistence:")
+    assert schedule.get_labor_rule_violations() == []
+    schedule.min_rest_hours = 24
+    violations = schedule.get_labor_rule_violations()
+    print(f"  With 24h rest: {[reason for emp_id, shift, reason in violations]}")
+    assert [shift for emp_id, shift, reason in violations] == shifts[1:6]  # 20h between the daily shifts
+    loaded = Schedule.from_dict(schedule.to_dict())
+    assert loaded.min_rest_hours == 24 and loaded.max_consecutive_days == 6
+    assert len(loaded.get_timeline(nurse.id)) == 8
+    shifts[7].remove_employee(nurse.id)
+    assert len(schedule.get_timeline(nurse.id)) == 7
+
+    print("\n✅ EMPLOYEE TIMELINE TEST PASSED")
+
+
+if __name__ == "__main__":
+    test_employee_timeline()